@@ -59,6 +59,23 @@ class IECORE_API FileIndexedIO : public StreamIndexedIO
 		/// 	"compressor" : String [ 'blosclz' | 'lz4' | 'lz4hc' | 'snappy' | 'zlib']
 		///		"compressionLevel" : Int [ 0 = no compression, 9 = max compression ]
 		///		"maxCompressedBlockSize" : UInt [ size of compression block ]
+		///		"subIndexMemoryLimit" : UInt64 [ bytes of loaded subindexes kept in memory when reading, 0 = unlimited ].
+		///			Least recently used subindexes that aren't referenced by an IndexedIO are released to
+		///			stay below the limit. Defaults to the IECORE_STREAMINDEXEDIO_SUBINDEX_MEMORY_LIMIT
+		///			environment variable.
+		///		"deduplicateOnAppend" : Bool [ when opening in Append mode, hash the existing data so that duplicates
+		///			of it are not written again ]
+		///		"compressionQueueLength" : Int [ number of blocks compressed in the background while the caller
+		///			continues writing, 0 = compress on the calling thread ]. Blocks are written to the file in the
+		///			order they were queued, and the queue is flushed before any read or commit.
+		///		"compressionPolicy" : Compound [ overrides the compression of the entries matching the names of the
+		///			members. Members may be named after an entry, or after an IndexedIO::DataType (e.g. "FloatArray"),
+		///			with entry names taking precedence. Each member is a Compound containing any of :
+		///				"compressor" : String, "compressionLevel" : Int,
+		///				"shuffle" : String [ 'none' | 'byte' | 'bit' ],
+		///				"minSize" : Int [ blocks smaller than this are not compressed ]
+		///			Settings which aren't given use the file wide values. The compressor is recorded with each
+		///			block, so no options are needed to read the file. ]
 		FileIndexedIO(const std::string &path, const IndexedIO::EntryIDList &root, IndexedIO::OpenMode mode, const CompoundData *options = nullptr);
 
 		~FileIndexedIO() override;
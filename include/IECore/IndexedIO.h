@@ -54,6 +54,7 @@ namespace IECore
 
 IE_CORE_FORWARDDECLARE( IndexedIO );
 IE_CORE_FORWARDDECLARE( CompoundData );
+IE_CORE_FORWARDDECLARE( Data );
 
 /// Abstract interface to define operations on a random-access indexed input/output device. All methods throw an instance of IOException,
 /// or one of its subclasses, if an error is encountered.
@@ -358,6 +359,15 @@ class IECORE_API IndexedIO : public RunTimeTyped
 		/// \param x The data to write
 		virtual void write(const IndexedIO::EntryID &name, const unsigned short &x) = 0;
 
+		/// Create a new file containing the contents of a VectorTypedData, stored as an array of
+		/// its BaseType so that it can be read back with the array read() methods. Implementations
+		/// may use the hash cached by the data to identify arrays that have already been written,
+		/// without having to process them again. The default implementation calls the array write()
+		/// method for the BaseType.
+		/// \param name The name of the file to be written
+		/// \param data The data to write
+		virtual void write(const IndexedIO::EntryID &name, const Data *data);
+
 		/// Read a float array from an existing file.
 		/// \param name The name of the file to be read
 		/// \param x The buffer to fill. If 0 is passed, then memory is allocated and should be freed by the caller.
@@ -496,6 +506,15 @@ class IECORE_API IndexedIO : public RunTimeTyped
 		/// \param x Returns the data read.
 		virtual void read(const IndexedIO::EntryID &name, unsigned short &x) const  = 0;
 
+		/// Reads several files from the current directory in a single operation, returning
+		/// a Data object for each of them, in the same order as the names. Single values are
+		/// returned as SimpleTypedData and arrays as VectorTypedData. The default implementation
+		/// reads the files one at a time, but derived classes may override it to read them
+		/// more efficiently as a batch.
+		/// \param names The names of the files to be read
+		/// \param values Returns the data read.
+		virtual void read(const IndexedIO::EntryIDList &names, std::vector<DataPtr> &values) const;
+
 		/// A representation of a single file/directory
 		class IECORE_API Entry
 		{
@@ -42,6 +42,7 @@
 
 #include <memory>
 #include <string>
+#include <vector>
 
 namespace IECore
 {
@@ -266,6 +267,12 @@ class IECORE_API Object : public RunTimeTyped
 
 				/// Load an Object instance previously saved by SaveContext::save().
 				typename T::Ptr load( const IndexedIO *container, const IndexedIO::EntryID &name );
+				/// Loads several Object instances previously saved into the same container,
+				/// returning them in the same order as `names`. When there are enough of them
+				/// and the container supports concurrent reads, the objects are loaded in
+				/// parallel. Objects shared between them are still loaded only once.
+				template<class T>
+				std::vector<typename T::Ptr> load( const IndexedIO *container, const IndexedIO::EntryIDList &names );
 				/// Returns an interface to a raw container created by SaveContext::rawContainer() - please see
 				/// documentation and cautionary notes for that function.
 				const IndexedIO *rawContainer();
@@ -277,6 +284,7 @@ class IECORE_API Object : public RunTimeTyped
 				struct LoadedObjects;
 				LoadContext( ConstIndexedIOPtr ioInterface, std::shared_ptr<LoadedObjects> loadedObjects, const IECore::Canceller *canceller = nullptr );
 				ObjectPtr loadObjectOrReference( const IndexedIO *container, const IndexedIO::EntryID &name );
+				void loadObjectsOrReferences( const IndexedIO *container, const IndexedIO::EntryIDList &names, std::vector<ObjectPtr> &objects );
 				ObjectPtr loadObject( const IndexedIO *container );
 
 				ConstIndexedIOPtr m_ioInterface;
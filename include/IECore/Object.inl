@@ -87,6 +87,21 @@ typename T::Ptr Object::LoadContext::load( const IndexedIO *i, const IndexedIO::
 	return runTimeCast<T>( loadObjectOrReference( i, name ) );
 }
 
+template<class T>
+std::vector<typename T::Ptr> Object::LoadContext::load( const IndexedIO *i, const IndexedIO::EntryIDList &names )
+{
+	std::vector<ObjectPtr> objects;
+	loadObjectsOrReferences( i, names, objects );
+
+	std::vector<typename T::Ptr> result;
+	result.reserve( objects.size() );
+	for( const auto &o : objects )
+	{
+		result.push_back( runTimeCast<T>( o ) );
+	}
+	return result;
+}
+
 inline const Canceller *Object::LoadContext::canceller()
 {
 	return m_canceller;
@@ -0,0 +1,85 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2026, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+
+#ifndef IECORE_OBJECTALGO_H
+#define IECORE_OBJECTALGO_H
+
+#include "IECore/Canceller.h"
+#include "IECore/Export.h"
+#include "IECore/Object.h"
+#include "IECore/VectorTypedData.h"
+
+#include <iosfwd>
+
+namespace IECore
+{
+
+namespace ObjectAlgo
+{
+
+/// Compact binary serialisation
+/// ============================
+///
+/// Encodes objects as a flat, length-prefixed binary blob, avoiding the
+/// directory and entry overhead of `Object::save()`. This is intended for
+/// small objects and for transferring objects over sockets or storing them
+/// as a single entry in an IndexedIO. TypedData, CompoundData, CompoundObject
+/// and ObjectVector are encoded directly, and objects shared between members
+/// are encoded only once. All other objects are embedded using the IndexedIO
+/// format of `Object::save()`.
+///
+/// The encoding uses the byte order of the machine that wrote it, and an
+/// IOException is thrown when reading data written with a different byte
+/// order.
+
+/// Returns the encoding of `object`.
+IECORE_API CharVectorDataPtr serialise( const Object *object );
+/// Writes the encoding of `object` to `stream`.
+IECORE_API void serialise( const Object *object, std::ostream &stream );
+
+/// Returns the object encoded in `data`, which must have been created by
+/// `serialise()`.
+IECORE_API ObjectPtr deserialise( const CharVectorData *data, const Canceller *canceller = nullptr );
+IECORE_API ObjectPtr deserialise( const char *data, size_t size, const Canceller *canceller = nullptr );
+/// Reads an encoded object from `stream`, consuming exactly the bytes
+/// written by `serialise()`, so that several objects may be read from the
+/// same stream in turn.
+IECORE_API ObjectPtr deserialise( std::istream &stream, const Canceller *canceller = nullptr );
+
+} // namespace ObjectAlgo
+
+} // namespace IECore
+
+#endif // IECORE_OBJECTALGO_H
@@ -75,6 +75,10 @@ class IECORE_API PathMatcher
 		template<typename PathIterator>
 		PathMatcher( PathIterator pathsBegin, PathIterator pathsEnd );
 
+		/// Replaces the contents with the specified paths. Paths are
+		/// added fastest when those with common ancestors are adjacent,
+		/// as they are in a sorted list or in the order visited by
+		/// a RawIterator.
 		template<typename PathIterator>
 		void init( PathIterator pathsBegin, PathIterator pathsEnd );
 
@@ -232,6 +236,20 @@ class IECORE_API PathMatcher
 
 		typedef std::vector<IECore::InternedString>::const_iterator NameIterator;
 
+		// Stores the ancestors of the last path added by `buildPath()`,
+		// so that the next path can start from them rather than
+		// searching from the root again.
+		struct BuildCache
+		{
+			std::vector<IECore::InternedString> path;
+			std::vector<Node *> nodes;
+		};
+
+		// Used by `init()` to add a path to a newly cleared tree, in which
+		// no nodes other than `Node::leaf()` may be shared.
+		void buildPath( const std::string &path, BuildCache &cache );
+		void buildPath( const std::vector<IECore::InternedString> &path, BuildCache &cache );
+
 		// Utility used in lazy-copy-on-write.
 		PathMatcher::Node *writable( Node *node, NodePtr &writableCopy, bool shared );
 
@@ -243,6 +261,9 @@ class IECORE_API PathMatcher
 		NodePtr addPathsWalk( Node *node, const Node *srcNode, bool shared, bool &added );
 		NodePtr addPrefixedPathsWalk( Node *node, const Node *srcNode, const NameIterator &start, const NameIterator &end, bool shared, bool &added  );
 		NodePtr removePathsWalk( Node *node, const Node *srcNode, bool shared, bool &removed );
+		// Returns the intersection of the two nodes, sharing subtrees that are common to both,
+		// or null if the intersection is empty.
+		static NodePtr intersectionWalk( const Node *node, const Node *otherNode );
 
 		void matchWalk( const Node *node, const NameIterator &start, const NameIterator &end, unsigned &result ) const;
 
@@ -54,9 +54,10 @@ template<typename PathIterator>
 void PathMatcher::init( PathIterator pathsBegin, PathIterator pathsEnd )
 {
 	clear();
+	BuildCache cache;
 	for( PathIterator it = pathsBegin; it != pathsEnd; it++ )
 	{
-		addPath( *it );
+		buildPath( *it, cache );
 	}
 }
 
@@ -101,6 +101,15 @@ class IECORE_API StreamIndexedIO : public IndexedIO
 
 		void commit() override;
 
+		/// Returns the memory used by the index of the file, including the
+		/// subindexes loaded so far.
+		size_t indexMemoryUsage() const;
+
+		/// Returns a hash identifying the file and its current contents, or a
+		/// default constructed hash if the file can't be identified. Files are
+		/// only identified when opened in Read mode.
+		const MurmurHash &fileIdentity() const;
+
 		void write(const IndexedIO::EntryID &name, const float *x, unsigned long arrayLength) override;
 		void write(const IndexedIO::EntryID &name, const double *x, unsigned long arrayLength) override;
 		void write(const IndexedIO::EntryID &name, const half *x, unsigned long arrayLength) override;
@@ -127,6 +136,10 @@ class IECORE_API StreamIndexedIO : public IndexedIO
 		void write(const IndexedIO::EntryID &name, const short &x) override;
 		void write(const IndexedIO::EntryID &name, const unsigned short &x) override;
 
+		/// Uses the hash cached by numeric arrays to find duplicates, skipping both
+		/// the hashing and compression of data that has already been written.
+		void write(const IndexedIO::EntryID &name, const Data *data) override;
+
 		void read(const IndexedIO::EntryID &name, float *&x, unsigned long arrayLength) const override;
 		void read(const IndexedIO::EntryID &name, double *&x, unsigned long arrayLength) const override;
 		void read(const IndexedIO::EntryID &name, half *&x, unsigned long arrayLength) const override;
@@ -153,6 +166,22 @@ class IECORE_API StreamIndexedIO : public IndexedIO
 		void read(const IndexedIO::EntryID &name, short &x) const override;
 		void read(const IndexedIO::EntryID &name, unsigned short &x) const override;
 
+		/// Reads the data blocks sorted by their position in the file, coalescing
+		/// the reads of nearby blocks, and decompresses them in parallel.
+		void read(const IndexedIO::EntryIDList &names, std::vector<DataPtr> &values) const override;
+
+		/// Decompressed data read from files opened in Read mode may be stored in a cache
+		/// shared by all the readers in the process, so that files opened more than once
+		/// don't decompress the same data repeatedly. Files are identified by their device,
+		/// inode, size and modification time, so rewritten files are not served stale data.
+		/// The cache is disabled by default, and the initial limit may be given in bytes
+		/// with the IECORE_STREAMINDEXEDIO_BLOCK_CACHE_MEMORY_LIMIT environment variable.
+		static void setBlockCacheMemoryLimit( size_t memoryLimit );
+		static size_t getBlockCacheMemoryLimit();
+		/// Returns the "hits", "misses", "memoryUsage" and "memoryLimit" of the cache.
+		static CompoundDataPtr blockCacheStatistics();
+		static void clearBlockCache();
+
 		class PlatformReader;
 
 	protected:
@@ -165,6 +194,12 @@ class IECORE_API StreamIndexedIO : public IndexedIO
 
 		class Reader;
 
+		class BatchReader;
+
+		class DataWriter;
+
+		class BlockCache;
+
 		class StringCache;
 
 		/// Class that provides access to the stream file.
@@ -178,15 +213,32 @@ class IECORE_API StreamIndexedIO : public IndexedIO
 				/// see 'setInput'
 				void read( char *buffer, size_t size, size_t pos);
 
+				/// Returns a pointer to 'size' bytes at 'pos' offset in the file
+				/// if the file is memory mapped, and nullptr otherwise. Memory
+				/// mapping is enabled for files opened in Read mode when the
+				/// IECORE_MMAPREAD_ENABLED environment variable is set.
+				const char *map( size_t size, size_t pos ) const;
+
 				void seekg( size_t pos, std::ios_base::seekdir dir );
+				/// Writes are combined into a large buffer, so seeking to the current
+				/// 'write' position is free, and seeking anywhere else flushes the buffer.
 				void seekp( size_t pos, std::ios_base::seekdir dir );
 				void read( char *buffer, size_t size );
 				void write( const char *buffer, size_t size );
 				Imf::Int64 tellg();
 				Imf::Int64 tellp();
 
+				/// Writes any buffered data to the stream. This is called automatically
+				/// before reading and before the index is flushed.
+				void flushWrites();
+
 				IndexedIO::OpenMode openMode() const;
 
+				/// Returns a hash identifying the file and its current contents, or a
+				/// default constructed hash if the file can't be identified or it isn't
+				/// opened in Read mode.
+				const MurmurHash &identity() const;
+
 				// returns a read lock, when thread-safety is required.
 				typedef tbb::recursive_mutex Mutex;
 				typedef Mutex::scoped_lock MutexLock;
@@ -208,6 +260,11 @@ class IECORE_API StreamIndexedIO : public IndexedIO
 				/// Optionally provide a filename to use for lock free reading
 				void setInput( std::iostream *stream, bool emptyFile, const std::string& fileName );
 
+				/// Writes 'size' bytes at 'pos' offset in the file. Called with large blocks
+				/// of combined writes. The default implementation writes to the stream,
+				/// derived classes may override it to use a more efficient mechanism.
+				virtual void writeBlock( const char *buffer, size_t size, size_t pos );
+
 				IndexedIO::OpenMode m_openmode;
 				std::iostream *m_stream;
 				Mutex m_mutex;
@@ -218,6 +275,11 @@ class IECORE_API StreamIndexedIO : public IndexedIO
 				/// platform specific utility object to provide lock free reads to the referenced
 				/// stream. Can be null and the locking stream reads will be used.
 				std::unique_ptr<PlatformReader> m_platformReader;
+
+				MurmurHash m_identity;
+
+				std::vector<char> m_writeBuffer;
+				size_t m_writeBufferPosition;
 		};
 		IE_CORE_DECLAREPTR( StreamFile );
 
@@ -234,13 +296,13 @@ class IECORE_API StreamIndexedIO : public IndexedIO
 		/// if the entry to remove does not exist.
 		void remove( const IndexedIO::EntryID &name, bool throwIfNonExistent );
 
-		// Write an array of POD types
+		// Write an array of POD types. The hash, if given, must uniquely identify the contents of the array.
 		template<typename T>
-		void write(const IndexedIO::EntryID &name, const T *x, unsigned long arrayLength);
+		void write(const IndexedIO::EntryID &name, const T *x, unsigned long arrayLength, const MurmurHash *hash = nullptr);
 
 		// Write an array of POD types (without temporary buffers - used on little endian platforms)
 		template<typename T>
-		void rawWrite(const IndexedIO::EntryID &name, const T *x, unsigned long arrayLength);
+		void rawWrite(const IndexedIO::EntryID &name, const T *x, unsigned long arrayLength, const MurmurHash *hash = nullptr);
 
 		// Read an array of POD types
 		template<typename T>
@@ -98,6 +98,14 @@ class IECORESCENE_API LinkedScene : public  SampledSceneInterface
 		/// \param time Specifies the time that should be used to query the given scene
 		static IECore::CompoundDataPtr linkAttributeData( const SceneInterface *scene, double time );
 
+		/// Opens the scenes linked from this location and its descendants in parallel,
+		/// including the links within linked scenes, so that subsequent traversals needn't
+		/// wait for each file to be opened. Linked locations are held in a cache keyed by
+		/// file name and root, which is shared by all LinkedScenes and also used when
+		/// links are expanded during traversal. Links which can't be opened are ignored
+		/// here, and reported when they are expanded. Only valid in read mode.
+		void expandLinks( const IECore::Canceller *canceller = nullptr ) const;
+
 		/*
 		 * virtual functions defined in SceneInterface.
 		 */
@@ -147,6 +155,7 @@ class IECORESCENE_API LinkedScene : public  SampledSceneInterface
 		double objectSampleInterval( double time, size_t &floorIndex, size_t &ceilIndex ) const override;
 		IECore::ConstObjectPtr readObjectAtSample( size_t sampleIndex, const IECore::Canceller *canceller = nullptr ) const override;
 		IECore::ConstObjectPtr readObject( double time, const IECore::Canceller *canceller = nullptr ) const override;
+		void readObjects( const std::vector<double> &times, std::vector<IECore::ConstObjectPtr> &objects, const IECore::Canceller *canceller = nullptr ) const override;
 		PrimitiveVariableMap readObjectPrimitiveVariables( const std::vector<IECore::InternedString> &primVarNames, double time ) const override;
 		void writeObject( const IECore::Object *object, double time ) override;
 
@@ -160,21 +169,33 @@ class IECORESCENE_API LinkedScene : public  SampledSceneInterface
 
 		void hash( HashType hashType, double time, IECore::MurmurHash &h ) const override;
 
+		size_t memoryUsage() const override;
+
 	private :
 
-		LinkedScene( SceneInterface *mainScene, const SceneInterface *linkedScene, IECore::PathMatcherDataPtr linkLocationsData, int rootLinkDepth, bool readOnly, bool atLink, bool timeRemapped );
+		class LinkTimes;
+		IE_CORE_DECLAREPTR( LinkTimes );
+
+		struct ExpandedLinks;
+
+		LinkedScene( SceneInterface *mainScene, const SceneInterface *linkedScene, IECore::PathMatcherDataPtr linkLocationsData, int rootLinkDepth, bool readOnly, bool atLink, bool timeRemapped, LinkTimes *linkTimes = nullptr );
 
 		ConstSceneInterfacePtr expandLink( const IECore::StringData *fileName, const IECore::InternedStringVectorData *root, int &linkDepth );
 
 		void mainSceneHash( HashType hashType, double time, IECore::MurmurHash &h ) const;
 
 		// uses the mainScene to ask what is the time the link is remapped to. Should only be called when the linkAttribute is available.
+		// The results are held in m_linkTimes.
 		double remappedLinkTime( double time ) const;
+		double readRemappedLinkTime( double time ) const;
 		double remappedLinkTimeAtSample( size_t sampleIndex ) const;
 
 		IECore::PathMatcher linkLocations() const;
 		void recurseLinkLocations( IECore::PathMatcher &pathMatcher ) const;
 
+		void expandLinks( ExpandedLinks &expandedLinks, const IECore::Canceller *canceller ) const;
+		void mainLinksWalk( const SceneInterface *mainLocation, SceneInterface::Path &path, std::vector<ConstSceneInterfacePtr> &links ) const;
+
 		SceneInterfacePtr m_mainScene;
 		ConstSceneInterfacePtr m_linkedScene;
 		unsigned int m_rootLinkDepth;
@@ -182,6 +203,8 @@ class IECORESCENE_API LinkedScene : public  SampledSceneInterface
 		bool m_atLink;
 		bool m_sampled;
 		bool m_timeRemapped;
+		/// Shared by the link location and the locations below it. Null unless m_timeRemapped is true.
+		LinkTimesPtr m_linkTimes;
 		// \todo: std::map< Path, LinkedScenes > for quick scene calls... built by scene... dies with the instance (usually only root uses it).
 
 		/// locations of all links in the scene.
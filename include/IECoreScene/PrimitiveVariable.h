@@ -86,6 +86,16 @@ struct IECORESCENE_API PrimitiveVariable
 	/// is not indexed, a direct copy will be returned.
 	IECore::DataPtr expandedData() const;
 
+	/// Returns `data` for modification in place, first replacing it with a
+	/// copy if it is referenced from anywhere else, such as another
+	/// PrimitiveVariable or Primitive. Because TypedData is copy-on-write,
+	/// the copy doesn't duplicate any values until `writable()` is called on
+	/// it. Algorithms should share variables with their inputs, and only call
+	/// this for the variables they actually modify.
+	IECore::Data *writableData();
+	/// As above, but for `indices`. Returns nullptr if there are no indices.
+	IECore::IntVectorData *writableIndices();
+
 	/// The interpolation type for this PrimitiveVariable.
 	Interpolation interpolation;
 	/// The Data for this PrimitiveVariable. Unless Interpolation is Constant,
@@ -120,6 +120,12 @@ class IECORESCENE_API SampledSceneInterface : public SceneInterface
 		IECore::ConstObjectPtr readAttribute( const Name &name, double time ) const override;
 		IECore::ConstObjectPtr readObject( double time, const IECore::Canceller *canceller = nullptr ) const override;
 
+		/// Equivalent to calling readObject() for each of the times, but reads each
+		/// of the samples needed only once, and reads the samples concurrently. This
+		/// is intended for reading all the segments needed for motion blur. Derived
+		/// classes which remap time should reimplement it to do so.
+		virtual void readObjects( const std::vector<double> &times, std::vector<IECore::ConstObjectPtr> &objects, const IECore::Canceller *canceller = nullptr ) const;
+
 };
 
 
@@ -39,6 +39,10 @@
 
 #include "IECoreScene/SceneInterface.h"
 
+#include "IECore/Canceller.h"
+#include "IECore/PathMatcher.h"
+
+#include <functional>
 #include <map>
 #include <string>
 
@@ -62,10 +66,41 @@ enum ProcessFlags
 
 typedef std::map<std::string, size_t> SceneStats;
 
+/// Function called for each location visited by `parallelTraverse()`. Returning
+/// false for any frame prevents the children of the location from being visited.
+/// Must be threadsafe, as it is called concurrently for different locations.
+typedef std::function<bool ( const SceneInterface *location, double time )> LocationFunction;
+
+/// Visits every location below `src` in parallel, calling `locationFn` once for
+/// each frame from `startFrame` to `endFrame`. The frames of a single location are
+/// visited in order, before its children. If `filter` is specified, `locationFn` is
+/// only called for locations it matches exactly, and only the ancestors of matched
+/// locations are traversed. Results may be aggregated by `locationFn` using atomics
+/// or thread local storage.
+IECORESCENE_API void parallelTraverse(
+	const SceneInterface *src, const LocationFunction &locationFn, int startFrame, int endFrame, float frameRate,
+	const IECore::PathMatcher *filter = nullptr, const IECore::Canceller *canceller = nullptr
+);
+
 IECORESCENE_API SceneStats parallelReadAll( const SceneInterface *src, int startFrame, int endFrame, float frameRate, unsigned int flags );
 
-/// copy from one scene to another.
+/// Function called by `copy()` after each location sample has been written.
+typedef std::function<void ( size_t samplesWritten, size_t numSamples )> ProgressFunction;
+
+/// copy from one scene to another, reading and writing each location in turn on
+/// the calling thread.
 IECORESCENE_API void copy( const SceneInterface *src, SceneInterface *dst, int startFrame, int endFrame, float frameRate, unsigned int flags );
+/// copy from one scene to another. Locations are read by parallel tasks while
+/// the calling thread writes them, in the same order as a serial traversal
+/// would, so `dst` needn't be threadsafe, but `src` must support concurrent
+/// reads from different locations. Reads are performed ahead of the
+/// writes until the data waiting to be written exceeds `memoryLimit` bytes.
+/// When `progress` is given, the locations of `src` are counted before the
+/// copy starts, so that the total number of samples can be reported.
+IECORESCENE_API void copy(
+	const SceneInterface *src, SceneInterface *dst, int startFrame, int endFrame, float frameRate, unsigned int flags,
+	size_t memoryLimit, const ProgressFunction &progress = ProgressFunction(), const IECore::Canceller *canceller = nullptr
+);
 
 } // SceneAlgo
 
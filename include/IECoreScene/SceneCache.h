@@ -35,6 +35,7 @@
 #ifndef IECORESCENE_SCENECACHE_H
 #define IECORESCENE_SCENECACHE_H
 
+#include "IECore/CompoundData.h"
 #include "IECore/PathMatcherData.h"
 
 #include "IECoreScene/Export.h"
@@ -134,11 +135,84 @@ class IECORESCENE_API SceneCache : public SampledSceneInterface
 		SceneInterfacePtr scene( const Path &path, MissingBehaviour missingBehaviour = ThrowIfMissing ) override;
 		ConstSceneInterfacePtr scene( const Path &path, SceneInterface::MissingBehaviour missingBehaviour = ThrowIfMissing ) const override;
 
+		using SceneInterface::intersectingLocations;
+		/// Reads bounds and transforms directly from the file, without
+		/// constructing a SceneCache for each location visited.
+		IECore::PathMatcher intersectingLocations( const std::vector<Imath::Plane3d> &planes, double time, const IECore::Canceller *canceller = nullptr ) const override;
+
 		void hash( HashType hashType, double time, IECore::MurmurHash &h ) const override;
 
+		/// Includes the index of the file and the location table, sets and
+		/// sample times loaded from it. The objects, attributes and transforms
+		/// held in the caches described below are shared by all files, and
+		/// aren't included.
+		size_t memoryUsage() const override;
+
 		/// tells you if this scene cache is read only or writable:
 		bool readOnly() const;
 
+		/// Objects, attributes and transforms read from files are held in caches
+		/// shared by all the SceneCaches in the process, each limited by the memory
+		/// used by the objects it holds, as reported by Object::memoryUsage(). The
+		/// initial limits may be given in bytes with the IECORESCENE_SCENECACHE_OBJECT_CACHE_MEMORY_LIMIT,
+		/// IECORESCENE_SCENECACHE_ATTRIBUTE_CACHE_MEMORY_LIMIT and
+		/// IECORESCENE_SCENECACHE_TRANSFORM_CACHE_MEMORY_LIMIT environment variables.
+		enum CacheType
+		{
+			ObjectCache,
+			AttributeCache,
+			TransformCache
+		};
+
+		static void setCacheMemoryLimit( CacheType cache, size_t memoryLimit );
+		static size_t getCacheMemoryLimit( CacheType cache );
+		/// Returns the "hits", "misses", "evictions", "memoryUsage" and "memoryLimit" of the cache.
+		static IECore::CompoundDataPtr cacheStatistics( CacheType cache );
+		static void clearCache( CacheType cache );
+
+		/// Returns the paths of this location and all its descendants, relative
+		/// to this location, optionally only including locations with objects.
+		/// Files contain a table of all the locations, along with their local tags
+		/// and whether they have objects, so this and the childNames(), hasChild(),
+		/// hasObject() and local tag queries are answered without loading the
+		/// index of each location. Files written before the table was introduced
+		/// are still supported. Only valid in read mode.
+		IECore::PathMatcher locationPaths( bool objectsOnly = false ) const;
+
+		/// Schedules background reads of the objects, transforms and bounds of the
+		/// locations matched by `paths`, for all the samples needed to evaluate them
+		/// between `startTime` and `endTime`. The results are held in the caches
+		/// described above, so that subsequent reads needn't wait for the file.
+		/// Returns immediately, and the file is kept open until the reads complete.
+		/// The reads are stopped early if `canceller` is cancelled or cancelPrefetch()
+		/// is called, and `canceller` must remain valid until waitForPrefetch() returns.
+		/// Only valid in read mode.
+		void prefetch( const IECore::PathMatcher &paths, double startTime, double endTime, const IECore::Canceller *canceller = nullptr ) const;
+		/// Cancels all the prefetches scheduled for this file.
+		void cancelPrefetch() const;
+		/// Waits for all the prefetches scheduled for this file to complete.
+		void waitForPrefetch() const;
+
+		enum PrimitiveVariableEncoding
+		{
+			/// Primitive variables are stored as is.
+			FullPrecision,
+			/// Floating point components are stored as 16 bit half floats.
+			HalfPrecision,
+			/// Floating point components are stored as 16 bit offsets within
+			/// the range of values for each component.
+			FixedPoint
+		};
+
+		/// Sets a lossy encoding for Float, V2f, V3f and Color3f vector
+		/// primitive variables named primVarName, for all objects subsequently
+		/// written anywhere in the file. The maximum error introduced is stored
+		/// alongside the encoded data, and the reader decodes the data
+		/// transparently. Data which can't be represented by the encoding
+		/// (non-finite values, or values out of half range) is stored at full precision.
+		/// Only valid in write mode.
+		void setPrimitiveVariableEncoding( const Name &primVarName, PrimitiveVariableEncoding encoding );
+
 		// The attribute names used to mark animated topology and primitive variables
 		// when SceneCache objects are Primitives.
 		static const Name &animatedObjectTopologyAttribute;
@@ -48,6 +48,7 @@
 IECORE_PUSH_DEFAULT_VISIBILITY
 #include "OpenEXR/ImathBox.h"
 #include "OpenEXR/ImathMatrix.h"
+#include "OpenEXR/ImathPlane.h"
 IECORE_POP_DEFAULT_VISIBILITY
 
 namespace IECoreScene
@@ -272,6 +273,23 @@ class IECORESCENE_API SceneInterface : public IECore::RunTimeTyped
 		/// Returns a const interface for querying the scene at the given path (full path).
 		virtual ConstSceneInterfacePtr scene( const Path &path, MissingBehaviour missingBehaviour = ThrowIfMissing ) const = 0;
 
+		/*
+		 * Spatial queries
+		 */
+
+		/// Returns the locations from path() down whose bounds intersect the convex
+		/// volume bounded by `planes` at the given time. The planes are specified in the
+		/// local space of this location, with their normals pointing out of the volume.
+		/// Locations are tested using their bounds transformed into this space, so the
+		/// result is conservative, and the children of locations outside the volume are
+		/// not visited. All paths returned are relative to the current location.
+		/// The default implementation uses readBound() and readTransformAsMatrix(),
+		/// visiting children in parallel.
+		virtual IECore::PathMatcher intersectingLocations( const std::vector<Imath::Plane3d> &planes, double time, const IECore::Canceller *canceller = nullptr ) const;
+		/// Convenience returning the locations whose bounds intersect `bound`,
+		/// which is specified in the local space of this location.
+		IECore::PathMatcher intersectingLocations( const Imath::Box3d &bound, double time, const IECore::Canceller *canceller = nullptr ) const;
+
 		/*
 		 * Hash
 		 */
@@ -285,6 +303,16 @@ class IECORESCENE_API SceneInterface : public IECore::RunTimeTyped
 		/// as well as add the time dependency as applicable.
 		virtual void hash( HashType hashType, double time, IECore::MurmurHash &h ) const;
 
+		/*
+		 * Memory
+		 */
+
+		/// Returns an estimate of the memory held for the file this location
+		/// belongs to, such as its index. This is used by SharedSceneInterfaces
+		/// to limit the memory used by the scenes it keeps open, and may change
+		/// as more of the file is read. The default implementation returns 0.
+		virtual size_t memoryUsage() const;
+
 		/*
 		 * Utility functions
 		 */
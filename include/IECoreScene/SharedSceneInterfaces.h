@@ -38,6 +38,8 @@
 #include "IECoreScene/Export.h"
 #include "IECoreScene/SceneInterface.h"
 
+#include "IECore/CompoundData.h"
+
 namespace IECoreScene
 {
 
@@ -45,9 +47,15 @@ class IECORESCENE_API SharedSceneInterfaces
 {
 	public :
 
-		/// Creates a SceneInterface using a cache, so you don't end up opening the same file multiple times
+		/// Creates a SceneInterface using a cache, so you don't end up opening the same file multiple times.
+		/// Failures to open a file are cached too, and rethrown until the file is erased from the cache.
 		static ConstSceneInterfacePtr get( const std::string &fileName );
 
+		/// Returns the location at `root` within the scene for `fileName`, or null if
+		/// it doesn't exist. Locations are cached along with their scene, and are
+		/// released when the scene is removed from the cache.
+		static ConstSceneInterfacePtr location( const std::string &fileName, const SceneInterface::Path &root );
+
 		/// Erase a single file from the cache
 		static void erase( const std::string &fileName );
 
@@ -63,6 +71,29 @@ class IECORESCENE_API SharedSceneInterfaces
 		/// Returns the number of scene interfaces currently in the cache.
 		static size_t numScenes();
 
+		/// Sets the limit for the memory used by the scene interfaces in the
+		/// cache, as reported by SceneInterface::memoryUsage(). The least recently
+		/// used scenes are released when either limit is exceeded, although the
+		/// most recently used scene is always kept. The memory used by the scenes
+		/// is measured again whenever the cache is modified while a memory limit
+		/// is set, and when memoryUsage() or statistics() are called. A limit of 0 disables the
+		/// memory limit, which is the default unless a limit is given in bytes
+		/// with the IECORESCENE_SHAREDSCENEINTERFACES_MEMORY_LIMIT environment variable.
+		static void setMemoryLimit( size_t memoryLimit );
+		static size_t getMemoryLimit();
+		/// Returns the memory used by the scene interfaces currently in the cache.
+		static size_t memoryUsage();
+
+		/// Retrieves a scene as for get(), and keeps it in the cache regardless of
+		/// the limits until unpin() has been called as many times as pin(). Pinned
+		/// scenes are still removed by erase() and clear().
+		static ConstSceneInterfacePtr pin( const std::string &fileName );
+		static void unpin( const std::string &fileName );
+
+		/// Returns the "hits", "misses", "evictions", "numScenes", "pinnedScenes",
+		/// "maxScenes", "memoryUsage" and "memoryLimit" of the cache.
+		static IECore::CompoundDataPtr statistics();
+
 };
 
 } // namespace IECoreScene
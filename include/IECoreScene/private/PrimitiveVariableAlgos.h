@@ -152,6 +152,22 @@ class IndexedPrimitiveVariableBuilder
 		std::unordered_map<int, int> m_indexMapping;
 };
 
+// Returns true if any primitive is flagged for deletion. When none are,
+// the delete algorithms share the primitive variables of their input rather
+// than filtering them into new data.
+template<typename U>
+bool deletesAny( const PrimitiveVariable::IndexedView<U> &deleteFlagView, bool invert )
+{
+	for( size_t i = 0, e = deleteFlagView.size(); i < e; ++i )
+	{
+		if( static_cast<bool>( deleteFlagView[i] ) != invert )
+		{
+			return true;
+		}
+	}
+	return false;
+}
+
 // Base type for all Functors which delete primivars
 template<typename U>
 class DeleteFlagged
@@ -164,10 +164,10 @@ void CompoundDataBase::load( LoadContextPtr context )
 
 	IndexedIO::EntryIDList memberNames;
 	container->entryIds( memberNames );
-	IndexedIO::EntryIDList::const_iterator it;
-	for( it=memberNames.begin(); it!=memberNames.end(); it++ )
+	std::vector<DataPtr> members = context->load<Data>( container.get(), memberNames );
+	for( size_t i = 0; i < memberNames.size(); ++i )
 	{
-		m[*it] = context->load<Data>( container.get(), *it );
+		m[memberNames[i]] = members[i];
 	}
 }
 
@@ -103,11 +103,11 @@ void CompoundObject::load( LoadContextPtr context )
 
 	IndexedIO::EntryIDList memberNames;
 	container->entryIds( memberNames );
-	IndexedIO::EntryIDList::const_iterator it;
+	std::vector<ObjectPtr> members = context->load<Object>( container.get(), memberNames );
 
-	for( it=memberNames.begin(); it!=memberNames.end(); it++ )
+	for( size_t i = 0; i < memberNames.size(); ++i )
 	{
-		m_members[*it] = context->load<Object>( container.get(), *it );
+		m_members[memberNames[i]] = members[i];
 	}
 }
 
@@ -38,6 +38,14 @@
 
 #include "boost/filesystem/operations.hpp"
 
+#ifndef _MSC_VER
+#include <fcntl.h>
+#include <unistd.h>
+#endif
+
+#include <cerrno>
+#include <cstring>
+
 using namespace IECore;
 
 namespace fs = boost::filesystem;
@@ -67,9 +75,21 @@ class FileIndexedIO::StreamFile : public StreamIndexedIO::StreamFile
 
 		void flush( size_t endPosition ) override;
 
+	protected:
+
+		void writeBlock( const char *buffer, size_t size, size_t pos ) override;
+
+	private:
+
+		/// Opens a file handle used to write blocks without going
+		/// through the stream.
+		void openWriteHandle();
+
+		int m_writeHandle;
+
 };
 
-FileIndexedIO::StreamFile::StreamFile( const std::string &filename, IndexedIO::OpenMode mode ) : StreamIndexedIO::StreamFile(mode), m_filename( filename ), m_endPosition(0)
+FileIndexedIO::StreamFile::StreamFile( const std::string &filename, IndexedIO::OpenMode mode ) : StreamIndexedIO::StreamFile(mode), m_filename( filename ), m_endPosition(0), m_writeHandle( -1 )
 {
 	if (mode & IndexedIO::Write)
 	{
@@ -80,6 +100,7 @@ FileIndexedIO::StreamFile::StreamFile( const std::string &filename, IndexedIO::O
 			throw IOException( "FileIndexedIO: Cannot open '" + filename + "' for writing" );
 		}
 		setInput( f, true, "");
+		openWriteHandle();
 	}
 	else if (mode & IndexedIO::Append)
 	{
@@ -93,6 +114,7 @@ FileIndexedIO::StreamFile::StreamFile( const std::string &filename, IndexedIO::O
 				throw IOException( "FileIndexedIO: Cannot open '" + filename + "' for append" );
 			}
 			setInput( f, true, "" );
+			openWriteHandle();
 		}
 		else
 		{
@@ -118,6 +140,7 @@ FileIndexedIO::StreamFile::StreamFile( const std::string &filename, IndexedIO::O
 				throw IOException( "FileIndexedIO: Caught error reading file '" + filename + "'" );
 			}
 
+			openWriteHandle();
 		}
 	}
 	else
@@ -147,6 +170,40 @@ FileIndexedIO::StreamFile::StreamFile( const std::string &filename, IndexedIO::O
 	}
 }
 
+void FileIndexedIO::StreamFile::openWriteHandle()
+{
+#ifndef _MSC_VER
+	m_writeHandle = ::open( m_filename.c_str(), O_WRONLY );
+#endif
+}
+
+void FileIndexedIO::StreamFile::writeBlock( const char *buffer, size_t size, size_t pos )
+{
+#ifndef _MSC_VER
+	if ( m_writeHandle >= 0 )
+	{
+		while ( size )
+		{
+			ssize_t result = ::pwrite( m_writeHandle, buffer, size, pos );
+			if ( result < 0 )
+			{
+				if ( errno == EINTR )
+				{
+					continue;
+				}
+				throw IOException( "FileIndexedIO: Error writing file '" + m_filename + "' : " + strerror( errno ) );
+			}
+			buffer += result;
+			size -= result;
+			pos += result;
+		}
+		return;
+	}
+#endif
+
+	StreamIndexedIO::StreamFile::writeBlock( buffer, size, pos );
+}
+
 void FileIndexedIO::StreamFile::flush( size_t endPosition )
 {
 	m_endPosition = endPosition;
@@ -154,6 +211,13 @@ void FileIndexedIO::StreamFile::flush( size_t endPosition )
 
 FileIndexedIO::StreamFile::~StreamFile()
 {
+#ifndef _MSC_VER
+	if ( m_writeHandle >= 0 )
+	{
+		::close( m_writeHandle );
+	}
+#endif
+
 	if ( m_openmode == IndexedIO::Write || m_openmode == IndexedIO::Append )
 	{
 		std::fstream *f = static_cast< std::fstream * >( m_stream );
@@ -34,9 +34,14 @@
 
 #include "IECore/IndexedIO.h"
 
+#include "IECore/DataAlgo.h"
 #include "IECore/Exception.h"
+#include "IECore/SimpleTypedData.h"
+#include "IECore/TypeTraits.h"
+#include "IECore/VectorTypedData.h"
 
 #include "boost/filesystem/convenience.hpp"
+#include "boost/mpl/and.hpp"
 
 #include <iostream>
 
@@ -58,6 +63,117 @@ static CreatorMap &creators()
 	return *g_createFns;
 }
 
+template<typename T>
+DataPtr readSingle( const IndexedIO *io, const IndexedIO::Entry &entry )
+{
+	typename TypedData<T>::Ptr result = new TypedData<T>();
+	io->read( entry.id(), result->writable() );
+	return result;
+}
+
+template<typename T>
+DataPtr readArray( const IndexedIO *io, const IndexedIO::Entry &entry )
+{
+	typename TypedData<std::vector<T> >::Ptr result = new TypedData<std::vector<T> >();
+	std::vector<T> &values = result->writable();
+	values.resize( entry.arrayLength() );
+	if( !values.empty() )
+	{
+		T *data = values.data();
+		io->read( entry.id(), data, entry.arrayLength() );
+	}
+	return result;
+}
+
+DataPtr readData( const IndexedIO *io, const IndexedIO::Entry &entry )
+{
+	if( entry.entryType() != IndexedIO::File )
+	{
+		throw IOException( "IndexedIO::read : Entry '" + entry.id().value() + "' is not a file" );
+	}
+
+	switch( entry.dataType() )
+	{
+		case IndexedIO::Float :
+			return readSingle<float>( io, entry );
+		case IndexedIO::FloatArray :
+			return readArray<float>( io, entry );
+		case IndexedIO::Double :
+			return readSingle<double>( io, entry );
+		case IndexedIO::DoubleArray :
+			return readArray<double>( io, entry );
+		case IndexedIO::Int :
+		case IndexedIO::Long :
+			return readSingle<int>( io, entry );
+		case IndexedIO::IntArray :
+		case IndexedIO::LongArray :
+			return readArray<int>( io, entry );
+		case IndexedIO::String :
+			return readSingle<std::string>( io, entry );
+		case IndexedIO::StringArray :
+			return readArray<std::string>( io, entry );
+		case IndexedIO::UInt :
+			return readSingle<unsigned int>( io, entry );
+		case IndexedIO::UIntArray :
+			return readArray<unsigned int>( io, entry );
+		case IndexedIO::Char :
+			return readSingle<char>( io, entry );
+		case IndexedIO::CharArray :
+			return readArray<char>( io, entry );
+		case IndexedIO::UChar :
+			return readSingle<unsigned char>( io, entry );
+		case IndexedIO::UCharArray :
+			return readArray<unsigned char>( io, entry );
+		case IndexedIO::Half :
+			return readSingle<half>( io, entry );
+		case IndexedIO::HalfArray :
+			return readArray<half>( io, entry );
+		case IndexedIO::Short :
+			return readSingle<short>( io, entry );
+		case IndexedIO::ShortArray :
+			return readArray<short>( io, entry );
+		case IndexedIO::UShort :
+			return readSingle<unsigned short>( io, entry );
+		case IndexedIO::UShortArray :
+			return readArray<unsigned short>( io, entry );
+		case IndexedIO::Int64 :
+			return readSingle<int64_t>( io, entry );
+		case IndexedIO::Int64Array :
+			return readArray<int64_t>( io, entry );
+		case IndexedIO::UInt64 :
+			return readSingle<uint64_t>( io, entry );
+		case IndexedIO::UInt64Array :
+			return readArray<uint64_t>( io, entry );
+		case IndexedIO::InternedStringArray :
+			return readArray<InternedString>( io, entry );
+		default :
+			throw IOException( "IndexedIO::read : Unsupported data type for entry '" + entry.id().value() + "'" );
+	}
+}
+
+struct ArrayWriter
+{
+
+	ArrayWriter( IndexedIO *io, const IndexedIO::EntryID &name ) : m_io( io ), m_name( name )
+	{
+	}
+
+	template<typename T>
+	void operator()( const T *data, typename std::enable_if<boost::mpl::and_<TypeTraits::IsVectorTypedData<T>, TypeTraits::HasBaseType<T> >::value>::type *enabler = nullptr )
+	{
+		m_io->write( m_name, data->baseReadable(), data->baseSize() );
+	}
+
+	void operator()( const Data *data )
+	{
+		throw IOException( "IndexedIO::write : Unsupported data type \"" + std::string( data->typeName() ) + "\" for entry '" + m_name.value() + "'" );
+	}
+
+	IndexedIO *m_io;
+	const IndexedIO::EntryID &m_name;
+
+};
+
 } // namespace
 
 //////////////////////////////////////////////////////////////////////////
@@ -110,6 +226,21 @@ IndexedIO::~IndexedIO()
 {
 }
 
+void IndexedIO::read( const IndexedIO::EntryIDList &names, std::vector<DataPtr> &values ) const
+{
+	values.clear();
+	values.reserve( names.size() );
+	for( const auto &name : names )
+	{
+		values.push_back( readData( this, entry( name ) ) );
+	}
+}
+
+void IndexedIO::write( const IndexedIO::EntryID &name, const Data *data )
+{
+	dispatch( data, ArrayWriter( this, name ) );
+}
+
 void IndexedIO::readable(const IndexedIO::EntryID &name) const
 {
 }
@@ -61,23 +61,12 @@ typedef std::pair<const char *, const char *> CharRange;
 struct Hash
 {
 
-	// Dan Bernstein's original string hash
-	size_t operator()( const char *s ) const
-	{
-		size_t hash = 5381;
-		while( *s )
-		{
-			hash = ( ( hash << 5 ) + hash ) + *s++;
-		}
-
-		return hash;
-	}
-
 	size_t operator()( const std::string &s ) const
 	{
-		return (*this)( s.c_str() );
+		return (*this)( CharRange( s.data(), s.data() + s.size() ) );
 	}
 
+	// Dan Bernstein's original string hash
 	size_t operator()( const CharRange &range ) const
 	{
 		size_t hash = 5381;
@@ -91,6 +80,20 @@ struct Hash
 
 };
 
+// Used to look up a CharRange for which we have
+// already computed the hash.
+struct PrecomputedHash
+{
+
+	size_t operator()( const CharRange & ) const
+	{
+		return hash;
+	}
+
+	const size_t hash;
+
+};
+
 // Equality operator between strings of various types.
 // As above, this allows HashSet lookups to be performed
 // using any type, without the overhead of constructing
@@ -103,16 +106,6 @@ struct Equal
 		return s1 == s2;
 	}
 
-	bool operator()( const char *c, const std::string &s ) const
-	{
-		return strcmp( c, s.c_str() )==0;
-	}
-
-	bool operator()( const std::string &s, const char *c ) const
-	{
-		return strcmp( c, s.c_str() )==0;
-	}
-
 	bool operator()( const CharRange &c, const std::string &s ) const
 	{
 		return s.compare( 0, std::string::npos, c.first, c.second - c.first )==0;
@@ -137,62 +130,86 @@ typedef boost::multi_index::multi_index_container<
 > HashSet;
 
 typedef HashSet::nth_index<0>::type Index;
-typedef HashSet::nth_index_const_iterator<0>::type ConstIterator;
 typedef tbb::spin_rw_mutex Mutex;
 
-static HashSet *hashSet()
+// The table is striped into shards by hash, each with its own
+// mutex, so that threads interning different strings rarely
+// contend for the same lock. Shards are cache line aligned to
+// avoid false sharing between their mutexes.
+struct alignas( 64 ) Shard
 {
-	static HashSet g_hashSet;
-	return &g_hashSet;
+	Mutex mutex;
+	HashSet hashSet;
+};
+
+const size_t g_numShardsBits = 6;
+const size_t g_numShards = 1 << g_numShardsBits;
+
+static Shard *shards()
+{
+	static Shard g_shards[g_numShards];
+	return g_shards;
 }
 
-static Mutex *mutex()
+static Shard &shard( size_t hash )
 {
-	static Detail::Mutex g_mutex;
-	return &g_mutex;
+	// Fibonacci hashing, so that the shard is chosen from
+	// different bits than the HashSet buckets are.
+	const uint64_t h = static_cast<uint64_t>( hash ) * 0x9E3779B97F4A7C15ull;
+	return shards()[h >> ( 64 - g_numShardsBits )];
 }
 
+// Interned strings are never removed from the table, so each
+// thread can keep a small direct-mapped cache of the strings it
+// has looked up recently, and find them again without taking any
+// lock at all.
+const size_t g_lookupCacheSize = 1024;
+static thread_local const std::string *g_lookupCache[g_lookupCacheSize];
+
 } // namespace Detail
 
 const std::string *InternedString::internedString( const char *value )
 {
-	Detail::HashSet *hashSet = Detail::hashSet();
-	Detail::Index &hashIndex = hashSet->get<0>();
-	Detail::Mutex::scoped_lock lock( *Detail::mutex(), false ); // read-only lock
-	Detail::HashSet::const_iterator it = hashIndex.find( value );
-	if( it!=hashIndex.end() )
-	{
-		return &(*it);
-	}
-	else
-	{
-		lock.upgrade_to_writer();
-		return &(*(hashSet->insert( std::string( value ) ).first ) );
-	}
+	return internedString( value, strlen( value ) );
 }
 
 const std::string *InternedString::internedString( const char *value, size_t length )
 {
-	Detail::HashSet *hashSet = Detail::hashSet();
-	Detail::Index &hashIndex = hashSet->get<0>();
-	Detail::Mutex::scoped_lock lock( *Detail::mutex(), false ); // read-only lock
-	Detail::HashSet::const_iterator it = hashIndex.find( Detail::CharRange( value, value + length ) );
+	const Detail::CharRange range( value, value + length );
+	const size_t hash = Detail::Hash()( range );
+
+	const std::string *&cached = Detail::g_lookupCache[hash & ( Detail::g_lookupCacheSize - 1 )];
+	if( cached && cached->size() == length && memcmp( cached->data(), value, length ) == 0 )
+	{
+		return cached;
+	}
+
+	Detail::Shard &shard = Detail::shard( hash );
+	Detail::Index &hashIndex = shard.hashSet.get<0>();
+	Detail::Mutex::scoped_lock lock( shard.mutex, false ); // read-only lock
+	Detail::Index::const_iterator it = hashIndex.find( range, Detail::PrecomputedHash{ hash }, Detail::Equal() );
 	if( it!=hashIndex.end() )
 	{
-		return &(*it);
+		cached = &(*it);
 	}
 	else
 	{
 		lock.upgrade_to_writer();
-		return &(*(hashSet->insert( std::string( value, length ) ).first ) );
+		cached = &(*(shard.hashSet.insert( std::string( value, length ) ).first ) );
 	}
+	return cached;
 }
 
 size_t InternedString::numUniqueStrings()
 {
-	Detail::Mutex::scoped_lock lock( *Detail::mutex(), false ); // read-only lock
-	Detail::HashSet *hashSet = Detail::hashSet();
-	return hashSet->size();
+	size_t result = 0;
+	Detail::Shard *shards = Detail::shards();
+	for( size_t i = 0; i < Detail::g_numShards; ++i )
+	{
+		Detail::Mutex::scoped_lock lock( shards[i].mutex, false ); // read-only lock
+		result += shards[i].hashSet.size();
+	}
+	return result;
 }
 
 static InternedString g_emptyString("");
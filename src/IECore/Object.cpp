@@ -35,11 +35,19 @@
 #include "IECore/Object.h"
 
 #include "IECore/MurmurHash.h"
+#include "IECore/StreamIndexedIO.h"
 
 #include "boost/format.hpp"
 #include "boost/tokenizer.hpp"
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+#include "tbb/task_arena.h"
+
+#include <atomic>
 #include <iostream>
+#include <mutex>
+#include <thread>
 
 
 using namespace IECore;
@@ -224,8 +232,88 @@ void Object::SaveContext::save( const Object *toSave, IndexedIO *container, cons
 // load context stuff
 //////////////////////////////////////////////////////////////////////////////////////////
 
-struct Object::LoadContext::LoadedObjects : public std::map<IndexedIO::EntryIDList, ObjectPtr>
+namespace
+{
+
+// Containers with fewer children than this are always loaded serially,
+// because the overhead of spawning tasks would outweigh the benefit.
+const size_t g_parallelLoadThreshold = 8;
+
+bool supportsParallelLoad( const IndexedIO *container )
+{
+	// Only StreamIndexedIO is known to support concurrent reads, and
+	// only when it isn't also being written to.
+	return
+		( container->openMode() & IndexedIO::Read ) &&
+		runTimeCast<const StreamIndexedIO>( container )
+	;
+}
+
+} // namespace
+
+struct Object::LoadContext::LoadedObjects
 {
+
+	// Returns the object at `path`, calling `loader` to load it if it has
+	// not been loaded already. Concurrent requests for the same object wait
+	// for the first one to finish, so that shared objects are only loaded
+	// once.
+	template<typename Loader>
+	ObjectPtr load( const IndexedIO::EntryIDList &path, Loader &&loader )
+	{
+		std::shared_ptr<Entry> entry;
+		{
+			std::lock_guard<std::mutex> lock( m_mutex );
+			std::shared_ptr<Entry> &e = m_entries[path];
+			if( !e )
+			{
+				e = std::make_shared<Entry>();
+			}
+			entry = e;
+		}
+
+		if( entry->loadingThread == std::this_thread::get_id() )
+		{
+			// A reference back to an object we are still in the process of
+			// loading. This can only happen for cyclic references, and as
+			// before we return the null placeholder in that case. Note that
+			// loading in parallel is isolated, so the current thread can only
+			// be executing loads for descendants of the objects it is loading.
+			return entry->object;
+		}
+
+		std::lock_guard<std::mutex> lock( entry->mutex );
+		if( !entry->loaded )
+		{
+			entry->loadingThread = std::this_thread::get_id();
+			try
+			{
+				entry->object = loader();
+			}
+			catch( ... )
+			{
+				entry->loadingThread = std::thread::id();
+				throw;
+			}
+			entry->loaded = true;
+			entry->loadingThread = std::thread::id();
+		}
+		return entry->object;
+	}
+
+	private :
+
+		struct Entry
+		{
+			std::mutex mutex;
+			std::atomic<std::thread::id> loadingThread{ std::thread::id() };
+			bool loaded = false;
+			ObjectPtr object;
+		};
+
+		std::mutex m_mutex;
+		std::map<IndexedIO::EntryIDList, std::shared_ptr<Entry>> m_entries;
+
 };
 
 Object::LoadContext::LoadContext( ConstIndexedIOPtr ioInterface, const Canceller *canceller )
@@ -287,15 +375,14 @@ ObjectPtr Object::LoadContext::loadObjectOrReference( const IndexedIO *container
 				pathParts.push_back( *t );
 			}
 		}
-		std::pair<LoadedObjects::iterator, bool> ret = m_loadedObjects->insert( std::pair<IndexedIO::EntryIDList, ObjectPtr>( pathParts, nullptr ) );
-		if ( ret.second )
-		{
-			// jump to the path..
-			ConstIndexedIOPtr ioObject = m_ioInterface->directory( pathParts );
-			// add the loaded object to the map.
-			ret.first->second = loadObject( ioObject.get() );
-		}
-		return ret.first->second;
+		return m_loadedObjects->load(
+			pathParts,
+			[this, &pathParts] {
+				// jump to the path..
+				ConstIndexedIOPtr ioObject = m_ioInterface->directory( pathParts );
+				return loadObject( ioObject.get() );
+			}
+		);
 	}
 	else
 	{
@@ -304,14 +391,42 @@ ObjectPtr Object::LoadContext::loadObjectOrReference( const IndexedIO *container
 		IndexedIO::EntryIDList pathParts;
 		ioObject->path( pathParts );
 
-		std::pair<LoadedObjects::iterator, bool> ret = m_loadedObjects->insert( std::pair<IndexedIO::EntryIDList, ObjectPtr>( pathParts, nullptr ) );
-		if ( ret.second )
+		return m_loadedObjects->load(
+			pathParts,
+			[this, &ioObject] {
+				return loadObject( ioObject.get() );
+			}
+		);
+	}
+}
+
+void Object::LoadContext::loadObjectsOrReferences( const IndexedIO *container, const IndexedIO::EntryIDList &names, std::vector<ObjectPtr> &objects )
+{
+	objects.resize( names.size() );
+
+	auto loadRange = [&]( const tbb::blocked_range<size_t> &range ) {
+		for( size_t i = range.begin(); i != range.end(); ++i )
 		{
-			// add the loaded object to the map.
-			ret.first->second = loadObject( ioObject.get() );
+			Canceller::check( m_canceller );
+			objects[i] = loadObjectOrReference( container, names[i] );
 		}
-		return ret.first->second;
+	};
+
+	if( names.size() < g_parallelLoadThreshold || !supportsParallelLoad( container ) )
+	{
+		loadRange( tbb::blocked_range<size_t>( 0, names.size() ) );
+		return;
 	}
+
+	// Isolation prevents this thread from picking up unrelated tasks while
+	// it waits, which could otherwise end up waiting on an object that
+	// this thread is itself responsible for loading.
+	tbb::this_task_arena::isolate(
+		[&] {
+			tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+			tbb::parallel_for( tbb::blocked_range<size_t>( 0, names.size() ), loadRange, taskGroupContext );
+		}
+	);
 }
 
 // this function can only load concrete objects. it can't load references to
@@ -0,0 +1,723 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2026, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+
+#include "IECore/ObjectAlgo.h"
+
+#include "IECore/ByteOrder.h"
+#include "IECore/CompoundData.h"
+#include "IECore/CompoundObject.h"
+#include "IECore/DataAlgo.h"
+#include "IECore/Exception.h"
+#include "IECore/MemoryIndexedIO.h"
+#include "IECore/ObjectVector.h"
+#include "IECore/SimpleTypedData.h"
+#include "IECore/TypeTraits.h"
+
+#include "boost/format.hpp"
+
+#include <cstring>
+#include <istream>
+#include <ostream>
+#include <type_traits>
+#include <unordered_map>
+
+using namespace IECore;
+
+//////////////////////////////////////////////////////////////////////////
+// Format
+//////////////////////////////////////////////////////////////////////////
+//
+// The encoding starts with a fixed size header :
+//
+// - 4 byte magic number.
+// - 1 byte format version.
+// - 1 byte flag, set when written on a little endian machine.
+// - 8 byte payload size.
+//
+// The payload is a single object record. Sizes and type ids within
+// records are written as variable length integers, 7 bits per byte.
+// Every record other than `NullRecord` and `ReferenceRecord` is given
+// an index in the order the records start, so that later references to
+// the same object can be written as `ReferenceRecord`.
+
+namespace
+{
+
+const char g_magic[4] = { 'I', 'E', 'C', 'O' };
+const unsigned char g_version = 1;
+const size_t g_headerSize = sizeof( g_magic ) + 2 + sizeof( uint64_t );
+
+const IndexedIO::EntryID g_objectEntry( "object" );
+
+enum RecordType : unsigned char
+{
+	NullRecord = 0,
+	ReferenceRecord = 1,
+	// Type id, geometric interpretation and data.
+	TypedDataRecord = 2,
+	// Type id, number of members, and a name and record for each member.
+	// Used for CompoundData and CompoundObject.
+	CompoundRecord = 3,
+	// Number of members, and a record for each member. Used for ObjectVector.
+	VectorRecord = 4,
+	// Size, and a MemoryIndexedIO buffer containing the object saved as
+	// `g_objectEntry`. Used for all other objects.
+	IndexedIORecord = 5
+};
+
+// Returns true for the types with a TypedDataRecord encoding. These are
+// all supported by `dispatch()`.
+bool hasTypedDataRecord( TypeId typeId )
+{
+	switch( typeId )
+	{
+		case BoolDataTypeId :
+		case FloatDataTypeId :
+		case DoubleDataTypeId :
+		case IntDataTypeId :
+		case UIntDataTypeId :
+		case CharDataTypeId :
+		case UCharDataTypeId :
+		case ShortDataTypeId :
+		case UShortDataTypeId :
+		case Int64DataTypeId :
+		case UInt64DataTypeId :
+		case StringDataTypeId :
+		case InternedStringDataTypeId :
+		case HalfDataTypeId :
+		case V2iDataTypeId :
+		case V3iDataTypeId :
+		case V2fDataTypeId :
+		case V3fDataTypeId :
+		case V2dDataTypeId :
+		case V3dDataTypeId :
+		case Color3fDataTypeId :
+		case Color4fDataTypeId :
+		case Box2iDataTypeId :
+		case Box2fDataTypeId :
+		case Box3fDataTypeId :
+		case Box2dDataTypeId :
+		case Box3dDataTypeId :
+		case M33fDataTypeId :
+		case M33dDataTypeId :
+		case M44fDataTypeId :
+		case M44dDataTypeId :
+		case TransformationMatrixfDataTypeId :
+		case TransformationMatrixdDataTypeId :
+		case QuatfDataTypeId :
+		case QuatdDataTypeId :
+		case BoolVectorDataTypeId :
+		case FloatVectorDataTypeId :
+		case DoubleVectorDataTypeId :
+		case HalfVectorDataTypeId :
+		case IntVectorDataTypeId :
+		case UIntVectorDataTypeId :
+		case CharVectorDataTypeId :
+		case UCharVectorDataTypeId :
+		case ShortVectorDataTypeId :
+		case UShortVectorDataTypeId :
+		case Int64VectorDataTypeId :
+		case UInt64VectorDataTypeId :
+		case StringVectorDataTypeId :
+		case InternedStringVectorDataTypeId :
+		case V2iVectorDataTypeId :
+		case V3iVectorDataTypeId :
+		case V2fVectorDataTypeId :
+		case V3fVectorDataTypeId :
+		case V2dVectorDataTypeId :
+		case V3dVectorDataTypeId :
+		case Color3fVectorDataTypeId :
+		case Color4fVectorDataTypeId :
+		case Box3fVectorDataTypeId :
+		case Box3dVectorDataTypeId :
+		case M33fVectorDataTypeId :
+		case M33dVectorDataTypeId :
+		case M44fVectorDataTypeId :
+		case M44dVectorDataTypeId :
+		case QuatfVectorDataTypeId :
+		case QuatdVectorDataTypeId :
+			return true;
+		default :
+			return false;
+	}
+}
+
+template<typename T>
+using IsRawTypedData = std::integral_constant<
+	bool,
+	TypeTraits::IsNumericBasedSimpleTypedData<T>::value || TypeTraits::IsNumericBasedVectorTypedData<T>::value
+>;
+
+class Encoder
+{
+
+	public :
+
+		Encoder( std::vector<char> &buffer )
+			:	m_buffer( buffer )
+		{
+		}
+
+		void writeObject( const Object *object )
+		{
+			if( !object )
+			{
+				writeByte( NullRecord );
+				return;
+			}
+
+			auto inserted = m_indices.insert( { object, m_indices.size() } );
+			if( !inserted.second )
+			{
+				writeByte( ReferenceRecord );
+				writeSize( inserted.first->second );
+				return;
+			}
+
+			const TypeId typeId = object->typeId();
+			if( hasTypedDataRecord( typeId ) )
+			{
+				const Data *data = static_cast<const Data *>( object );
+				writeByte( TypedDataRecord );
+				writeSize( typeId );
+				writeByte( getGeometricInterpretation( data ) );
+				dispatch( data, *this );
+			}
+			else if( typeId == CompoundDataTypeId )
+			{
+				const CompoundDataMap &members = static_cast<const CompoundData *>( object )->readable();
+				writeByte( CompoundRecord );
+				writeSize( typeId );
+				writeSize( members.size() );
+				for( const auto &member : members )
+				{
+					writeString( member.first.string() );
+					writeObject( member.second.get() );
+				}
+			}
+			else if( typeId == CompoundObjectTypeId )
+			{
+				const CompoundObject::ObjectMap &members = static_cast<const CompoundObject *>( object )->members();
+				writeByte( CompoundRecord );
+				writeSize( typeId );
+				writeSize( members.size() );
+				for( const auto &member : members )
+				{
+					writeString( member.first.string() );
+					writeObject( member.second.get() );
+				}
+			}
+			else if( typeId == ObjectVectorTypeId )
+			{
+				const ObjectVector::MemberContainer &members = static_cast<const ObjectVector *>( object )->members();
+				writeByte( VectorRecord );
+				writeSize( members.size() );
+				for( const auto &member : members )
+				{
+					writeObject( member.get() );
+				}
+			}
+			else
+			{
+				MemoryIndexedIOPtr io = new MemoryIndexedIO( ConstCharVectorDataPtr(), IndexedIO::rootPath, IndexedIO::Exclusive | IndexedIO::Write );
+				object->save( io, g_objectEntry );
+				ConstCharVectorDataPtr buffer = io->buffer();
+				writeByte( IndexedIORecord );
+				writeSize( buffer->readable().size() );
+				writeBytes( buffer->readable().data(), buffer->readable().size() );
+			}
+		}
+
+		// TypedData encodings, called via `dispatch()`.
+
+		template<typename T>
+		typename std::enable_if<IsRawTypedData<T>::value>::type operator()( const T *data )
+		{
+			const size_t size = data->baseSize();
+			writeSize( size );
+			if( size )
+			{
+				writeBytes( data->baseReadable(), size * sizeof( typename T::BaseType ) );
+			}
+		}
+
+		void operator()( const BoolData *data )
+		{
+			writeByte( data->readable() );
+		}
+
+		void operator()( const BoolVectorData *data )
+		{
+			const std::vector<bool> &v = data->readable();
+			writeSize( v.size() );
+			for( bool b : v )
+			{
+				writeByte( b );
+			}
+		}
+
+		void operator()( const StringData *data )
+		{
+			writeString( data->readable() );
+		}
+
+		void operator()( const InternedStringData *data )
+		{
+			writeString( data->readable().string() );
+		}
+
+		void operator()( const StringVectorData *data )
+		{
+			const std::vector<std::string> &v = data->readable();
+			writeSize( v.size() );
+			for( const auto &s : v )
+			{
+				writeString( s );
+			}
+		}
+
+		void operator()( const InternedStringVectorData *data )
+		{
+			const std::vector<InternedString> &v = data->readable();
+			writeSize( v.size() );
+			for( const auto &s : v )
+			{
+				writeString( s.string() );
+			}
+		}
+
+		void operator()( const Data *data )
+		{
+			throw Exception( boost::str( boost::format( "ObjectAlgo::serialise : Unsupported type \"%s\"" ) % data->typeName() ) );
+		}
+
+	private :
+
+		void writeByte( unsigned char c )
+		{
+			m_buffer.push_back( (char)c );
+		}
+
+		void writeSize( uint64_t size )
+		{
+			while( size >= 0x80 )
+			{
+				m_buffer.push_back( (char)( ( size & 0x7f ) | 0x80 ) );
+				size >>= 7;
+			}
+			m_buffer.push_back( (char)size );
+		}
+
+		void writeBytes( const void *bytes, size_t size )
+		{
+			const char *c = static_cast<const char *>( bytes );
+			m_buffer.insert( m_buffer.end(), c, c + size );
+		}
+
+		void writeString( const std::string &s )
+		{
+			writeSize( s.size() );
+			writeBytes( s.data(), s.size() );
+		}
+
+		std::vector<char> &m_buffer;
+		std::unordered_map<const Object *, size_t> m_indices;
+
+};
+
+class Decoder
+{
+
+	public :
+
+		Decoder( const char *data, size_t size, const Canceller *canceller )
+			:	m_data( data ), m_size( size ), m_offset( 0 ), m_canceller( canceller )
+		{
+		}
+
+		size_t offset() const
+		{
+			return m_offset;
+		}
+
+		ObjectPtr readObject()
+		{
+			Canceller::check( m_canceller );
+
+			const unsigned char recordType = readByte();
+			switch( recordType )
+			{
+				case NullRecord :
+					return nullptr;
+				case ReferenceRecord : {
+					const uint64_t index = readSize();
+					if( index >= m_objects.size() )
+					{
+						throw IOException( "ObjectAlgo::deserialise : Invalid reference" );
+					}
+					return m_objects[index];
+				}
+				case TypedDataRecord : {
+					const TypeId typeId = readTypeId();
+					if( !hasTypedDataRecord( typeId ) )
+					{
+						throw IOException( boost::str( boost::format( "ObjectAlgo::deserialise : Unexpected type %d" ) % typeId ) );
+					}
+					DataPtr data = boost::static_pointer_cast<Data>( Object::create( typeId ) );
+					m_objects.push_back( data );
+					const GeometricData::Interpretation interpretation = (GeometricData::Interpretation)readByte();
+					dispatch( data.get(), *this );
+					if( interpretation != GeometricData::None )
+					{
+						setGeometricInterpretation( data.get(), interpretation );
+					}
+					return data;
+				}
+				case CompoundRecord : {
+					const TypeId typeId = readTypeId();
+					if( typeId == CompoundDataTypeId )
+					{
+						CompoundDataPtr result = new CompoundData;
+						m_objects.push_back( result );
+						CompoundDataMap &members = result->writable();
+						for( uint64_t i = 0, n = readSize(); i < n; ++i )
+						{
+							const InternedString name = readString();
+							DataPtr member = runTimeCast<Data>( readObject() );
+							if( !member )
+							{
+								throw IOException( "ObjectAlgo::deserialise : Expected Data for CompoundData member" );
+							}
+							members[name] = member;
+						}
+						return result;
+					}
+					else if( typeId == CompoundObjectTypeId )
+					{
+						CompoundObjectPtr result = new CompoundObject;
+						m_objects.push_back( result );
+						CompoundObject::ObjectMap &members = result->members();
+						for( uint64_t i = 0, n = readSize(); i < n; ++i )
+						{
+							const InternedString name = readString();
+							members[name] = readObject();
+						}
+						return result;
+					}
+					throw IOException( boost::str( boost::format( "ObjectAlgo::deserialise : Unexpected type %d" ) % typeId ) );
+				}
+				case VectorRecord : {
+					ObjectVectorPtr result = new ObjectVector;
+					m_objects.push_back( result );
+					ObjectVector::MemberContainer &members = result->members();
+					const uint64_t n = readSize();
+					members.reserve( std::min<uint64_t>( n, remaining() ) );
+					for( uint64_t i = 0; i < n; ++i )
+					{
+						members.push_back( readObject() );
+					}
+					return result;
+				}
+				case IndexedIORecord : {
+					const uint64_t size = readSize();
+					const char *bytes = readBytes( size );
+					CharVectorDataPtr buffer = new CharVectorData( std::vector<char>( bytes, bytes + size ) );
+					MemoryIndexedIOPtr io = new MemoryIndexedIO( buffer, IndexedIO::rootPath, IndexedIO::Exclusive | IndexedIO::Read );
+					ObjectPtr result = Object::load( io, g_objectEntry, m_canceller );
+					m_objects.push_back( result );
+					return result;
+				}
+				default :
+					throw IOException( boost::str( boost::format( "ObjectAlgo::deserialise : Unknown record type %d" ) % (int)recordType ) );
+			}
+		}
+
+		// TypedData decodings, called via `dispatch()`.
+
+		template<typename T>
+		typename std::enable_if<IsRawTypedData<T>::value && TypeTraits::IsSimpleTypedData<T>::value>::type operator()( T *data )
+		{
+			const uint64_t size = readSize();
+			if( size != data->baseSize() )
+			{
+				throw IOException( "ObjectAlgo::deserialise : Unexpected data size" );
+			}
+			const size_t numBytes = size * sizeof( typename T::BaseType );
+			memcpy( data->baseWritable(), readBytes( numBytes ), numBytes );
+		}
+
+		template<typename T>
+		typename std::enable_if<IsRawTypedData<T>::value && TypeTraits::IsVectorTypedData<T>::value>::type operator()( T *data )
+		{
+			typedef typename T::BaseType BaseType;
+			typedef typename T::ValueType::value_type ElementType;
+			const size_t baseSizePerElement = sizeof( ElementType ) / sizeof( BaseType );
+
+			const uint64_t size = readSize();
+			if( size % baseSizePerElement || size > remaining() / sizeof( BaseType ) )
+			{
+				throw IOException( "ObjectAlgo::deserialise : Unexpected data size" );
+			}
+			if( !size )
+			{
+				return;
+			}
+			const size_t numBytes = size * sizeof( BaseType );
+			const char *bytes = readBytes( numBytes );
+			data->writable().resize( size / baseSizePerElement );
+			memcpy( data->baseWritable(), bytes, numBytes );
+		}
+
+		void operator()( BoolData *data )
+		{
+			data->writable() = readByte();
+		}
+
+		void operator()( BoolVectorData *data )
+		{
+			std::vector<bool> &v = data->writable();
+			const uint64_t size = readSize();
+			v.reserve( std::min<uint64_t>( size, remaining() ) );
+			for( uint64_t i = 0; i < size; ++i )
+			{
+				v.push_back( readByte() );
+			}
+		}
+
+		void operator()( StringData *data )
+		{
+			data->writable() = readString();
+		}
+
+		void operator()( InternedStringData *data )
+		{
+			data->writable() = readString();
+		}
+
+		void operator()( StringVectorData *data )
+		{
+			std::vector<std::string> &v = data->writable();
+			const uint64_t size = readSize();
+			v.reserve( std::min<uint64_t>( size, remaining() ) );
+			for( uint64_t i = 0; i < size; ++i )
+			{
+				v.push_back( readString() );
+			}
+		}
+
+		void operator()( InternedStringVectorData *data )
+		{
+			std::vector<InternedString> &v = data->writable();
+			const uint64_t size = readSize();
+			v.reserve( std::min<uint64_t>( size, remaining() ) );
+			for( uint64_t i = 0; i < size; ++i )
+			{
+				v.push_back( readString() );
+			}
+		}
+
+		void operator()( Data *data )
+		{
+			throw IOException( boost::str( boost::format( "ObjectAlgo::deserialise : Unsupported type \"%s\"" ) % data->typeName() ) );
+		}
+
+	private :
+
+		size_t remaining() const
+		{
+			return m_size - m_offset;
+		}
+
+		const char *readBytes( uint64_t size )
+		{
+			if( size > remaining() )
+			{
+				throw IOException( "ObjectAlgo::deserialise : Unexpected end of data" );
+			}
+			const char *result = m_data + m_offset;
+			m_offset += size;
+			return result;
+		}
+
+		unsigned char readByte()
+		{
+			return *readBytes( 1 );
+		}
+
+		uint64_t readSize()
+		{
+			uint64_t result = 0;
+			for( unsigned shift = 0; shift < 64; shift += 7 )
+			{
+				const unsigned char c = readByte();
+				result |= uint64_t( c & 0x7f ) << shift;
+				if( !( c & 0x80 ) )
+				{
+					return result;
+				}
+			}
+			throw IOException( "ObjectAlgo::deserialise : Invalid size" );
+		}
+
+		TypeId readTypeId()
+		{
+			return (TypeId)readSize();
+		}
+
+		std::string readString()
+		{
+			const uint64_t size = readSize();
+			const char *bytes = readBytes( size );
+			return std::string( bytes, size );
+		}
+
+		const char *m_data;
+		const size_t m_size;
+		size_t m_offset;
+		const Canceller *m_canceller;
+		std::vector<ObjectPtr> m_objects;
+
+};
+
+void writeHeader( char *header, uint64_t payloadSize )
+{
+	memcpy( header, g_magic, sizeof( g_magic ) );
+	header[4] = g_version;
+	header[5] = littleEndian();
+	memcpy( header + 6, &payloadSize, sizeof( payloadSize ) );
+}
+
+uint64_t readHeader( const char *header )
+{
+	if( memcmp( header, g_magic, sizeof( g_magic ) ) )
+	{
+		throw IOException( "ObjectAlgo::deserialise : Not a serialised object" );
+	}
+	if( (unsigned char)header[4] > g_version )
+	{
+		throw IOException( "ObjectAlgo::deserialise : Format version greater than library version" );
+	}
+	if( (bool)header[5] != littleEndian() )
+	{
+		throw IOException( "ObjectAlgo::deserialise : Serialised object has different byte order" );
+	}
+	uint64_t payloadSize;
+	memcpy( &payloadSize, header + 6, sizeof( payloadSize ) );
+	return payloadSize;
+}
+
+ObjectPtr decodePayload( const char *payload, uint64_t size, const Canceller *canceller )
+{
+	Decoder decoder( payload, size, canceller );
+	ObjectPtr result = decoder.readObject();
+	if( decoder.offset() != size )
+	{
+		throw IOException( "ObjectAlgo::deserialise : Unexpected data after object" );
+	}
+	return result;
+}
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// Public API
+//////////////////////////////////////////////////////////////////////////
+
+CharVectorDataPtr IECore::ObjectAlgo::serialise( const Object *object )
+{
+	if( !object )
+	{
+		throw InvalidArgumentException( "ObjectAlgo::serialise : Object must not be null" );
+	}
+
+	CharVectorDataPtr result = new CharVectorData;
+	std::vector<char> &buffer = result->writable();
+	buffer.resize( g_headerSize );
+
+	Encoder encoder( buffer );
+	encoder.writeObject( object );
+
+	writeHeader( buffer.data(), buffer.size() - g_headerSize );
+	return result;
+}
+
+void IECore::ObjectAlgo::serialise( const Object *object, std::ostream &stream )
+{
+	ConstCharVectorDataPtr data = serialise( object );
+	stream.write( data->readable().data(), data->readable().size() );
+	if( !stream )
+	{
+		throw IOException( "ObjectAlgo::serialise : Error writing to stream" );
+	}
+}
+
+ObjectPtr IECore::ObjectAlgo::deserialise( const CharVectorData *data, const Canceller *canceller )
+{
+	return deserialise( data->readable().data(), data->readable().size(), canceller );
+}
+
+ObjectPtr IECore::ObjectAlgo::deserialise( const char *data, size_t size, const Canceller *canceller )
+{
+	if( size < g_headerSize )
+	{
+		throw IOException( "ObjectAlgo::deserialise : Unexpected end of data" );
+	}
+
+	const uint64_t payloadSize = readHeader( data );
+	if( payloadSize != size - g_headerSize )
+	{
+		throw IOException( "ObjectAlgo::deserialise : Unexpected data size" );
+	}
+
+	return decodePayload( data + g_headerSize, payloadSize, canceller );
+}
+
+ObjectPtr IECore::ObjectAlgo::deserialise( std::istream &stream, const Canceller *canceller )
+{
+	char header[g_headerSize];
+	if( !stream.read( header, g_headerSize ) )
+	{
+		throw IOException( "ObjectAlgo::deserialise : Unexpected end of stream" );
+	}
+
+	const uint64_t payloadSize = readHeader( header );
+	std::vector<char> payload( payloadSize );
+	if( !stream.read( payload.data(), payloadSize ) )
+	{
+		throw IOException( "ObjectAlgo::deserialise : Unexpected end of stream" );
+	}
+
+	return decodePayload( payload.data(), payloadSize, canceller );
+}
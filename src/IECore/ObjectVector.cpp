@@ -121,10 +121,11 @@ void ObjectVector::load( LoadContextPtr context )
 
 	IndexedIO::EntryIDList l;
 	ioMembers->entryIds(l);
-	for( IndexedIO::EntryIDList::const_iterator it=l.begin(); it!=l.end(); it++ )
+	std::vector<ObjectPtr> members = context->load<Object>( ioMembers.get(), l );
+	for( size_t j = 0; j < l.size(); ++j )
 	{
-		MemberContainer::size_type i = boost::lexical_cast<MemberContainer::size_type>( (*it).value() );
-		m_members[i] = context->load<Object>( ioMembers.get(), *it );
+		MemberContainer::size_type i = boost::lexical_cast<MemberContainer::size_type>( l[j].value() );
+		m_members[i] = members[j];
 	}
 }
 
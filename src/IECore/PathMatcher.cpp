@@ -39,6 +39,7 @@
 
 #include "IECore/StringAlgo.h"
 
+#include <algorithm>
 #include <stack>
 
 using namespace std;
@@ -378,6 +379,76 @@ bool PathMatcher::addPath( const std::vector<IECore::InternedString> &path )
 	return result;
 }
 
+void PathMatcher::buildPath( const std::string &path, BuildCache &cache )
+{
+	if( path.empty() )
+	{
+		return;
+	}
+	std::vector<IECore::InternedString> tokenizedPath;
+	StringAlgo::tokenize( path, '/', tokenizedPath );
+	buildPath( tokenizedPath, cache );
+}
+
+void PathMatcher::buildPath( const std::vector<IECore::InternedString> &path, BuildCache &cache )
+{
+	if( path.empty() )
+	{
+		m_root->terminator = true;
+		return;
+	}
+
+	// Start from the deepest ancestor shared with the previous path.
+	// The cache holds only the ancestors of that path and never the
+	// final node, because the final node may be the shared leaf, which
+	// must not be edited.
+
+	if( cache.nodes.empty() )
+	{
+		cache.nodes.push_back( m_root.get() );
+	}
+
+	size_t depth = 0;
+	const size_t maxDepth = std::min( cache.path.size(), path.size() - 1 );
+	while( depth < maxDepth && cache.path[depth] == path[depth] )
+	{
+		depth++;
+	}
+	cache.path.resize( depth );
+	cache.nodes.resize( depth + 1 );
+
+	Node *node = cache.nodes.back();
+	for( ; depth < path.size() - 1; ++depth )
+	{
+		Node::ChildMapIterator childIt = node->children.find( path[depth] );
+		if( childIt == node->children.end() )
+		{
+			childIt = node->children.insert( Node::ChildMapValue( path[depth], new Node() ) ).first;
+		}
+		else if( childIt->second.get() == Node::leaf() )
+		{
+			// Replace the shared leaf with a node we can add children to.
+			childIt->second = new Node( /* terminator = */ true );
+		}
+		node = childIt->second.get();
+		cache.path.push_back( path[depth] );
+		cache.nodes.push_back( node );
+	}
+
+	Node::ChildMapIterator childIt = node->children.find( path.back() );
+	if( childIt == node->children.end() )
+	{
+		node->children.insert( Node::ChildMapValue( path.back(), Node::leaf() ) );
+	}
+	else if( !childIt->second->terminator )
+	{
+		// The child may be the shared leaf, when the same path is added
+		// twice. That is already a terminator, so we only write to nodes
+		// which aren't, and which therefore can't be shared.
+		childIt->second->terminator = true;
+	}
+}
+
 bool PathMatcher::removePath( const std::string &path )
 {
 	if( path.empty() )
@@ -440,20 +511,8 @@ bool PathMatcher::removePaths( const PathMatcher &paths )
 
 PathMatcher PathMatcher::intersection( const PathMatcher &paths ) const
 {
-	PathMatcher result = PathMatcher();
-	for( Iterator it = (*this).begin(); it != (*this).end(); ++it )
-	{
-		RawIterator rit = paths.find( *it );
-		if( rit == paths.end() )
-		{
-			it.prune();
-		}
-		else if( rit.exactMatch() )
-		{
-			result.addPath( *it );
-		}
-	}
-	return result;
+	NodePtr root = intersectionWalk( m_root.get(), paths.m_root.get() );
+	return root ? PathMatcher( root ) : PathMatcher();
 }
 
 bool PathMatcher::prune( const std::string &path )
@@ -754,6 +813,57 @@ PathMatcher::NodePtr PathMatcher::removePathsWalk( Node *node, const Node *srcNo
 	return result;
 }
 
+PathMatcher::NodePtr PathMatcher::intersectionWalk( const Node *node, const Node *otherNode )
+{
+	if( node == otherNode )
+	{
+		// The intersection of a subtree with itself is the
+		// subtree, which we can share rather than copy.
+		return const_cast<Node *>( node );
+	}
+
+	const bool terminator = node->terminator && otherNode->terminator;
+
+	// Visit the children of whichever node has fewest, and look
+	// for each of them in the other node.
+	const Node *smaller = node;
+	const Node *larger = otherNode;
+	if( larger->children.size() < smaller->children.size() )
+	{
+		std::swap( smaller, larger );
+	}
+
+	NodePtr result;
+	for( Node::ConstChildMapIterator it = smaller->children.begin(), eIt = smaller->children.end(); it != eIt; ++it )
+	{
+		const Node *otherChild = larger->child( it->first );
+		if( !otherChild )
+		{
+			continue;
+		}
+
+		NodePtr newChild = intersectionWalk( it->second.get(), otherChild );
+		if( !newChild )
+		{
+			continue;
+		}
+
+		if( !result )
+		{
+			result = new Node( terminator );
+		}
+		// Children are visited in order, so each one belongs at the end.
+		result->children.emplace_hint( result->children.end(), it->first, newChild );
+	}
+
+	if( !result && terminator )
+	{
+		return Node::leaf();
+	}
+
+	return result;
+}
+
 namespace
 {
 
@@ -37,6 +37,8 @@
 #include "IECore/MessageHandler.h"
 #include "IECore/TypedData.inl"
 
+#include "boost/iterator/iterator_facade.hpp"
+
 using namespace IECore;
 
 namespace
@@ -44,6 +46,65 @@ namespace
 
 static const unsigned int g_ioVersion = 0;
 
+// Iterates over the exact matches stored by `PathMatcherData::save()`.
+// Paths are visited in the order they were saved by the RawIterator,
+// which is the order `PathMatcher::init()` builds fastest from.
+class ExactMatchIterator : public boost::iterator_facade<ExactMatchIterator, const std::vector<InternedString>, boost::single_pass_traversal_tag>
+{
+
+	public :
+
+		ExactMatchIterator( const std::vector<InternedString> &strings, const std::vector<unsigned int> &pathLengths, const std::vector<unsigned char> &exactMatches, size_t index )
+			:	m_strings( strings ), m_pathLengths( pathLengths ), m_exactMatches( exactMatches ), m_index( index ), m_stringIndex( 0 )
+		{
+			satisfyExactMatchRequirement();
+		}
+
+	private :
+
+		friend class boost::iterator_core_access;
+
+		void increment()
+		{
+			++m_index;
+			satisfyExactMatchRequirement();
+		}
+
+		bool equal( const ExactMatchIterator &other ) const
+		{
+			return m_index == other.m_index;
+		}
+
+		const std::vector<InternedString> &dereference() const
+		{
+			return m_path;
+		}
+
+		void satisfyExactMatchRequirement()
+		{
+			for( size_t e = m_pathLengths.size(); m_index < e; ++m_index )
+			{
+				m_path.resize( m_pathLengths[m_index] );
+				if( m_path.size() )
+				{
+					m_path.back() = m_strings[m_stringIndex++];
+				}
+				if( m_exactMatches[m_index] )
+				{
+					return;
+				}
+			}
+		}
+
+		const std::vector<InternedString> &m_strings;
+		const std::vector<unsigned int> &m_pathLengths;
+		const std::vector<unsigned char> &m_exactMatches;
+		size_t m_index;
+		size_t m_stringIndex;
+		std::vector<InternedString> m_path;
+
+};
+
 } // namespace
 
 namespace IECore
@@ -101,19 +162,10 @@ void PathMatcherData::load( LoadContextPtr context )
 	unsigned char *exactMatchesPtr = exactMatches.data();
 	container->read( "exactMatches", exactMatchesPtr, exactMatchesEntry.arrayLength() );
 
-	std::vector<InternedString> path;
-	for( size_t i = 0, e = pathLengths.size(); i < e; ++i )
-	{
-		path.resize( pathLengths[i] );
-		if( pathLengths[i] )
-		{
-			path.back() = *stringsPtr++;
-		}
-		if( exactMatches[i] )
-		{
-			writable().addPath( path );
-		}
-	}
+	writable().init(
+		ExactMatchIterator( strings, pathLengths, exactMatches, 0 ),
+		ExactMatchIterator( strings, pathLengths, exactMatches, pathLengths.size() )
+	);
 }
 
 template class TypedData<PathMatcher>;
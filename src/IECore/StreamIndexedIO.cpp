@@ -37,15 +37,23 @@
 
 #include "IECore/ByteOrder.h"
 #include "IECore/CompoundData.h"
+#include "IECore/DataAlgo.h"
+#include "IECore/LRUCache.h"
 #include "IECore/MemoryStream.h"
 #include "IECore/MessageHandler.h"
 #include "IECore/MurmurHash.h"
 #include "IECore/SimpleTypedData.h"
+#include "IECore/TypeTraits.h"
 #include "IECore/VectorTypedData.h"
 
 #include "blosc.h"
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+#include "tbb/spin_mutex.h"
 #include "tbb/spin_rw_mutex.h"
+#include "tbb/task_arena.h"
+#include "tbb/task_group.h"
 
 #include "boost/format.hpp"
 #include "boost/iostreams/device/file.hpp"
@@ -57,14 +65,24 @@
 #include "boost/tokenizer.hpp"
 
 #include <algorithm>
+#include <atomic>
 #include <cassert>
+#include <cstdlib>
+#include <cstring>
+#include <deque>
 #include <iostream>
 #include <list>
 #include <map>
+#include <memory>
+#include <mutex>
 #include <set>
+#include <tuple>
+#include <unordered_map>
 
 #include <fcntl.h>
 #ifndef _MSC_VER
+	#include <sys/mman.h>
+	#include <sys/stat.h>
 	#include <unistd.h>
 #endif
 #include <stdint.h>
@@ -85,6 +103,9 @@ static const Imf::Int64 g_versionedMagicNumber = 0xB00B1E50;
 /// \todo Store SubIndexSize and NodeCount as unsigned 64bit integers
 static const Imf::Int64 g_currentVersion = 7;
 
+/// Size of the buffer used to combine consecutive writes into large blocks.
+static const size_t g_writeBufferSize = 4 * 1024 * 1024;
+
 /// FileFormat ::= Data Index IndexOffset Version MagicNumber
 /// Data ::= DataEntry*
 /// Index ::= zip(StringCache NodeTree FreePages)
@@ -162,7 +183,10 @@ class StreamIndexedIO::PlatformReader
 	public:
 		virtual ~PlatformReader();
 		virtual bool read( char *buffer, size_t size, size_t pos ) = 0;
-		static std::unique_ptr<PlatformReader> create( const std::string &fileName );
+		/// Returns a pointer to 'size' bytes at offset 'pos' if the reader
+		/// provides direct access to the file contents, or nullptr otherwise.
+		virtual const char *map( size_t size, size_t pos ) const;
+		static std::unique_ptr<PlatformReader> create( const std::string &fileName, bool memoryMapped = false );
 };
 
 #ifndef _MSC_VER
@@ -200,15 +224,101 @@ bool PosixPlatformReader::read( char *buffer, size_t size, size_t pos )
 	return (size_t) result == size;
 }
 
+/// Posix Reader which maps the whole file into memory, so that the
+/// data blocks can be decompressed straight from the page cache
+/// without any intermediate copies.
+class MMapPlatformReader : public StreamIndexedIO::PlatformReader
+{
+	public:
+		~MMapPlatformReader();
+		MMapPlatformReader( const std::string &fileName );
+		bool read( char *buffer, size_t size, size_t pos ) override;
+		const char *map( size_t size, size_t pos ) const override;
+		bool valid() const;
+	private:
+		const char *m_data;
+		size_t m_size;
+};
+
+MMapPlatformReader::MMapPlatformReader( const std::string &fileName ) : m_data( nullptr ), m_size( 0 )
+{
+	int fileHandle = ::open( fileName.c_str(), O_RDONLY );
+	if( fileHandle < 0 )
+	{
+		return;
+	}
+
+	struct stat fileStat;
+	if( ::fstat( fileHandle, &fileStat ) == 0 && fileStat.st_size > 0 )
+	{
+		void *data = ::mmap( nullptr, fileStat.st_size, PROT_READ, MAP_SHARED, fileHandle, 0 );
+		if( data != MAP_FAILED )
+		{
+			m_data = static_cast<const char *>( data );
+			m_size = fileStat.st_size;
+		}
+	}
+
+	/// The mapping remains valid after the file descriptor is closed.
+	::close( fileHandle );
+}
+
+MMapPlatformReader::~MMapPlatformReader()
+{
+	if( m_data )
+	{
+		::munmap( const_cast<char *>( m_data ), m_size );
+	}
+}
+
+bool MMapPlatformReader::read( char *buffer, size_t size, size_t pos )
+{
+	const char *src = map( size, pos );
+	if( !src )
+	{
+		return false;
+	}
+
+	memcpy( buffer, src, size );
+	return true;
+}
+
+const char *MMapPlatformReader::map( size_t size, size_t pos ) const
+{
+	if( !m_data || pos > m_size || size > m_size - pos )
+	{
+		return nullptr;
+	}
+	return m_data + pos;
+}
+
+bool MMapPlatformReader::valid() const
+{
+	return m_data != nullptr;
+}
+
 #endif
 
 StreamIndexedIO::PlatformReader::~PlatformReader()
 {
 }
 
-std::unique_ptr<StreamIndexedIO::PlatformReader> StreamIndexedIO::PlatformReader::create(const std::string& fileName)
+const char *StreamIndexedIO::PlatformReader::map( size_t size, size_t pos ) const
+{
+	return nullptr;
+}
+
+std::unique_ptr<StreamIndexedIO::PlatformReader> StreamIndexedIO::PlatformReader::create( const std::string &fileName, bool memoryMapped )
 {
 #ifndef _MSC_VER
+	if( memoryMapped )
+	{
+		std::unique_ptr<MMapPlatformReader> m( new MMapPlatformReader( fileName ) );
+		if( m->valid() )
+		{
+			return std::move( m );
+		}
+	}
 	PlatformReader* p = new PosixPlatformReader(fileName);
 	return std::unique_ptr<StreamIndexedIO::PlatformReader>(p);
 #else
@@ -375,7 +485,7 @@ namespace
 const char* indexCompressor = "lz4";
 const int indexCompressionLevel = 9;
 
-const static std::map<std::string, int> nameCodeMapping = {{"blosclz", 0}, {"lz4", 1}, {"lz4hc", 2}, {"snappy", 3}, {"zlib", 4}};
+const static std::map<std::string, int> nameCodeMapping = {{"blosclz", 0}, {"lz4", 1}, {"lz4hc", 2}, {"snappy", 3}, {"zlib", 4}, {"zstd", 5}};
 
 //! map blosc compressor name to a int which we can serialise into
 //! the indexedIO header. We don't use the blosc header defined values incase they change.
@@ -402,8 +512,62 @@ std::string getCompressor( int code )
 	return "unknown";
 }
 
+/// data smaller than this is never compressed
+const size_t g_minCompressedBlockSize = 1024U;
+
+/// Names used to refer to data types in the "compressionPolicy" option
+const static std::map<std::string, IndexedIO::DataType> nameDataTypeMapping = {
+	{ "Float", IndexedIO::Float }, { "FloatArray", IndexedIO::FloatArray },
+	{ "Double", IndexedIO::Double }, { "DoubleArray", IndexedIO::DoubleArray },
+	{ "Int", IndexedIO::Int }, { "IntArray", IndexedIO::IntArray },
+	{ "String", IndexedIO::String }, { "StringArray", IndexedIO::StringArray },
+	{ "UInt", IndexedIO::UInt }, { "UIntArray", IndexedIO::UIntArray },
+	{ "Char", IndexedIO::Char }, { "CharArray", IndexedIO::CharArray },
+	{ "UChar", IndexedIO::UChar }, { "UCharArray", IndexedIO::UCharArray },
+	{ "Half", IndexedIO::Half }, { "HalfArray", IndexedIO::HalfArray },
+	{ "Short", IndexedIO::Short }, { "ShortArray", IndexedIO::ShortArray },
+	{ "UShort", IndexedIO::UShort }, { "UShortArray", IndexedIO::UShortArray },
+	{ "Int64", IndexedIO::Int64 }, { "Int64Array", IndexedIO::Int64Array },
+	{ "UInt64", IndexedIO::UInt64 }, { "UInt64Array", IndexedIO::UInt64Array },
+	{ "InternedStringArray", IndexedIO::InternedStringArray }
+};
+
+const static std::map<std::string, int> nameShuffleMapping = {{"none", BLOSC_NOSHUFFLE}, {"byte", BLOSC_SHUFFLE}, {"bit", BLOSC_BITSHUFFLE}};
+
+/// The size of the elements of the given data type, used by blosc to shuffle the data.
+size_t dataTypeElementSize( IndexedIO::DataType dataType )
+{
+	switch( dataType )
+	{
+		case IndexedIO::Char :
+		case IndexedIO::CharArray :
+		case IndexedIO::UChar :
+		case IndexedIO::UCharArray :
+		case IndexedIO::String :
+		case IndexedIO::StringArray :
+			return 1;
+		case IndexedIO::Half :
+		case IndexedIO::HalfArray :
+		case IndexedIO::Short :
+		case IndexedIO::ShortArray :
+		case IndexedIO::UShort :
+		case IndexedIO::UShortArray :
+			return 2;
+		case IndexedIO::Double :
+		case IndexedIO::DoubleArray :
+		case IndexedIO::Int64 :
+		case IndexedIO::Int64Array :
+		case IndexedIO::UInt64 :
+		case IndexedIO::UInt64Array :
+		case IndexedIO::InternedStringArray :
+			return 8;
+		default :
+			return 4;
+	}
+}
+
 /// compress 'size' bytes at 'data' into 'outputBuffer'
-/// compressionLevel, compressor & threadCount are passed directly to blosc ( see blosc.h )
+/// compressionLevel, compressor, threadCount, shuffle & typeSize are passed directly to blosc ( see blosc.h )
 /// if  'size' is greater than the max buffer blosc can handle we split into a number of independently compressed blocks.
 /// returns the number of compression blocks
 /// 'outputBuffer' contains the compressed block data and is resized in this function.
@@ -416,7 +580,9 @@ size_t compress(
 	const std::string &compressor,
 	int threadCount,
 	boost::optional<size_t> maxBlockSize = boost::optional<size_t>(),
-	size_t minCompressedBlockSize = 1024U
+	size_t minCompressedBlockSize = g_minCompressedBlockSize,
+	int shuffle = BLOSC_SHUFFLE,
+	size_t typeSize = 4
 )
 {
 	size_t maxCompressedBlockSize = maxBlockSize ? maxBlockSize.get() : BLOSC_MAX_BUFFERSIZE;
@@ -451,8 +617,8 @@ size_t compress(
 
 		int compressedSize = blosc_compress_ctx(
 			compressionLevel,
-			true,
-			4,
+			shuffle,
+			typeSize,
 			currentBlockUncompressedSize,
 			currentBlockCompressed,
 			writePtr,
@@ -485,6 +651,52 @@ size_t compress(
 	return numBlocks;
 }
 
+/// A single blosc compressed block, and the location it should be decompressed to.
+struct CompressedBlock
+{
+	const char *data;
+	char *output;
+	size_t decompressedSize;
+};
+
+void decompressBlock( const CompressedBlock &block, int threadCount, const char *errorContext )
+{
+	int bloscResult = blosc_decompress_ctx( block.data, block.output, block.decompressedSize, threadCount );
+
+	if( bloscResult <= 0 )
+	{
+		throw IECore::IOException( std::string( errorContext ) + " - Corrupted compressed archive" );
+	}
+}
+
+/// Decompresses a list of blosc blocks. Each block was compressed independently, so
+/// when there is more than one we decompress them in parallel.
+void decompressBlocks( const std::vector<CompressedBlock> &blocks, int threadCount, const char *errorContext )
+{
+	if( blocks.size() == 1 )
+	{
+		decompressBlock( blocks[0], threadCount, errorContext );
+		return;
+	}
+
+	/// Isolate the tasks so that the caller's thread can't steal unrelated work
+	/// while waiting, as callers may be holding locks.
+	tbb::this_task_arena::isolate(
+		[&blocks, threadCount, errorContext] {
+			tbb::parallel_for(
+				tbb::blocked_range<size_t>( 0, blocks.size(), 1 ),
+				[&blocks, threadCount, errorContext]( const tbb::blocked_range<size_t> &r )
+				{
+					for( size_t i = r.begin(); i != r.end(); ++i )
+					{
+						decompressBlock( blocks[i], threadCount, errorContext );
+					}
+				}
+			);
+		}
+	);
+}
+
 /// decompress a memory buffer which is formed by a number of blosc compressed blocks
 /// returns the number of compression blocks
 /// 'outputBuffer' contains the decompressed data and is resized in this function if not large enough.
@@ -499,6 +711,11 @@ size_t decompress( const char *data, size_t size, std::vector<char> &outputBuffe
 		size_t compressedNumBytes = 0, decompressedNumBytes = 0, blockSize = 0;
 		blosc_cbuffer_sizes( &data[compressedBytesRead], &decompressedNumBytes, &compressedNumBytes, &blockSize );
 
+		if( !compressedNumBytes )
+		{
+			throw IECore::IOException( "StreamIndexedIO (decompress) - Corrupted compressed archive" );
+		}
+
 		blockSizes.push_back( std::make_pair( compressedNumBytes, decompressedNumBytes ) );
 		totalDecompressedSize += decompressedNumBytes;
 		compressedBytesRead += compressedNumBytes;
@@ -510,21 +727,23 @@ size_t decompress( const char *data, size_t size, std::vector<char> &outputBuffe
 		outputBuffer.swap( b );
 	}
 
+	std::vector<CompressedBlock> blocks;
+	blocks.reserve( blockSizes.size() );
+
 	compressedBytesRead = 0;
 	size_t decompressedBytesWritten = 0;
 	for( const auto &blockSize : blockSizes )
 	{
-		int bloscResult = blosc_decompress_ctx( &data[compressedBytesRead], &outputBuffer[decompressedBytesWritten], blockSize.second, threadCount );
-
-		if( bloscResult <= 0 )
-		{
-			throw IECore::IOException( "StreamIndexedIO (decompress) - Corrupted compressed archive" );
-		}
-
+		blocks.push_back( { &data[compressedBytesRead], &outputBuffer[decompressedBytesWritten], blockSize.second } );
 		compressedBytesRead += blockSize.first;
 		decompressedBytesWritten += blockSize.second;
 	}
 
+	if( !blocks.empty() )
+	{
+		decompressBlocks( blocks, threadCount, "StreamIndexedIO (decompress)" );
+	}
+
 	return blockSizes.size();
 }
 
@@ -700,6 +919,14 @@ class DataNode : public NodeBase
 			return m_numCompressedBlocks;
 		}
 
+		/// Used to fill in the location of data written by the compression pipeline.
+		void setLocation( Imf::Int64 offset, Imf::Int64 size, unsigned short numCompressedBlocks )
+		{
+			m_offset = offset;
+			m_size = size;
+			m_numCompressedBlocks = numCompressedBlocks;
+		}
+
 		void copyFrom( DataNode *other )
 		{
 			m_dataType = other->m_dataType;
@@ -884,7 +1111,14 @@ class StreamIndexedIO::Node
 		};
 
 		/// Construct a new Node in the given index with the given numeric id
+		/// The directory is pinned so that the subindexes containing it can't be evicted
+		/// for as long as the Node exists.
 		Node(StreamIndexedIO::Index* index, DirectoryNode *dirNode);
+		~Node();
+
+		/// Moves the Node to a directory returned by directoryChild(), adopting the pin that
+		/// directoryChild() took on it and releasing the pin on the previous directory.
+		void setDirectory( DirectoryNode *pinnedDirNode );
 
 		void childNames( IndexedIO::EntryIDList &names ) const;
 		void childNames( IndexedIO::EntryIDList &names, IndexedIO::EntryType ) const;
@@ -894,20 +1128,26 @@ class StreamIndexedIO::Node
 		bool hasChild( const IndexedIO::EntryID &name ) const;
 
 		// Returns the named child directory node or NULL if not existent. Loads the subindex for the child nodes (if applicable).
+		// The returned directory is pinned, and the caller is responsible for calling Index::unpinDirectory() or setDirectory().
 		DirectoryNode* directoryChild( const IndexedIO::EntryID &name ) const;
 
 		/// returns information about the Data node
 		bool dataChildInfo( const IndexedIO::EntryID &name, Info &info ) const;
 
+		// Returns the new child directory, or NULL if a child with the name already exists.
+		// As for directoryChild(), the returned directory is pinned.
 		DirectoryNode* addChild( const IndexedIO::EntryID & childName );
-		void addDataChild(
+		/// If 'pending' is true, a DataNode is always created and the location
+		/// of the data is filled in later by the compression pipeline.
+		NodeBase* addDataChild(
 			const IndexedIO::EntryID &childName,
 			IndexedIO::DataType dataType,
 			size_t arrayLen,
 			size_t offset,
 			size_t size,
 			size_t decompressedSize,
-			size_t numCompressedBlocks
+			size_t numCompressedBlocks,
+			bool pending = false
 		);
 
 		void removeChild( const IndexedIO::EntryID &childName, bool throwException = true );
@@ -916,57 +1156,68 @@ class StreamIndexedIO::Node
 		DirectoryNode *m_node;
 };
 
-//! Small scoped class to read from a given data block in a file,
-//! decompressing if required.
-class StreamIndexedIO::Reader
+/// Process wide cache of decompressed data blocks, keyed by the identity of
+/// the file and the location of the block within it.
+class StreamIndexedIO::BlockCache
 {
-	public:
 
-		//! If an outputBuffer is supplied then it has to be large enough to store info.decompressedSize bytes of data
-		//! and if one isn't supplied then a suitably sized buffer is created and freed on destruction.
-		Reader( StreamIndexedIO::StreamFile &f, const Node::Info &info, int threadCount = 1, char *outputBuffer = nullptr )
-			: m_data( nullptr ),
-			m_decompressedData( outputBuffer ),
-			m_size( info.size ),
-			m_decompressedSize( info.decompressedSize ),
-			m_ownDecompressedData( outputBuffer == nullptr )
+	public :
+
+		/// Returns true if the blocks of the given file should be cached.
+		static bool enabled( const StreamIndexedIO::StreamFile &f );
+
+		/// Returns the decompressed block, decompressing it if it isn't cached.
+		static ConstCharVectorDataPtr get( StreamIndexedIO::StreamFile &f, const Node::Info &info, int threadCount );
+
+		static void setMemoryLimit( size_t memoryLimit );
+		static size_t getMemoryLimit();
+		static CompoundDataPtr statistics();
+		static void clear();
+
+	private :
+
+		struct GetterKey
 		{
-			if( m_ownDecompressedData )
+			GetterKey( StreamIndexedIO::StreamFile &f, const Node::Info &info, int threadCount );
+
+			operator const MurmurHash & () const
 			{
-				m_decompressedData = new char[m_decompressedSize];
+				return hash;
 			}
 
-			if( info.numCompressedBlocks > 0 )
-			{
-				m_data = new char[info.size];
-				f.read( m_data, info.size, info.offset );
+			MurmurHash hash;
+			StreamIndexedIO::StreamFile &file;
+			const Node::Info &info;
+			int threadCount;
+		};
 
-				const char* readPtr = m_data;
-				char* writePtr = m_decompressedData;
+		typedef LRUCache<MurmurHash, ConstCharVectorDataPtr, LRUCachePolicy::Parallel, GetterKey> Cache;
 
-				size_t writeBufferSize = m_decompressedSize;
-				for ( size_t block = 0; block < info.numCompressedBlocks; ++block )
-				{
-					/// read the blosc header so we can decompress this block
-					size_t compresedNumBytes = 0, decompressedNumBytes = 0, blockSize = 0;
-					blosc_cbuffer_sizes( readPtr, &decompressedNumBytes , &compresedNumBytes, &blockSize );
+		static Cache &cache();
+		static ConstCharVectorDataPtr getter( const GetterKey &key, Cache::Cost &cost );
 
-					int bloscResult = blosc_decompress_ctx( readPtr, writePtr, decompressedNumBytes, threadCount );
+		static std::atomic<uint64_t> g_lookups;
+		static std::atomic<uint64_t> g_misses;
 
-					if( bloscResult <= 0 )
-					{
-						throw IECore::IOException( "StreamIndexedIO::Reader - Corrupted compressed archive" );
-					}
+};
 
-					readPtr += compresedNumBytes;
-					writePtr += decompressedNumBytes;
-					writeBufferSize -= decompressedNumBytes;
-				}
-			}
-			else
-			{
-				f.read( m_decompressedData, info.size, info.offset );
-			}
+//! Small scoped class to read from a given data block in a file,
+//! decompressing if required.
+class StreamIndexedIO::Reader
+{
+	public:
+
+		//! If an outputBuffer is supplied then it has to be large enough to store info.decompressedSize bytes of data
+		//! and if one isn't supplied then a suitably sized buffer is created and freed on destruction.
+		Reader( StreamIndexedIO::StreamFile &f, const Node::Info &info, int threadCount = 1, char *outputBuffer = nullptr )
+			: Reader( &f, f.map( info.size, info.offset ), info, threadCount, outputBuffer )
+		{
+		}
+
+		//! Reads from a copy of the stored data block that has already been loaded into memory.
+		Reader( const char *data, const Node::Info &info, int threadCount = 1, char *outputBuffer = nullptr )
+			: Reader( nullptr, data, info, threadCount, outputBuffer )
+		{
 		}
 
 		~Reader()
@@ -982,12 +1233,20 @@ class StreamIndexedIO::Reader
 			}
 		}
 
-		char *data() const
+		const char *data() const
 		{
 			if( m_decompressedData )
 			{
 				return m_decompressedData;
 			}
+			else if( m_cachedData )
+			{
+				return m_cachedData->readable().data();
+			}
+			else if( m_mappedData )
+			{
+				return m_mappedData;
+			}
 			else
 			{
 				return m_data;
@@ -1000,13 +1259,264 @@ class StreamIndexedIO::Reader
 		}
 
 	private:
+
+		friend class StreamIndexedIO::BlockCache;
+
+		Reader( StreamIndexedIO::StreamFile *f, const char *data, const Node::Info &info, int threadCount, char *outputBuffer, bool useBlockCache = true )
+			: m_data( nullptr ),
+			m_decompressedData( outputBuffer ),
+			m_mappedData( data ),
+			m_size( info.size ),
+			m_decompressedSize( info.decompressedSize ),
+			m_ownDecompressedData( outputBuffer == nullptr )
+		{
+			if( info.numCompressedBlocks > 0 && f && useBlockCache && BlockCache::enabled( *f ) )
+			{
+				m_cachedData = BlockCache::get( *f, info, threadCount );
+				if( m_ownDecompressedData )
+				{
+					/// data() returns the cached block directly.
+					m_decompressedData = nullptr;
+					m_ownDecompressedData = false;
+				}
+				else
+				{
+					memcpy( m_decompressedData, m_cachedData->readable().data(), m_decompressedSize );
+				}
+				return;
+			}
+
+			if( info.numCompressedBlocks == 0 && m_mappedData && m_ownDecompressedData )
+			{
+				/// Uncompressed data can be used straight from the memory mapped file.
+				m_decompressedData = nullptr;
+				m_ownDecompressedData = false;
+				return;
+			}
+
+			if( m_ownDecompressedData )
+			{
+				m_decompressedData = new char[m_decompressedSize];
+			}
+
+			if( info.numCompressedBlocks > 0 )
+			{
+				if( m_mappedData )
+				{
+					decompressBlocks( compressedBlocks( info ), threadCount, "StreamIndexedIO::Reader" );
+				}
+				else if( info.numCompressedBlocks == 1 )
+				{
+					m_data = new char[info.size];
+					f->read( m_data, info.size, info.offset );
+					decompressBlocks( compressedBlocks( info ), threadCount, "StreamIndexedIO::Reader" );
+				}
+				else
+				{
+					readAheadAndDecompress( *f, info, threadCount );
+				}
+			}
+			else if( m_mappedData )
+			{
+				memcpy( m_decompressedData, m_mappedData, info.size );
+			}
+			else
+			{
+				f->read( m_decompressedData, info.size, info.offset );
+			}
+		}
+
+		/// Returns the blocks stored in the compressed buffer, which must already be
+		/// fully available, either in m_data or in the memory mapped file.
+		std::vector<CompressedBlock> compressedBlocks( const Node::Info &info ) const
+		{
+			std::vector<CompressedBlock> blocks;
+			blocks.reserve( info.numCompressedBlocks );
+
+			const char *readPtr = m_mappedData ? m_mappedData : m_data;
+			const char *readEnd = readPtr + info.size;
+			char *writePtr = m_decompressedData;
+			size_t writeBufferSize = m_decompressedSize;
+
+			for( size_t block = 0; block < info.numCompressedBlocks; ++block )
+			{
+				/// read the blosc header so we can decompress this block
+				size_t compressedNumBytes = 0, decompressedNumBytes = 0, blockSize = 0;
+				blosc_cbuffer_sizes( readPtr, &decompressedNumBytes, &compressedNumBytes, &blockSize );
+
+				if( !compressedNumBytes || compressedNumBytes > (size_t)( readEnd - readPtr ) || decompressedNumBytes > writeBufferSize )
+				{
+					throw IECore::IOException( "StreamIndexedIO::Reader - Corrupted compressed archive" );
+				}
+
+				blocks.push_back( { readPtr, writePtr, decompressedNumBytes } );
+
+				readPtr += compressedNumBytes;
+				writePtr += decompressedNumBytes;
+				writeBufferSize -= decompressedNumBytes;
+			}
+
+			return blocks;
+		}
+
+		/// Reads the blocks one at a time, decompressing each one in a separate task
+		/// while the next one is being read from the file.
+		void readAheadAndDecompress( StreamIndexedIO::StreamFile &f, const Node::Info &info, int threadCount )
+		{
+			m_data = new char[info.size];
+
+			char *readPtr = m_data;
+			char *writePtr = m_decompressedData;
+			size_t compressedBytesRemaining = info.size;
+			size_t writeBufferSize = m_decompressedSize;
+			bool corrupted = false;
+
+			tbb::this_task_arena::isolate(
+				[&] {
+					tbb::task_group decompressionTasks;
+					for( size_t block = 0; block < info.numCompressedBlocks; ++block )
+					{
+						if( compressedBytesRemaining < BLOSC_MIN_HEADER_LENGTH )
+						{
+							corrupted = true;
+							break;
+						}
+
+						const size_t blockOffset = info.offset + ( readPtr - m_data );
+						f.read( readPtr, BLOSC_MIN_HEADER_LENGTH, blockOffset );
+
+						size_t compressedNumBytes = 0, decompressedNumBytes = 0, blockSize = 0;
+						blosc_cbuffer_sizes( readPtr, &decompressedNumBytes, &compressedNumBytes, &blockSize );
+
+						if( compressedNumBytes < BLOSC_MIN_HEADER_LENGTH || compressedNumBytes > compressedBytesRemaining || decompressedNumBytes > writeBufferSize )
+						{
+							corrupted = true;
+							break;
+						}
+
+						f.read( readPtr + BLOSC_MIN_HEADER_LENGTH, compressedNumBytes - BLOSC_MIN_HEADER_LENGTH, blockOffset + BLOSC_MIN_HEADER_LENGTH );
+
+						const CompressedBlock compressedBlock = { readPtr, writePtr, decompressedNumBytes };
+						decompressionTasks.run(
+							[compressedBlock, threadCount] {
+								decompressBlock( compressedBlock, threadCount, "StreamIndexedIO::Reader" );
+							}
+						);
+
+						readPtr += compressedNumBytes;
+						writePtr += decompressedNumBytes;
+						compressedBytesRemaining -= compressedNumBytes;
+						writeBufferSize -= decompressedNumBytes;
+					}
+					decompressionTasks.wait();
+				}
+			);
+
+			if( corrupted )
+			{
+				throw IECore::IOException( "StreamIndexedIO::Reader - Corrupted compressed archive" );
+			}
+		}
+
 		char *m_data;
 		char *m_decompressedData;
+		/// Points to the stored data if it is already in memory, either
+		/// because the file is memory mapped or it was loaded by the caller.
+		const char *m_mappedData;
+		/// Holds the decompressed data when it comes from the BlockCache.
+		ConstCharVectorDataPtr m_cachedData;
 		Imf::Int64 m_size;
 		Imf::Int64 m_decompressedSize;
 		bool m_ownDecompressedData;
 };
 
+///////////////////////////////////////////////
+//
+// StreamIndexedIO::BlockCache
+//
+///////////////////////////////////////////////
+
+std::atomic<uint64_t> StreamIndexedIO::BlockCache::g_lookups( 0 );
+std::atomic<uint64_t> StreamIndexedIO::BlockCache::g_misses( 0 );
+
+StreamIndexedIO::BlockCache::GetterKey::GetterKey( StreamIndexedIO::StreamFile &f, const Node::Info &info, int threadCount )
+	: hash( f.identity() ), file( f ), info( info ), threadCount( threadCount )
+{
+	hash.append( (uint64_t)info.offset );
+	hash.append( (uint64_t)info.size );
+}
+
+bool StreamIndexedIO::BlockCache::enabled( const StreamIndexedIO::StreamFile &f )
+{
+	return f.identity() != MurmurHash() && cache().getMaxCost();
+}
+
+ConstCharVectorDataPtr StreamIndexedIO::BlockCache::get( StreamIndexedIO::StreamFile &f, const Node::Info &info, int threadCount )
+{
+	g_lookups++;
+	return cache().get( GetterKey( f, info, threadCount ) );
+}
+
+void StreamIndexedIO::BlockCache::setMemoryLimit( size_t memoryLimit )
+{
+	cache().setMaxCost( memoryLimit );
+}
+
+size_t StreamIndexedIO::BlockCache::getMemoryLimit()
+{
+	return cache().getMaxCost();
+}
+
+CompoundDataPtr StreamIndexedIO::BlockCache::statistics()
+{
+	const uint64_t lookups = g_lookups;
+	const uint64_t misses = g_misses;
+
+	CompoundDataPtr result = new CompoundData();
+	result->writable()["hits"] = new UInt64Data( lookups > misses ? lookups - misses : 0 );
+	result->writable()["misses"] = new UInt64Data( misses );
+	result->writable()["memoryUsage"] = new UInt64Data( cache().currentCost() );
+	result->writable()["memoryLimit"] = new UInt64Data( cache().getMaxCost() );
+	return result;
+}
+
+void StreamIndexedIO::BlockCache::clear()
+{
+	cache().clear();
+	g_lookups = 0;
+	g_misses = 0;
+}
+
+StreamIndexedIO::BlockCache::Cache &StreamIndexedIO::BlockCache::cache()
+{
+	static Cache *g_cache = nullptr;
+	static std::once_flag g_once;
+	std::call_once(
+		g_once,
+		[] {
+			size_t memoryLimit = 0;
+			if( const char *memoryLimitEnvVar = getenv( "IECORE_STREAMINDEXEDIO_BLOCK_CACHE_MEMORY_LIMIT" ) )
+			{
+				memoryLimit = strtoull( memoryLimitEnvVar, nullptr, 10 );
+			}
+			g_cache = new Cache( getter, memoryLimit );
+		}
+	);
+	return *g_cache;
+}
+
+ConstCharVectorDataPtr StreamIndexedIO::BlockCache::getter( const GetterKey &key, Cache::Cost &cost )
+{
+	g_misses++;
+
+	CharVectorDataPtr result = new CharVectorData();
+	result->writable().resize( key.info.decompressedSize );
+	Reader reader( &key.file, key.file.map( key.info.size, key.info.offset ), key.info, key.threadCount, result->writable().data(), /* useBlockCache = */ false );
+
+	cost = key.info.decompressedSize;
+	return result;
+}
+
 /// A tree to represent nodes in a filesystem, along with their locations in a file.
 class StreamIndexedIO::Index : public RefCounted
 {
@@ -1042,6 +1552,22 @@ class StreamIndexedIO::Index : public RefCounted
 		/// \param prefixSize If true than it will prepend to the block, the size of it
 		Imf::Int64 writeUniqueData( const char *data, size_t size, bool prefixSize = false );
 
+		/// Settings used to compress a data block
+		struct CompressionSettings
+		{
+			std::string compressor;
+			int compressionLevel;
+			int shuffle;
+			/// blocks smaller than this aren't compressed
+			size_t minSize;
+			/// size of the elements of the data, used for shuffling
+			size_t typeSize;
+		};
+
+		/// Returns the settings used to compress the given entry. These are chosen by the
+		/// "compressionPolicy" option, and default to the file wide compressor and level.
+		CompressionSettings compressionSettings( const IndexedIO::EntryID &name, IndexedIO::DataType dataType ) const;
+
 		struct WriteInfo
 		{
 			WriteInfo() : offset( 0 ), size( 0 ), numCompressedBlocks( 0 )
@@ -1057,7 +1583,23 @@ class StreamIndexedIO::Index : public RefCounted
 			size_t numCompressedBlocks;
 		};
 
-		WriteInfo writeUniqueDataCompressed( const char *data, size_t size, bool prefixSize = false );
+		/// Compresses and writes the data, unless the same uncompressed data has been written before, in which case
+		/// the previous block is reused without compressing it again. Duplicates are found by hashing the
+		/// uncompressed data, or by using `dataHash` if given, which must uniquely identify the contents of the data.
+		WriteInfo writeUniqueDataCompressed( const char *data, size_t size, const CompressionSettings &settings, bool prefixSize = false, const MurmurHash *dataHash = nullptr );
+
+		/// Writes the data using writeUniqueDataCompressed() and adds a data child for it to the node.
+		/// If a compression queue length was given, large blocks are instead compressed in the background,
+		/// and the location of the child is filled in when the block is written. Queued blocks are always
+		/// written in the order they were queued.
+		void writeDataChild( Node &node, const IndexedIO::EntryID &name, IndexedIO::DataType dataType, size_t arrayLength, const char *data, size_t size, const MurmurHash *dataHash = nullptr );
+
+		/// Returns true if there are blocks waiting in the compression queue.
+		bool hasPendingWrites() const;
+
+		/// Waits for the compression of the oldest queued blocks and writes them to
+		/// the file, until no more than 'maxPendingWrites' blocks remain queued.
+		void writePendingData( size_t maxPendingWrites = 0 );
 
 		/// flushes the children of the given directory node to a subindex in the file
 		void commitNodeToSubIndex( DirectoryNode *n );
@@ -1065,6 +1607,24 @@ class StreamIndexedIO::Index : public RefCounted
 		/// read the subindex that contains the children of the given node
 		void readNodeFromSubIndex( DirectoryNode *n );
 
+		/// Reads the subindex that contains the children of the given node without locking the stream.
+		/// It must only be called on nodes that are not yet visible to other threads.
+		/// Returns the size of the decompressed subindex.
+		size_t loadSubIndex( DirectoryNode *n );
+
+		/// Functions used to keep loaded subindexes from being evicted while they are referenced by
+		/// a Node. Pinning a directory pins all the loaded subindexes above it. They do nothing unless
+		/// a subindex memory limit was given when opening the file for reading.
+		void pinDirectory( DirectoryNode *n );
+		void unpinDirectory( DirectoryNode *n );
+
+		/// Registers a directory whose subindex has just been loaded, for eviction.
+		void registerLoadedSubIndex( DirectoryNode *n, size_t memory );
+
+		/// Releases the least recently used unpinned subindexes until the memory used by
+		/// the loaded subindexes is below the limit.
+		void evictSubIndexes();
+
 		typedef tbb::spin_rw_mutex Mutex;
 		typedef Mutex::scoped_lock MutexLock;
 		/// Returns an appropriate mutex scoped lock to access the given Directory node.
@@ -1073,6 +1633,9 @@ class StreamIndexedIO::Index : public RefCounted
 
 		int decompressionThreadCount() const { return m_decompressionThreadCount; }
 
+		/// Returns the size of the decompressed index and the subindexes currently loaded.
+		size_t memoryUsage() const { return m_indexMemory; }
+
 		CompoundDataPtr metadata() const
 		{
 			CompoundDataPtr meta(new CompoundData());
@@ -1111,6 +1674,52 @@ class StreamIndexedIO::Index : public RefCounted
 		typedef std::map< std::pair<MurmurHash,unsigned int>, Imf::Int64 > HashToDataMap;
 		HashToDataMap m_hashToDataMap;
 
+		/// Maps the hash and size of uncompressed data, and whether the block is prefixed
+		/// with its size, to the block it was written to. Blocks with and without the prefix
+		/// are never interchangeable, even when their data is identical.
+		typedef std::tuple<MurmurHash, size_t, bool> DeduplicationKey;
+		typedef std::map< DeduplicationKey, WriteInfo > HashToWriteInfoMap;
+		HashToWriteInfoMap m_uncompressedHashToWriteInfo;
+		/// As above, but for hashes provided by the caller of writeUniqueDataCompressed()
+		HashToWriteInfoMap m_dataHashToWriteInfo;
+
+		/// Whether m_uncompressedHashToWriteInfo is rebuilt from the existing data when opening in Append mode
+		bool m_deduplicateOnAppend;
+
+		/// A block queued for compression, and the nodes waiting for its location.
+		struct PendingWrite
+		{
+			PendingWrite( const char *buffer, size_t size ) : data( buffer, buffer + size ), numBlocks( 0 )
+			{
+			}
+
+			std::vector<char> data;
+			std::vector<char> compressedBuffer;
+			size_t numBlocks;
+			DeduplicationKey uncompressedHashKey;
+			std::vector<DeduplicationKey> dataHashKeys;
+			std::vector<DataNode *> nodes;
+			tbb::task_group compression;
+		};
+
+		/// Maximum number of blocks in the compression queue. Zero disables the queue.
+		size_t m_compressionQueueLength;
+		std::deque< std::unique_ptr<PendingWrite> > m_pendingWrites;
+		/// Equivalent to the maps above, for blocks that are still queued
+		typedef std::map< DeduplicationKey, PendingWrite * > HashToPendingWriteMap;
+		HashToPendingWriteMap m_uncompressedHashToPendingWrite;
+		HashToPendingWriteMap m_dataHashToPendingWrite;
+
+		/// Writes the compressed data to a newly allocated block, or the
+		/// original data if compression didn't reduce its size.
+		WriteInfo writeCompressedData( const char *data, size_t size, const std::vector<char> &compressedBuffer, size_t numBlocks, bool prefixSize );
+
+		/// Writes the data to a newly allocated block and returns its offset
+		Imf::Int64 writeData( const char *data, size_t size, bool prefixSize );
+
+		/// Adds the data blocks from the given directory and its children to m_uncompressedHashToWriteInfo
+		void rebuildDeduplicationMap( DirectoryNode *n );
+
 		StringCache m_stringCache;
 
 		StreamIndexedIO::StreamFilePtr m_stream;
@@ -1129,6 +1738,40 @@ class StreamIndexedIO::Index : public RefCounted
 		boost::optional<size_t> m_maxCompressedBlockSize;
 		std::string m_compressor;
 
+		/// Compression settings from the "compressionPolicy" option. Settings which weren't
+		/// given are left empty or negative, and use the file wide settings instead.
+		typedef std::map< IndexedIO::EntryID, CompressionSettings > EntryCompressionMap;
+		typedef std::map< IndexedIO::DataType, CompressionSettings > DataTypeCompressionMap;
+		EntryCompressionMap m_entryCompression;
+		DataTypeCompressionMap m_dataTypeCompression;
+
+		void readCompressionPolicy( const CompoundData *policy );
+
+		struct LoadedSubIndex
+		{
+			size_t memory;
+			size_t pins;
+			size_t lastUsed;
+		};
+
+		typedef std::unordered_map< DirectoryNode *, LoadedSubIndex > LoadedSubIndexMap;
+
+		/// Maximum memory used by loaded subindexes, or 0 for no limit
+		size_t m_subIndexMemoryLimit;
+		LoadedSubIndexMap m_loadedSubIndexes;
+		size_t m_loadedSubIndexMemory;
+		size_t m_loadedSubIndexClock;
+		/// Size of the main index and the loaded subindexes, whether they may be evicted or not.
+		std::atomic<size_t> m_indexMemory;
+		/// Protects the members above. When both are required the directory
+		/// lock is always acquired before this one.
+		tbb::spin_mutex m_loadedSubIndexMutex;
+		/// Serialises evictions
+		std::mutex m_evictionMutex;
+
+		/// Removes the given directory and the subindexes loaded below it from m_loadedSubIndexes.
+		void forgetLoadedSubIndexes( DirectoryNode *n );
+
 		struct FreePage
 		{
 			FreePage( Imf::Int64 offset, Imf::Int64 sz ) : m_offset(offset), m_size(sz) {}
@@ -1306,6 +1949,18 @@ void DirectoryNode::recoveredSubIndex()
 
 StreamIndexedIO::Node::Node(Index* index, DirectoryNode *dirNode) : m_idx(index), m_node(dirNode)
 {
+	m_idx->pinDirectory( m_node );
+}
+
+StreamIndexedIO::Node::~Node()
+{
+	m_idx->unpinDirectory( m_node );
+}
+
+void StreamIndexedIO::Node::setDirectory( DirectoryNode *pinnedDirNode )
+{
+	m_idx->unpinDirectory( m_node );
+	m_node = pinnedDirNode;
 }
 
 bool StreamIndexedIO::Node::hasChild( const IndexedIO::EntryID &name ) const
@@ -1337,7 +1992,12 @@ DirectoryNode* StreamIndexedIO::Node::directoryChild( const IndexedIO::EntryID &
 
 				// this can occur when the user flushed a directory and right after tries to access it.
 				m_idx->readNodeFromSubIndex( dir );
+				m_idx->pinDirectory( dir );
+				return dir;
 			}
+
+			// pin while we hold the lock, so the directory can't be evicted before the caller uses it.
+			m_idx->pinDirectory( dir );
 			return dir;
 		}
 		else if ( (*it)->nodeType() == NodeBase::SubIndex )
@@ -1349,7 +2009,17 @@ DirectoryNode* StreamIndexedIO::Node::directoryChild( const IndexedIO::EntryID &
 
 			lock.release();		/// we release the lock while loading data..
 
-			m_idx->readNodeFromSubIndex( newDir );
+			// newDir is not visible to other threads yet, so different subindexes can be loaded concurrently.
+			size_t memory = 0;
+			try
+			{
+				memory = m_idx->loadSubIndex( newDir );
+			}
+			catch( ... )
+			{
+				NodeBase::destroy( newDir );
+				throw;
+			}
 
 			// now that we loaded the whole thing, lock our Index for writing
 			m_idx->lockDirectory( lock, m_node, true );
@@ -1357,16 +2027,26 @@ DirectoryNode* StreamIndexedIO::Node::directoryChild( const IndexedIO::EntryID &
 			// there's a chance that someone else already replaced the pointer...
 			if ( (*it)->nodeType() == NodeBase::Directory )
 			{
+				DirectoryNode *dir = static_cast< DirectoryNode *>(*it);
+				m_idx->pinDirectory( dir );
 				lock.release();		/// we release the lock because we won't change the children anyways..
 				NodeBase::destroy( newDir );
-				return static_cast< DirectoryNode *>(*it);
+				return dir;
 			}
 
+			// and now we are ok to delete the SubIndexNode. We don't use `subIndex` because it
+			// may have been evicted and recreated while we weren't holding the lock.
+			delete static_cast< SubIndexNode *>( *it );
+
 			// replace SubIndex by Directory node.
 			(*it) = newDir;
 
-			// and now we are ok to delete the SubIndexNode..
-			delete subIndex;
+			m_idx->registerLoadedSubIndex( newDir, memory );
+			m_idx->pinDirectory( newDir );
+
+			lock.release();
+
+			m_idx->evictSubIndexes();
 
 			return newDir;
 		}
@@ -1376,6 +2056,11 @@ DirectoryNode* StreamIndexedIO::Node::directoryChild( const IndexedIO::EntryID &
 
 bool StreamIndexedIO::Node::dataChildInfo( const IndexedIO::EntryID &name, Info &info ) const
 {
+	if ( m_idx->hasPendingWrites() )
+	{
+		m_idx->writePendingData();
+	}
+
 	Index::MutexLock lock;
 	m_idx->lockDirectory( lock, m_node );
 
@@ -1429,17 +2114,19 @@ DirectoryNode* StreamIndexedIO::Node::addChild( const IndexedIO::EntryID &childN
 
 	m_idx->m_hasChanged = true;
 
+	m_idx->pinDirectory( child );
 	return child;
 }
 
-void StreamIndexedIO::Node::addDataChild(
+NodeBase* StreamIndexedIO::Node::addDataChild(
 	const IndexedIO::EntryID &childName,
 	IndexedIO::DataType dataType,
 	size_t arrayLen,
 	size_t offset,
 	size_t size,
 	size_t decompressedSize,
-	size_t numCompressedBlocks
+	size_t numCompressedBlocks,
+	bool pending
 )
 {
 	if ( m_node->subindex() )
@@ -1454,8 +2141,10 @@ void StreamIndexedIO::Node::addDataChild(
 
 	m_idx->m_stringCache.add( childName );
 
+	NodeBase *result = nullptr;
+
 	// SmallDataNodes should not be compressed.
-	if( arrayLen <= SmallDataNode::maxArrayLength && size <= SmallDataNode::maxSize && ( size == decompressedSize ) && (numCompressedBlocks == 0) )
+	if( !pending && arrayLen <= SmallDataNode::maxArrayLength && size <= SmallDataNode::maxSize && ( size == decompressedSize ) && (numCompressedBlocks == 0) )
 	{
 		SmallDataNode* child = new SmallDataNode(childName, dataType, arrayLen, size, offset);
 		if ( !child )
@@ -1463,6 +2152,7 @@ void StreamIndexedIO::Node::addDataChild(
 			throw Exception( "Failed to allocate node!" );
 		}
 		m_node->registerChild( child );
+		result = child;
 	}
 	else
 	{
@@ -1482,8 +2172,10 @@ void StreamIndexedIO::Node::addDataChild(
 			throw Exception( "Failed to allocate node!" );
 		}
 		m_node->registerChild( child );
+		result = child;
 	}
 	m_idx->m_hasChanged = true;
+	return result;
 }
 
 const IndexedIO::EntryID &StreamIndexedIO::Node::name() const
@@ -1557,67 +2249,196 @@ void StreamIndexedIO::Node::removeChild( const IndexedIO::EntryID &childName, bo
 //
 ///////////////////////////////////////////////
 
-StreamIndexedIO::Index::Index( StreamIndexedIO::StreamFilePtr stream, const CompoundData *options )
-	: m_root( nullptr ),
-	m_version( g_currentVersion ),
-	m_hasChanged( false ),
-	m_offset( 0 ),
-	m_next( 0 ),
-	m_stream( stream ), m_compressionLevel( 0 ),
-	m_compressionThreadCount(1),
-	m_decompressionThreadCount(1), m_compressor( "lz4" )
+StreamIndexedIO::Index::Index( StreamIndexedIO::StreamFilePtr stream, const CompoundData *options )
+	: m_root( nullptr ),
+	m_version( g_currentVersion ),
+	m_hasChanged( false ),
+	m_offset( 0 ),
+	m_next( 0 ),
+	m_stream( stream ), m_compressionLevel( 0 ),
+	m_compressionThreadCount(1),
+	m_decompressionThreadCount(1), m_compressor( "lz4" ),
+	m_deduplicateOnAppend( false ),
+	m_compressionQueueLength( 0 ),
+	m_subIndexMemoryLimit( 0 ),
+	m_loadedSubIndexMemory( 0 ),
+	m_loadedSubIndexClock( 0 ),
+	m_indexMemory( 0 )
+
+{
+	m_stringCache.add(IndexedIO::rootName);
+
+	if ( const char *subIndexMemoryLimitEnvVar = getenv( "IECORE_STREAMINDEXEDIO_SUBINDEX_MEMORY_LIMIT" ) )
+	{
+		m_subIndexMemoryLimit = strtoull( subIndexMemoryLimitEnvVar, nullptr, 10 );
+	}
+
+	const char *compressionLevelEnvVar = getenv( "IECORE_STREAMINDEXEDIO_COMPRESSION" );
+	if ( compressionLevelEnvVar )
+	{
+		char buffer[1024];
+		if ( sscanf( compressionLevelEnvVar, "%s %i %i %i", &buffer[0], &m_compressionLevel, &m_compressionThreadCount, &m_decompressionThreadCount ) == 4 )
+		{
+			m_compressor = std::string( buffer );
+		}
+	}
+
+	if ( options )
+	{
+		if ( const StringData* compressor = options->member<StringData>("compressor", false) )
+		{
+			m_compressor = compressor->readable();
+		}
+
+		if ( const IntData* compressionLevel = options->member<IntData>("compressionLevel", false) )
+		{
+			m_compressionLevel = compressionLevel->readable();
+		}
+
+		if ( const IntData* compressionThreadCount = options->member<IntData>("compressionThreadCount", false) )
+		{
+			m_compressionThreadCount = compressionThreadCount->readable();
+		}
+
+		if ( const IntData* decompressionThreadCount = options->member<IntData>("decompressionThreadCount", false) )
+		{
+			m_decompressionThreadCount = decompressionThreadCount->readable();
+		}
+
+		if ( const UIntData* maxCompressedBlockSize = options->member<UIntData>("maxCompressedBlockSize", false) )
+		{
+			m_maxCompressedBlockSize = maxCompressedBlockSize->readable();
+		}
+
+		if ( const UInt64Data* subIndexMemoryLimit = options->member<UInt64Data>("subIndexMemoryLimit", false) )
+		{
+			m_subIndexMemoryLimit = subIndexMemoryLimit->readable();
+		}
+
+		if ( const BoolData* deduplicateOnAppend = options->member<BoolData>("deduplicateOnAppend", false) )
+		{
+			m_deduplicateOnAppend = deduplicateOnAppend->readable();
+		}
+
+		if ( const IntData* compressionQueueLength = options->member<IntData>("compressionQueueLength", false) )
+		{
+			m_compressionQueueLength = std::max( 0, compressionQueueLength->readable() );
+		}
+
+		if ( const CompoundData* compressionPolicy = options->member<CompoundData>("compressionPolicy", false) )
+		{
+			readCompressionPolicy( compressionPolicy );
+		}
+	}
+
+	// subindexes are only evicted from read-only files, as the other modes may still modify them.
+	if ( m_stream->openMode() & ( IndexedIO::Write | IndexedIO::Append ) )
+	{
+		m_subIndexMemoryLimit = 0;
+	}
+
+	// validate our parameters
+	m_compressionLevel = std::min( std::max( 0, m_compressionLevel ), 9 ); // todo replace with std::clamp in C++17
+	m_compressionThreadCount = std::min( std::max( 1, m_compressionThreadCount ), 32 );
+	m_decompressionThreadCount = std::min( std::max( 1, m_decompressionThreadCount ), 32 );
+
+	if ( getCompressionCode( m_compressor ) == -1)
+	{
+		m_compressor = "lz4";
+	}
+
+}
 
+void StreamIndexedIO::Index::readCompressionPolicy( const CompoundData *policy )
 {
-	m_stringCache.add(IndexedIO::rootName);
-
-	const char *compressionLevelEnvVar = getenv( "IECORE_STREAMINDEXEDIO_COMPRESSION" );
-	if ( compressionLevelEnvVar )
+	for ( const auto &member : policy->readable() )
 	{
-		char buffer[1024];
-		if ( sscanf( compressionLevelEnvVar, "%s %i %i %i", &buffer[0], &m_compressionLevel, &m_compressionThreadCount, &m_decompressionThreadCount ) == 4 )
+		const CompoundData *entrySettings = runTimeCast<const CompoundData>( member.second.get() );
+		if ( !entrySettings )
 		{
-			m_compressor = std::string( buffer );
+			continue;
 		}
-	}
 
-	if ( options )
-	{
-		if ( const StringData* compressor = options->member<StringData>("compressor", false) )
+		// invalid settings revert to the file wide ones, in the same way as the other options
+		CompressionSettings settings = { "", -1, -1, g_minCompressedBlockSize, 0 };
+		if ( const StringData *compressor = entrySettings->member<StringData>( "compressor" ) )
 		{
-			m_compressor = compressor->readable();
+			// blosc may have been built without some of the compressors
+			if ( getCompressionCode( compressor->readable() ) != -1 && blosc_compname_to_compcode( compressor->readable().c_str() ) >= 0 )
+			{
+				settings.compressor = compressor->readable();
+			}
 		}
 
-		if ( const IntData* compressionLevel = options->member<IntData>("compressionLevel", false) )
+		if ( const IntData *compressionLevel = entrySettings->member<IntData>( "compressionLevel" ) )
 		{
-			m_compressionLevel = compressionLevel->readable();
+			settings.compressionLevel = std::min( std::max( 0, compressionLevel->readable() ), 9 );
 		}
 
-		if ( const IntData* compressionThreadCount = options->member<IntData>("compressionThreadCount", false) )
+		if ( const StringData *shuffle = entrySettings->member<StringData>( "shuffle" ) )
 		{
-			m_compressionThreadCount = compressionThreadCount->readable();
+			const auto it = nameShuffleMapping.find( shuffle->readable() );
+			if ( it != nameShuffleMapping.end() )
+			{
+				settings.shuffle = it->second;
+			}
 		}
 
-		if ( const IntData* decompressionThreadCount = options->member<IntData>("decompressionThreadCount", false) )
+		if ( const IntData *minSize = entrySettings->member<IntData>( "minSize" ) )
 		{
-			m_decompressionThreadCount = decompressionThreadCount->readable();
+			settings.minSize = std::max( (int)g_minCompressedBlockSize, minSize->readable() );
 		}
 
-		if ( const UIntData* maxCompressedBlockSize = options->member<UIntData>("maxCompressedBlockSize", false) )
+		// members named after a data type apply to all the entries of that type
+		const auto it = nameDataTypeMapping.find( member.first.string() );
+		if ( it != nameDataTypeMapping.end() )
 		{
-			m_maxCompressedBlockSize = maxCompressedBlockSize->readable();
+			m_dataTypeCompression[ it->second ] = settings;
+		}
+		else
+		{
+			m_entryCompression[ member.first ] = settings;
 		}
 	}
+}
 
-	// validate our parameters
-	m_compressionLevel = std::min( std::max( 0, m_compressionLevel ), 9 ); // todo replace with std::clamp in C++17
-	m_compressionThreadCount = std::min( std::max( 1, m_compressionThreadCount ), 32 );
-	m_decompressionThreadCount = std::min( std::max( 1, m_decompressionThreadCount ), 32 );
+StreamIndexedIO::Index::CompressionSettings StreamIndexedIO::Index::compressionSettings( const IndexedIO::EntryID &name, IndexedIO::DataType dataType ) const
+{
+	CompressionSettings result = { m_compressor, m_compressionLevel, BLOSC_SHUFFLE, g_minCompressedBlockSize, dataTypeElementSize( dataType ) };
 
-	if ( getCompressionCode( m_compressor ) == -1)
+	const CompressionSettings *settings = nullptr;
+	EntryCompressionMap::const_iterator eIt = m_entryCompression.find( name );
+	if ( eIt != m_entryCompression.end() )
 	{
-		m_compressor = "lz4";
+		settings = &eIt->second;
+	}
+	else
+	{
+		DataTypeCompressionMap::const_iterator tIt = m_dataTypeCompression.find( dataType );
+		if ( tIt != m_dataTypeCompression.end() )
+		{
+			settings = &tIt->second;
+		}
+	}
+
+	if ( settings )
+	{
+		if ( !settings->compressor.empty() )
+		{
+			result.compressor = settings->compressor;
+		}
+		if ( settings->compressionLevel >= 0 )
+		{
+			result.compressionLevel = settings->compressionLevel;
+		}
+		if ( settings->shuffle >= 0 )
+		{
+			result.shuffle = settings->shuffle;
+		}
+		result.minSize = settings->minSize;
 	}
 
+	return result;
 }
 
 StreamIndexedIO::Index::~Index()
@@ -1646,9 +2467,11 @@ void StreamIndexedIO::Index::flush()
 {
 	if ( m_hasChanged )
 	{
+		writePendingData();
 		Imf::Int64 end = write();
 		assert( m_stream.get() );
 		assert( m_hasChanged == false );
+		m_stream->flushWrites();
 		m_stream->flush( end );
 	}
 }
@@ -1721,6 +2544,7 @@ void StreamIndexedIO::Index::openStream()
 				assert( indexInStream.is_complete() );
 
 				read( indexInStream );
+				m_indexMemory = decompressedIndex.size();
 			}
 			else
 			{
@@ -1732,12 +2556,18 @@ void StreamIndexedIO::Index::openStream()
 				assert( indexInStream.is_complete() );
 
 				read( indexInStream );
+				m_indexMemory = end - m_offset;
 			}
 		}
 		else
 		{
 			read( f );
 		}
+
+		if ( m_deduplicateOnAppend && ( m_stream->openMode() & IndexedIO::Append ) )
+		{
+			rebuildDeduplicationMap( m_root );
+		}
 	}
 	else
 	{
@@ -2502,11 +3332,6 @@ void StreamIndexedIO::Index::addFreePage(  Imf::Int64 offset, Imf::Int64 sz )
 
 Imf::Int64 StreamIndexedIO::Index::writeUniqueData( const char *data, size_t size, bool prefixSize )
 {
-	m_hasChanged = true;
-
-	/// Find next writable location
-	Imf::Int64 loc;
-
 	// compute hash for the data
 	MurmurHash hash;
 	hash.append( data, size );
@@ -2515,25 +3340,45 @@ Imf::Int64 StreamIndexedIO::Index::writeUniqueData( const char *data, size_t siz
 	{
 		throw IOException( "StreamIndexedIO: Data size too long!" );
 	}
-	uint32_t clampedSize = size;
 	size_t totalSize = size;
 
 	if ( prefixSize )
 	{
-		totalSize += sizeof( clampedSize );
+		totalSize += sizeof( uint32_t );
 	}
 
 	// see if it's already stored by another node..
-	std::pair< HashToDataMap::iterator,bool > ret = m_hashToDataMap.insert( HashToDataMap::value_type( std::pair< MurmurHash,Imf::Int64>(hash,totalSize), 0 ) );
-	if ( !ret.second )
+	HashToDataMap::iterator it = m_hashToDataMap.find( HashToDataMap::key_type( hash, totalSize ) );
+	if ( it != m_hashToDataMap.end() )
 	{
 		// we already saved this data, so we dont save any additional data
-		return ret.first->second;
+		m_hasChanged = true;
+		return it->second;
+	}
+
+	Imf::Int64 loc = writeData( data, size, prefixSize );
+	m_hashToDataMap.insert( HashToDataMap::value_type( HashToDataMap::key_type( hash, totalSize ), loc ) );
+	return loc;
+}
+
+Imf::Int64 StreamIndexedIO::Index::writeData( const char *data, size_t size, bool prefixSize )
+{
+	m_hasChanged = true;
+
+	if ( size >= UINT32_MAX )
+	{
+		throw IOException( "StreamIndexedIO: Data size too long!" );
+	}
+	uint32_t clampedSize = size;
+	size_t totalSize = size;
+
+	if ( prefixSize )
+	{
+		totalSize += sizeof( clampedSize );
 	}
 
-	/// New data, find next writable location.
-	loc = allocate( totalSize );
-	ret.first->second = loc;
+	/// Find next writable location.
+	Imf::Int64 loc = allocate( totalSize );
 
 	/// Seek 'write' pointer to writable location
 	m_stream->seekp( loc, std::ios::beg );
@@ -2549,37 +3394,268 @@ Imf::Int64 StreamIndexedIO::Index::writeUniqueData( const char *data, size_t siz
 	return loc;
 }
 
-StreamIndexedIO::Index::WriteInfo StreamIndexedIO::Index::writeUniqueDataCompressed( const char *data, size_t size, bool prefixSize )
+StreamIndexedIO::Index::WriteInfo StreamIndexedIO::Index::writeUniqueDataCompressed( const char *data, size_t size, const CompressionSettings &settings, bool prefixSize, const MurmurHash *dataHash )
 {
-	WriteInfo writeInfo;
+	// a hash provided by the caller lets us skip both hashing and compressing duplicates
+	if ( dataHash )
+	{
+		HashToWriteInfoMap::const_iterator it = m_dataHashToWriteInfo.find( DeduplicationKey( *dataHash, size, prefixSize ) );
+		if ( it != m_dataHashToWriteInfo.end() )
+		{
+			m_hasChanged = true;
+			return it->second;
+		}
+	}
+
+	// hashing the uncompressed data is much cheaper than compressing it, so we look for duplicates first
+	MurmurHash hash;
+	hash.append( data, size );
+
+	HashToWriteInfoMap::const_iterator it = m_uncompressedHashToWriteInfo.find( DeduplicationKey( hash, size, prefixSize ) );
+	if ( it != m_uncompressedHashToWriteInfo.end() )
+	{
+		m_hasChanged = true;
+		if ( dataHash )
+		{
+			m_dataHashToWriteInfo[ DeduplicationKey( *dataHash, size, prefixSize ) ] = it->second;
+		}
+		return it->second;
+	}
 
 	std::vector<char> compressedBuffer;
 	size_t numBlocks = 0;
 
-	if ( m_compressionLevel )
+	if ( settings.compressionLevel )
+	{
+		numBlocks = compress(
+			data, size, compressedBuffer, settings.compressionLevel, settings.compressor, m_compressionThreadCount,
+			m_maxCompressedBlockSize, settings.minSize, settings.shuffle, settings.typeSize
+		);
+	}
+
+	WriteInfo writeInfo = writeCompressedData( data, size, compressedBuffer, numBlocks, prefixSize );
+
+	m_uncompressedHashToWriteInfo[ DeduplicationKey( hash, size, prefixSize ) ] = writeInfo;
+	if ( dataHash )
 	{
-		numBlocks = compress( data, size, compressedBuffer, m_compressionLevel, m_compressor, m_compressionThreadCount, m_maxCompressedBlockSize );
+		m_dataHashToWriteInfo[ DeduplicationKey( *dataHash, size, prefixSize ) ] = writeInfo;
 	}
 
+	return writeInfo;
+}
+
+StreamIndexedIO::Index::WriteInfo StreamIndexedIO::Index::writeCompressedData( const char *data, size_t size, const std::vector<char> &compressedBuffer, size_t numBlocks, bool prefixSize )
+{
+	WriteInfo writeInfo;
+
 	//! if compression fails or produces a buffer larger than the original
 	//! write the original source data uncompressed
 	if( numBlocks && !compressedBuffer.empty() && ( compressedBuffer.size() < size ) )
 	{
-		writeInfo.offset = writeUniqueData( compressedBuffer.data(), compressedBuffer.size(), prefixSize );
+		writeInfo.offset = writeData( compressedBuffer.data(), compressedBuffer.size(), prefixSize );
 		writeInfo.size = compressedBuffer.size();
 		writeInfo.numCompressedBlocks = numBlocks;
 	}
 	else
 	{
-		writeInfo.offset = writeUniqueData( data, size, prefixSize );
+		writeInfo.offset = writeData( data, size, prefixSize );
 		writeInfo.size = size;
 		writeInfo.numCompressedBlocks = 0;
 	}
 
-
 	return writeInfo;
 }
 
+void StreamIndexedIO::Index::writeDataChild( Node &node, const IndexedIO::EntryID &name, IndexedIO::DataType dataType, size_t arrayLength, const char *data, size_t size, const MurmurHash *dataHash )
+{
+	const CompressionSettings settings = compressionSettings( name, dataType );
+
+	// small blocks aren't compressed, so there's nothing to gain from queueing them
+	if ( !m_compressionQueueLength || !settings.compressionLevel || size < settings.minSize )
+	{
+		WriteInfo info = writeUniqueDataCompressed( data, size, settings, false, dataHash );
+		node.addDataChild( name, dataType, arrayLength, info.offset, info.size, size, info.numCompressedBlocks );
+		return;
+	}
+
+	// look for duplicates in the same way as writeUniqueDataCompressed(),
+	// including the blocks which are still queued.
+	PendingWrite *pendingWrite = nullptr;
+	const DeduplicationKey dataHashKey( dataHash ? *dataHash : MurmurHash(), size, false );
+	if ( dataHash )
+	{
+		HashToWriteInfoMap::const_iterator it = m_dataHashToWriteInfo.find( dataHashKey );
+		if ( it != m_dataHashToWriteInfo.end() )
+		{
+			node.addDataChild( name, dataType, arrayLength, it->second.offset, it->second.size, size, it->second.numCompressedBlocks );
+			return;
+		}
+
+		HashToPendingWriteMap::const_iterator pit = m_dataHashToPendingWrite.find( dataHashKey );
+		if ( pit != m_dataHashToPendingWrite.end() )
+		{
+			pendingWrite = pit->second;
+		}
+	}
+
+	if ( !pendingWrite )
+	{
+		MurmurHash hash;
+		hash.append( data, size );
+		const DeduplicationKey uncompressedHashKey( hash, size, false );
+
+		HashToWriteInfoMap::const_iterator it = m_uncompressedHashToWriteInfo.find( uncompressedHashKey );
+		if ( it != m_uncompressedHashToWriteInfo.end() )
+		{
+			if ( dataHash )
+			{
+				m_dataHashToWriteInfo[ dataHashKey ] = it->second;
+			}
+			node.addDataChild( name, dataType, arrayLength, it->second.offset, it->second.size, size, it->second.numCompressedBlocks );
+			return;
+		}
+
+		HashToPendingWriteMap::const_iterator pit = m_uncompressedHashToPendingWrite.find( uncompressedHashKey );
+		if ( pit != m_uncompressedHashToPendingWrite.end() )
+		{
+			pendingWrite = pit->second;
+		}
+		else
+		{
+			// queue a new block, copying the data as the caller's buffer may be reused
+			m_pendingWrites.push_back( std::unique_ptr<PendingWrite>( new PendingWrite( data, size ) ) );
+			pendingWrite = m_pendingWrites.back().get();
+			pendingWrite->uncompressedHashKey = uncompressedHashKey;
+			m_uncompressedHashToPendingWrite[ uncompressedHashKey ] = pendingWrite;
+
+			const int compressionThreadCount = m_compressionThreadCount;
+			const boost::optional<size_t> maxCompressedBlockSize = m_maxCompressedBlockSize;
+			pendingWrite->compression.run(
+				[pendingWrite, settings, compressionThreadCount, maxCompressedBlockSize] {
+					pendingWrite->numBlocks = compress(
+						pendingWrite->data.data(), pendingWrite->data.size(), pendingWrite->compressedBuffer,
+						settings.compressionLevel, settings.compressor, compressionThreadCount,
+						maxCompressedBlockSize, settings.minSize, settings.shuffle, settings.typeSize
+					);
+				}
+			);
+		}
+
+		if ( dataHash )
+		{
+			pendingWrite->dataHashKeys.push_back( dataHashKey );
+			m_dataHashToPendingWrite[ dataHashKey ] = pendingWrite;
+		}
+	}
+
+	NodeBase *child = node.addDataChild( name, dataType, arrayLength, 0, 0, size, 0, /* pending = */ true );
+	pendingWrite->nodes.push_back( static_cast<DataNode *>( child ) );
+
+	writePendingData( m_compressionQueueLength );
+}
+
+bool StreamIndexedIO::Index::hasPendingWrites() const
+{
+	return !m_pendingWrites.empty();
+}
+
+void StreamIndexedIO::Index::writePendingData( size_t maxPendingWrites )
+{
+	while ( m_pendingWrites.size() > maxPendingWrites )
+	{
+		// Validate the block before removing it from the queue. If we throw, the
+		// block and its nodes stay queued, so every subsequent flush throws too,
+		// rather than writing an index in which the nodes have no location.
+		m_pendingWrites.front()->compression.wait();
+		if( m_pendingWrites.front()->numBlocks > std::numeric_limits<unsigned short>::max() )
+		{
+			throw IECore::Exception(
+				boost::str(
+					boost::format( "StreamIndexedIO::Index::writePendingData - Unable to store file with more than %1% compressed blocks " ) %
+						std::numeric_limits<unsigned short>::max()
+				)
+			);
+		}
+
+		std::unique_ptr<PendingWrite> pendingWrite = std::move( m_pendingWrites.front() );
+		m_pendingWrites.pop_front();
+
+		m_uncompressedHashToPendingWrite.erase( pendingWrite->uncompressedHashKey );
+		for ( const auto &key : pendingWrite->dataHashKeys )
+		{
+			m_dataHashToPendingWrite.erase( key );
+		}
+
+		const WriteInfo writeInfo = writeCompressedData(
+			pendingWrite->data.data(), pendingWrite->data.size(), pendingWrite->compressedBuffer, pendingWrite->numBlocks, false
+		);
+
+		m_uncompressedHashToWriteInfo[ pendingWrite->uncompressedHashKey ] = writeInfo;
+		for ( const auto &key : pendingWrite->dataHashKeys )
+		{
+			m_dataHashToWriteInfo[ key ] = writeInfo;
+		}
+
+		for ( auto node : pendingWrite->nodes )
+		{
+			node->setLocation( writeInfo.offset, writeInfo.size, writeInfo.numCompressedBlocks );
+		}
+	}
+}
+
+void StreamIndexedIO::Index::rebuildDeduplicationMap( DirectoryNode *n )
+{
+	for ( DirectoryNode::ChildMap::const_iterator it = n->children().begin(); it != n->children().end(); ++it )
+	{
+		Node::Info info;
+		switch( (*it)->nodeType() )
+		{
+			case NodeBase::Data :
+			{
+				DataNode *dataNode = static_cast< DataNode * >( *it );
+				info.offset = dataNode->offset();
+				info.size = dataNode->size();
+				info.decompressedSize = dataNode->decompressedSize();
+				info.numCompressedBlocks = dataNode->compressedBlocks();
+				break;
+			}
+			case NodeBase::SmallData :
+			{
+				SmallDataNode *dataNode = static_cast< SmallDataNode * >( *it );
+				info.offset = dataNode->offset();
+				info.size = dataNode->size();
+				info.decompressedSize = dataNode->decompressedSize();
+				info.numCompressedBlocks = dataNode->compressedBlocks();
+				break;
+			}
+			case NodeBase::Directory :
+				rebuildDeduplicationMap( static_cast< DirectoryNode * >( *it ) );
+				continue;
+			default :
+				// the contents of subindexes are not loaded in Append mode
+				continue;
+		}
+
+		MurmurHash hash;
+		if ( info.decompressedSize )
+		{
+			Reader reader( *m_stream, info, m_decompressionThreadCount, nullptr );
+			hash.append( reader.data(), info.decompressedSize );
+		}
+		else
+		{
+			// matches the hash of empty data in writeUniqueDataCompressed()
+			hash.append( static_cast<const char *>( nullptr ), 0 );
+		}
+
+		WriteInfo writeInfo;
+		writeInfo.offset = info.offset;
+		writeInfo.size = info.size;
+		writeInfo.numCompressedBlocks = info.numCompressedBlocks;
+		m_uncompressedHashToWriteInfo.insert( HashToWriteInfoMap::value_type( DeduplicationKey( hash, info.decompressedSize, false ), writeInfo ) );
+	}
+}
+
 void StreamIndexedIO::Index::deallocateWalk( NodeBase* n )
 {
 	assert(n);
@@ -2613,6 +3689,9 @@ void StreamIndexedIO::Index::commitNodeToSubIndex( DirectoryNode *n )
 		return;
 	}
 
+	// the subindex stores the location of the data, so it must be written first
+	writePendingData();
+
 	if ( n->subindex() == DirectoryNode::NoSubIndex )
 	{
 		MemoryStreamSink sink;
@@ -2633,77 +3712,234 @@ void StreamIndexedIO::Index::commitNodeToSubIndex( DirectoryNode *n )
 		std::vector<char> compressedIndex;
 		compress( indexData, indexDataSize, compressedIndex, indexCompressionLevel, indexCompressor, 1, BLOSC_MAX_BUFFERSIZE, 0);
 
-		uint32_t subindexSize = compressedIndex.size();
+		uint32_t subindexSize = compressedIndex.size();
+
+		// tell the Directory node that it's contents have been written as a subindex
+		Imf::Int64 offset = writeUniqueData( &compressedIndex[0], subindexSize, true );
+		n->setSubIndexOffset( offset );
+	}
+}
+
+void StreamIndexedIO::Index::readNodeFromSubIndex( DirectoryNode *n )
+{
+	/// guarantees thread safe access to the m_subindex variable
+	StreamFile::MutexLock lock( m_stream->mutex() );
+
+	if ( n->subindex() == DirectoryNode::LoadedSubIndex )
+	{
+		return;
+	}
+
+	m_indexMemory += loadSubIndex( n );
+}
+
+size_t StreamIndexedIO::Index::loadSubIndex( DirectoryNode *n )
+{
+	uint32_t subindexSize = 0;
+	m_stream->read( (char *)&subindexSize, sizeof( subindexSize ), n->offset() );
+	if ( bigEndian() )
+	{
+		subindexSize = reverseBytes<>( subindexSize );
+	}
+
+	std::vector<char> data( subindexSize );
+	m_stream->read( data.data(), subindexSize, n->offset() + sizeof( subindexSize ) );
+
+	io::filtering_istream indexInStream;
+	size_t memory = subindexSize;
+
+	std::vector<char> decompressedIndex;
+	if (m_version >= 7)
+	{
+		decompress( data.data(), subindexSize, decompressedIndex, 1 );
+		memory = decompressedIndex.size();
+
+		MemoryStreamSource source( &decompressedIndex[0], decompressedIndex.size(), false );
+		indexInStream.push( source );
+	}
+	else
+	{
+		MemoryStreamSource source( data.data(), subindexSize, false );
+
+		indexInStream.push( io::gzip_decompressor() );
+		indexInStream.push( source );
+	}
+	assert( indexInStream.is_complete() );
+
+	uint32_t nodeCount = 0;
+
+	readLittleEndian( indexInStream, nodeCount );
+
+	for( uint32_t i = 0; i < nodeCount; i++ )
+	{
+		NodeBase *child = m_version >= 6 ? readNode( indexInStream ) : readNodeV5( indexInStream );
+		n->registerChild( child );
+	}
+
+	/// make sure the children is sorted to avoid non-thread safe sorting happening later...
+	n->sortChildren();
+
+	/// mark the node as loaded from subindex
+	n->recoveredSubIndex();
 
-		// tell the Directory node that it's contents have been written as a subindex
-		Imf::Int64 offset = writeUniqueData( &compressedIndex[0], subindexSize, true );
-		n->setSubIndexOffset( offset );
-	}
+	return memory;
 }
 
-void StreamIndexedIO::Index::readNodeFromSubIndex( DirectoryNode *n )
+void StreamIndexedIO::Index::pinDirectory( DirectoryNode *n )
 {
-	/// guarantees thread safe access to the file and also to the m_subindex variable
-	StreamFile::MutexLock lock( m_stream->mutex() );
-
-	if ( n->subindex() == DirectoryNode::LoadedSubIndex )
+	if ( !m_subIndexMemoryLimit )
 	{
 		return;
 	}
 
-	m_stream->seekg( n->offset(), std::ios::beg );
+	tbb::spin_mutex::scoped_lock lock( m_loadedSubIndexMutex );
+	const size_t time = ++m_loadedSubIndexClock;
+	for ( ; n; n = n->parent() )
+	{
+		if ( n->subindex() != DirectoryNode::LoadedSubIndex )
+		{
+			continue;
+		}
+		LoadedSubIndexMap::iterator it = m_loadedSubIndexes.find( n );
+		if ( it != m_loadedSubIndexes.end() )
+		{
+			it->second.pins++;
+			it->second.lastUsed = time;
+		}
+	}
+}
 
-	uint32_t subindexSize = 0;
-	readLittleEndian( *m_stream, subindexSize );
+void StreamIndexedIO::Index::unpinDirectory( DirectoryNode *n )
+{
+	if ( !m_subIndexMemoryLimit )
+	{
+		return;
+	}
 
-	char *data = m_stream->ioBuffer(subindexSize);
-	m_stream->read( data, subindexSize );
+	tbb::spin_mutex::scoped_lock lock( m_loadedSubIndexMutex );
+	for ( ; n; n = n->parent() )
+	{
+		if ( n->subindex() != DirectoryNode::LoadedSubIndex )
+		{
+			continue;
+		}
+		LoadedSubIndexMap::iterator it = m_loadedSubIndexes.find( n );
+		if ( it != m_loadedSubIndexes.end() )
+		{
+			assert( it->second.pins );
+			it->second.pins--;
+		}
+	}
+}
 
-	io::filtering_istream indexInStream;
+void StreamIndexedIO::Index::registerLoadedSubIndex( DirectoryNode *n, size_t memory )
+{
+	m_indexMemory += memory;
 
-	if (m_version >= 7)
+	if ( !m_subIndexMemoryLimit )
 	{
-		std::vector<char> decompressedIndex;
-		decompress( data, subindexSize, decompressedIndex, 1 );
-
-		MemoryStreamSource source( &decompressedIndex[0], decompressedIndex.size(), false );
-		indexInStream.push( source );
-		assert( indexInStream.is_complete() );
+		return;
+	}
 
-		uint32_t nodeCount = 0;
+	tbb::spin_mutex::scoped_lock lock( m_loadedSubIndexMutex );
+	LoadedSubIndex &loaded = m_loadedSubIndexes[n];
+	loaded.memory = memory;
+	loaded.pins = 0;
+	loaded.lastUsed = ++m_loadedSubIndexClock;
+	m_loadedSubIndexMemory += memory;
+}
 
-		readLittleEndian( indexInStream, nodeCount );
+void StreamIndexedIO::Index::forgetLoadedSubIndexes( DirectoryNode *n )
+{
+	if ( n->subindex() == DirectoryNode::LoadedSubIndex )
+	{
+		LoadedSubIndexMap::iterator it = m_loadedSubIndexes.find( n );
+		if ( it != m_loadedSubIndexes.end() )
+		{
+			assert( it->second.pins == 0 );
+			m_loadedSubIndexMemory -= it->second.memory;
+			m_indexMemory -= it->second.memory;
+			m_loadedSubIndexes.erase( it );
+		}
+	}
 
-		for( uint32_t i = 0; i < nodeCount; i++ )
+	for ( DirectoryNode::ChildMap::const_iterator it = n->children().begin(); it != n->children().end(); ++it )
+	{
+		if ( (*it)->nodeType() == NodeBase::Directory )
 		{
-			NodeBase *child = m_version >= 6 ? readNode( indexInStream ) : readNodeV5( indexInStream );
-			n->registerChild( child );
+			forgetLoadedSubIndexes( static_cast< DirectoryNode * >( *it ) );
 		}
 	}
-	else
+}
+
+void StreamIndexedIO::Index::evictSubIndexes()
+{
+	if ( !m_subIndexMemoryLimit )
 	{
-		MemoryStreamSource source( data, subindexSize, false );
+		return;
+	}
 
-		indexInStream.push( io::gzip_decompressor() );
-		indexInStream.push( source );
-		assert( indexInStream.is_complete() );
+	std::lock_guard<std::mutex> evictionLock( m_evictionMutex );
 
-		uint32_t nodeCount = 0;
+	// gather the unpinned subindexes, least recently used first.
+	std::vector< std::pair< size_t, DirectoryNode * > > candidates;
+	{
+		tbb::spin_mutex::scoped_lock lock( m_loadedSubIndexMutex );
+		if ( m_loadedSubIndexMemory <= m_subIndexMemoryLimit )
+		{
+			return;
+		}
+		for ( LoadedSubIndexMap::const_iterator it = m_loadedSubIndexes.begin(); it != m_loadedSubIndexes.end(); ++it )
+		{
+			if ( !it->second.pins )
+			{
+				candidates.push_back( std::make_pair( it->second.lastUsed, it->first ) );
+			}
+		}
+	}
+	std::sort( candidates.begin(), candidates.end() );
 
-		readLittleEndian( indexInStream, nodeCount );
+	// Directories are only destroyed here, and we hold m_evictionMutex, so a candidate
+	// is alive for as long as it is registered in m_loadedSubIndexes.
+	for ( std::vector< std::pair< size_t, DirectoryNode * > >::const_iterator cit = candidates.begin(); cit != candidates.end(); ++cit )
+	{
+		DirectoryNode *dir = cit->second;
+		DirectoryNode *parent = nullptr;
+		{
+			tbb::spin_mutex::scoped_lock lock( m_loadedSubIndexMutex );
+			if ( m_loadedSubIndexMemory <= m_subIndexMemoryLimit )
+			{
+				return;
+			}
+			LoadedSubIndexMap::const_iterator it = m_loadedSubIndexes.find( dir );
+			if ( it == m_loadedSubIndexes.end() || it->second.pins )
+			{
+				continue;
+			}
+			parent = dir->parent();
+		}
 
-		for( uint32_t i = 0; i < nodeCount; i++ )
+		// Once we hold the parent lock, the directory can only be pinned by a Node that
+		// already pins it, so the check below can't be invalidated before we swap it out.
+		MutexLock parentLock;
+		lockDirectory( parentLock, parent, true );
 		{
-			NodeBase *child = m_version >= 6 ? readNode( indexInStream ) : readNodeV5( indexInStream );
-			n->registerChild( child );
+			tbb::spin_mutex::scoped_lock lock( m_loadedSubIndexMutex );
+			LoadedSubIndexMap::const_iterator it = m_loadedSubIndexes.find( dir );
+			if ( it == m_loadedSubIndexes.end() || it->second.pins )
+			{
+				continue;
+			}
+			forgetLoadedSubIndexes( dir );
 		}
-	}
 
-	/// make sure the children is sorted to avoid non-thread safe sorting happening later...
-	n->sortChildren();
+		DirectoryNode::ChildMap::iterator it = parent->findChild( dir->name() );
+		assert( it != parent->children().end() && *it == dir );
+		(*it) = new SubIndexNode( dir->name(), dir->offset() );
+		parentLock.release();
 
-	/// mark the node as loaded from subindex
-	n->recoveredSubIndex();
+		NodeBase::destroy( dir );
+	}
 }
 
 void StreamIndexedIO::Index::lockDirectory( MutexLock &lock, const DirectoryNode *n, bool writeAccess ) const
@@ -2730,7 +3966,7 @@ void StreamIndexedIO::Index::lockDirectory( MutexLock &lock, const DirectoryNode
 //
 ///////////////////////////////////////////////
 
-StreamIndexedIO::StreamFile::StreamFile( IndexedIO::OpenMode mode ) : m_openmode( mode ), m_stream( nullptr ), m_ioBufferLen( 0 ), m_ioBuffer( nullptr )
+StreamIndexedIO::StreamFile::StreamFile( IndexedIO::OpenMode mode ) : m_openmode( mode ), m_stream( nullptr ), m_ioBufferLen( 0 ), m_ioBuffer( nullptr ), m_writeBufferPosition( 0 )
 {
 	IndexedIO::validateOpenMode(m_openmode);
 }
@@ -2752,6 +3988,11 @@ IndexedIO::OpenMode StreamIndexedIO::StreamFile::openMode() const
 	return m_openmode;
 }
 
+const MurmurHash &StreamIndexedIO::StreamFile::identity() const
+{
+	return m_identity;
+}
+
 void StreamIndexedIO::StreamFile::setInput( std::iostream *stream, bool emptyFile, const std::string& fileName )
 {
 	m_stream = stream;
@@ -2762,8 +4003,33 @@ void StreamIndexedIO::StreamFile::setInput( std::iostream *stream, bool emptyFil
 
 	if ( fileName != "" && getenv("IECORE_OFFSETREAD_DISABLED") == nullptr )
 	{
-		m_platformReader = PlatformReader::create( fileName );
+		/// Memory mapping is only safe when the file isn't going to be modified
+		/// by us, so we restrict it to files opened in Read mode.
+		const bool memoryMapped = ( m_openmode & IndexedIO::Read ) && getenv( "IECORE_MMAPREAD_ENABLED" ) != nullptr;
+		m_platformReader = PlatformReader::create( fileName, memoryMapped );
+	}
+
+#ifndef _MSC_VER
+	/// Only files that we don't modify can share cached data with other readers.
+	struct stat fileStat;
+	if ( fileName != "" && ( m_openmode & IndexedIO::Read ) && stat( fileName.c_str(), &fileStat ) == 0 )
+	{
+		m_identity.append( (uint64_t)fileStat.st_dev );
+		m_identity.append( (uint64_t)fileStat.st_ino );
+		m_identity.append( (uint64_t)fileStat.st_size );
+#ifdef __APPLE__
+		m_identity.append( (int64_t)fileStat.st_mtimespec.tv_sec );
+		m_identity.append( (int64_t)fileStat.st_mtimespec.tv_nsec );
+		m_identity.append( (int64_t)fileStat.st_ctimespec.tv_sec );
+		m_identity.append( (int64_t)fileStat.st_ctimespec.tv_nsec );
+#else
+		m_identity.append( (int64_t)fileStat.st_mtim.tv_sec );
+		m_identity.append( (int64_t)fileStat.st_mtim.tv_nsec );
+		m_identity.append( (int64_t)fileStat.st_ctim.tv_sec );
+		m_identity.append( (int64_t)fileStat.st_ctim.tv_nsec );
+#endif
 	}
+#endif
 }
 
 char *StreamIndexedIO::StreamFile::ioBuffer( unsigned long size )
@@ -2790,6 +4056,7 @@ StreamIndexedIO::StreamFile::Mutex & StreamIndexedIO::StreamFile::mutex()
 void StreamIndexedIO::StreamFile::flush( size_t endPosition )
 {
 	assert( m_stream );
+	flushWrites();
 	m_stream->flush();
 }
 
@@ -2815,6 +4082,12 @@ bool StreamIndexedIO::StreamFile::canRead( std::iostream &f )
 
 void StreamIndexedIO::StreamFile::read( char *buffer, size_t size, size_t pos )
 {
+	if ( m_openmode & ( IndexedIO::Write | IndexedIO::Append ) )
+	{
+		MutexLock lock( m_mutex );
+		flushWrites();
+	}
+
 	if ( !m_platformReader || ( !m_platformReader->read( buffer, size, pos ) ) )
 	{
 		MutexLock lock( m_mutex );
@@ -2823,19 +4096,41 @@ void StreamIndexedIO::StreamFile::read( char *buffer, size_t size, size_t pos )
 	}
 }
 
+const char *StreamIndexedIO::StreamFile::map( size_t size, size_t pos ) const
+{
+	return m_platformReader ? m_platformReader->map( size, pos ) : nullptr;
+}
+
 void StreamIndexedIO::StreamFile::seekg( size_t pos, std::ios_base::seekdir dir )
 {
+	flushWrites();
 	m_stream->seekg( pos, dir );
 }
 
 void StreamIndexedIO::StreamFile::seekp( size_t pos, std::ios_base::seekdir dir )
 {
+	if ( dir == std::ios::beg )
+	{
+		/// Consecutive writes are combined, so we only need
+		/// to flush when moving away from the end of the buffer.
+		if ( pos != m_writeBufferPosition + m_writeBuffer.size() )
+		{
+			flushWrites();
+			m_writeBufferPosition = pos;
+		}
+		return;
+	}
+
+	flushWrites();
+
 	/// Seek 'write' pointer to writable location
 	m_stream->seekp( pos, dir );
 
 	/// Clear error flags because problem on GCC 3.3.4:
 	/// When the file is a std::stringstream then the first seekp(0) will fail and inhibit following operations on the file.
 	m_stream->clear();
+
+	m_writeBufferPosition = m_stream->tellp();
 }
 
 Imf::Int64 StreamIndexedIO::StreamFile::tellg()
@@ -2845,17 +4140,52 @@ Imf::Int64 StreamIndexedIO::StreamFile::tellg()
 
 Imf::Int64 StreamIndexedIO::StreamFile::tellp()
 {
-	return m_stream->tellp();
+	return m_writeBufferPosition + m_writeBuffer.size();
 }
 
 void StreamIndexedIO::StreamFile::read( char *buffer, size_t size )
 {
+	flushWrites();
 	m_stream->read( buffer, size );
 }
 
 void StreamIndexedIO::StreamFile::write( const char *buffer, size_t size )
 {
+	if ( m_writeBuffer.size() + size > g_writeBufferSize )
+	{
+		flushWrites();
+		if ( size >= g_writeBufferSize )
+		{
+			/// No point copying large blocks into the buffer.
+			writeBlock( buffer, size, m_writeBufferPosition );
+			m_writeBufferPosition += size;
+			return;
+		}
+	}
+
+	m_writeBuffer.insert( m_writeBuffer.end(), buffer, buffer + size );
+}
+
+void StreamIndexedIO::StreamFile::flushWrites()
+{
+	if ( m_writeBuffer.empty() )
+	{
+		return;
+	}
+
+	writeBlock( m_writeBuffer.data(), m_writeBuffer.size(), m_writeBufferPosition );
+	m_writeBufferPosition += m_writeBuffer.size();
+	m_writeBuffer.clear();
+}
+
+void StreamIndexedIO::StreamFile::writeBlock( const char *buffer, size_t size, size_t pos )
+{
+	m_stream->seekp( pos, std::ios::beg );
+	/// See comment in seekp().
+	m_stream->clear();
 	m_stream->write( buffer, size );
+	/// Make the data visible to the lock free reads.
+	m_stream->flush();
 }
 
 ///////////////////////////////////////////////
@@ -2874,6 +4204,26 @@ StreamIndexedIO::StreamIndexedIO() : m_node(nullptr)
 {
 }
 
+void StreamIndexedIO::setBlockCacheMemoryLimit( size_t memoryLimit )
+{
+	BlockCache::setMemoryLimit( memoryLimit );
+}
+
+size_t StreamIndexedIO::getBlockCacheMemoryLimit()
+{
+	return BlockCache::getMemoryLimit();
+}
+
+CompoundDataPtr StreamIndexedIO::blockCacheStatistics()
+{
+	return BlockCache::statistics();
+}
+
+void StreamIndexedIO::clearBlockCache()
+{
+	BlockCache::clear();
+}
+
 StreamIndexedIO::StreamIndexedIO( StreamIndexedIO::Node &node )
 {
 	m_node = &node;
@@ -2895,7 +4245,6 @@ void StreamIndexedIO::open( StreamFilePtr file, const IndexedIO::EntryIDList &ro
 StreamIndexedIO::~StreamIndexedIO()
 {
 	delete m_node;
-	// \todo Consider a mechanism for deallocating sub-indexes
 }
 
 void StreamIndexedIO::setRoot( const IndexedIO::EntryIDList &root )
@@ -2908,7 +4257,7 @@ void StreamIndexedIO::setRoot( const IndexedIO::EntryIDList &root )
 		{
 			break;
 		}
-		m_node->m_node = childNode;
+		m_node->setDirectory( childNode );
 	}
 	bool found = ( t == root.end() );
 
@@ -2935,7 +4284,7 @@ void StreamIndexedIO::setRoot( const IndexedIO::EntryIDList &root )
 				{
 					throw IOException( "StreamIndexedIO: Cannot create entry '" + (*t).value() + "'" );
 				}
-				m_node->m_node = childNode;
+				m_node->setDirectory( childNode );
 			}
 		}
 	}
@@ -3014,6 +4363,7 @@ IndexedIOPtr StreamIndexedIO::subdirectory( const IndexedIO::EntryID &name, Inde
 		}
 	}
 	StreamIndexedIO::Node *newNode = new StreamIndexedIO::Node( m_node->m_idx.get(), childNode );
+	m_node->m_idx->unpinDirectory( childNode );
 	return duplicate(*newNode);
 }
 
@@ -3035,6 +4385,7 @@ ConstIndexedIOPtr StreamIndexedIO::subdirectory( const IndexedIO::EntryID &name,
 		throw IOException( "StreamIndexedIO: Could not find child '" + name.value() + "'" );
 	}
 	StreamIndexedIO::Node *newNode = new StreamIndexedIO::Node( m_node->m_idx.get(), childNode );
+	m_node->m_idx->unpinDirectory( childNode );
 	return duplicate(*newNode);
 }
 
@@ -3052,6 +4403,7 @@ IndexedIOPtr StreamIndexedIO::createSubdirectory( const IndexedIO::EntryID &name
 		throw IOException( "StreamIndexedIO: Could not insert child '" + name.value() + "'" );
 	}
 	StreamIndexedIO::Node *newNode = new StreamIndexedIO::Node( m_node->m_idx.get(), childNode );
+	m_node->m_idx->unpinDirectory( childNode );
 	return duplicate(*newNode);
 }
 
@@ -3157,7 +4509,7 @@ ConstIndexedIOPtr StreamIndexedIO::parentDirectory() const
 IndexedIOPtr StreamIndexedIO::directory( const IndexedIO::EntryIDList &path, IndexedIO::MissingBehaviour missingBehaviour )
 {
 	// from the root go to the path
-	StreamIndexedIO::Node *newNode = new StreamIndexedIO::Node( m_node->m_idx.get(), m_node->m_idx->root() );
+	std::unique_ptr<StreamIndexedIO::Node> newNode( new StreamIndexedIO::Node( m_node->m_idx.get(), m_node->m_idx->root() ) );
 
 	for ( IndexedIO::EntryIDList::const_iterator pIt = path.begin(); pIt != path.end(); pIt++ )
 	{
@@ -3184,9 +4536,9 @@ IndexedIOPtr StreamIndexedIO::directory( const IndexedIO::EntryIDList &path, Ind
 				throw IOException( "StreamIndexedIO: Could not find child '" + name.value() + "'" );
 			}
 		}
-		newNode->m_node = childNode;
+		newNode->setDirectory( childNode );
 	}
-	return duplicate(*newNode);
+	return duplicate( *newNode.release() );
 }
 
 ConstIndexedIOPtr StreamIndexedIO::directory( const IndexedIO::EntryIDList &path, IndexedIO::MissingBehaviour missingBehaviour ) const
@@ -3199,6 +4551,16 @@ void StreamIndexedIO::commit()
 	m_node->m_idx->commitNodeToSubIndex( m_node->m_node );
 }
 
+size_t StreamIndexedIO::indexMemoryUsage() const
+{
+	return m_node->m_idx->memoryUsage();
+}
+
+const MurmurHash &StreamIndexedIO::fileIdentity() const
+{
+	return streamFile().identity();
+}
+
 void StreamIndexedIO::write(const IndexedIO::EntryID &name, const InternedString *x, unsigned long arrayLength)
 {
 	writable(name);
@@ -3223,8 +4585,7 @@ void StreamIndexedIO::write(const IndexedIO::EntryID &name, const InternedString
 
 	IndexedIO::DataFlattenTraits<Imf::Int64*>::flatten(constIds, arrayLength, data);
 
-	Index::WriteInfo info = index->writeUniqueDataCompressed( data, size );
-	m_node->addDataChild( name, dataType, arrayLength, info.offset, info.size, size, info.numCompressedBlocks );
+	index->writeDataChild( *m_node, name, dataType, arrayLength, data, size );
 
 	delete [] ids;
 }
@@ -3272,7 +4633,7 @@ void StreamIndexedIO::read(const IndexedIO::EntryID &name, InternedString *&x, u
 }
 
 template<typename T>
-void StreamIndexedIO::write(const IndexedIO::EntryID &name, const T *x, unsigned long arrayLength)
+void StreamIndexedIO::write(const IndexedIO::EntryID &name, const T *x, unsigned long arrayLength, const MurmurHash *hash)
 {
 	writable(name);
 	remove(name, false);
@@ -3284,12 +4645,11 @@ void StreamIndexedIO::write(const IndexedIO::EntryID &name, const T *x, unsigned
 	assert(data);
 	IndexedIO::DataFlattenTraits<T*>::flatten(x, arrayLength, data);
 
-	Index::WriteInfo info = m_node->m_idx->writeUniqueDataCompressed( data, size );
-	m_node->addDataChild( name, dataType, arrayLength, info.offset, info.size, size, info.numCompressedBlocks );
+	m_node->m_idx->writeDataChild( *m_node, name, dataType, arrayLength, data, size, hash );
 }
 
 template<typename T>
-void StreamIndexedIO::rawWrite(const IndexedIO::EntryID &name, const T *x, unsigned long arrayLength)
+void StreamIndexedIO::rawWrite(const IndexedIO::EntryID &name, const T *x, unsigned long arrayLength, const MurmurHash *hash)
 {
 	writable(name);
 	remove(name, false);
@@ -3297,8 +4657,7 @@ void StreamIndexedIO::rawWrite(const IndexedIO::EntryID &name, const T *x, unsig
 	unsigned long size = IndexedIO::DataSizeTraits<T*>::size(x, arrayLength);
 	IndexedIO::DataType dataType = IndexedIO::DataTypeTraits<T*>::type();
 
-	Index::WriteInfo info = m_node->m_idx->writeUniqueDataCompressed( (char *) x, size );
-	m_node->addDataChild( name, dataType, arrayLength, info.offset, info.size, size, info.numCompressedBlocks );
+	m_node->m_idx->writeDataChild( *m_node, name, dataType, arrayLength, (char *) x, size, hash );
 }
 
 template<typename T>
@@ -3314,8 +4673,7 @@ void StreamIndexedIO::write(const IndexedIO::EntryID &name, const T &x)
 	assert(data);
 	IndexedIO::DataFlattenTraits<T>::flatten(x, data);
 
-	Index::WriteInfo info = m_node->m_idx->writeUniqueDataCompressed( data, size );
-	m_node->addDataChild( name, dataType, 0, info.offset, info.size, size, info.numCompressedBlocks );
+	m_node->m_idx->writeDataChild( *m_node, name, dataType, 0, data, size );
 }
 
 template<typename T>
@@ -3327,8 +4685,7 @@ void StreamIndexedIO::rawWrite(const IndexedIO::EntryID &name, const T &x)
 	unsigned long size = IndexedIO::DataSizeTraits<T>::size(x);
 	IndexedIO::DataType dataType = IndexedIO::DataTypeTraits<T>::type();
 
-	Index::WriteInfo info = m_node->m_idx->writeUniqueDataCompressed( (char *) &x, size );
-	m_node->addDataChild( name, dataType, 0, info.offset, info.size, size, info.numCompressedBlocks );
+	m_node->m_idx->writeDataChild( *m_node, name, dataType, 0, (char *) &x, size );
 }
 
 template<typename T>
@@ -3545,6 +4902,42 @@ void StreamIndexedIO::write(const IndexedIO::EntryID &name, const unsigned short
 {
 	WRITE<unsigned short>(name, x);
 }
+
+class StreamIndexedIO::DataWriter
+{
+
+	public :
+
+		DataWriter( StreamIndexedIO *io, const IndexedIO::EntryID &name ) : m_io( io ), m_name( name )
+		{
+		}
+
+		template<typename T>
+		void operator()( const T *data, typename std::enable_if<TypeTraits::IsNumericBasedVectorTypedData<T>::value>::type *enabler = nullptr )
+		{
+			// the hash is cached by the data, so this is usually free.
+			MurmurHash hash;
+			data->hash( hash );
+			m_io->WRITE<typename T::BaseType>( m_name, data->baseReadable(), data->baseSize(), &hash );
+		}
+
+		void operator()( const Data *data )
+		{
+			// strings are converted before being written, so we don't benefit from the hash
+			m_io->IndexedIO::write( m_name, data );
+		}
+
+	private :
+
+		StreamIndexedIO *m_io;
+		const IndexedIO::EntryID &m_name;
+
+};
+
+void StreamIndexedIO::write( const IndexedIO::EntryID &name, const Data *data )
+{
+	dispatch( data, DataWriter( this, name ) );
+}
 // Read
 
 void StreamIndexedIO::read(const IndexedIO::EntryID &name, float *&x, unsigned long arrayLength) const
@@ -3666,3 +5059,274 @@ void StreamIndexedIO::read(const IndexedIO::EntryID &name, unsigned short &x) co
 {
 	READ<unsigned short>(name, x);
 }
+
+///////////////////////////////////////////////
+//
+// StreamIndexedIO::BatchReader (begin)
+//
+///////////////////////////////////////////////
+
+namespace
+{
+
+/// Data blocks closer than this are read from the file with a single
+/// read, at the expense of also reading the bytes in between.
+const size_t g_batchReadMaxGap = 64 * 1024;
+/// Limits the amount of memory used by a single coalesced read.
+const size_t g_batchReadMaxSize = 64 * 1024 * 1024;
+
+} // namespace
+
+//! Reads a batch of data entries, coalescing the reads of blocks stored near each
+//! other in the file and decoding the entries in parallel.
+class StreamIndexedIO::BatchReader
+{
+	public :
+
+		struct Request
+		{
+			IndexedIO::Entry entry;
+			Node::Info info;
+			size_t index;
+		};
+
+		static void read( Index *index, std::vector<Request> &requests, std::vector<DataPtr> &values )
+		{
+			std::sort(
+				requests.begin(), requests.end(),
+				[]( const Request &a, const Request &b ) { return a.info.offset < b.info.offset; }
+			);
+
+			std::vector<Range> ranges;
+			for( size_t i = 0; i < requests.size(); ++i )
+			{
+				const size_t begin = requests[i].info.offset;
+				const size_t end = begin + requests[i].info.size;
+				if(
+					ranges.empty() ||
+					begin > ranges.back().end + g_batchReadMaxGap ||
+					end - ranges.back().begin > g_batchReadMaxSize
+				)
+				{
+					ranges.push_back( { i, i + 1, begin, end } );
+				}
+				else
+				{
+					ranges.back().lastRequest = i + 1;
+					ranges.back().end = std::max( ranges.back().end, end );
+				}
+			}
+
+			StreamIndexedIO::StreamFile &f = index->streamFile();
+			const int threadCount = index->decompressionThreadCount();
+
+			tbb::this_task_arena::isolate(
+				[&] {
+					tbb::parallel_for(
+						tbb::blocked_range<size_t>( 0, ranges.size(), 1 ),
+						[&]( const tbb::blocked_range<size_t> &r )
+						{
+							std::vector<char> buffer;
+							for( size_t i = r.begin(); i != r.end(); ++i )
+							{
+								const Range &range = ranges[i];
+								const size_t rangeSize = range.end - range.begin;
+								const char *data = f.map( rangeSize, range.begin );
+								if( !data )
+								{
+									buffer.resize( rangeSize );
+									f.read( buffer.data(), rangeSize, range.begin );
+									data = buffer.data();
+								}
+
+								for( size_t j = range.firstRequest; j < range.lastRequest; ++j )
+								{
+									const Request &request = requests[j];
+									values[request.index] = decode( index, request, data + ( request.info.offset - range.begin ), threadCount );
+								}
+							}
+						}
+					);
+				}
+			);
+		}
+
+	private :
+
+		struct Range
+		{
+			size_t firstRequest;
+			size_t lastRequest;
+			size_t begin;
+			size_t end;
+		};
+
+		static DataPtr decode( Index *index, const Request &request, const char *data, int threadCount )
+		{
+			switch( request.entry.dataType() )
+			{
+				case IndexedIO::Float :
+					return decodeSingle<float>( request, data, threadCount );
+				case IndexedIO::FloatArray :
+					return decodeArray<float>( request, data, threadCount );
+				case IndexedIO::Double :
+					return decodeSingle<double>( request, data, threadCount );
+				case IndexedIO::DoubleArray :
+					return decodeArray<double>( request, data, threadCount );
+				case IndexedIO::Int :
+				case IndexedIO::Long :
+					return decodeSingle<int>( request, data, threadCount );
+				case IndexedIO::IntArray :
+				case IndexedIO::LongArray :
+					return decodeArray<int>( request, data, threadCount );
+				case IndexedIO::String :
+					return decodeSingle<std::string>( request, data, threadCount );
+				case IndexedIO::StringArray :
+					return decodeFlattenedArray<std::string>( request, data, threadCount );
+				case IndexedIO::UInt :
+					return decodeSingle<unsigned int>( request, data, threadCount );
+				case IndexedIO::UIntArray :
+					return decodeArray<unsigned int>( request, data, threadCount );
+				case IndexedIO::Char :
+					return decodeSingle<char>( request, data, threadCount );
+				case IndexedIO::CharArray :
+					return decodeArray<char>( request, data, threadCount );
+				case IndexedIO::UChar :
+					return decodeSingle<unsigned char>( request, data, threadCount );
+				case IndexedIO::UCharArray :
+					return decodeArray<unsigned char>( request, data, threadCount );
+				case IndexedIO::Half :
+					return decodeSingle<half>( request, data, threadCount );
+				case IndexedIO::HalfArray :
+					return decodeArray<half>( request, data, threadCount );
+				case IndexedIO::Short :
+					return decodeSingle<short>( request, data, threadCount );
+				case IndexedIO::ShortArray :
+					return decodeArray<short>( request, data, threadCount );
+				case IndexedIO::UShort :
+					return decodeSingle<unsigned short>( request, data, threadCount );
+				case IndexedIO::UShortArray :
+					return decodeArray<unsigned short>( request, data, threadCount );
+				case IndexedIO::Int64 :
+					return decodeSingle<int64_t>( request, data, threadCount );
+				case IndexedIO::Int64Array :
+					return decodeArray<int64_t>( request, data, threadCount );
+				case IndexedIO::UInt64 :
+					return decodeSingle<uint64_t>( request, data, threadCount );
+				case IndexedIO::UInt64Array :
+					return decodeArray<uint64_t>( request, data, threadCount );
+				case IndexedIO::InternedStringArray :
+					return decodeInternedStringArray( index, request, data, threadCount );
+				default :
+					throw IOException( "StreamIndexedIO::read : Unsupported data type for entry '" + request.entry.id().value() + "'" );
+			}
+		}
+
+		template<typename T>
+		static DataPtr decodeSingle( const Request &request, const char *data, int threadCount )
+		{
+			typename TypedData<T>::Ptr result = new TypedData<T>();
+			Reader reader( data, request.info, threadCount );
+			IndexedIO::DataFlattenTraits<T>::unflatten( reader.data(), result->writable() );
+			return result;
+		}
+
+		template<typename T>
+		static DataPtr decodeFlattenedArray( const Request &request, const char *data, int threadCount )
+		{
+			typename TypedData<std::vector<T> >::Ptr result = new TypedData<std::vector<T> >();
+			std::vector<T> &values = result->writable();
+			values.resize( request.entry.arrayLength() );
+			if( !values.empty() )
+			{
+				T *x = values.data();
+				Reader reader( data, request.info, threadCount );
+				IndexedIO::DataFlattenTraits<T *>::unflatten( reader.data(), x, values.size() );
+			}
+			return result;
+		}
+
+		template<typename T>
+		static DataPtr decodeArray( const Request &request, const char *data, int threadCount )
+		{
+#ifdef IE_CORE_LITTLE_ENDIAN
+			typename TypedData<std::vector<T> >::Ptr result = new TypedData<std::vector<T> >();
+			std::vector<T> &values = result->writable();
+			values.resize( request.entry.arrayLength() );
+			if( !values.empty() )
+			{
+				checkArraySize( request, sizeof( T ) * values.size() );
+				Reader reader( data, request.info, threadCount, reinterpret_cast<char *>( values.data() ) );
+			}
+			return result;
+#else
+			return decodeFlattenedArray<T>( request, data, threadCount );
+#endif
+		}
+
+		static DataPtr decodeInternedStringArray( Index *index, const Request &request, const char *data, int threadCount )
+		{
+			InternedStringVectorDataPtr result = new InternedStringVectorData();
+			std::vector<InternedString> &values = result->writable();
+			values.resize( request.entry.arrayLength() );
+			if( !values.empty() )
+			{
+				checkArraySize( request, sizeof( Imf::Int64 ) * values.size() );
+				std::vector<Imf::Int64> ids( values.size() );
+				Reader reader( data, request.info, threadCount, reinterpret_cast<char *>( ids.data() ) );
+
+				const StringCache &stringCache = index->stringCache();
+				for( size_t i = 0; i < ids.size(); ++i )
+				{
+					values[i] = stringCache.findById( ids[i] );
+				}
+			}
+			return result;
+		}
+
+		static void checkArraySize( const Request &request, size_t arraySizeInBytes )
+		{
+			if( arraySizeInBytes != request.info.decompressedSize )
+			{
+				throw IECore::IOException(
+					boost::str(
+						boost::format( "StreamIndexedIO::read - array size (%1%) does not match block size (%2%) " ) %
+							arraySizeInBytes %
+							request.info.decompressedSize
+					)
+				);
+			}
+		}
+
+};
+
+void StreamIndexedIO::read( const IndexedIO::EntryIDList &names, std::vector<DataPtr> &values ) const
+{
+	assert( m_node );
+
+	std::vector<BatchReader::Request> requests;
+	requests.reserve( names.size() );
+	for( size_t i = 0; i < names.size(); ++i )
+	{
+		readable( names[i] );
+
+		BatchReader::Request request;
+		request.entry = entry( names[i] );
+		if( request.entry.entryType() != IndexedIO::File || !m_node->dataChildInfo( names[i], request.info ) )
+		{
+			throw IOException( "StreamIndexedIO::read: Data entry not found '" + names[i].value() + "'" );
+		}
+		request.index = i;
+		requests.push_back( request );
+	}
+
+	values.clear();
+	values.resize( names.size() );
+	BatchReader::read( m_node->m_idx.get(), requests, values );
+}
+
+///////////////////////////////////////////////
+//
+// StreamIndexedIO::BatchReader (end)
+//
+///////////////////////////////////////////////
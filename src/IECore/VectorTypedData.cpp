@@ -90,7 +90,7 @@ static IndexedIO::EntryID g_sizeEntry("size");
 		Data::save( context );																		\
 		IndexedIO *container = context->rawContainer();												\
 		assert( ( sizeof( TNAME::ValueType::value_type ) / sizeof( TNAME::BaseType ) ) == N );		\
-		container->write( g_valueEntry, baseReadable(), baseSize() );								\
+		container->write( g_valueEntry, static_cast<const Data *>( this ) );						\
 	}																								\
 	template<>																						\
 	void TNAME::load( LoadContextPtr context )														\
@@ -256,6 +256,24 @@ struct IndexedIOHelper
 		}
 	}
 
+	static list readList(IndexedIOPtr p, list names)
+	{
+		assert(p);
+
+		IndexedIO::EntryIDList entryIds;
+		IndexedIOHelper::listToEntryIds( names, entryIds );
+
+		std::vector<DataPtr> values;
+		p->read( entryIds, values );
+
+		list result;
+		for( const auto &value : values )
+		{
+			result.append( value );
+		}
+		return result;
+	}
+
 	static std::string readString(IndexedIOPtr p, const IndexedIO::EntryID &name)
 	{
 		assert(p);
@@ -380,6 +398,7 @@ void bindIndexedIOBase()
 		.def("path", &IndexedIOHelper::path)
 		.def("remove", &IndexedIO::remove)
 		.def("removeAll", &IndexedIO::removeAll)
+		.def("commit", &IndexedIO::commit)
 		.def("currentEntryId", &IndexedIOHelper::currentEntryId)
 		.def("entryIds", &IndexedIOHelper::entryIds)
 		.def("entryIds", &IndexedIOHelper::typedEntryIds)
@@ -402,6 +421,7 @@ void bindIndexedIOBase()
 		.def("write", writeUShort)
 #endif
 		.def("read", &IndexedIOHelper::read)
+		.def("read", &IndexedIOHelper::readList)
 		.def("create", &IndexedIOHelper::create, (arg("path"), arg("root"), arg("mode"), arg("options") = object() ) )
 		.def("create", &IndexedIOHelper::createAtRoot, (arg("path"), arg("mode"), arg("options") = object() ) ).staticmethod("create")
 		.def("supportedExtensions", &IndexedIOHelper::supportedExtensions ).staticmethod("supportedExtensions")
@@ -412,7 +432,12 @@ void bindIndexedIOBase()
 
 void bindStreamIndexedIO()
 {
-	IECorePython::RunTimeTypedClass<StreamIndexedIO>();
+	IECorePython::RunTimeTypedClass<StreamIndexedIO>()
+		.def( "setBlockCacheMemoryLimit", &StreamIndexedIO::setBlockCacheMemoryLimit ).staticmethod( "setBlockCacheMemoryLimit" )
+		.def( "getBlockCacheMemoryLimit", &StreamIndexedIO::getBlockCacheMemoryLimit ).staticmethod( "getBlockCacheMemoryLimit" )
+		.def( "blockCacheStatistics", &StreamIndexedIO::blockCacheStatistics ).staticmethod( "blockCacheStatistics" )
+		.def( "clearBlockCache", &StreamIndexedIO::clearBlockCache ).staticmethod( "clearBlockCache" )
+	;
 }
 
 void bindFileIndexedIO()
@@ -36,10 +36,17 @@
 
 #include "IECorePython/InternedStringBinding.h"
 
+#include "IECorePython/ScopedGILRelease.h"
+
+#include "IECore/Exception.h"
 #include "IECore/InternedString.h"
 
+#include "boost/format.hpp"
 #include "boost/functional/hash.hpp"
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+
 using namespace std;
 using namespace boost;
 using namespace boost::python;
@@ -108,6 +115,35 @@ static size_t len( const InternedString &str )
 	return str.string().length();
 }
 
+static void testInternedStringConcurrentConstruction( size_t numIterations, size_t numUniqueStrings )
+{
+	ScopedGILRelease gilRelease;
+
+	std::vector<std::string> strings;
+	std::vector<InternedString> internedStrings;
+	for( size_t i = 0; i < numUniqueStrings; ++i )
+	{
+		strings.push_back( boost::str( boost::format( "__testInternedStringConcurrentConstruction%d" ) % i ) );
+		internedStrings.push_back( strings.back() );
+	}
+
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+	tbb::parallel_for(
+		tbb::blocked_range<size_t>( 0, numIterations ),
+		[&]( const tbb::blocked_range<size_t> &r ) {
+			for( size_t i = r.begin(); i != r.end(); ++i )
+			{
+				const size_t index = ( i * 7919 ) % numUniqueStrings;
+				if( InternedString( strings[index] ) != internedStrings[index] )
+				{
+					throw IECore::Exception( "InternedString \"" + strings[index] + "\" was not unique" );
+				}
+			}
+		},
+		taskGroupContext
+	);
+}
+
 void bindInternedString()
 {
 
@@ -128,6 +164,9 @@ void bindInternedString()
 
 	InternedStringFromPython();
 
+	/// \todo If we create an IECoreTest module, move this into it.
+	def( "testInternedStringConcurrentConstruction", &testInternedStringConcurrentConstruction );
+
 }
 
 } // namespace IECorePython
@@ -0,0 +1,80 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2026, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+
+#include "boost/python.hpp"
+
+#include "IECorePython/ObjectAlgoBinding.h"
+
+#include "IECorePython/ScopedGILRelease.h"
+
+#include "IECore/ObjectAlgo.h"
+
+using namespace boost::python;
+using namespace IECore;
+using namespace IECorePython;
+
+namespace
+{
+
+CharVectorDataPtr serialise( const Object *object )
+{
+	ScopedGILRelease gilRelease;
+	return ObjectAlgo::serialise( object );
+}
+
+ObjectPtr deserialise( const CharVectorData *data, const Canceller *canceller )
+{
+	ScopedGILRelease gilRelease;
+	return ObjectAlgo::deserialise( data, canceller );
+}
+
+} // namespace
+
+namespace IECorePython
+{
+
+void bindObjectAlgo()
+{
+
+	object module( borrowed( PyImport_AddModule( "IECore.ObjectAlgo" ) ) );
+	scope().attr( "ObjectAlgo" ) = module;
+
+	scope moduleScope( module );
+
+	def( "serialise", &::serialise );
+	def( "deserialise", &::deserialise, ( arg( "data" ), arg( "canceller" ) = object() ) );
+}
+
+} // namespace IECorePython
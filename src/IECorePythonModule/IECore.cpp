@@ -155,6 +155,7 @@
 #include "IECorePython/PathMatcherBinding.h"
 #include "IECorePython/CancellerBinding.h"
 #include "IECorePython/IndexedIOAlgoBinding.h"
+#include "IECorePython/ObjectAlgoBinding.h"
 
 #include "IECore/IECore.h"
 #include "IECore/Version.h"
@@ -299,6 +300,7 @@ BOOST_PYTHON_MODULE(_IECore)
 	bindPathMatcher();
 	bindCanceller();
 	bindIndexedIOAlgo();
+	bindObjectAlgo();
 	bindTBB();
 
 	def( "milestoneVersion", &IECore::milestoneVersion );
@@ -0,0 +1,148 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2026, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#ifndef IECORESCENE_BOUNDQUERYALGO_H
+#define IECORESCENE_BOUNDQUERYALGO_H
+
+#include "IECoreScene/SceneInterface.h"
+
+#include "IECore/Canceller.h"
+
+#include "OpenEXR/ImathBoxAlgo.h"
+#include "OpenEXR/ImathPlane.h"
+
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+
+#include <limits>
+#include <vector>
+
+namespace IECoreScene
+{
+	namespace Private
+	{
+		// Returns false if `bound` is entirely outside any one of `planes`.
+		inline bool intersects( const Imath::Box3d &bound, const std::vector<Imath::Plane3d> &planes )
+		{
+			if( bound.isEmpty() )
+			{
+				return false;
+			}
+
+			for( const auto &plane : planes )
+			{
+				// The corner of the box furthest behind the plane.
+				const Imath::V3d corner(
+					plane.normal.x > 0 ? bound.min.x : bound.max.x,
+					plane.normal.y > 0 ? bound.min.y : bound.max.y,
+					plane.normal.z > 0 ? bound.min.z : bound.max.z
+				);
+				if( plane.distanceTo( corner ) > 0 )
+				{
+					return false;
+				}
+			}
+
+			return true;
+		}
+
+		// Returns the planes bounding `bound`, with their normals pointing outwards.
+		inline std::vector<Imath::Plane3d> boxPlanes( const Imath::Box3d &bound )
+		{
+			if( bound.isEmpty() )
+			{
+				// A plane that nothing is in front of.
+				return { Imath::Plane3d( Imath::V3d( 1, 0, 0 ), -std::numeric_limits<double>::infinity() ) };
+			}
+
+			return {
+				Imath::Plane3d( Imath::V3d( 1, 0, 0 ), bound.max.x ),
+				Imath::Plane3d( Imath::V3d( -1, 0, 0 ), -bound.min.x ),
+				Imath::Plane3d( Imath::V3d( 0, 1, 0 ), bound.max.y ),
+				Imath::Plane3d( Imath::V3d( 0, -1, 0 ), -bound.min.y ),
+				Imath::Plane3d( Imath::V3d( 0, 0, 1 ), bound.max.z ),
+				Imath::Plane3d( Imath::V3d( 0, 0, -1 ), -bound.min.z )
+			};
+		}
+
+		// Adds the locations intersecting `planes` to `result`, recursing only to the children
+		// of intersecting locations. `planes` are in the space of the parent of `location`, and
+		// `toPlaneSpace` transforms from the space of `location` to that of its parent.
+		// `Location` must provide `readBound()`, `childNames()` and `child()` methods
+		// matching SceneInterface, and `ReadTransformFn` reads the transform of a location.
+		template<typename Location, typename ReadTransformFn>
+		void locationsIntersectingWalk(
+			const Location *location, const Imath::M44d &toPlaneSpace, const std::vector<Imath::Plane3d> &planes, double time,
+			const ReadTransformFn &readTransform, IECore::PathMatcher &result, const IECore::Canceller *canceller
+		)
+		{
+			IECore::Canceller::check( canceller );
+
+			if( !intersects( Imath::transform( location->readBound( time ), toPlaneSpace ), planes ) )
+			{
+				return;
+			}
+
+			result.addPath( SceneInterface::Path() );
+
+			SceneInterface::NameList childNames;
+			location->childNames( childNames );
+
+			std::vector<IECore::PathMatcher> childResults( childNames.size() );
+			tbb::parallel_for(
+				tbb::blocked_range<size_t>( 0, childNames.size() ),
+				[&]( const tbb::blocked_range<size_t> &range )
+				{
+					for( size_t i = range.begin(); i != range.end(); ++i )
+					{
+						auto child = location->child( childNames[i], SceneInterface::ThrowIfMissing );
+						locationsIntersectingWalk(
+							child.get(), readTransform( child.get(), time ) * toPlaneSpace, planes, time,
+							readTransform, childResults[i], canceller
+						);
+					}
+				}
+			);
+
+			for( size_t i = 0; i < childNames.size(); ++i )
+			{
+				result.addPaths( childResults[i], { childNames[i] } );
+			}
+		}
+
+	} // private
+
+} // IECoreScene
+
+#endif // IECORESCENE_BOUNDQUERYALGO_H
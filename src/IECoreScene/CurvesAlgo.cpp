@@ -387,6 +387,21 @@ CurvesPrimitivePtr deleteCurves(
 		invert
 	);
 
+	if( !IECoreScene::PrimitiveVariableAlgos::deletesAny( deleteFlagView, invert ) )
+	{
+		CurvesPrimitivePtr outCurvesPrimitive = new CurvesPrimitive( curvesPrimitive->verticesPerCurve(), curvesPrimitive->basis(), curvesPrimitive->periodic() );
+		for( const auto &it : curvesPrimitive->variables )
+		{
+			if( !curvesPrimitive->isPrimitiveVariableValid( it.second ) )
+			{
+				throw InvalidArgumentException(
+					boost::str ( boost::format( "CurvesAlgo::deleteCurves cannot process invalid primitive variable \"%s\"" ) % it.first ) );
+			}
+		}
+		outCurvesPrimitive->variables = curvesPrimitive->variables;
+		return outCurvesPrimitive;
+	}
+
 	const IECore::Data *inputVertsPerCurve = IECore::runTimeCast<const IECore::Data>( curvesPrimitive->verticesPerCurve() );
 
 	IECoreScene::PrimitiveVariableAlgos::IndexedData outputVertsPerCurve = dispatch( inputVertsPerCurve, deleteUniformFn );
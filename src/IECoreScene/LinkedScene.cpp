@@ -42,7 +42,13 @@
 
 #include "boost/foreach.hpp"
 
+#include "tbb/blocked_range.h"
+#include "tbb/concurrent_unordered_set.h"
+#include "tbb/parallel_for.h"
+#include "tbb/spin_mutex.h"
+
 #include <set>
+#include <unordered_map>
 using namespace IECore;
 using namespace IECoreScene;
 
@@ -71,9 +77,65 @@ const InternedString LinkedScene::g_time("time");
 
 namespace
 {
-	const InternedString g_linkLocations( "linkLocations" );
+
+const InternedString g_linkLocations( "linkLocations" );
+
+MurmurHash linkHash( const std::string &fileName, const SceneInterface::Path &root )
+{
+	MurmurHash h;
+	h.append( fileName );
+	h.append( (uint64_t)root.size() );
+	h.append( root.data(), root.size() );
+	return h;
 }
 
+} // namespace
+
+// Remapped times for a link, shared by the link location and the locations
+// below it, so that locations read repeatedly at the same time only read
+// the link attribute once.
+class LinkedScene::LinkTimes : public RefCounted
+{
+
+	public :
+
+		bool find( double time, double &remappedTime ) const
+		{
+			tbb::spin_mutex::scoped_lock lock( m_mutex );
+			auto it = m_times.find( time );
+			if( it == m_times.end() )
+			{
+				return false;
+			}
+			remappedTime = it->second;
+			return true;
+		}
+
+		void insert( double time, double remappedTime )
+		{
+			tbb::spin_mutex::scoped_lock lock( m_mutex );
+			if( m_times.size() >= g_maxTimes )
+			{
+				m_times.clear();
+			}
+			m_times[time] = remappedTime;
+		}
+
+	private :
+
+		static const size_t g_maxTimes = 1000;
+
+		mutable tbb::spin_mutex m_mutex;
+		std::unordered_map<double, double> m_times;
+
+};
+
+// The links expanded by expandLinks(), so that each is only visited once.
+struct LinkedScene::ExpandedLinks
+{
+	tbb::concurrent_unordered_set<MurmurHash> links;
+};
+
 LinkedScene::LinkedScene( const std::string &fileName, IndexedIO::OpenMode mode )
 	: m_mainScene( nullptr ),
 	m_linkedScene( nullptr ),
@@ -123,7 +185,8 @@ LinkedScene::LinkedScene(
 	int rootLinkDepth,
 	bool readOnly,
 	bool atLink,
-	bool timeRemapped
+	bool timeRemapped,
+	LinkTimes *linkTimes
 )
 	: m_mainScene( mainScene ),
 	m_linkedScene( linkedScene ),
@@ -131,8 +194,14 @@ LinkedScene::LinkedScene(
 	m_readOnly( readOnly ),
 	m_atLink( atLink ),
 	m_timeRemapped( timeRemapped ),
+	m_linkTimes( linkTimes ),
 	m_linkLocationsData( linkLocationsData )
 {
+	if( m_timeRemapped && !m_linkTimes )
+	{
+		m_linkTimes = new LinkTimes;
+	}
+
 	if ( !mainScene )
 	{
 		throw Exception( "NULL main scene!" );
@@ -1059,6 +1128,36 @@ ConstObjectPtr LinkedScene::readObject( double time, const Canceller *canceller
 	}
 }
 
+void LinkedScene::readObjects( const std::vector<double> &times, std::vector<ConstObjectPtr> &objects, const Canceller *canceller ) const
+{
+	const SceneInterface *scene = m_linkedScene ? m_linkedScene.get() : m_mainScene.get();
+
+	std::vector<double> remappedTimes;
+	const std::vector<double> *sceneTimes = &times;
+	if ( m_linkedScene && m_timeRemapped )
+	{
+		remappedTimes.reserve( times.size() );
+		for ( double time : times )
+		{
+			remappedTimes.push_back( remappedLinkTime( time ) );
+		}
+		sceneTimes = &remappedTimes;
+	}
+
+	if ( const SampledSceneInterface *sampledScene = runTimeCast<const SampledSceneInterface>( scene ) )
+	{
+		sampledScene->readObjects( *sceneTimes, objects, canceller );
+	}
+	else
+	{
+		objects.resize( sceneTimes->size() );
+		for ( size_t i = 0; i < sceneTimes->size(); ++i )
+		{
+			objects[i] = scene->readObject( (*sceneTimes)[i], canceller );
+		}
+	}
+}
+
 PrimitiveVariableMap LinkedScene::readObjectPrimitiveVariables( const std::vector<InternedString> &primVarNames, double time ) const
 {
 	if ( m_linkedScene )
@@ -1118,7 +1217,7 @@ ConstSceneInterfacePtr LinkedScene::expandLink( const StringData *fileName, cons
 		ConstSceneInterfacePtr l = nullptr;
 		try
 		{
-			l = SharedSceneInterfaces::get( fileName->readable() );
+			l = SharedSceneInterfaces::location( fileName->readable(), root->readable() );
 		}
 		catch ( IECore::Exception &e )
 		{
@@ -1128,7 +1227,6 @@ ConstSceneInterfacePtr LinkedScene::expandLink( const StringData *fileName, cons
 		}
 
 		linkDepth = root->readable().size();
-		l = l->scene(root->readable(), NullIfMissing);
 		if ( !l )
 		{
 			// \todo Consider throwing or printing error message.
@@ -1141,6 +1239,22 @@ ConstSceneInterfacePtr LinkedScene::expandLink( const StringData *fileName, cons
 }
 
 double LinkedScene::remappedLinkTime( double time ) const
+{
+	double result;
+	if( m_linkTimes && m_linkTimes->find( time, result ) )
+	{
+		return result;
+	}
+
+	result = readRemappedLinkTime( time );
+	if( m_linkTimes )
+	{
+		m_linkTimes->insert( time, result );
+	}
+	return result;
+}
+
+double LinkedScene::readRemappedLinkTime( double time ) const
 {
 	if( m_mainScene->hasAttribute( timeLinkAttribute ) )
 	{
@@ -1209,7 +1323,7 @@ SceneInterfacePtr LinkedScene::child( const Name &name, MissingBehaviour missing
 		ConstSceneInterfacePtr c = m_linkedScene->child( name, SceneInterface::NullIfMissing );
 		if ( c )
 		{
-			return new LinkedScene( m_mainScene.get(), c.get(), m_linkLocationsData, m_rootLinkDepth, m_readOnly, false, m_timeRemapped );
+			return new LinkedScene( m_mainScene.get(), c.get(), m_linkLocationsData, m_rootLinkDepth, m_readOnly, false, m_timeRemapped, m_linkTimes.get() );
 		}
 		if( !m_atLink )
 		{
@@ -1465,6 +1579,12 @@ void LinkedScene::hash( HashType hashType, double time, MurmurHash &h ) const
 	}
 }
 
+size_t LinkedScene::memoryUsage() const
+{
+	// Linked files are opened through SharedSceneInterfaces, which accounts for them separately.
+	return m_mainScene->memoryUsage();
+}
+
 /// serialise this into the linked scene cache so it can just be loaded directly without having to traverse the entire scene
 IECore::PathMatcher LinkedScene::linkLocations() const
 {
@@ -1491,3 +1611,120 @@ void LinkedScene::recurseLinkLocations( PathMatcher &pathMatcher ) const
 		runTimeCast<const LinkedScene>( childScene.get() )->recurseLinkLocations( pathMatcher );
 	}
 }
+
+void LinkedScene::expandLinks( const Canceller *canceller ) const
+{
+	if ( !m_readOnly )
+	{
+		throw Exception( "expandLinks() called on write-only LinkedScene!" );
+	}
+
+	ExpandedLinks expandedLinks;
+	expandLinks( expandedLinks, canceller );
+}
+
+void LinkedScene::expandLinks( ExpandedLinks &expandedLinks, const Canceller *canceller ) const
+{
+	std::vector<ConstSceneInterfacePtr> linkedScenes;
+	if( m_linkedScene )
+	{
+		// The locations below us come from the linked scene.
+		linkedScenes.push_back( m_linkedScene );
+	}
+
+	if( !m_linkedScene || m_atLink )
+	{
+		SceneInterface::Path path;
+		m_mainScene->path( path );
+		std::vector<ConstSceneInterfacePtr> links;
+		mainLinksWalk( m_mainScene.get(), path, links );
+
+		tbb::spin_mutex linkedScenesMutex;
+		tbb::parallel_for(
+			tbb::blocked_range<size_t>( 0, links.size() ),
+			[&]( const tbb::blocked_range<size_t> &range ) {
+				for( size_t i = range.begin(); i != range.end(); ++i )
+				{
+					Canceller::check( canceller );
+
+					const SceneInterface *location = links[i].get();
+					ConstStringDataPtr fileName;
+					ConstInternedStringVectorDataPtr root;
+					if( location->hasAttribute( fileNameLinkAttribute ) && location->hasAttribute( rootLinkAttribute ) )
+					{
+						fileName = runTimeCast< const StringData >( location->readAttribute( fileNameLinkAttribute, 0 ) );
+						root = runTimeCast< const InternedStringVectorData >( location->readAttribute( rootLinkAttribute, 0 ) );
+					}
+					else if( ConstCompoundDataPtr d = runTimeCast< const CompoundData >( location->readAttribute( linkAttribute, 0 ) ) )
+					{
+						fileName = d->member< const StringData >( g_fileName );
+						root = d->member< const InternedStringVectorData >( g_root );
+					}
+
+					if( !fileName || !root )
+					{
+						continue;
+					}
+
+					ConstSceneInterfacePtr l;
+					try
+					{
+						l = SharedSceneInterfaces::location( fileName->readable(), root->readable() );
+					}
+					catch( const IECore::Exception & )
+					{
+						// Reported by expandLink() when the location is visited.
+						continue;
+					}
+
+					if( l && expandedLinks.links.insert( linkHash( fileName->readable(), root->readable() ) ).second )
+					{
+						tbb::spin_mutex::scoped_lock lock( linkedScenesMutex );
+						linkedScenes.push_back( l );
+					}
+				}
+			}
+		);
+	}
+
+	// Expand the links within the linked scenes.
+	tbb::parallel_for(
+		tbb::blocked_range<size_t>( 0, linkedScenes.size() ),
+		[&]( const tbb::blocked_range<size_t> &range ) {
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				if( const LinkedScene *linkedScene = runTimeCast< const LinkedScene >( linkedScenes[i].get() ) )
+				{
+					linkedScene->expandLinks( expandedLinks, canceller );
+				}
+			}
+		}
+	);
+}
+
+void LinkedScene::mainLinksWalk( const SceneInterface *mainLocation, SceneInterface::Path &path, std::vector<ConstSceneInterfacePtr> &links ) const
+{
+	// Files list the locations of their links, so we only need to visit
+	// the ancestors of the links, unless the file predates the list.
+	const PathMatcher &linkLocations = m_linkLocationsData->readable();
+	if( !linkLocations.isEmpty() && !( linkLocations.match( path ) & ( PathMatcher::ExactMatch | PathMatcher::DescendantMatch ) ) )
+	{
+		return;
+	}
+
+	if( mainLocation->hasAttribute( fileNameLinkAttribute ) || mainLocation->hasAttribute( linkAttribute ) )
+	{
+		links.push_back( mainLocation );
+	}
+
+	SceneInterface::NameList childNames;
+	mainLocation->childNames( childNames );
+	path.push_back( SceneInterface::Name() );
+	for( const SceneInterface::Name &childName : childNames )
+	{
+		path.back() = childName;
+		ConstSceneInterfacePtr child = mainLocation->child( childName );
+		mainLinksWalk( child.get(), path, links );
+	}
+	path.pop_back();
+}
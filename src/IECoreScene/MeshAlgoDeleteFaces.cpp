@@ -141,6 +141,23 @@ void deleteCreases( MeshPrimitive *out, const MeshPrimitive *in, const std::vect
 template<typename T>
 MeshPrimitivePtr deleteFaces( const MeshPrimitive *meshPrimitive, PrimitiveVariable::IndexedView<T> &deleteFlagView, bool invert, const Canceller *canceller )
 {
+	if( !IECoreScene::PrimitiveVariableAlgos::deletesAny( deleteFlagView, invert ) )
+	{
+		MeshPrimitivePtr outMeshPrimitive = new MeshPrimitive( meshPrimitive->verticesPerFace(), meshPrimitive->vertexIds(), meshPrimitive->interpolation() );
+		outMeshPrimitive->setCorners( meshPrimitive->cornerIds(), meshPrimitive->cornerSharpnesses() );
+		outMeshPrimitive->setCreases( meshPrimitive->creaseLengths(), meshPrimitive->creaseIds(), meshPrimitive->creaseSharpnesses() );
+		for( const auto &it : meshPrimitive->variables )
+		{
+			if( !meshPrimitive->isPrimitiveVariableValid( it.second ) )
+			{
+				throw InvalidArgumentException(
+					boost::str ( boost::format( "MeshAlgo::deleteFaces cannot process invalid primitive variable \"%s\"" ) % it.first ) );
+			}
+		}
+		outMeshPrimitive->variables = meshPrimitive->variables;
+		return outMeshPrimitive;
+	}
+
 	// construct 3 functors for deleting (uniform, vertex & face varying) primvars
 	IECoreScene::PrimitiveVariableAlgos::DeleteFlaggedUniformFunctor<T> uniformFunctor( deleteFlagView, invert );
 	IECoreScene::PrimitiveVariableAlgos::DeleteFlaggedFaceVaryingFunctor<T> faceVaryingFunctor( deleteFlagView, meshPrimitive->verticesPerFace(), invert );
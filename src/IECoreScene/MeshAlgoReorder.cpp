@@ -71,13 +71,18 @@ struct ReorderFn
 		{
 		}
 
-		template<typename T>
-		DataPtr operator()( const TypedData<std::vector<T> > *d, const std::string &name )
+		// template template parameter 'S' to capture if the input type is either TypedData or GeometricTypedData
+		template<typename T, template<typename> class S>
+		DataPtr operator()( const S<std::vector<T> > *d, const std::string &name )
 		{
 			const auto &inputs = d->readable();
 
-			typename TypedData<std::vector<T> >::Ptr data = d->copy();
+			// Every element is assigned below, so we start from new data rather
+			// than a copy, which would duplicate the inputs when made writable.
+			typename S<std::vector<T> >::Ptr data = new S<std::vector<T> >();
+			setGeometricInterpretation( data.get(), getGeometricInterpretation( d ) );
 			auto &outputs = data->writable();
+			outputs.resize( m_remapping.size() );
 
 			int i = 0;
 			for ( std::vector<int>::const_iterator it = m_remapping.begin(); it != m_remapping.end(); ++it, ++i )
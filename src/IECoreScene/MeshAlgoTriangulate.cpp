@@ -33,6 +33,7 @@
 //////////////////////////////////////////////////////////////////////////
 
 #include "IECoreScene/MeshAlgo.h"
+#include "IECoreScene/private/PrimitiveVariableAlgos.h"
 
 #include "IECore/DataAlgo.h"
 #include "IECore/DespatchTypedData.h"
@@ -71,6 +72,9 @@ struct TriangleDataRemap
 		assert( otherData );
 		const typename T::ValueType &otherDataReadable = otherData->readable();
 
+		PrimitiveVariableAlgos::GeometricInterpretationCopier<T> copier;
+		copier( otherData, data );
+
 		dataWritable.clear();
 		dataWritable.resize( m_indices.size() );
 
@@ -226,8 +230,10 @@ struct TriangulateFn
 				continue;
 			}
 
+			// Every element is assigned by the remap, so we start from new data
+			// rather than a copy, which would duplicate the input when made writable.
 			const Data *inputData = it->second.indices ? it->second.indices.get() : it->second.data.get();
-			DataPtr result = inputData->copy();
+			DataPtr result = boost::static_pointer_cast<Data>( Object::create( inputData->typeId() ) );
 			remap->m_other = inputData;
 
 			despatchTypedData<TriangleDataRemap, TypeTraits::IsVectorTypedData>( result.get(), *remap );
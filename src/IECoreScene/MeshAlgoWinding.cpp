@@ -37,7 +37,7 @@
 
 #include "IECore/DataAlgo.h"
 
-#include <unordered_set>
+#include <unordered_map>
 
 using namespace Imath;
 using namespace IECore;
@@ -98,7 +98,10 @@ void IECoreScene::MeshAlgo::reverseWinding( MeshPrimitive *mesh, const Canceller
 		mesh->interpolation()
 	);
 
-	std::unordered_set<const Data *> visited;
+	// Maps from the original data to the reversed data, so that data
+	// shared by several variables is only reversed once. Data shared with
+	// anything other than this mesh is copied before being reversed.
+	std::unordered_map<const Data *, DataPtr> reversed;
 	ReverseWindingFunctor reverseWindingFunctor( mesh, canceller );
 	for( auto &it : mesh->variables )
 	{
@@ -106,14 +109,25 @@ void IECoreScene::MeshAlgo::reverseWinding( MeshPrimitive *mesh, const Canceller
 		{
 			if( it.second.indices )
 			{
-				if( visited.insert( it.second.indices.get() ).second )
+				DataPtr &reversedIndices = reversed[it.second.indices.get()];
+				if( !reversedIndices )
 				{
-					::reverseWinding<IntVectorData::ValueType>( mesh, it.second.indices->writable(), canceller );
+					IntVectorData *indices = it.second.writableIndices();
+					::reverseWinding<IntVectorData::ValueType>( mesh, indices->writable(), canceller );
+					reversedIndices = indices;
 				}
+				it.second.indices = boost::static_pointer_cast<IntVectorData>( reversedIndices );
 			}
-			else if( visited.insert( it.second.data.get() ).second )
+			else
 			{
-				dispatch( it.second.data.get(), reverseWindingFunctor );
+				DataPtr &reversedData = reversed[it.second.data.get()];
+				if( !reversedData )
+				{
+					Data *data = it.second.writableData();
+					dispatch( data, reverseWindingFunctor );
+					reversedData = data;
+				}
+				it.second.data = reversedData;
 			}
 		}
 	}
@@ -113,6 +113,7 @@ PointsPrimitivePtr deletePoints( const PointsPrimitive *pointsPrimitive, IECoreS
 	PointsPrimitivePtr outPointsPrimitive = new PointsPrimitive( 0 );
 
 	IECoreScene::PrimitiveVariableAlgos::DeleteFlaggedUniformFunctor<T> vertexFunctor( deleteFlagView, invert );
+	const bool anyDeleted = IECoreScene::PrimitiveVariableAlgos::deletesAny( deleteFlagView, invert );
 
 	for( PrimitiveVariableMap::const_iterator it = pointsPrimitive->variables.begin(), e = pointsPrimitive->variables.end(); it != e; ++it )
 	{
@@ -128,6 +129,11 @@ PointsPrimitivePtr deletePoints( const PointsPrimitive *pointsPrimitive, IECoreS
 					throw InvalidArgumentException(
 						boost::str ( boost::format( "PointsAlgo::deletePoints cannot process invalid primitive variable \"%s\"" ) % it->first ) );
 				}
+				if( !anyDeleted )
+				{
+					outPointsPrimitive->variables[it->first] = it->second;
+					break;
+				}
 				const IECore::Data *inputData = it->second.data.get();
 				vertexFunctor.setIndices( it->second.indices.get() );
 				IECoreScene::PrimitiveVariableAlgos::IndexedData indexedData = dispatch( inputData, vertexFunctor );
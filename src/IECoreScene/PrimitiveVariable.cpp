@@ -178,3 +178,21 @@ DataPtr PrimitiveVariable::expandedData() const
 
 	return dispatch( data.get(), Expander( indices->readable() ) );
 }
+
+Data *PrimitiveVariable::writableData()
+{
+	if( data && data->refCount() > 1 )
+	{
+		data = data->copy();
+	}
+	return data.get();
+}
+
+IntVectorData *PrimitiveVariable::writableIndices()
+{
+	if( indices && indices->refCount() > 1 )
+	{
+		indices = indices->copy();
+	}
+	return indices.get();
+}
@@ -38,6 +38,11 @@
 #include "IECore/SimpleTypedData.h"
 #include "IECore/TransformationMatrixData.h"
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+
+#include <algorithm>
+
 using namespace IECore;
 using namespace IECoreScene;
 
@@ -159,3 +164,86 @@ ConstObjectPtr SampledSceneInterface::readObject( double time, const Canceller *
 
 	return object;
 }
+
+void SampledSceneInterface::readObjects( const std::vector<double> &times, std::vector<ConstObjectPtr> &objects, const Canceller *canceller ) const
+{
+	// Find the intervals first, so that we know all the samples we need.
+
+	struct Interval
+	{
+		size_t sample1;
+		size_t sample2;
+		double x;
+	};
+
+	std::vector<Interval> intervals( times.size() );
+	std::vector<size_t> samples;
+	for( size_t i = 0; i < times.size(); ++i )
+	{
+		Interval &interval = intervals[i];
+		interval.x = objectSampleInterval( times[i], interval.sample1, interval.sample2 );
+		if( interval.x < 1 )
+		{
+			samples.push_back( interval.sample1 );
+		}
+		if( interval.x > 0 )
+		{
+			samples.push_back( interval.sample2 );
+		}
+	}
+
+	std::sort( samples.begin(), samples.end() );
+	samples.erase( std::unique( samples.begin(), samples.end() ), samples.end() );
+
+	// Read each sample once.
+
+	std::vector<ConstObjectPtr> sampleObjects( samples.size() );
+	tbb::parallel_for(
+		tbb::blocked_range<size_t>( 0, samples.size() ),
+		[this, &samples, &sampleObjects, canceller] ( const tbb::blocked_range<size_t> &range ) {
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				sampleObjects[i] = readObjectAtSample( samples[i], canceller );
+			}
+		}
+	);
+
+	auto sampleObject = [&samples, &sampleObjects] ( size_t sample ) {
+		return sampleObjects[ std::lower_bound( samples.begin(), samples.end(), sample ) - samples.begin() ];
+	};
+
+	// And interpolate them, in the same way as readObject().
+
+	objects.resize( times.size() );
+	tbb::parallel_for(
+		tbb::blocked_range<size_t>( 0, times.size() ),
+		[&intervals, &objects, &sampleObject, canceller] ( const tbb::blocked_range<size_t> &range ) {
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				const Interval &interval = intervals[i];
+				if( interval.x == 0 )
+				{
+					objects[i] = sampleObject( interval.sample1 );
+					continue;
+				}
+				if( interval.x == 1 )
+				{
+					objects[i] = sampleObject( interval.sample2 );
+					continue;
+				}
+
+				Canceller::check( canceller );
+				ConstObjectPtr object1 = sampleObject( interval.sample1 );
+				ConstObjectPtr object2 = sampleObject( interval.sample2 );
+				ObjectPtr object = linearObjectInterpolation( object1.get(), object2.get(), interval.x );
+				if( !object )
+				{
+					// failed to interpolate, return the closest one
+					objects[i] = ( interval.x >= 0.5 ? object2 : object1 );
+					continue;
+				}
+				objects[i] = object;
+			}
+		}
+	);
+}
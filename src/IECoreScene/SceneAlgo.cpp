@@ -39,9 +39,18 @@
 #include "IECoreScene/PointsPrimitive.h"
 #include "IECoreScene/SceneInterface.h"
 
-#include "tbb/task.h"
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+#include "tbb/task_arena.h"
+#include "tbb/task_group.h"
 
+#include <algorithm>
 #include <atomic>
+#include <condition_variable>
+#include <exception>
+#include <memory>
+#include <mutex>
+#include <vector>
 
 using namespace IECore;
 using namespace IECoreScene;
@@ -49,65 +58,55 @@ using namespace IECoreScene;
 namespace
 {
 
-template<typename LocationFn>
-class Task : public tbb::task
+void parallelTraverseWalk(
+	const SceneInterface *location, const SceneInterface::Path &path, const SceneAlgo::LocationFunction &locationFn,
+	const std::vector<double> &times, const PathMatcher *filter, const Canceller *canceller,
+	tbb::task_group_context &taskGroupContext
+)
 {
+	Canceller::check( canceller );
 
-	public :
-
-		Task(
-			const SceneInterface *src, SceneInterface *dst, LocationFn &locationFn, double time, unsigned int flags
-		) : m_src( src ), m_dst( dst ), m_locationFn( locationFn ), m_time( time ), m_flags( flags )
+	const unsigned match = filter ? filter->match( path ) : (unsigned)PathMatcher::EveryMatch;
+	if( match & PathMatcher::ExactMatch )
+	{
+		bool visitChildren = true;
+		for( const auto &time : times )
 		{
+			visitChildren = locationFn( location, time ) && visitChildren;
 		}
 
-		~Task() override
+		if( !visitChildren )
 		{
+			return;
 		}
+	}
 
-		task *execute() override
-		{
-			m_locationFn( m_src, m_dst, m_time, m_flags );
-
-			SceneInterface::NameList childNames;
-			m_src->childNames( childNames );
-
-			set_ref_count( 1 + childNames.size() );
-
-			std::vector<SceneInterfacePtr> childSceneInterfaces;
-			childSceneInterfaces.reserve( childNames.size() );
+	if( !( match & PathMatcher::DescendantMatch ) )
+	{
+		return;
+	}
 
-			std::vector<ConstSceneInterfacePtr> srcChildSceneInterfaces;
-			srcChildSceneInterfaces.reserve( childNames.size() );
+	SceneInterface::NameList childNames;
+	location->childNames( childNames );
 
-			for( const auto &childName : childNames )
+	// Nested parallel_for gives us depth first traversal, with idle threads
+	// stealing whole subtrees from busy ones.
+	tbb::parallel_for(
+		tbb::blocked_range<size_t>( 0, childNames.size() ),
+		[&]( const tbb::blocked_range<size_t> &range )
+		{
+			SceneInterface::Path childPath = path;
+			childPath.push_back( InternedString() );
+			for( size_t i = range.begin(); i != range.end(); ++i )
 			{
-				SceneInterfacePtr dstChild = m_dst ? m_dst->child( childName, SceneInterface::CreateIfMissing ) : nullptr;
-				if( dstChild )
-				{
-					childSceneInterfaces.push_back( dstChild );
-				}
-
-				ConstSceneInterfacePtr srcChild = m_src->child( childName );
-				srcChildSceneInterfaces.push_back( srcChild );
-
-				Task *t = new( allocate_child() ) Task( srcChild.get(), dstChild.get(), m_locationFn, m_time, m_flags );
-				spawn( *t );
+				childPath.back() = childNames[i];
+				ConstSceneInterfacePtr child = location->child( childNames[i] );
+				parallelTraverseWalk( child.get(), childPath, locationFn, times, filter, canceller, taskGroupContext );
 			}
-			wait_for_all();
-
-			return nullptr;
-		}
-
-	private :
-
-		const SceneInterface *m_src;
-		SceneInterface *m_dst;
-		LocationFn &m_locationFn;
-		double m_time;
-		unsigned int m_flags;
-
-};
+		},
+		taskGroupContext
+	);
+}
 
 template<typename T>
 struct CopyInfo
@@ -125,28 +124,36 @@ struct CopyInfo
 	T setCount;
 };
 
-CopyInfo<size_t> handleLocation( const SceneInterface *src, SceneInterface *dst, double time, unsigned int flags )
+// Everything read from a single location at a single time,
+// held between the read and write stages of `copy()`.
+struct LocationSample
 {
-	SceneInterface::Path path;
-	src->path( path );
-	bool isRoot = path.empty();
-	CopyInfo<size_t> copyInfo;
+	LocationSample() : memoryUsage( 0 )
+	{
+	}
+
+	Imath::Box3d bound;
+	ConstDataPtr transform;
+	std::vector<std::pair<SceneInterface::Name, ConstObjectPtr>> attributes;
+	SceneInterface::NameList tags;
+	std::vector<std::pair<SceneInterface::Name, PathMatcher>> sets;
+	ConstObjectPtr object;
+	size_t memoryUsage;
+};
 
+void readLocation( const SceneInterface *src, bool isRoot, double time, unsigned int flags, LocationSample &sample )
+{
 	if( flags & SceneAlgo::Bounds )
 	{
-		auto bound = src->readBound( time );
-		if( dst )
-		{
-			dst->writeBound( bound, time );
-		}
+		sample.bound = src->readBound( time );
 	}
 
 	if( flags & SceneAlgo::Transforms )
 	{
-		IECore::ConstDataPtr transform = src->readTransform( time );
-		if( dst && !isRoot )
+		sample.transform = src->readTransform( time );
+		if( sample.transform )
 		{
-			dst->writeTransform( transform.get(), time );
+			sample.memoryUsage += sample.transform->memoryUsage();
 		}
 	}
 
@@ -155,72 +162,112 @@ CopyInfo<size_t> handleLocation( const SceneInterface *src, SceneInterface *dst,
 		SceneInterface::NameList attributeNames;
 		src->attributeNames( attributeNames );
 
-		copyInfo.attributeCount += attributeNames.size();
+		sample.attributes.reserve( attributeNames.size() );
 		for( const auto &attributeName : attributeNames )
 		{
-			IECore::ConstObjectPtr attr = src->readAttribute( attributeName, time );
-			if( dst )
+			ConstObjectPtr attribute = src->readAttribute( attributeName, time );
+			if( attribute )
 			{
-				dst->writeAttribute( attributeName, attr.get(), time );
+				sample.memoryUsage += attribute->memoryUsage();
 			}
+			sample.attributes.emplace_back( attributeName, attribute );
 		}
 	}
 
 	if( flags & SceneAlgo::Tags )
 	{
-		SceneInterface::NameList tags;
-		src->readTags( tags );
-		copyInfo.tagCount += tags.size();
-		if( dst )
-		{
-			dst->writeTags( tags );
-		}
+		src->readTags( sample.tags );
 	}
 
 	if( flags & SceneAlgo::Sets && isRoot )
 	{
-		SceneInterface::NameList setNames = src->setNames();
-		copyInfo.setCount += setNames.size();
-		for( const auto &setName : setNames )
+		for( const auto &setName : src->setNames() )
 		{
-			PathMatcher set = src->readSet( setName );
-			if( dst )
-			{
-				dst->writeSet( setName, set );
-			}
+			sample.sets.emplace_back( setName, src->readSet( setName ) );
 		}
 	}
 
 	if( flags & SceneAlgo::Objects && src->hasObject() )
 	{
-		IECore::ConstObjectPtr obj = src->readObject( time );
-
-		if( IECoreScene::MeshPrimitive::ConstPtr mesh = IECore::runTimeCast<const IECoreScene::MeshPrimitive>( obj ) )
-		{
-			copyInfo.polygonCount += mesh->numFaces();
-		}
-		else if( IECoreScene::CurvesPrimitive::ConstPtr curves = IECore::runTimeCast<const IECoreScene::CurvesPrimitive>( obj ) )
-		{
-			copyInfo.curveCount += curves->numCurves();
-		}
-		else if( IECoreScene::PointsPrimitive::ConstPtr points = IECore::runTimeCast<const IECoreScene::PointsPrimitive>( obj ) )
-		{
-			copyInfo.pointCount += points->getNumPoints();
-		}
-		if( dst )
+		sample.object = src->readObject( time );
+		if( sample.object )
 		{
-			dst->writeObject( obj.get(), time );
+			sample.memoryUsage += sample.object->memoryUsage();
 		}
 	}
+}
 
-	return copyInfo;
+void writeLocation( const LocationSample &sample, SceneInterface *dst, bool isRoot, double time, unsigned int flags )
+{
+	if( flags & SceneAlgo::Bounds )
+	{
+		dst->writeBound( sample.bound, time );
+	}
+
+	if( flags & SceneAlgo::Transforms && !isRoot )
+	{
+		dst->writeTransform( sample.transform.get(), time );
+	}
+
+	for( const auto &attribute : sample.attributes )
+	{
+		dst->writeAttribute( attribute.first, attribute.second.get(), time );
+	}
+
+	if( flags & SceneAlgo::Tags )
+	{
+		dst->writeTags( sample.tags );
+	}
+
+	for( const auto &set : sample.sets )
+	{
+		dst->writeSet( set.first, set.second );
+	}
+
+	if( sample.object )
+	{
+		dst->writeObject( sample.object.get(), time );
+	}
+}
 
+CopyInfo<size_t> handleLocation( const SceneInterface *src, double time, unsigned int flags )
+{
+	SceneInterface::Path path;
+	src->path( path );
+
+	LocationSample sample;
+	readLocation( src, path.empty(), time, flags, sample );
+
+	CopyInfo<size_t> copyInfo;
+	copyInfo.attributeCount = sample.attributes.size();
+	copyInfo.tagCount = sample.tags.size();
+	copyInfo.setCount = sample.sets.size();
+
+	if( const MeshPrimitive *mesh = runTimeCast<const MeshPrimitive>( sample.object.get() ) )
+	{
+		copyInfo.polygonCount = mesh->numFaces();
+	}
+	else if( const CurvesPrimitive *curves = runTimeCast<const CurvesPrimitive>( sample.object.get() ) )
+	{
+		copyInfo.curveCount = curves->numCurves();
+	}
+	else if( const PointsPrimitive *points = runTimeCast<const PointsPrimitive>( sample.object.get() ) )
+	{
+		copyInfo.pointCount = points->getNumPoints();
+	}
+
+	return copyInfo;
 }
 
-template<typename LocationFn>
-void copy( const SceneInterface *src, SceneInterface *dst, double time, unsigned int flags, LocationFn &locationFn )
+void copyWalk( const SceneInterface *src, SceneInterface *dst, double time, unsigned int flags )
 {
-	locationFn( src, dst, time, flags );
+	SceneInterface::Path path;
+	src->path( path );
+	const bool isRoot = path.empty();
+
+	LocationSample sample;
+	readLocation( src, isRoot, time, flags, sample );
+	writeLocation( sample, dst, isRoot, time, flags );
 
 	SceneInterface::NameList childNames;
 	src->childNames( childNames );
@@ -228,10 +275,291 @@ void copy( const SceneInterface *src, SceneInterface *dst, double time, unsigned
 	for( const auto &childName : childNames )
 	{
 		SceneInterfacePtr dstChild = dst->child( childName, SceneInterface::CreateIfMissing );
-		::copy( src->child( childName ).get(), dstChild.get(), time, flags, locationFn );
+		copyWalk( src->child( childName ).get(), dstChild.get(), time, flags );
+	}
+}
+
+size_t countLocations( const SceneInterface *src )
+{
+	size_t result = 1;
+	SceneInterface::NameList childNames;
+	src->childNames( childNames );
+	for( const auto &childName : childNames )
+	{
+		result += countLocations( src->child( childName ).get() );
 	}
+	return result;
 }
 
+// Copies a scene by reading location samples in parallel TBB tasks, while
+// the calling thread writes them to the destination in the same order as
+// a serial traversal would. The source is traversed incrementally, and
+// samples are read ahead into a fixed number of slots until `memoryLimit`
+// bytes are waiting to be written.
+class CopyPipeline
+{
+
+	public :
+
+		CopyPipeline(
+			const SceneInterface *src, SceneInterface *dst, int startFrame, int endFrame, float frameRate, unsigned int flags,
+			size_t memoryLimit, const SceneAlgo::ProgressFunction &progress, const Canceller *canceller
+		)
+			:	m_src( src ), m_dst( dst ), m_startFrame( startFrame ), m_endFrame( endFrame ), m_frameRate( frameRate ), m_flags( flags ),
+				m_memoryLimit( memoryLimit ), m_progress( progress ), m_canceller( canceller ),
+				m_samples( std::max( 2 * tbb::this_task_arena::max_concurrency(), 2 ) ),
+				m_frame( startFrame - 1 ), m_numSamples( 0 ), m_memoryUsage( 0 ), m_stopping( false )
+		{
+			SceneInterface::Path path;
+			src->path( path );
+			m_srcIsRoot = path.empty();
+
+			if( m_progress && endFrame >= startFrame )
+			{
+				// The hierarchy is the same on every frame, so we only
+				// need to count it once.
+				m_numSamples = countLocations( src ) * ( endFrame - startFrame + 1 );
+			}
+		}
+
+		void run()
+		{
+			size_t queued = 0;
+			size_t written = 0;
+			try
+			{
+				while( true )
+				{
+					Canceller::check( m_canceller );
+
+					// The next sample to be written is always queued, so that the
+					// copy progresses whatever the memory usage. The ones after it
+					// are read by tasks while there are free slots and memory.
+					while(
+						queued - written < m_samples.size() &&
+						( queued == written || m_memoryUsage.load( std::memory_order_relaxed ) < m_memoryLimit ) &&
+						queueSample( m_samples[queued % m_samples.size()] )
+					)
+					{
+						if( queued != written )
+						{
+							Sample *sample = &m_samples[queued % m_samples.size()];
+							m_tasks.run( [this, sample] { readSample( *sample ); } );
+						}
+						queued++;
+					}
+
+					if( queued == written )
+					{
+						// Every location has been written for every frame.
+						break;
+					}
+
+					Sample &sample = m_samples[written % m_samples.size()];
+					readSample( sample );
+					{
+						std::unique_lock<std::mutex> lock( m_mutex );
+						m_sampleRead.wait( lock, [&sample] { return sample.state == Sample::Read; } );
+					}
+
+					if( sample.exception )
+					{
+						std::rethrow_exception( sample.exception );
+					}
+
+					writeSample( sample );
+
+					m_memoryUsage -= sample.data->memoryUsage;
+					sample.data.reset();
+					sample.location.reset();
+					sample.state = Sample::Free;
+					written++;
+
+					if( m_progress )
+					{
+						m_progress( written, m_numSamples );
+					}
+				}
+			}
+			catch( ... )
+			{
+				m_stopping = true;
+				m_tasks.wait();
+				throw;
+			}
+
+			m_tasks.wait();
+		}
+
+	private :
+
+		struct Sample
+		{
+			Sample() : state( Free ), depth( 0 ), isRoot( false ), time( 0 ), flags( 0 )
+			{
+			}
+
+			enum State
+			{
+				Free,
+				Pending,
+				Reading,
+				Read
+			};
+
+			std::atomic<State> state;
+
+			// Set by the writing thread before the state becomes Pending.
+			ConstSceneInterfacePtr location;
+			SceneInterface::Name name;
+			size_t depth;
+			bool isRoot;
+			double time;
+			unsigned flags;
+
+			std::unique_ptr<LocationSample> data;
+			std::exception_ptr exception;
+		};
+
+		// A location on the path to the one most recently queued.
+		struct TraversalLocation
+		{
+			ConstSceneInterfacePtr location;
+			SceneInterface::Name name;
+			SceneInterface::NameList childNames;
+			size_t nextChild;
+		};
+
+		void visit( const ConstSceneInterfacePtr &location, const SceneInterface::Name &name )
+		{
+			m_traversal.push_back( { location, name, SceneInterface::NameList(), 0 } );
+			location->childNames( m_traversal.back().childNames );
+		}
+
+		// Moves the traversal on to the next location in depth first order,
+		// starting again from the root for each frame. Returns false once
+		// every location has been visited for every frame.
+		bool advance()
+		{
+			while( !m_traversal.empty() )
+			{
+				TraversalLocation &parent = m_traversal.back();
+				if( parent.nextChild < parent.childNames.size() )
+				{
+					const SceneInterface::Name name = parent.childNames[parent.nextChild++];
+					ConstSceneInterfacePtr child = parent.location->child( name );
+					visit( child, name );
+					return true;
+				}
+				m_traversal.pop_back();
+			}
+
+			if( m_frame >= m_endFrame )
+			{
+				return false;
+			}
+
+			m_frame++;
+			visit( m_src, m_src->name() );
+			return true;
+		}
+
+		// Sets up `sample` to read the next location of the traversal.
+		// Returns false if there are no more locations.
+		bool queueSample( Sample &sample )
+		{
+			if( !advance() )
+			{
+				return false;
+			}
+
+			const TraversalLocation &location = m_traversal.back();
+			sample.location = location.location;
+			sample.name = location.name;
+			sample.depth = m_traversal.size() - 1;
+			// Only the source location itself may be the root
+			// of the scene, since the rest are its descendants.
+			sample.isRoot = sample.depth == 0 && m_srcIsRoot;
+			sample.time = m_frame / m_frameRate;
+			// Tags are only copied on the first frame.
+			sample.flags = m_frame == m_startFrame ? m_flags : m_flags & ~SceneAlgo::Tags;
+			sample.exception = nullptr;
+			sample.state = Sample::Pending;
+			return true;
+		}
+
+		// Called both from the read tasks and from the writing thread, which
+		// reads samples itself rather than waiting for tasks that haven't
+		// started yet. Whoever gets there first does the work.
+		void readSample( Sample &sample )
+		{
+			Sample::State expected = Sample::Pending;
+			if( !sample.state.compare_exchange_strong( expected, Sample::Reading ) )
+			{
+				return;
+			}
+
+			if( !m_stopping )
+			{
+				try
+				{
+					std::unique_ptr<LocationSample> data( new LocationSample );
+					readLocation( sample.location.get(), sample.isRoot, sample.time, sample.flags, *data );
+					m_memoryUsage += data->memoryUsage;
+					sample.data = std::move( data );
+				}
+				catch( ... )
+				{
+					sample.exception = std::current_exception();
+				}
+			}
+
+			{
+				std::lock_guard<std::mutex> lock( m_mutex );
+				sample.state = Sample::Read;
+			}
+			m_sampleRead.notify_all();
+		}
+
+		void writeSample( const Sample &sample )
+		{
+			// Only the destination locations on the path to the
+			// sample are kept, since the source is visited depth first.
+			m_dstLocations.resize( sample.depth );
+			SceneInterfacePtr dstLocation = sample.depth ? m_dstLocations.back()->child( sample.name, SceneInterface::CreateIfMissing ) : SceneInterfacePtr( m_dst );
+			m_dstLocations.push_back( dstLocation );
+
+			writeLocation( *sample.data, dstLocation.get(), sample.isRoot, sample.time, sample.flags );
+		}
+
+		const ConstSceneInterfacePtr m_src;
+		bool m_srcIsRoot;
+		SceneInterface *m_dst;
+		const int m_startFrame;
+		const int m_endFrame;
+		const float m_frameRate;
+		const unsigned m_flags;
+		const size_t m_memoryLimit;
+		const SceneAlgo::ProgressFunction &m_progress;
+		const Canceller *m_canceller;
+
+		// Ring buffer of the samples being read ahead of the writes.
+		std::vector<Sample> m_samples;
+
+		// Only accessed by the writing thread.
+		std::vector<TraversalLocation> m_traversal;
+		int m_frame;
+		std::vector<SceneInterfacePtr> m_dstLocations;
+		size_t m_numSamples;
+
+		std::atomic<size_t> m_memoryUsage;
+		std::atomic_bool m_stopping;
+		std::mutex m_mutex;
+		std::condition_variable m_sampleRead;
+		tbb::task_group m_tasks;
+
+};
+
 } // namespace
 
 namespace IECoreScene
@@ -245,25 +573,20 @@ SceneStats parallelReadAll( const SceneInterface *src, int startFrame, int endFr
 	std::atomic<size_t> locationCount( 0 );
 	::CopyInfo<std::atomic<size_t> > copyInfos;
 
-	auto locationFn = [&locationCount, &copyInfos]( const SceneInterface *src, SceneInterface *dst, double time, unsigned int flags )
+	auto locationFn = [&locationCount, &copyInfos, flags]( const SceneInterface *src, double time )
 	{
 		locationCount++;
-		::CopyInfo<size_t> copyInfo = ::handleLocation( src, nullptr, time, flags );
+		::CopyInfo<size_t> copyInfo = ::handleLocation( src, time, flags );
 
 		copyInfos.polygonCount += copyInfo.polygonCount;
 		copyInfos.tagCount += copyInfo.tagCount;
 		copyInfos.attributeCount += copyInfo.attributeCount;
 		copyInfos.curveCount += copyInfo.curveCount;
 		copyInfos.pointCount += copyInfo.pointCount;
+		return true;
 	};
 
-	for( int f = startFrame; f <= endFrame; ++f )
-	{
-		double time = f / frameRate;
-		tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
-		Task<decltype( locationFn )> *task = new( tbb::task::allocate_root( taskGroupContext ) ) Task<decltype( locationFn )>( src, nullptr, locationFn, time, flags );
-		tbb::task::spawn_root_and_wait( *task );
-	}
+	parallelTraverse( src, locationFn, startFrame, endFrame, frameRate );
 
 	SceneStats stats;
 	stats["locations"] = locationCount;
@@ -276,6 +599,26 @@ SceneStats parallelReadAll( const SceneInterface *src, int startFrame, int endFr
 	return stats;
 }
 
+void parallelTraverse(
+	const SceneInterface *src, const LocationFunction &locationFn, int startFrame, int endFrame, float frameRate,
+	const PathMatcher *filter, const Canceller *canceller
+)
+{
+	std::vector<double> times;
+	for( int f = startFrame; f <= endFrame; ++f )
+	{
+		times.push_back( f / frameRate );
+	}
+
+	SceneInterface::Path path;
+	src->path( path );
+
+	// Isolate the traversal, so that cancellation or exceptions from outer
+	// task groups don't leave it partially complete.
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+	::parallelTraverseWalk( src, path, locationFn, times, filter, canceller, taskGroupContext );
+}
+
 void copy( const SceneInterface *src, SceneInterface *dst, int startFrame, int endFrame, float frameRate, unsigned int flags )
 {
 	for( int f = startFrame; f <= endFrame; ++f )
@@ -287,10 +630,19 @@ void copy( const SceneInterface *src, SceneInterface *dst, int startFrame, int e
 			flags &= ~Tags;
 		}
 
-		::copy( src, dst, time, flags, ::handleLocation );
+		::copyWalk( src, dst, time, flags );
 	}
 }
 
+void copy(
+	const SceneInterface *src, SceneInterface *dst, int startFrame, int endFrame, float frameRate, unsigned int flags,
+	size_t memoryLimit, const ProgressFunction &progress, const Canceller *canceller
+)
+{
+	::CopyPipeline pipeline( src, dst, startFrame, endFrame, frameRate, flags, memoryLimit, progress, canceller );
+	pipeline.run();
+}
+
 } // SceneAlgo
 
 } // IECoreScene
\ No newline at end of file
@@ -34,6 +34,7 @@
 
 #include "IECoreScene/SceneCache.h"
 
+#include "BoundQueryAlgo.h"
 #include "TagSetAlgo.h"
 
 #include "IECoreScene/Primitive.h"
@@ -41,12 +42,16 @@
 #include "IECoreScene/SharedSceneInterfaces.h"
 #include "IECoreScene/VisibleRenderable.h"
 
-#include "IECore/ComputationCache.h"
+#include "IECore/CompoundData.h"
+#include "IECore/DataAlgo.h"
 #include "IECore/FileIndexedIO.h"
 #include "IECore/HeaderGenerator.h"
+#include "IECore/Interpolator.h"
+#include "IECore/LRUCache.h"
 #include "IECore/MessageHandler.h"
 #include "IECore/ObjectInterpolator.h"
 #include "IECore/SimpleTypedData.h"
+#include "IECore/VectorTypedData.h"
 #include "IECore/TransformationMatrixData.h"
 #include "IECore/PathMatcherData.h"
 
@@ -55,7 +60,20 @@
 #include "boost/core/demangle.hpp"
 #include "boost/tuple/tuple.hpp"
 
+#include "tbb/blocked_range.h"
 #include "tbb/concurrent_hash_map.h"
+#include "tbb/parallel_for.h"
+#include "tbb/task_arena.h"
+
+#include <algorithm>
+#include <atomic>
+#include <cmath>
+#include <condition_variable>
+#include <cstdlib>
+#include <limits>
+#include <map>
+#include <memory>
+#include <mutex>
 
 using namespace IECore;
 using namespace IECoreScene;
@@ -89,12 +107,621 @@ static InternedString ancestorTagsEntry("ancestorTags");
 static InternedString descendentTagsEntry("descendentTags");
 static InternedString setsEntry("sets");
 static InternedString childSetsEntry("childSets");
+static InternedString completeSetsEntry("sceneCache:completeSets");
+static InternedString completeSetsFlagEntry("complete");
 
 const SceneInterface::Name &SceneCache::animatedObjectTopologyAttribute = InternedString( "sceneInterface:animatedObjectTopology" );
 const SceneInterface::Name &SceneCache::animatedObjectPrimVarsAttribute = InternedString( "sceneInterface:animatedObjectPrimVars" );
 
 typedef std::vector<double> SampleTimes;
 
+// Sample times restored from a file, which are shared by all the
+// locations using them. Evenly spaced samples, which are by far the
+// most common, are located without searching.
+struct IndexedSampleTimes
+{
+
+	IndexedSampleTimes()
+		:	inverseStep( 0 )
+	{
+	}
+
+	explicit IndexedSampleTimes( const SampleTimes &sampleTimes )
+		:	times( sampleTimes ), inverseStep( 0 )
+	{
+		if( times.size() < 2 || times.back() <= times.front() )
+		{
+			return;
+		}
+
+		const double step = ( times.back() - times.front() ) / ( times.size() - 1 );
+		for( size_t i = 0; i < times.size(); ++i )
+		{
+			if( std::abs( times[i] - ( times.front() + i * step ) ) > step * 1e-6 )
+			{
+				return;
+			}
+		}
+		inverseStep = 1.0 / step;
+	}
+
+	// Returns the index of the first sample at or after `time`, which
+	// must be within the range of the samples.
+	size_t ceilIndex( double time ) const
+	{
+		if( inverseStep == 0 )
+		{
+			return std::lower_bound( times.begin(), times.end(), time ) - times.begin();
+		}
+
+		// The estimate may be one sample out due to rounding.
+		size_t result = std::min( (size_t)std::ceil( ( time - times.front() ) * inverseStep ), times.size() - 1 );
+		while( result > 0 && times[result - 1] >= time )
+		{
+			--result;
+		}
+		while( result < times.size() - 1 && times[result] < time )
+		{
+			++result;
+		}
+		return result;
+	}
+
+	SampleTimes times;
+	// Non-zero when the samples are evenly spaced.
+	double inverseStep;
+
+};
+
+//////////////////////////////////////////////////////////////////////////
+// Location table
+//////////////////////////////////////////////////////////////////////////
+
+static InternedString locationTableEntry( "sceneCache:locationTable" );
+static InternedString locationTableNamesEntry( "names" );
+static InternedString locationTableSubtreeBeginEntry( "subtreeBegin" );
+static InternedString locationTableFlagsEntry( "flags" );
+static InternedString locationTableSampleCountsEntry( "sampleCounts" );
+static InternedString locationTableTagNamesEntry( "tagNames" );
+static InternedString locationTableTagOffsetsEntry( "tagOffsets" );
+static InternedString locationTableTagIdsEntry( "tagIds" );
+
+// A flattened copy of the hierarchy, written when the file is closed, so
+// that readers can answer structural queries without loading the index of
+// each location. Locations are stored in the order they are flushed, with
+// the subtree of each location immediately preceding it, so the root is
+// last. Each column is stored as a single array.
+struct LocationTable
+{
+
+	enum Flags
+	{
+		HasObject = 1,
+		HasTransform = 2,
+		HasBound = 4
+	};
+
+	enum SampleCount
+	{
+		ObjectSamples,
+		TransformSamples,
+		BoundSamples,
+		NumSampleCounts
+	};
+
+	static const size_t npos = std::numeric_limits<size_t>::max();
+
+	size_t size() const
+	{
+		return names.size();
+	}
+
+	size_t root() const
+	{
+		return names.size() - 1;
+	}
+
+	unsigned sampleCount( size_t index, SampleCount sampleCount ) const
+	{
+		return sampleCounts[index * NumSampleCounts + sampleCount];
+	}
+
+	// Calls `f( childIndex )` for each child of the location, last child first.
+	template<typename F>
+	void children( size_t index, F &&f ) const
+	{
+		size_t i = index;
+		while( i > subtreeBegin[index] )
+		{
+			const size_t child = i - 1;
+			f( child );
+			i = subtreeBegin[child];
+		}
+	}
+
+	// Only valid for tables returned by `read()`.
+	size_t child( size_t index, const InternedString &name ) const
+	{
+		const auto begin = sortedChildren.begin() + childOffsets[index];
+		const auto end = sortedChildren.begin() + childOffsets[index + 1];
+		const auto it = std::lower_bound(
+			begin, end, name,
+			[this]( unsigned child, const InternedString &key ) {
+				return names[child] < key;
+			}
+		);
+		return it != end && names[*it] == name ? *it : npos;
+	}
+
+	void addLocation( const InternedString &name, size_t locationSubtreeBegin, unsigned char locationFlags, const unsigned *locationSampleCounts, const SceneInterface::NameList &tags )
+	{
+		names.push_back( name );
+		subtreeBegin.push_back( locationSubtreeBegin );
+		flags.push_back( locationFlags );
+		sampleCounts.insert( sampleCounts.end(), locationSampleCounts, locationSampleCounts + NumSampleCounts );
+
+		if( tagOffsets.empty() )
+		{
+			tagOffsets.push_back( 0 );
+		}
+		for( const auto &tag : tags )
+		{
+			auto inserted = tagIndices.insert( { tag, (unsigned)tagNames.size() } );
+			if( inserted.second )
+			{
+				tagNames.push_back( tag );
+			}
+			tagIds.push_back( inserted.first->second );
+		}
+		tagOffsets.push_back( tagIds.size() );
+	}
+
+	void write( IndexedIO *io ) const
+	{
+		writeColumn( io, locationTableNamesEntry, names );
+		writeColumn( io, locationTableSubtreeBeginEntry, subtreeBegin );
+		writeColumn( io, locationTableFlagsEntry, flags );
+		writeColumn( io, locationTableSampleCountsEntry, sampleCounts );
+		writeColumn( io, locationTableTagNamesEntry, tagNames );
+		writeColumn( io, locationTableTagOffsetsEntry, tagOffsets );
+		writeColumn( io, locationTableTagIdsEntry, tagIds );
+	}
+
+	static std::unique_ptr<const LocationTable> read( const IndexedIO *io )
+	{
+		std::unique_ptr<LocationTable> result( new LocationTable );
+		readColumn( io, locationTableNamesEntry, result->names );
+		readColumn( io, locationTableSubtreeBeginEntry, result->subtreeBegin );
+		readColumn( io, locationTableFlagsEntry, result->flags );
+		readColumn( io, locationTableSampleCountsEntry, result->sampleCounts );
+		readColumn( io, locationTableTagNamesEntry, result->tagNames );
+		readColumn( io, locationTableTagOffsetsEntry, result->tagOffsets );
+		readColumn( io, locationTableTagIdsEntry, result->tagIds );
+
+		const size_t size = result->names.size();
+		if(
+			!size || result->subtreeBegin.size() != size || result->flags.size() != size ||
+			result->sampleCounts.size() != size * NumSampleCounts || result->tagOffsets.size() != size + 1 ||
+			result->tagOffsets.back() != result->tagIds.size()
+		)
+		{
+			throw IOException( "Inconsistent location table" );
+		}
+
+		result->buildChildIndex();
+
+		return std::move( result );
+	}
+
+	size_t memoryUsage() const
+	{
+		return
+			names.capacity() * sizeof( InternedString ) +
+			subtreeBegin.capacity() * sizeof( unsigned ) +
+			flags.capacity() +
+			sampleCounts.capacity() * sizeof( unsigned ) +
+			tagNames.capacity() * sizeof( InternedString ) +
+			( tagOffsets.capacity() + tagIds.capacity() ) * sizeof( unsigned ) +
+			( childOffsets.capacity() + sortedChildren.capacity() ) * sizeof( unsigned )
+		;
+	}
+
+	// Sorts the children of each location by name, so that
+	// `child()` can use a binary search.
+	void buildChildIndex()
+	{
+		childOffsets.resize( size() + 1 );
+		sortedChildren.clear();
+		sortedChildren.reserve( size() );
+		for( size_t i = 0; i < size(); ++i )
+		{
+			if( subtreeBegin[i] > i )
+			{
+				throw IOException( "Inconsistent location table" );
+			}
+
+			childOffsets[i] = sortedChildren.size();
+			children( i, [this]( size_t child ) { sortedChildren.push_back( child ); } );
+			// InternedStrings compare by address, which is all we need
+			// for a binary search.
+			std::sort(
+				sortedChildren.begin() + childOffsets[i], sortedChildren.end(),
+				[this]( unsigned a, unsigned b ) { return names[a] < names[b]; }
+			);
+		}
+		childOffsets[size()] = sortedChildren.size();
+	}
+
+	std::vector<InternedString> names;
+	// Index of the first location in the subtree of each location.
+	std::vector<unsigned> subtreeBegin;
+	std::vector<unsigned char> flags;
+	// `NumSampleCounts` values for each location.
+	std::vector<unsigned> sampleCounts;
+	// The local tags of location `i` are `tagNames[tagIds[j]]`
+	// for `j` from `tagOffsets[i]` to `tagOffsets[i+1]`.
+	std::vector<InternedString> tagNames;
+	std::vector<unsigned> tagOffsets;
+	std::vector<unsigned> tagIds;
+	// Only used while writing.
+	std::map<InternedString, unsigned> tagIndices;
+	// Only used while reading. The children of location `i` are
+	// `sortedChildren[j]` for `j` from `childOffsets[i]` to
+	// `childOffsets[i+1]`, sorted by name.
+	std::vector<unsigned> childOffsets;
+	std::vector<unsigned> sortedChildren;
+
+	template<typename T>
+	static void writeColumn( IndexedIO *io, const IndexedIO::EntryID &name, const std::vector<T> &column )
+	{
+		// Empty columns aren't written at all.
+		if( !column.empty() )
+		{
+			io->write( name, column.data(), column.size() );
+		}
+	}
+
+	template<typename T>
+	static void readColumn( const IndexedIO *io, const IndexedIO::EntryID &name, std::vector<T> &column )
+	{
+		if( !io->hasEntry( name ) )
+		{
+			column.clear();
+			return;
+		}
+
+		column.resize( io->entry( name ).arrayLength() );
+		T *data = column.data();
+		io->read( name, data, column.size() );
+	}
+
+};
+
+const size_t LocationTable::npos;
+
+//////////////////////////////////////////////////////////////////////////
+// Primitive variable encoding
+//////////////////////////////////////////////////////////////////////////
+
+// Encoded primitive variables are stored as CompoundData containing
+// the encoded data and everything needed to decode it.
+static InternedString encodingEntry( "sceneCache:encoding" );
+static InternedString encodedTypeIdEntry( "typeId" );
+static InternedString encodedInterpretationEntry( "interpretation" );
+static InternedString encodedDataEntry( "data" );
+static InternedString encodedOffsetEntry( "offset" );
+static InternedString encodedScaleEntry( "scale" );
+static InternedString encodedMaxErrorEntry( "maxError" );
+
+static const float g_fixedPointMax = std::numeric_limits<unsigned short>::max();
+
+template<typename T>
+static size_t numComponents()
+{
+	return sizeof( typename T::ValueType::value_type ) / sizeof( float );
+}
+
+// Returns the encoded data, or the original data if it
+// can't be represented by the encoding.
+template<typename T>
+static ConstDataPtr encodeData( const T *data, SceneCache::PrimitiveVariableEncoding encoding )
+{
+	const float *values = data->baseReadable();
+	const size_t size = data->baseSize();
+	const size_t components = numComponents<T>();
+
+	CompoundDataPtr result = new CompoundData;
+	float maxError = 0;
+
+	if( encoding == SceneCache::HalfPrecision )
+	{
+		HalfVectorDataPtr halfData = new HalfVectorData;
+		std::vector<half> &halfValues = halfData->writable();
+		halfValues.resize( size );
+		for( size_t i = 0; i < size; ++i )
+		{
+			if( !std::isfinite( values[i] ) || std::abs( values[i] ) > HALF_MAX )
+			{
+				return data;
+			}
+			halfValues[i] = values[i];
+			maxError = std::max( maxError, std::abs( values[i] - (float)halfValues[i] ) );
+		}
+		result->writable()[encodedDataEntry] = halfData;
+	}
+	else
+	{
+		if( !size )
+		{
+			return data;
+		}
+
+		// 16 bit offsets from the minimum of each component
+		std::vector<float> offset( components, std::numeric_limits<float>::max() );
+		std::vector<float> scale( components, std::numeric_limits<float>::lowest() );
+		for( size_t i = 0; i < size; ++i )
+		{
+			if( !std::isfinite( values[i] ) )
+			{
+				return data;
+			}
+			offset[i % components] = std::min( offset[i % components], values[i] );
+			scale[i % components] = std::max( scale[i % components], values[i] );
+		}
+
+		for( size_t c = 0; c < components; ++c )
+		{
+			scale[c] = ( scale[c] - offset[c] ) / g_fixedPointMax;
+			if( !std::isfinite( scale[c] ) )
+			{
+				// The range overflows a float, so can't be represented.
+				return data;
+			}
+		}
+
+		UShortVectorDataPtr fixedPointData = new UShortVectorData;
+		std::vector<unsigned short> &fixedPointValues = fixedPointData->writable();
+		fixedPointValues.resize( size );
+		for( size_t i = 0; i < size; ++i )
+		{
+			const size_t c = i % components;
+			const float q = scale[c] > 0 ? std::round( ( values[i] - offset[c] ) / scale[c] ) : 0.0f;
+			fixedPointValues[i] = (unsigned short)std::min( std::max( q, 0.0f ), g_fixedPointMax );
+			const float decoded = offset[c] + (float)fixedPointValues[i] * scale[c];
+			if( !std::isfinite( decoded ) )
+			{
+				return data;
+			}
+			maxError = std::max( maxError, std::abs( values[i] - decoded ) );
+		}
+
+		result->writable()[encodedDataEntry] = fixedPointData;
+		result->writable()[encodedOffsetEntry] = new FloatVectorData( offset );
+		result->writable()[encodedScaleEntry] = new FloatVectorData( scale );
+	}
+
+	result->writable()[encodingEntry] = new IntData( encoding );
+	result->writable()[encodedTypeIdEntry] = new IntData( data->typeId() );
+	result->writable()[encodedInterpretationEntry] = new IntData( getGeometricInterpretation( data ) );
+	result->writable()[encodedMaxErrorEntry] = new FloatData( maxError );
+	return result;
+}
+
+static ConstDataPtr encodeData( const Data *data, SceneCache::PrimitiveVariableEncoding encoding )
+{
+	switch( data->typeId() )
+	{
+		case FloatVectorDataTypeId :
+			return encodeData( static_cast<const FloatVectorData *>( data ), encoding );
+		case V2fVectorDataTypeId :
+			return encodeData( static_cast<const V2fVectorData *>( data ), encoding );
+		case V3fVectorDataTypeId :
+			return encodeData( static_cast<const V3fVectorData *>( data ), encoding );
+		case Color3fVectorDataTypeId :
+			return encodeData( static_cast<const Color3fVectorData *>( data ), encoding );
+		default :
+			return data;
+	}
+}
+
+template<typename T>
+static DataPtr decodeData( const CompoundData *encoded, SceneCache::PrimitiveVariableEncoding encoding )
+{
+	typename T::Ptr result = new T;
+	const size_t components = numComponents<T>();
+
+	if( encoding == SceneCache::HalfPrecision )
+	{
+		const std::vector<half> &halfValues = encoded->member<HalfVectorData>( encodedDataEntry, true )->readable();
+		result->writable().resize( halfValues.size() / components );
+		float *values = result->baseWritable();
+		for( size_t i = 0; i < halfValues.size(); ++i )
+		{
+			values[i] = halfValues[i];
+		}
+	}
+	else
+	{
+		const std::vector<unsigned short> &fixedPointValues = encoded->member<UShortVectorData>( encodedDataEntry, true )->readable();
+		const std::vector<float> &offset = encoded->member<FloatVectorData>( encodedOffsetEntry, true )->readable();
+		const std::vector<float> &scale = encoded->member<FloatVectorData>( encodedScaleEntry, true )->readable();
+		if( offset.size() != components || scale.size() != components )
+		{
+			throw IOException( "SceneCache : Invalid fixed point primitive variable" );
+		}
+		result->writable().resize( fixedPointValues.size() / components );
+		float *values = result->baseWritable();
+		for( size_t i = 0; i < fixedPointValues.size(); ++i )
+		{
+			const size_t c = i % components;
+			values[i] = offset[c] + (float)fixedPointValues[i] * scale[c];
+		}
+	}
+
+	return result;
+}
+
+static DataPtr decodeData( const CompoundData *encoded )
+{
+	const SceneCache::PrimitiveVariableEncoding encoding = (SceneCache::PrimitiveVariableEncoding)encoded->member<IntData>( encodingEntry, true )->readable();
+	DataPtr result;
+	switch( encoded->member<IntData>( encodedTypeIdEntry, true )->readable() )
+	{
+		case FloatVectorDataTypeId :
+			result = decodeData<FloatVectorData>( encoded, encoding );
+			break;
+		case V2fVectorDataTypeId :
+			result = decodeData<V2fVectorData>( encoded, encoding );
+			break;
+		case V3fVectorDataTypeId :
+			result = decodeData<V3fVectorData>( encoded, encoding );
+			break;
+		case Color3fVectorDataTypeId :
+			result = decodeData<Color3fVectorData>( encoded, encoding );
+			break;
+		default :
+			throw IOException( "SceneCache : Unsupported encoded primitive variable type" );
+	}
+
+	setGeometricInterpretation( result.get(), (GeometricData::Interpretation)encoded->member<IntData>( encodedInterpretationEntry, true )->readable() );
+	return result;
+}
+
+static void decodePrimitiveVariables( PrimitiveVariableMap &variables )
+{
+	for( auto &variable : variables )
+	{
+		const CompoundData *encoded = runTimeCast<const CompoundData>( variable.second.data.get() );
+		if( encoded && encoded->readable().find( encodingEntry ) != encoded->readable().end() )
+		{
+			variable.second.data = decodeData( encoded );
+		}
+	}
+}
+
+//////////////////////////////////////////////////////////////////////////
+// ReaderCache
+//////////////////////////////////////////////////////////////////////////
+
+// Process wide cache of the objects loaded by SceneCache readers, limited
+// by the memory used by the objects it holds.
+template<typename Key>
+class ReaderCache : private boost::noncopyable
+{
+
+	public :
+
+		typedef ObjectPtr (*ComputeFn)( const Key &key );
+
+		ReaderCache( ComputeFn computeFn, const char *memoryLimitEnvVar, size_t defaultMemoryLimit )
+			:	m_computeFn( computeFn ),
+				m_cache(
+					[this] ( const GetterKey &key, size_t &cost ) { return getter( key, cost ); },
+					[this] ( const MurmurHash &hash, const ConstObjectPtr &object ) { removed( hash ); },
+					defaultMemoryLimit
+				),
+				m_lookups( 0 ), m_misses( 0 ), m_evictions( 0 )
+		{
+			if( const char *memoryLimit = getenv( memoryLimitEnvVar ) )
+			{
+				m_cache.setMaxCost( strtoull( memoryLimit, nullptr, 10 ) );
+			}
+		}
+
+		// Returns the object, computing it if it isn't cached.
+		ConstObjectPtr get( const MurmurHash &hash, const Key &key )
+		{
+			m_lookups++;
+			return m_cache.get( GetterKey( hash, &key ) );
+		}
+
+		// Returns the object if it is cached, and null otherwise. Doesn't
+		// add an entry for objects that aren't cached, and doesn't contribute
+		// to the lookup statistics.
+		ConstObjectPtr retrieve( const MurmurHash &hash, const Key &key )
+		{
+			if( !m_cache.cached( hash ) )
+			{
+				return nullptr;
+			}
+			// The object may have been evicted since the check above, in
+			// which case it is computed again rather than being cached as null.
+			return m_cache.get( GetterKey( hash, &key ) );
+		}
+
+		void setMemoryLimit( size_t memoryLimit )
+		{
+			m_cache.setMaxCost( memoryLimit );
+		}
+
+		size_t getMemoryLimit() const
+		{
+			return m_cache.getMaxCost();
+		}
+
+		CompoundDataPtr statistics() const
+		{
+			const uint64_t lookups = m_lookups;
+			const uint64_t misses = m_misses;
+
+			CompoundDataPtr result = new CompoundData();
+			result->writable()["hits"] = new UInt64Data( lookups > misses ? lookups - misses : 0 );
+			result->writable()["misses"] = new UInt64Data( misses );
+			result->writable()["evictions"] = new UInt64Data( m_evictions );
+			result->writable()["memoryUsage"] = new UInt64Data( m_cache.currentCost() );
+			result->writable()["memoryLimit"] = new UInt64Data( m_cache.getMaxCost() );
+			return result;
+		}
+
+		void clear()
+		{
+			m_cache.clear();
+			m_lookups = 0;
+			m_misses = 0;
+			m_evictions = 0;
+		}
+
+	private :
+
+		struct GetterKey
+		{
+			GetterKey( const MurmurHash &hash, const Key *key )
+				:	hash( hash ), key( key )
+			{
+			}
+
+			operator const MurmurHash & () const
+			{
+				return hash;
+			}
+
+			const MurmurHash &hash;
+			const Key *key;
+		};
+
+		typedef LRUCache<MurmurHash, ConstObjectPtr, LRUCachePolicy::Parallel, GetterKey> Cache;
+
+		ConstObjectPtr getter( const GetterKey &key, size_t &cost )
+		{
+			m_misses++;
+			ConstObjectPtr result = m_computeFn( *key.key );
+			cost = result ? result->memoryUsage() : 0;
+			return result;
+		}
+
+		void removed( const MurmurHash &hash )
+		{
+			m_evictions++;
+		}
+
+		ComputeFn m_computeFn;
+		Cache m_cache;
+		std::atomic<uint64_t> m_lookups;
+		std::atomic<uint64_t> m_misses;
+		std::atomic<uint64_t> m_evictions;
+
+};
+
 class SceneCache::Implementation : public RefCounted
 {
 	public :
@@ -112,7 +739,7 @@ class SceneCache::Implementation : public RefCounted
 			throw Exception( "File name not available in scene cache!" );
 		}
 
-		bool hasObject() const
+		virtual bool hasObject() const
 		{
 			return m_indexedIO->hasEntry( objectEntry );
 		}
@@ -138,7 +765,7 @@ class SceneCache::Implementation : public RefCounted
 			attributes->entryIds( attrsNames, IndexedIO::Directory );
 		}
 
-		bool hasTag( const Name &name, int filter ) const
+		virtual bool hasTag( const Name &name, int filter ) const
 		{
 			if ( !filter )
 			{
@@ -186,7 +813,7 @@ class SceneCache::Implementation : public RefCounted
 			return false;
 		}
 
-		void readTags( NameList &tags, int filter ) const
+		virtual void readTags( NameList &tags, int filter ) const
 		{
 			tags.clear();
 
@@ -244,7 +871,7 @@ class SceneCache::Implementation : public RefCounted
 			}
 		}
 
-		void childNames( NameList &childNames ) const
+		virtual void childNames( NameList &childNames ) const
 		{
 			ConstIndexedIOPtr children = m_indexedIO->subdirectory( childrenEntry, IndexedIO::NullIfMissing );
 			if ( !children )
@@ -256,7 +883,7 @@ class SceneCache::Implementation : public RefCounted
 			children->entryIds( childNames, IndexedIO::Directory );
 		}
 
-		bool hasChild( const Name &name ) const
+		virtual bool hasChild( const Name &name ) const
 		{
 			ConstIndexedIOPtr children = m_indexedIO->subdirectory( childrenEntry, IndexedIO::NullIfMissing );
 			if ( !children )
@@ -324,7 +951,7 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 
 		IE_CORE_DECLAREPTR( ReaderImplementation )
 
-		ReaderImplementation( IndexedIOPtr io, SceneCache::Implementation *parent = nullptr) : SceneCache::Implementation( io ), m_parent(static_cast< ReaderImplementation* >( parent )), m_sharedData(nullptr), m_boundSampleTimes(nullptr), m_transformSampleTimes(nullptr), m_objectSampleTimes(nullptr)
+		ReaderImplementation( IndexedIOPtr io, SceneCache::Implementation *parent = nullptr, size_t locationIndex = LocationTable::npos ) : SceneCache::Implementation( io ), m_parent(static_cast< ReaderImplementation* >( parent )), m_sharedData(nullptr), m_locationIndex( locationIndex ), m_boundSampleTimes(nullptr), m_transformSampleTimes(nullptr), m_objectSampleTimes(nullptr)
 		{
 			if ( m_parent )
 			{
@@ -334,7 +961,26 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 			else
 			{
 				// only the root instance allocate the map.
-				m_sharedData = new SharedData;
+				m_sharedData = new SharedData( m_indexedIO.get() );
+				if( m_indexedIO->hasEntry( locationTableEntry ) )
+				{
+					try
+					{
+						m_sharedData->locationTable = LocationTable::read( m_indexedIO->subdirectory( locationTableEntry ).get() );
+						m_locationIndex = m_sharedData->locationTable->root();
+					}
+					catch( const std::exception &e )
+					{
+						// The hierarchy can still be read without the table.
+						msg( Msg::Warning, "SceneCache", ( boost::format( "Ignoring location table : %s" ) % e.what() ).str() );
+					}
+				}
+				// Sets are only used if the writer finished writing all of them.
+				ConstIndexedIOPtr completeSetsIO = m_indexedIO->subdirectory( completeSetsEntry, IndexedIO::NullIfMissing );
+				if( completeSetsIO && completeSetsIO->hasEntry( completeSetsFlagEntry ) )
+				{
+					m_sharedData->completeSetsIO = completeSetsIO->subdirectory( setsEntry, IndexedIO::NullIfMissing );
+				}
 			}
 		}
 
@@ -367,7 +1013,7 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 			}
 		}
 
-		const SampleTimes &boundSampleTimes() const
+		const IndexedSampleTimes &boundSampleTimes() const
 		{
 			if ( !m_boundSampleTimes )
 			{
@@ -382,37 +1028,30 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 
 		double boundSampleTime( size_t sampleIndex ) const
 		{
-			const SampleTimes &sampleTimes = boundSampleTimes();
-			if ( sampleIndex >= sampleTimes.size() )
+			const IndexedSampleTimes &sampleTimes = boundSampleTimes();
+			if ( sampleIndex >= sampleTimes.times.size() )
 			{
 				throw Exception( "Sample index out of bounds!" );
 			}
-			return sampleTimes[sampleIndex];
+			return sampleTimes.times[sampleIndex];
 		}
 
-		static inline double sampleInterval( const SampleTimes &sampleTimes, double time, size_t &floorIndex, size_t &ceilIndex )
+		static inline double sampleInterval( const IndexedSampleTimes &sampleTimes, double time, size_t &floorIndex, size_t &ceilIndex )
 		{
-			SampleTimes::const_iterator it = sampleTimes.begin();
-			for ( ; it != sampleTimes.end(); it++ )
-			{
-				if ( time <= *it )
-				{
-					break;
-				}
-			}
-			if ( it == sampleTimes.begin() )
+			const SampleTimes &times = sampleTimes.times;
+			if ( times.empty() || time <= times.front() )
 			{
 				ceilIndex = floorIndex = 0;
 				return 0;
 			}
-			if ( it == sampleTimes.end() )
+			if ( time > times.back() )
 			{
-				ceilIndex = floorIndex = sampleTimes.size() - 1;
+				ceilIndex = floorIndex = times.size() - 1;
 				return 0;
 			}
-			ceilIndex = (it - sampleTimes.begin());
+			ceilIndex = sampleTimes.ceilIndex( time );
 			floorIndex = ceilIndex - 1;
-			double x = (time - sampleTimes[floorIndex]) / (sampleTimes[ceilIndex] - sampleTimes[floorIndex]);
+			double x = (time - times[floorIndex]) / (times[ceilIndex] - times[floorIndex]);
 			if ( x < 1e-4 )
 			{
 				x = 0;
@@ -426,14 +1065,20 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 
 		double boundSampleInterval( double time, size_t &floorIndex, size_t &ceilIndex ) const
 		{
-			const SampleTimes &sampleTimes = boundSampleTimes();
+			const IndexedSampleTimes &sampleTimes = boundSampleTimes();
 			return sampleInterval( sampleTimes, time, floorIndex, ceilIndex );
 		}
 
 		size_t numBoundSamples() const
 		{
-			const SampleTimes &sampleTimes = boundSampleTimes();
-			return sampleTimes.size();
+			if( const LocationTable *table = locationTable() )
+			{
+				// Locations without bounds have a single implicit sample.
+				return std::max( table->sampleCount( m_locationIndex, LocationTable::BoundSamples ), 1u );
+			}
+
+			const IndexedSampleTimes &sampleTimes = boundSampleTimes();
+			return sampleTimes.times.size();
 		}
 
 		Imath::Box3d readBoundAtSample( size_t sampleIndex ) const
@@ -456,14 +1101,32 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 			return result;
 		}
 
-		inline const SampleTimes &transformSampleTimes() const
+		Imath::Box3d readBound( double time ) const
 		{
-			if ( !m_transformSampleTimes )
+			size_t s0, s1;
+			const double x = boundSampleInterval( time, s0, s1 );
+			if( x == 0 )
 			{
-				m_transformSampleTimes = restoreSampleTimes( transformEntry );
-				if ( !m_transformSampleTimes )
-				{
-					m_transformSampleTimes = &g_defaults.implicitSample;
+				return readBoundAtSample( s0 );
+			}
+			if( x == 1 )
+			{
+				return readBoundAtSample( s1 );
+			}
+
+			Box3d result;
+			LinearInterpolator<Box3d>()( readBoundAtSample( s0 ), readBoundAtSample( s1 ), x, result );
+			return result;
+		}
+
+		inline const IndexedSampleTimes &transformSampleTimes() const
+		{
+			if ( !m_transformSampleTimes )
+			{
+				m_transformSampleTimes = restoreSampleTimes( transformEntry );
+				if ( !m_transformSampleTimes )
+				{
+					m_transformSampleTimes = &g_defaults.implicitSample;
 				}
 			}
 			return *m_transformSampleTimes;
@@ -471,23 +1134,29 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 
 		size_t numTransformSamples() const
 		{
-			const SampleTimes &sampleTimes = transformSampleTimes();
-			return sampleTimes.size();
+			if( const LocationTable *table = locationTable() )
+			{
+				// Locations without transforms have a single implicit sample.
+				return std::max( table->sampleCount( m_locationIndex, LocationTable::TransformSamples ), 1u );
+			}
+
+			const IndexedSampleTimes &sampleTimes = transformSampleTimes();
+			return sampleTimes.times.size();
 		}
 
 		double transformSampleTime( size_t sampleIndex ) const
 		{
-			const SampleTimes &sampleTimes = transformSampleTimes();
-			if ( sampleIndex >= sampleTimes.size() )
+			const IndexedSampleTimes &sampleTimes = transformSampleTimes();
+			if ( sampleIndex >= sampleTimes.times.size() )
 			{
 				throw Exception( "Sample index out of bounds!" );
 			}
-			return sampleTimes[sampleIndex];
+			return sampleTimes.times[sampleIndex];
 		}
 
 		double transformSampleInterval( double time, size_t &floorIndex, size_t &ceilIndex ) const
 		{
-			const SampleTimes &sampleTimes = transformSampleTimes();
+			const IndexedSampleTimes &sampleTimes = transformSampleTimes();
 			return sampleInterval( sampleTimes, time, floorIndex, ceilIndex );
 		}
 
@@ -501,7 +1170,47 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 			return dataToMatrix( readTransformAtSample( sampleIndex ).get() );
 		}
 
-		inline const SampleTimes &attributeSampleTimes( const SceneCache::Name &name ) const
+		Imath::M44d readTransformAsMatrix( double time ) const
+		{
+			if( !m_indexedIO->hasEntry( transformEntry ) )
+			{
+				// Common enough that it's worth skipping the transform cache.
+				return M44d();
+			}
+
+			size_t s0, s1;
+			const double x = transformSampleInterval( time, s0, s1 );
+			if( x == 0 )
+			{
+				return readTransformAsMatrixAtSample( s0 );
+			}
+			if( x == 1 )
+			{
+				return readTransformAsMatrixAtSample( s1 );
+			}
+
+			ConstDataPtr transform0 = readTransformAtSample( s0 );
+			ConstDataPtr transform1 = readTransformAtSample( s1 );
+			ConstDataPtr transform = runTimeCast<Data>( linearObjectInterpolation( transform0.get(), transform1.get(), x ) );
+			if( !transform )
+			{
+				transform = x >= 0.5 ? transform1 : transform0;
+			}
+			return dataToMatrix( transform.get() );
+		}
+
+		PathMatcher intersectingLocations( const std::vector<Imath::Plane3d> &planes, double time, const Canceller *canceller ) const
+		{
+			PathMatcher result;
+			Private::locationsIntersectingWalk(
+				this, Imath::M44d(), planes, time,
+				[]( const ReaderImplementation *location, double time ) { return location->readTransformAsMatrix( time ); },
+				result, canceller
+			);
+			return result;
+		}
+
+		inline const IndexedSampleTimes &attributeSampleTimes( const SceneCache::Name &name ) const
 		{
 			AttributeMapMutex::scoped_lock lock( m_attributeMutex, false );
 			AttributeSamplesMap::const_iterator cit = m_attributeSampleTimes.find( name );
@@ -512,7 +1221,7 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 
 			lock.upgrade_to_writer();
 
-			std::pair< AttributeSamplesMap::iterator, bool > it = m_attributeSampleTimes.insert( std::pair< IndexedIO::EntryID, SampleTimes* >( name, nullptr ) );
+			std::pair< AttributeSamplesMap::iterator, bool > it = m_attributeSampleTimes.insert( std::pair< IndexedIO::EntryID, const IndexedSampleTimes* >( name, nullptr ) );
 			if ( it.second )
 			{
 				it.first->second = restoreSampleTimes( attributesEntry, false, &name );
@@ -527,23 +1236,23 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 
 		size_t numAttributeSamples( const SceneCache::Name &name ) const
 		{
-			const SampleTimes &sampleTimes = attributeSampleTimes(name);
-			return sampleTimes.size();
+			const IndexedSampleTimes &sampleTimes = attributeSampleTimes(name);
+			return sampleTimes.times.size();
 		}
 
 		double attributeSampleTime( const SceneCache::Name &name, size_t sampleIndex ) const
 		{
-			const SampleTimes &sampleTimes = attributeSampleTimes( name );
-			if ( sampleIndex >= sampleTimes.size() )
+			const IndexedSampleTimes &sampleTimes = attributeSampleTimes( name );
+			if ( sampleIndex >= sampleTimes.times.size() )
 			{
 				throw Exception( "Sample index out of bounds!" );
 			}
-			return sampleTimes[sampleIndex];
+			return sampleTimes.times[sampleIndex];
 		}
 
 		double attributeSampleInterval( const SceneCache::Name &name, double time, size_t &floorIndex, size_t &ceilIndex ) const
 		{
-			const SampleTimes &sampleTimes = attributeSampleTimes( name );
+			const IndexedSampleTimes &sampleTimes = attributeSampleTimes( name );
 			return sampleInterval( sampleTimes, time, floorIndex, ceilIndex );
 		}
 
@@ -552,7 +1261,7 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 			return m_sharedData->readAttributeAtSample( this, name, sampleIndex );
 		}
 
-		inline const SampleTimes &objectSampleTimes() const
+		inline const IndexedSampleTimes &objectSampleTimes() const
 		{
 			if ( !m_objectSampleTimes )
 			{
@@ -563,23 +1272,29 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 
 		size_t numObjectSamples() const
 		{
-			const SampleTimes &sampleTimes = objectSampleTimes();
-			return sampleTimes.size();
+			const LocationTable *table = locationTable();
+			if( table && table->sampleCount( m_locationIndex, LocationTable::ObjectSamples ) )
+			{
+				return table->sampleCount( m_locationIndex, LocationTable::ObjectSamples );
+			}
+
+			const IndexedSampleTimes &sampleTimes = objectSampleTimes();
+			return sampleTimes.times.size();
 		}
 
 		double objectSampleTime( size_t sampleIndex ) const
 		{
-			const SampleTimes &sampleTimes = objectSampleTimes();
-			if ( sampleIndex >= sampleTimes.size() )
+			const IndexedSampleTimes &sampleTimes = objectSampleTimes();
+			if ( sampleIndex >= sampleTimes.times.size() )
 			{
 				throw Exception( "Sample index out of bounds!" );
 			}
-			return sampleTimes[sampleIndex];
+			return sampleTimes.times[sampleIndex];
 		}
 
 		double objectSampleInterval( double time, size_t &floorIndex, size_t &ceilIndex ) const
 		{
-			const SampleTimes &sampleTimes = objectSampleTimes();
+			const IndexedSampleTimes &sampleTimes = objectSampleTimes();
 			return sampleInterval( sampleTimes, time, floorIndex, ceilIndex );
 		}
 
@@ -590,7 +1305,9 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 
 		static PrimitiveVariableMap readObjectPrimitiveVariablesAtSample( const IndexedIOPtr &io, const std::vector<InternedString> &primVarNames, size_t sample, const Canceller *canceller )
 		{
-			return Primitive::loadPrimitiveVariables( io->subdirectory( objectEntry ).get(), sampleEntry(sample), primVarNames, canceller );
+			PrimitiveVariableMap result = Primitive::loadPrimitiveVariables( io->subdirectory( objectEntry ).get(), sampleEntry(sample), primVarNames, canceller );
+			decodePrimitiveVariables( result );
+			return result;
 		}
 
 		PrimitiveVariableMap readObjectPrimitiveVariables( const std::vector<InternedString> &primVarNames, double time ) const
@@ -612,6 +1329,8 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 			IndexedIOPtr objectIO = m_indexedIO->subdirectory( objectEntry );
 			PrimitiveVariableMap map1 = Primitive::loadPrimitiveVariables( objectIO.get(), sampleEntry(sample1), primVarNames );
 			PrimitiveVariableMap map2 = Primitive::loadPrimitiveVariables( objectIO.get(), sampleEntry(sample2), primVarNames );
+			decodePrimitiveVariables( map1 );
+			decodePrimitiveVariables( map2 );
 
 			for ( PrimitiveVariableMap::iterator it1 = map1.begin(); it1 != map1.end(); it1++ )
 			{
@@ -625,6 +1344,85 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 			return map1;
 		}
 
+		void prefetch( const PathMatcher &paths, double startTime, double endTime, const Canceller *canceller )
+		{
+			SharedData::PrefetchPtr prefetch = new SharedData::Prefetch( canceller );
+			{
+				std::lock_guard<std::mutex> lock( m_sharedData->prefetchesMutex );
+				std::vector<SharedData::PrefetchPtr> &prefetches = m_sharedData->prefetches;
+				prefetches.erase(
+					std::remove_if( prefetches.begin(), prefetches.end(), [] ( const SharedData::PrefetchPtr &p ) { return p->finished(); } ),
+					prefetches.end()
+				);
+				prefetches.push_back( prefetch );
+			}
+
+			ReaderImplementationPtr root = this;
+			while( root->m_parent )
+			{
+				root = root->m_parent;
+			}
+
+			if( startTime > endTime )
+			{
+				std::swap( startTime, endTime );
+			}
+
+			// The task holds a reference to the root, so the file remains
+			// open until the prefetch completes.
+			prefetchArena().enqueue(
+				[root, paths, startTime, endTime, prefetch] {
+					try
+					{
+						std::vector<ReaderImplementationPtr> locations;
+						SceneCache::Path path;
+						root->prefetchLocations( path, paths, *prefetch, locations );
+
+						tbb::parallel_for(
+							tbb::blocked_range<size_t>( 0, locations.size() ),
+							[&locations, startTime, endTime, &prefetch] ( const tbb::blocked_range<size_t> &range ) {
+								for( size_t i = range.begin(); i != range.end(); ++i )
+								{
+									locations[i]->prefetchSamples( startTime, endTime, *prefetch );
+								}
+							}
+						);
+					}
+					catch( const Cancelled & )
+					{
+					}
+					catch( const std::exception &e )
+					{
+						msg( Msg::Warning, "SceneCache::prefetch", e.what() );
+					}
+					prefetch->finish();
+				}
+			);
+		}
+
+		void cancelPrefetch()
+		{
+			std::lock_guard<std::mutex> lock( m_sharedData->prefetchesMutex );
+			for( const auto &prefetch : m_sharedData->prefetches )
+			{
+				prefetch->canceller.cancel();
+			}
+		}
+
+		void waitForPrefetch()
+		{
+			std::vector<SharedData::PrefetchPtr> prefetches;
+			{
+				std::lock_guard<std::mutex> lock( m_sharedData->prefetchesMutex );
+				prefetches = m_sharedData->prefetches;
+			}
+
+			for( const auto &prefetch : prefetches )
+			{
+				prefetch->wait();
+			}
+		}
+
 		ReaderImplementationPtr child( const Name &name, MissingBehaviour missingBehaviour )
 		{
 			IndexedIOPtr children = m_indexedIO->subdirectory( childrenEntry, (IndexedIO::MissingBehaviour)missingBehaviour );
@@ -637,7 +1435,7 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 			{
 				return nullptr;
 			}
-			return new ReaderImplementation( childIO, this );
+			return new ReaderImplementation( childIO, this, childLocationIndex( name ) );
 		}
 
 		ReaderImplementationPtr child( const Name &name, MissingBehaviour missingBehaviour ) const
@@ -652,7 +1450,125 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 			{
 				return nullptr;
 			}
-			return new ReaderImplementation( childIO, const_cast<ReaderImplementation*> ( this ) );
+			return new ReaderImplementation( childIO, const_cast<ReaderImplementation*> ( this ), childLocationIndex( name ) );
+		}
+
+		// Structural queries are answered from the location table when the
+		// file has one, so that the index of the location needn't be loaded.
+
+		bool hasObject() const override
+		{
+			if( const LocationTable *table = locationTable() )
+			{
+				return table->flags[m_locationIndex] & LocationTable::HasObject;
+			}
+			return Implementation::hasObject();
+		}
+
+		bool hasTag( const Name &name, int filter ) const override
+		{
+			const LocationTable *table = locationTable();
+			if( !table || filter != SceneInterface::LocalTag )
+			{
+				return Implementation::hasTag( name, filter );
+			}
+
+			for( unsigned i = table->tagOffsets[m_locationIndex]; i < table->tagOffsets[m_locationIndex + 1]; ++i )
+			{
+				if( table->tagNames[table->tagIds[i]] == name )
+				{
+					return true;
+				}
+			}
+			return false;
+		}
+
+		void readTags( NameList &tags, int filter ) const override
+		{
+			const LocationTable *table = locationTable();
+			if( !table || filter != SceneInterface::LocalTag )
+			{
+				Implementation::readTags( tags, filter );
+				return;
+			}
+
+			tags.clear();
+			for( unsigned i = table->tagOffsets[m_locationIndex]; i < table->tagOffsets[m_locationIndex + 1]; ++i )
+			{
+				tags.push_back( table->tagNames[table->tagIds[i]] );
+			}
+		}
+
+		void childNames( NameList &childNames ) const override
+		{
+			const LocationTable *table = locationTable();
+			if( !table )
+			{
+				Implementation::childNames( childNames );
+				return;
+			}
+
+			childNames.clear();
+			table->children( m_locationIndex, [&]( size_t child ) { childNames.push_back( table->names[child] ); } );
+			std::reverse( childNames.begin(), childNames.end() );
+		}
+
+		bool hasChild( const Name &name ) const override
+		{
+			if( locationTable() )
+			{
+				return childLocationIndex( name ) != LocationTable::npos;
+			}
+			return Implementation::hasChild( name );
+		}
+
+		size_t memoryUsage() const
+		{
+			size_t result = m_sharedData->memoryUsage();
+			if( const StreamIndexedIO *streamIndexedIO = runTimeCast<const StreamIndexedIO>( m_indexedIO.get() ) )
+			{
+				result += streamIndexedIO->indexMemoryUsage();
+			}
+			return result;
+		}
+
+		PathMatcher locationPaths( bool objectsOnly ) const
+		{
+			PathMatcher result;
+			SceneInterface::Path path;
+
+			const LocationTable *table = locationTable();
+			if( !table )
+			{
+				locationPathsWalk( path, objectsOnly, result );
+				return result;
+			}
+
+			// Walking backwards from a location visits its subtree depth first,
+			// with parents before their children. We keep a stack of the ancestors
+			// of the current location so we know when to pop from the path.
+			std::vector<size_t> ancestors;
+			for( size_t i = m_locationIndex + 1; i-- > table->subtreeBegin[m_locationIndex]; )
+			{
+				while( !ancestors.empty() && i < table->subtreeBegin[ancestors.back()] )
+				{
+					ancestors.pop_back();
+					path.pop_back();
+				}
+
+				if( i != m_locationIndex )
+				{
+					path.push_back( table->names[i] );
+					ancestors.push_back( i );
+				}
+
+				if( !objectsOnly || table->flags[i] & LocationTable::HasObject )
+				{
+					result.addPath( path );
+				}
+			}
+
+			return result;
 		}
 
 		SceneCache::ImplementationPtr scene( const Path &path, MissingBehaviour missingBehaviour )
@@ -773,6 +1689,21 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 			return reader;
 		}
 
+		/// Returns the set relative to this location, read from the sets stored
+		/// for the whole file, or null if the file doesn't have them.
+		ConstPathMatcherDataPtr readCompleteSet( const Name &name ) const
+		{
+			ConstPathMatcherDataPtr set = m_sharedData->readCompleteSet( name );
+			if( !set || !m_parent )
+			{
+				return set;
+			}
+
+			SceneCache::Path p;
+			path( p );
+			return new PathMatcherData( set->readable().subTree( p ) );
+		}
+
 		PathMatcher readSet( const Name &name, bool includeDescendantSets, const Canceller *canceller ) const
 		{
 			SceneInterface::Path prefix;
@@ -816,177 +1747,374 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 
 		}
 
-		NameList setNames( bool includeDescendantSets ) const
+		NameList setNames( bool includeDescendantSets ) const
+		{
+			NameList setNames;
+			IndexedIOPtr setsIO = m_indexedIO->subdirectory( setsEntry, IECore::IndexedIO::NullIfMissing );
+			if( setsIO )
+			{
+				setsIO->entryIds( setNames, IndexedIO::Directory );
+			}
+
+			if ( includeDescendantSets )
+			{
+				NameList childSets = readChildSets();
+				setNames.insert( setNames.end(), childSets.begin(), childSets.end() );
+			}
+
+			// ensure our set names are unique
+			std::sort( setNames.begin(), setNames.end() );
+			return NameList( setNames.begin(), std::unique( setNames.begin(), setNames.end() ) );
+		}
+
+	private :
+
+		/// read a set set explicitly defined at this location
+		PathMatcherDataPtr readLocalSet( const Name &name ) const
+		{
+			IndexedIOPtr setsIO = m_indexedIO->subdirectory( setsEntry, IECore::IndexedIO::NullIfMissing );
+
+			if( setsIO  && setsIO->hasEntry( name ) )
+			{
+				ObjectPtr obj = IECore::Object::load( setsIO, name );
+
+				if ( PathMatcherDataPtr pathMatcherData = IECore::runTimeCast<PathMatcherData>( obj ) )
+				{
+					return pathMatcherData;
+				}
+			}
+
+			return new PathMatcherData();
+		}
+
+		// \todo Consider using concurrent_vector for constant access time.
+		typedef tbb::concurrent_hash_map< uint64_t, IndexedSampleTimes > SampleTimesMap;
+		typedef std::map< IndexedIO::EntryID, const IndexedSampleTimes* > AttributeSamplesMap;
+		typedef tbb::spin_rw_mutex AttributeMapMutex;
+
+		typedef std::pair< const ReaderImplementation *, size_t > SimpleCacheKey;
+		typedef tuple< const ReaderImplementation *, const SceneCache::Name &, size_t > AttributeCacheKey;
+
+		typedef ReaderCache< SimpleCacheKey > SimpleCache;
+		typedef ReaderCache< AttributeCacheKey > AttributeCache;
+
+	public :
+
+		static SimpleCache &objectCache()
+		{
+			static SimpleCache *g_cache = new SimpleCache( doReadObjectAtSample, "IECORESCENE_SCENECACHE_OBJECT_CACHE_MEMORY_LIMIT", 500 * 1024 * 1024 );
+			return *g_cache;
+		}
+
+		static AttributeCache &attributeCache()
+		{
+			static AttributeCache *g_cache = new AttributeCache( doReadAttributeAtSample, "IECORESCENE_SCENECACHE_ATTRIBUTE_CACHE_MEMORY_LIMIT", 100 * 1024 * 1024 );
+			return *g_cache;
+		}
+
+		static SimpleCache &transformCache()
+		{
+			static SimpleCache *g_cache = new SimpleCache( doReadTransformAtSample, "IECORESCENE_SCENECACHE_TRANSFORM_CACHE_MEMORY_LIMIT", 50 * 1024 * 1024 );
+			return *g_cache;
+		}
+
+	private :
+
+		/// Hold pointers to values allocated/deallocated by the root scene object (the last one to die)
+		class SharedData : public RefCounted
+		{
+			public :
+
+				SharedData( const IndexedIO *io ) : sampleTimesMemory( 0 )
+				{
+					if( const StreamIndexedIO *streamIndexedIO = runTimeCast<const StreamIndexedIO>( io ) )
+					{
+						fileIdentity = streamIndexedIO->fileIdentity();
+					}
+					if( fileIdentity == MurmurHash() )
+					{
+						// The file can't be identified, so its entries can't be
+						// shared with any other reader.
+						fileIdentity.append( g_nextUniqueId++ );
+					}
+				}
+
+				/// utility function used by the ReaderImplementation to use the LRUCache for transform reading
+				IECore::ConstDataPtr readTransformAtSample( const ReaderImplementation *reader, size_t sample )
+				{
+					SimpleCacheKey key( reader, sample );
+					return runTimeCast< const Data >( transformCache().get( simpleHash( key ), key ) );
+				}
+
+				/// utility function used by the ReaderImplementation to use the LRUCache for object reading
+				IECore::ConstObjectPtr readObjectAtSample( const ReaderImplementation *reader, size_t sample, const Canceller *canceller )
+				{
+					// \todo - we should pass the Canceller through to Object::load, but this is currently
+					// complicated by the objectCache.  We should perhaps remove the objectCache anyway, since it
+					// is redundant with Gaffer's cache?  Though caching the topology for the special
+					// "animatedObjectPrimVars" mode could still be valuable?
+					Canceller::check( canceller );
+					SimpleCacheKey key( reader, sample );
+					return objectCache().get( simpleHash( key ), key );
+				}
+
+				/// utility function used by the ReaderImplementation to use the LRUCache for attribute reading
+				IECore::ConstObjectPtr readAttributeAtSample( const ReaderImplementation *reader, const SceneCache::Name &name, size_t sample )
+				{
+					AttributeCacheKey key( reader, name, sample );
+					return attributeCache().get( attributeHash( key ), key );
+				}
+
+				// \todo Consider adding "ReaderImplementation *rootScene" to optimize the scene() calls.
+				SampleTimesMap sampleTimesMap;
+				// Memory used by the entries of sampleTimesMap.
+				std::atomic<size_t> sampleTimesMemory;
+				/// A set of background reads scheduled by prefetch().
+				struct Prefetch : public RefCounted
+				{
+					Prefetch( const Canceller *externalCanceller )
+						:	externalCanceller( externalCanceller ), done( false )
+					{
+					}
+
+					void check() const
+					{
+						Canceller::check( &canceller );
+						Canceller::check( externalCanceller );
+					}
+
+					void finish()
+					{
+						std::lock_guard<std::mutex> lock( mutex );
+						done = true;
+						condition.notify_all();
+					}
+
+					bool finished()
+					{
+						std::lock_guard<std::mutex> lock( mutex );
+						return done;
+					}
+
+					void wait()
+					{
+						std::unique_lock<std::mutex> lock( mutex );
+						condition.wait( lock, [this] { return done; } );
+					}
+
+					Canceller canceller;
+					const Canceller *externalCanceller;
+					std::mutex mutex;
+					std::condition_variable condition;
+					bool done;
+				};
+
+				IE_CORE_DECLAREPTR( Prefetch );
+
+				std::mutex prefetchesMutex;
+				std::vector<PrefetchPtr> prefetches;
+
+				// Distinguishes the entries of this file in the process wide caches
+				// from those of other files, including files previously opened with the
+				// same name. Files opened for reading are identified by their device, inode,
+				// size and modification time, so reopening an unchanged file reuses the
+				// entries cached for it.
+				MurmurHash fileIdentity;
+
+				// Null if the file doesn't have a location table.
+				std::unique_ptr<const LocationTable> locationTable;
+
+				/// Returns the set stored for the whole file, or null if the file
+				/// wasn't written with complete sets.
+				ConstPathMatcherDataPtr readCompleteSet( const SceneCache::Name &name )
+				{
+					if( !completeSetsIO )
+					{
+						return nullptr;
+					}
+
+					{
+						std::lock_guard<std::mutex> lock( completeSetsMutex );
+						auto it = completeSets.find( name );
+						if( it != completeSets.end() )
+						{
+							return it->second;
+						}
+					}
+
+					// Load outside the lock, so that reads of different sets
+					// don't wait for each other.
+					ConstPathMatcherDataPtr set;
+					if( completeSetsIO->hasEntry( name ) )
+					{
+						set = runTimeCast<const PathMatcherData>( Object::load( completeSetsIO, name ) );
+					}
+					if( !set )
+					{
+						set = new PathMatcherData;
+					}
+
+					std::lock_guard<std::mutex> lock( completeSetsMutex );
+					return completeSets.insert( { name, set } ).first->second;
+				}
+
+				/// Returns an estimate of the memory used by the data shared by
+				/// all the locations of the file.
+				size_t memoryUsage()
+				{
+					size_t result = sizeof( SharedData );
+					if( locationTable )
+					{
+						result += locationTable->memoryUsage();
+					}
+
+					result += sampleTimesMemory;
+
+					std::lock_guard<std::mutex> lock( completeSetsMutex );
+					for( const auto &set : completeSets )
+					{
+						result += set.second->memoryUsage();
+					}
+					return result;
+				}
+
+				// Null if the file doesn't have complete sets.
+				ConstIndexedIOPtr completeSetsIO;
+				std::mutex completeSetsMutex;
+				std::map<SceneCache::Name, ConstPathMatcherDataPtr> completeSets;
+
+				static std::atomic<uint64_t> g_nextUniqueId;
+
+		};
+
+		// Separate arena for the prefetch tasks, so that the caller's own
+		// parallel work isn't queued behind them.
+		static tbb::task_arena &prefetchArena()
+		{
+			static tbb::task_arena *g_arena = new tbb::task_arena();
+			return *g_arena;
+		}
+
+		// Appends the locations matched by `paths` to `locations`, visiting only the
+		// parts of the hierarchy which contain matches.
+		void prefetchLocations( SceneCache::Path &path, const PathMatcher &paths, const SharedData::Prefetch &prefetch, std::vector<ReaderImplementationPtr> &locations )
 		{
-			NameList setNames;
-			IndexedIOPtr setsIO = m_indexedIO->subdirectory( setsEntry, IECore::IndexedIO::NullIfMissing );
-			if( setsIO )
+			prefetch.check();
+
+			const unsigned match = paths.match( path );
+			if( match & PathMatcher::ExactMatch )
 			{
-				setsIO->entryIds( setNames, IndexedIO::Directory );
+				locations.push_back( this );
 			}
 
-			if ( includeDescendantSets )
+			if( !( match & PathMatcher::DescendantMatch ) )
 			{
-				NameList childSets = readChildSets();
-				setNames.insert( setNames.end(), childSets.begin(), childSets.end() );
+				return;
 			}
 
-			// ensure our set names are unique
-			std::sort( setNames.begin(), setNames.end() );
-			return NameList( setNames.begin(), std::unique( setNames.begin(), setNames.end() ) );
-		}
-
-	private :
-
-		/// read a set set explicitly defined at this location
-		PathMatcherDataPtr readLocalSet( const Name &name ) const
-		{
-			IndexedIOPtr setsIO = m_indexedIO->subdirectory( setsEntry, IECore::IndexedIO::NullIfMissing );
-
-			if( setsIO  && setsIO->hasEntry( name ) )
+			NameList children;
+			childNames( children );
+			for( const auto &childName : children )
 			{
-				ObjectPtr obj = IECore::Object::load( setsIO, name );
-
-				if ( PathMatcherDataPtr pathMatcherData = IECore::runTimeCast<PathMatcherData>( obj ) )
-				{
-					return pathMatcherData;
-				}
+				path.push_back( childName );
+				child( childName, SceneInterface::ThrowIfMissing )->prefetchLocations( path, paths, prefetch, locations );
+				path.pop_back();
 			}
-
-			return new PathMatcherData();
 		}
 
-		// \todo Consider using concurrent_vector for constant access time.
-		typedef tbb::concurrent_hash_map< uint64_t, SampleTimes > SampleTimesMap;
-		typedef std::map< IndexedIO::EntryID, const SampleTimes* > AttributeSamplesMap;
-		typedef tbb::spin_rw_mutex AttributeMapMutex;
-
-		typedef std::pair< const ReaderImplementation *, size_t > SimpleCacheKey;
-		typedef tuple< const ReaderImplementation *, const SceneCache::Name &, size_t > AttributeCacheKey;
-
-		typedef IECore::ComputationCache< SimpleCacheKey > SimpleCache;
-		typedef IECore::ComputationCache< AttributeCacheKey > AttributeCache;
-
-		/// Hold pointers to values allocated/deallocated by the root scene object (the last one to die)
-		class SharedData : public RefCounted
+		// Returns the range of samples needed to evaluate times
+		// between `startTime` and `endTime`.
+		static void sampleRange( const IndexedSampleTimes &sampleTimes, double startTime, double endTime, size_t &firstIndex, size_t &lastIndex )
 		{
-			public :
-
-				SharedData() :
-					objectCache( new SimpleCache( doReadObjectAtSample, simpleHash,  10000 )  ),
-					attributeCache( new AttributeCache( doReadAttributeAtSample, attributeHash, 1000) ),
-					transformCache( new SimpleCache(  doReadTransformAtSample, simpleHash, 1000) )
-				{
-				}
+			size_t floorIndex, ceilIndex;
+			firstIndex = sampleInterval( sampleTimes, startTime, floorIndex, ceilIndex ) == 1 ? ceilIndex : floorIndex;
+			lastIndex = sampleInterval( sampleTimes, endTime, floorIndex, ceilIndex ) == 0 ? floorIndex : ceilIndex;
+		}
 
-				/// utility function used by the ReaderImplementation to use the LRUCache for transform reading
-				IECore::ConstDataPtr readTransformAtSample( const ReaderImplementation *reader, size_t sample )
+		// Reads all the samples needed to evaluate this location between
+		// `startTime` and `endTime`, so that they are held in the caches.
+		void prefetchSamples( double startTime, double endTime, const SharedData::Prefetch &prefetch ) const
+		{
+			size_t firstIndex, lastIndex;
+			try
+			{
+				if( hasObject() )
 				{
-					return runTimeCast< const Data >( transformCache->get( SimpleCacheKey(reader, sample) ) );
+					sampleRange( objectSampleTimes(), startTime, endTime, firstIndex, lastIndex );
+					for( size_t i = firstIndex; i <= lastIndex; ++i )
+					{
+						prefetch.check();
+						readObjectAtSample( i, &prefetch.canceller );
+					}
 				}
 
-				/// utility function used by the ReaderImplementation to use the LRUCache for object reading
-				IECore::ConstObjectPtr readObjectAtSample( const ReaderImplementation *reader, size_t sample, const Canceller *canceller )
+				sampleRange( transformSampleTimes(), startTime, endTime, firstIndex, lastIndex );
+				for( size_t i = firstIndex; i <= lastIndex; ++i )
 				{
-					// \todo - we should pass the Canceller through to Object::load, but this is currently
-					// complicated by the objectCache.  We should perhaps remove the objectCache anyway, since it
-					// is redundant with Gaffer's cache?  Though caching the topology for the special
-					// "animatedObjectPrimVars" mode could still be valuable?
-					const size_t defaultSample = -1;
-					SimpleCacheKey currentKey( reader, sample );
-
-					// if constant topology and the object is not in the cache, we try to build it from another frame
-					if ( reader->hasAttribute(animatedObjectPrimVarsAttribute) )
-					{
-						/// Could not create the object from another time sample... so we load the entire object
-						SimpleCacheKey defaultKey( reader, defaultSample );
-
-						Canceller::check( canceller );
-						ConstObjectPtr obj = objectCache->get( currentKey, SimpleCache::NullIfMissing );
-						if ( !obj )
-						{
-							/// ok, try to build the object from another frame...
-							Canceller::check( canceller );
-							ConstObjectPtr defaultObj = objectCache->get( defaultKey, SimpleCache::NullIfMissing );
-							if ( defaultObj )
-							{
-								IECore::ConstInternedStringVectorDataPtr varNames = runTimeCast<const InternedStringVectorData>( reader->readAttributeAtSample(animatedObjectPrimVarsAttribute, 0) );
-								if ( varNames )
-								{
-									PrimitivePtr prim= runTimeCast< Primitive >( defaultObj->copy() );
-									if ( prim )
-									{
-										// we managed to load the object from a different time sample from the cache, just have to load the changing prim vars...
-										mergeMaps( prim->variables, readObjectPrimitiveVariablesAtSample( reader->m_indexedIO, varNames->readable(), sample, canceller ) );
-										objectCache->set( currentKey, prim.get(), ObjectPool::StoreReference );
-										return prim;
-									}
-								}
-							}
-							/// ok, we don't have the object even from other times in the cache... load it from the file then.
-							Canceller::check( canceller );
-							obj = objectCache->get( currentKey );
-						}
-						/// register the object as the default, so next frames could reuse them
-						objectCache->set( defaultKey, obj.get(), ObjectPool::StoreReference );
-						return obj;
-					}
-					/// The object has animated topology... so we load the entire object
-					ConstObjectPtr obj = objectCache->get(currentKey);
-					return obj;
+					prefetch.check();
+					readTransformAtSample( i );
 				}
 
-				/// utility function used by the ReaderImplementation to use the LRUCache for attribute reading
-				IECore::ConstObjectPtr readAttributeAtSample( const ReaderImplementation *reader, const SceneCache::Name &name, size_t sample )
+				// Bounds aren't cached by the SceneCache, but reading them
+				// loads their part of the file index.
+				sampleRange( boundSampleTimes(), startTime, endTime, firstIndex, lastIndex );
+				for( size_t i = firstIndex; i <= lastIndex; ++i )
 				{
-					return attributeCache->get( AttributeCacheKey(reader,name,sample) );
+					prefetch.check();
+					readBoundAtSample( i );
 				}
+			}
+			catch( const Cancelled & )
+			{
+				throw;
+			}
+			catch( const std::exception & )
+			{
+				// Errors are left to be reported when the location
+				// is read for real.
+			}
+		}
 
-				// \todo Consider adding "ReaderImplementation *rootScene" to optimize the scene() calls.
-				SampleTimesMap sampleTimesMap;
-				SimpleCache::Ptr objectCache;
-				AttributeCache::Ptr attributeCache;
-				SimpleCache::Ptr transformCache;
+		const LocationTable *locationTable() const
+		{
+			return m_locationIndex != LocationTable::npos ? m_sharedData->locationTable.get() : nullptr;
+		}
 
-			private :
+		size_t childLocationIndex( const Name &name ) const
+		{
+			const LocationTable *table = locationTable();
+			return table ? table->child( m_locationIndex, name ) : LocationTable::npos;
+		}
 
-			// utility function that copies all the values from the rhs dictionary to the lhs.
-			template< typename T >
-			static void mergeMaps ( T& lhs, const T& rhs)
+		void locationPathsWalk( SceneInterface::Path &path, bool objectsOnly, PathMatcher &result ) const
+		{
+			if( !objectsOnly || hasObject() )
 			{
-	    		typename T::iterator lhsItr = lhs.begin();
-				typename T::const_iterator rhsItr = rhs.begin();
-
-				while (lhsItr != lhs.end() && rhsItr != rhs.end())
-				{
-					if (rhsItr->first < lhsItr->first)
-					{
-						lhs.insert(lhsItr, *rhsItr);
-						++rhsItr;
-					}
-					else if (rhsItr->first == lhsItr->first)
-					{
-						lhsItr->second = rhsItr->second;
-						++lhsItr;
-						++rhsItr;
-					}
-					else
-						++lhsItr;
-				}
-				lhs.insert(rhsItr, rhs.end());
+				result.addPath( path );
 			}
 
-		};
+			NameList children;
+			childNames( children );
+			for( const auto &childName : children )
+			{
+				path.push_back( childName );
+				child( childName, SceneInterface::ThrowIfMissing )->locationPathsWalk( path, objectsOnly, result );
+				path.pop_back();
+			}
+		}
 
 		ReaderImplementationPtr m_parent;
 		mutable SharedData *m_sharedData;
+		// Index in m_sharedData->locationTable, or LocationTable::npos
+		// if the file doesn't have a location table.
+		size_t m_locationIndex;
 
 		/// pointers to values in m_sharedData->sampleTimesMap for the current scene location.
-		mutable const SampleTimes *m_boundSampleTimes;
-		mutable const SampleTimes *m_transformSampleTimes;
+		mutable const IndexedSampleTimes *m_boundSampleTimes;
+		mutable const IndexedSampleTimes *m_transformSampleTimes;
 		mutable AttributeSamplesMap m_attributeSampleTimes;
 		mutable AttributeMapMutex m_attributeMutex;
-		mutable const SampleTimes *m_objectSampleTimes;
+		mutable const IndexedSampleTimes *m_objectSampleTimes;
 
 		IndexedIOPtr globalSampleTimes() const
 		{
@@ -997,7 +2125,7 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 			return m_indexedIO->parentDirectory()->subdirectory( sampleTimesEntry );
 		}
 
-		const SampleTimes *restoreSampleTimes( const IndexedIO::EntryID &childName, bool throwExceptions = false, const IndexedIO::EntryID *attribName = nullptr ) const
+		const IndexedSampleTimes *restoreSampleTimes( const IndexedIO::EntryID &childName, bool throwExceptions = false, const IndexedIO::EntryID *attribName = nullptr ) const
 		{
 			IndexedIOPtr location = m_indexedIO->subdirectory( childName, IndexedIO::NullIfMissing );
 			if ( location && attribName )
@@ -1054,7 +2182,8 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 			SampleTimesMap::accessor it;
 			if ( m_sharedData->sampleTimesMap.insert( it, sampleTimesIndex ) )
 			{
-				it->second = times;
+				it->second = IndexedSampleTimes( times );
+				m_sharedData->sampleTimesMemory += sizeof( IndexedSampleTimes ) + times.size() * sizeof( double );
 			}
 			return &(it->second);
 		}
@@ -1091,6 +2220,7 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 			size_t sample = key.second;
 			MurmurHash h;
 			reader->sceneHash( h );
+			h.append( reader->m_sharedData->fileIdentity );
 			h.append( (uint64_t)sample );
 			return h;
 		}
@@ -1116,7 +2246,35 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 		// static function used by the cache mechanism to actually load the object data from file.
 		static ObjectPtr doReadObjectAtSample( const SimpleCacheKey &key )
 		{
-			return Object::load( key.first->m_indexedIO->subdirectory( objectEntry ), sampleEntry(key.second) );
+			const ReaderImplementation *reader = key.first;
+			if ( key.second != 0 && reader->hasAttribute(animatedObjectPrimVarsAttribute) )
+			{
+				// if constant topology, we try to build the object from the first sample in the cache,
+				// so we only have to load the changing prim vars.
+				const SimpleCacheKey defaultKey( reader, 0 );
+				ConstPrimitivePtr defaultPrimitive = runTimeCast< const Primitive >( objectCache().retrieve( simpleHash( defaultKey ), defaultKey ) );
+				if ( defaultPrimitive )
+				{
+					IECore::ConstInternedStringVectorDataPtr varNames = runTimeCast<const InternedStringVectorData>( reader->readAttributeAtSample(animatedObjectPrimVarsAttribute, 0) );
+					if ( varNames )
+					{
+						PrimitivePtr prim = defaultPrimitive->copy();
+						PrimitiveVariableMap variables = readObjectPrimitiveVariablesAtSample( reader->m_indexedIO, varNames->readable(), key.second, nullptr );
+						for ( PrimitiveVariableMap::const_iterator it = variables.begin(); it != variables.end(); ++it )
+						{
+							prim->variables[it->first] = it->second;
+						}
+						return prim;
+					}
+				}
+			}
+
+			ObjectPtr result = Object::load( key.first->m_indexedIO->subdirectory( objectEntry ), sampleEntry(key.second) );
+			if( Primitive *primitive = runTimeCast<Primitive>( result.get() ) )
+			{
+				decodePrimitiveVariables( primitive->variables );
+			}
+			return result;
 		}
 
 		static MurmurHash attributeHash( const AttributeCacheKey &key )
@@ -1127,6 +2285,7 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 
 			MurmurHash h;
 			reader->sceneHash( h );
+			h.append( reader->m_sharedData->fileIdentity );
 			h.append(name.value());
 			h.append( (uint64_t)sample );
 			return h;
@@ -1164,13 +2323,13 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 		/// with identity transform.
 		static struct Defaults
 		{
-			SampleTimes implicitSample;
+			IndexedSampleTimes implicitSample;
 			M44dDataPtr defaultTransform;
 			Imath::Box3d defaultBox;
 
 			Defaults()
 			{
-				implicitSample.push_back( 0.0 );
+				implicitSample = IndexedSampleTimes( SampleTimes( 1, 0.0 ) );
 				defaultTransform = new M44dData();
 				defaultTransform->writable().makeIdentity();
 				defaultBox.makeEmpty();
@@ -1180,6 +2339,7 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 };
 
 SceneCache::ReaderImplementation::Defaults SceneCache::ReaderImplementation::g_defaults;
+std::atomic<uint64_t> SceneCache::ReaderImplementation::SharedData::g_nextUniqueId( 0 );
 
 /// Writer implementation for SceneCache
 /// Each location keeps refcount pointers to their child locations, so they can always return the same (unfinished child) and when the root is destroyed, it
@@ -1190,17 +2350,21 @@ class SceneCache::WriterImplementation : public SceneCache::Implementation
 
 		IE_CORE_DECLAREPTR( WriterImplementation )
 
-		WriterImplementation( IndexedIOPtr io, Implementation *parent = nullptr) : SceneCache::Implementation( io ), m_parent(static_cast< WriterImplementation* >( parent ))
+		WriterImplementation( IndexedIOPtr io, Implementation *parent = nullptr) : SceneCache::Implementation( io ), m_parent(static_cast< WriterImplementation* >( parent )), m_subtreeReferenced( false )
 		{
 			if ( m_parent )
 			{
 				// use same map from the root
 				m_sampleTimesMap = m_parent->m_sampleTimesMap;
+				m_locationTable = m_parent->m_locationTable;
+				m_completeSets = m_parent->m_completeSets;
 			}
 			else
 			{
 				// only the root instance allocate the map.
 				m_sampleTimesMap = new SampleTimesMap;
+				m_locationTable = std::make_shared<LocationTable>();
+				m_completeSets = std::make_shared<SetMap>();
 			}
 		}
 
@@ -1379,6 +2543,73 @@ class SceneCache::WriterImplementation : public SceneCache::Implementation
 			}
 		}
 
+		void setPrimitiveVariableEncoding( const SceneCache::Name &primVarName, SceneCache::PrimitiveVariableEncoding encoding )
+		{
+			writable();
+
+			WriterImplementation *root = this;
+			while( root->m_parent )
+			{
+				root = root->m_parent;
+			}
+
+			if( encoding == SceneCache::FullPrecision )
+			{
+				root->m_primitiveVariableEncodings.erase( primVarName );
+			}
+			else
+			{
+				root->m_primitiveVariableEncodings[primVarName] = encoding;
+			}
+		}
+
+		// Returns a copy of the object with its primitive variables
+		// encoded, or the object itself if there is nothing to encode.
+		ConstObjectPtr encodeObject( const Object *object ) const
+		{
+			const WriterImplementation *root = this;
+			while( root->m_parent )
+			{
+				root = root->m_parent;
+			}
+
+			const Primitive *primitive = runTimeCast< const Primitive >( object );
+			if( !primitive || root->m_primitiveVariableEncodings.empty() )
+			{
+				return object;
+			}
+
+			PrimitivePtr result;
+			for( const auto &encoding : root->m_primitiveVariableEncodings )
+			{
+				PrimitiveVariableMap::const_iterator it = primitive->variables.find( encoding.first );
+				if( it == primitive->variables.end() || !it->second.data )
+				{
+					continue;
+				}
+
+				ConstDataPtr encodedData = encodeData( it->second.data.get(), encoding.second );
+				if( encodedData == it->second.data )
+				{
+					continue;
+				}
+
+				if( !result )
+				{
+					// cheap, since the data is copy-on-write
+					result = primitive->copy();
+				}
+				// the encoded data is never modified, so it is safe to remove the const
+				result->variables[encoding.first].data = boost::const_pointer_cast<Data>( encodedData );
+			}
+
+			if( !result )
+			{
+				return object;
+			}
+			return result;
+		}
+
 		void writeObject( const Object *object, double time )
 		{
 			writable();
@@ -1408,7 +2639,7 @@ class SceneCache::WriterImplementation : public SceneCache::Implementation
 			size_t sampleIndex = m_objectSampleTimes.size();
 			m_objectSampleTimes.push_back( time );
 			IndexedIOPtr io = m_indexedIO->subdirectory( objectEntry, IndexedIO::CreateIfMissing );
-			object->save( io, sampleEntry(sampleIndex) );
+			encodeObject( object )->save( io, sampleEntry(sampleIndex) );
 
 			const VisibleRenderable *renderable = runTimeCast< const VisibleRenderable >( object );
 			if ( renderable )
@@ -1486,6 +2717,8 @@ class SceneCache::WriterImplementation : public SceneCache::Implementation
 
 			IndexedIOPtr setsIO = m_indexedIO->subdirectory( setsEntry, IndexedIO::CreateIfMissing );
 			setData->Object::save( setsIO, name );
+
+			m_sets[name] = set;
 		}
 
 		WriterImplementationPtr child( const Name &name, MissingBehaviour missingBehaviour )
@@ -1731,6 +2964,8 @@ class SceneCache::WriterImplementation : public SceneCache::Implementation
 		// animated bounding boxes in case they were not explicitly writen.
 		void flush()
 		{
+			const size_t subtreeBegin = m_locationTable->size();
+
 			// AncestorTags must be written before visiting children
 			if ( m_parent )
 			{
@@ -1740,10 +2975,17 @@ class SceneCache::WriterImplementation : public SceneCache::Implementation
 				writeTags( tags, SceneInterface::AncestorTag );
 			}
 
+			const bool hasChildLocations = !m_children.empty();
+
+			// Only the parent holds a reference to this location, unless
+			// it is still referenced from outside the file.
+			m_subtreeReferenced = refCount() > 1;
+
 			/// first call flush recursively on children...
 			for ( std::map< SceneCache::Name, WriterImplementationPtr >::const_iterator cit = m_children.begin(); cit != m_children.end(); cit++ )
 			{
 				cit->second->flush();
+				m_subtreeReferenced = m_subtreeReferenced || cit->second->m_subtreeReferenced;
 			}
 
 			try
@@ -1767,6 +3009,78 @@ class SceneCache::WriterImplementation : public SceneCache::Implementation
 				IECoreScene::SceneInterface::pathToString( p, stringPath );
 				throw IECore::IOException( boost::str( boost::format( "Unknown exception while flushing data ( for location %1% )" ) % stringPath ) );
 			}
+
+			NameList localTags;
+			readTags( localTags, SceneInterface::LocalTag );
+
+			addToLocationTable( subtreeBegin, localTags );
+			addToCompleteSets( localTags );
+			if( !m_parent )
+			{
+				m_locationTable->write( m_indexedIO->subdirectory( locationTableEntry, IndexedIO::CreateIfMissing ).get() );
+				writeCompleteSets();
+			}
+			m_locationTable.reset();
+			m_completeSets.reset();
+
+			// Nothing else is written to this location once it's flushed, so we move the whole subtree
+			// to a subindex. This keeps the main index small and lets readers load only the parts of the
+			// hierarchy they visit. Leaf locations are stored in the subindex of their parent. Committing
+			// destroys the index entries of the locations in the subtree, so it is skipped while any of them
+			// are still referenced from outside the file, to keep their IndexedIO handles valid.
+			if ( m_parent && hasChildLocations && !m_subtreeReferenced )
+			{
+				m_indexedIO->commit();
+			}
+		}
+
+		void addToLocationTable( size_t subtreeBegin, const NameList &localTags )
+		{
+			unsigned char flags = 0;
+			flags |= m_objectSampleTimes.empty() ? 0 : LocationTable::HasObject;
+			flags |= m_transformSampleTimes.empty() ? 0 : LocationTable::HasTransform;
+			flags |= m_boundSampleTimes.empty() ? 0 : LocationTable::HasBound;
+
+			unsigned sampleCounts[LocationTable::NumSampleCounts];
+			sampleCounts[LocationTable::ObjectSamples] = m_objectSampleTimes.size();
+			sampleCounts[LocationTable::TransformSamples] = m_transformSampleTimes.size();
+			sampleCounts[LocationTable::BoundSamples] = m_boundSampleTimes.size();
+
+			m_locationTable->addLocation( name(), subtreeBegin, flags, sampleCounts, localTags );
+		}
+
+		// Adds the sets written at this location, and the local tags which
+		// readers treat as sets, to the sets stored for the whole file.
+		void addToCompleteSets( const NameList &localTags )
+		{
+			SceneCache::Path p;
+			path( p );
+
+			for( const auto &tag : localTags )
+			{
+				(*m_completeSets)[tag].addPath( p );
+			}
+
+			for( const auto &set : m_sets )
+			{
+				(*m_completeSets)[set.first].addPaths( set.second, p );
+			}
+			m_sets.clear();
+		}
+
+		// Writes the sets for the whole file, so that readers can load each
+		// set with a single read rather than visiting every location. The
+		// flag is written last, so that readers only use complete sets.
+		void writeCompleteSets()
+		{
+			IndexedIOPtr io = m_indexedIO->subdirectory( completeSetsEntry, IndexedIO::CreateIfMissing );
+			IndexedIOPtr setsIO = io->subdirectory( setsEntry, IndexedIO::CreateIfMissing );
+			for( const auto &set : *m_completeSets )
+			{
+				PathMatcherDataPtr setData = new PathMatcherData( set.second );
+				setData->Object::save( setsIO, set.first );
+			}
+			io->write( completeSetsFlagEntry, (unsigned char)1 );
 		}
 
 		void doFlush()
@@ -2185,11 +3499,20 @@ class SceneCache::WriterImplementation : public SceneCache::Implementation
 		
 		WriterImplementation* m_parent;
 		std::map< SceneCache::Name, WriterImplementationPtr > m_children;
+		// Set by flush() when this location or one below it is referenced
+		// from outside the file, so that the subtree isn't committed.
+		bool m_subtreeReferenced;
 
 		typedef std::map< SampleTimes, uint64_t > SampleTimesMap;
 		typedef std::map< SceneCache::Name, SampleTimes > AttributeSamplesMap;
 
 		SampleTimesMap *m_sampleTimesMap;
+		// shared by all the locations, and filled in as they are flushed.
+		std::shared_ptr<LocationTable> m_locationTable;
+		typedef std::map< SceneCache::Name, PathMatcher > SetMap;
+		std::shared_ptr<SetMap> m_completeSets;
+		// sets written to this location, added to m_completeSets when flushed.
+		SetMap m_sets;
 		SampleTimes m_boundSampleTimes;		// implicit or explicit bound sample times
 		SampleTimes m_transformSampleTimes;
 		AttributeSamplesMap m_attributeSampleTimes;
@@ -2206,19 +3529,57 @@ class SceneCache::WriterImplementation : public SceneCache::Implementation
 
 		AnimatedHashTest m_animatedObjectTopology;
 		AnimatedPrimVarMap m_animatedObjectPrimVars;
+
+		// only the root location holds the encodings.
+		typedef std::map< SceneCache::Name, SceneCache::PrimitiveVariableEncoding > PrimitiveVariableEncodingMap;
+		PrimitiveVariableEncodingMap m_primitiveVariableEncodings;
 };
 
 //////////////////////////////////////////////////////////////////////////
 // SceneCache
 //////////////////////////////////////////////////////////////////////////
 
+static CompoundDataPtr compressionSettings( const std::string &compressor, int compressionLevel, const std::string &shuffle )
+{
+	CompoundDataPtr result = new CompoundData;
+	result->writable()["compressor"] = new StringData( compressor );
+	result->writable()["compressionLevel"] = new IntData( compressionLevel );
+	result->writable()["shuffle"] = new StringData( shuffle );
+	// small attributes aren't worth compressing
+	result->writable()["minSize"] = new IntData( 4096 );
+	return result;
+}
+
+static CompoundDataPtr indexedIOOptions()
+{
+	CompoundDataPtr options = new CompoundData;
+
+	// compress the data in the background while the next samples are being written
+	options->writable()["compressionQueueLength"] = new IntData( 2 * tbb::this_task_arena::max_concurrency() );
+
+	// compress the large arrays of primitive variables and topology, unless
+	// compression has been configured explicitly by the environment.
+	if( !getenv( "IECORE_STREAMINDEXEDIO_COMPRESSION" ) )
+	{
+		CompoundDataPtr policy = new CompoundData;
+		policy->writable()["FloatArray"] = compressionSettings( "zstd", 3, "byte" );
+		policy->writable()["DoubleArray"] = compressionSettings( "zstd", 3, "byte" );
+		policy->writable()["IntArray"] = compressionSettings( "lz4", 5, "bit" );
+		policy->writable()["UIntArray"] = compressionSettings( "lz4", 5, "bit" );
+		policy->writable()["Int64Array"] = compressionSettings( "lz4", 5, "bit" );
+		options->writable()["compressionPolicy"] = policy;
+	}
+
+	return options;
+}
+
 SceneCache::SceneCache( const std::string &fileName, IndexedIO::OpenMode mode )
 {
 	if( mode & IndexedIO::Append )
 	{
 		throw InvalidArgumentException( "Append mode not supported" );
 	}
-	IndexedIOPtr indexedIO = IndexedIO::create( fileName, IndexedIO::rootPath, mode );
+	IndexedIOPtr indexedIO = IndexedIO::create( fileName, IndexedIO::rootPath, mode, indexedIOOptions().get() );
 
 	if( indexedIO->openMode() & IndexedIO::Write )
 	{
@@ -2469,6 +3830,16 @@ IECore::PathMatcher SceneCache::readSet( const Name &name, bool includeDescendan
 {
 	ReaderImplementation *reader = ReaderImplementation::reader( m_implementation.get() );
 
+	if( includeDescendantSets )
+	{
+		// files written with complete sets hold the tags and sets of every location,
+		// so we don't need to visit the hierarchy.
+		if( ConstPathMatcherDataPtr set = reader->readCompleteSet( name ) )
+		{
+			return set->readable();
+		}
+	}
+
 	PathMatcher set;
 
 	// read the old style tags and convert to a set
@@ -2639,6 +4010,15 @@ ConstSceneInterfacePtr SceneCache::scene( const Path &path, SceneCache::MissingB
 	return duplicate( impl );
 }
 
+size_t SceneCache::memoryUsage() const
+{
+	if( ReaderImplementation *reader = ReaderImplementation::reader( m_implementation.get(), false ) )
+	{
+		return reader->memoryUsage();
+	}
+	return 0;
+}
+
 void SceneCache::hash( HashType hashType, double time, MurmurHash &h ) const
 {
 	SceneInterface::hash( hashType, time, h );
@@ -2656,3 +4036,99 @@ bool SceneCache::readOnly() const
 {
 	return dynamic_cast< const ReaderImplementation* >( m_implementation.get() ) != nullptr;
 }
+
+void SceneCache::setCacheMemoryLimit( CacheType cache, size_t memoryLimit )
+{
+	switch( cache )
+	{
+		case ObjectCache :
+			ReaderImplementation::objectCache().setMemoryLimit( memoryLimit );
+			break;
+		case AttributeCache :
+			ReaderImplementation::attributeCache().setMemoryLimit( memoryLimit );
+			break;
+		case TransformCache :
+			ReaderImplementation::transformCache().setMemoryLimit( memoryLimit );
+			break;
+	}
+}
+
+size_t SceneCache::getCacheMemoryLimit( CacheType cache )
+{
+	switch( cache )
+	{
+		case ObjectCache :
+			return ReaderImplementation::objectCache().getMemoryLimit();
+		case AttributeCache :
+			return ReaderImplementation::attributeCache().getMemoryLimit();
+		case TransformCache :
+			return ReaderImplementation::transformCache().getMemoryLimit();
+	}
+	throw InvalidArgumentException( "SceneCache::getCacheMemoryLimit : Invalid cache" );
+}
+
+CompoundDataPtr SceneCache::cacheStatistics( CacheType cache )
+{
+	switch( cache )
+	{
+		case ObjectCache :
+			return ReaderImplementation::objectCache().statistics();
+		case AttributeCache :
+			return ReaderImplementation::attributeCache().statistics();
+		case TransformCache :
+			return ReaderImplementation::transformCache().statistics();
+	}
+	throw InvalidArgumentException( "SceneCache::cacheStatistics : Invalid cache" );
+}
+
+void SceneCache::clearCache( CacheType cache )
+{
+	switch( cache )
+	{
+		case ObjectCache :
+			ReaderImplementation::objectCache().clear();
+			break;
+		case AttributeCache :
+			ReaderImplementation::attributeCache().clear();
+			break;
+		case TransformCache :
+			ReaderImplementation::transformCache().clear();
+			break;
+	}
+}
+
+PathMatcher SceneCache::intersectingLocations( const std::vector<Imath::Plane3d> &planes, double time, const Canceller *canceller ) const
+{
+	ReaderImplementation *reader = ReaderImplementation::reader( m_implementation.get() );
+	return reader->intersectingLocations( planes, time, canceller );
+}
+
+PathMatcher SceneCache::locationPaths( bool objectsOnly ) const
+{
+	ReaderImplementation *reader = ReaderImplementation::reader( m_implementation.get() );
+	return reader->locationPaths( objectsOnly );
+}
+
+void SceneCache::prefetch( const PathMatcher &paths, double startTime, double endTime, const Canceller *canceller ) const
+{
+	ReaderImplementation *reader = ReaderImplementation::reader( m_implementation.get() );
+	reader->prefetch( paths, startTime, endTime, canceller );
+}
+
+void SceneCache::cancelPrefetch() const
+{
+	ReaderImplementation *reader = ReaderImplementation::reader( m_implementation.get() );
+	reader->cancelPrefetch();
+}
+
+void SceneCache::waitForPrefetch() const
+{
+	ReaderImplementation *reader = ReaderImplementation::reader( m_implementation.get() );
+	reader->waitForPrefetch();
+}
+
+void SceneCache::setPrimitiveVariableEncoding( const Name &primVarName, PrimitiveVariableEncoding encoding )
+{
+	WriterImplementation *writer = WriterImplementation::writer( m_implementation.get() );
+	writer->setPrimitiveVariableEncoding( primVarName, encoding );
+}
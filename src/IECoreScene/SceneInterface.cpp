@@ -34,6 +34,8 @@
 
 #include "IECoreScene/SceneInterface.h"
 
+#include "BoundQueryAlgo.h"
+
 #include "boost/filesystem/convenience.hpp"
 #include "boost/tokenizer.hpp"
 #include "boost/algorithm/string.hpp"
@@ -134,11 +136,32 @@ bool SceneInterface::hasBound() const
 	return true;
 }
 
+PathMatcher SceneInterface::intersectingLocations( const std::vector<Imath::Plane3d> &planes, double time, const Canceller *canceller ) const
+{
+	PathMatcher result;
+	Private::locationsIntersectingWalk(
+		this, Imath::M44d(), planes, time,
+		[]( const SceneInterface *location, double time ) { return location->readTransformAsMatrix( time ); },
+		result, canceller
+	);
+	return result;
+}
+
+PathMatcher SceneInterface::intersectingLocations( const Imath::Box3d &bound, double time, const Canceller *canceller ) const
+{
+	return intersectingLocations( Private::boxPlanes( bound ), time, canceller );
+}
+
 void SceneInterface::hash( HashType hashType, double time, MurmurHash &h ) const
 {
 	h.append( typeId() );
 }
 
+size_t SceneInterface::memoryUsage() const
+{
+	return 0;
+}
+
 void SceneInterface::pathToString( const SceneInterface::Path &p, std::string &path )
 {
 	if ( !p.size() )
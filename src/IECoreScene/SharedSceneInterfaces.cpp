@@ -34,7 +34,18 @@
 
 #include "IECoreScene/SharedSceneInterfaces.h"
 
-#include "IECore/LRUCache.h"
+#include "IECore/MurmurHash.h"
+#include "IECore/SimpleTypedData.h"
+
+#include "tbb/concurrent_hash_map.h"
+
+#include <algorithm>
+#include <atomic>
+#include <cstdlib>
+#include <exception>
+#include <memory>
+#include <mutex>
+#include <vector>
 
 using namespace IECore;
 using namespace IECoreScene;
@@ -46,25 +57,371 @@ using namespace IECoreScene;
 namespace
 {
 
-typedef IECore::LRUCache< std::string, IECoreScene::ConstSceneInterfacePtr > SceneLRUCache;
-
-class Cache : public SceneLRUCache
+// Least recently used cache of scenes, limited both by the number of
+// scenes and by the memory they report. Hits only take a lock on their
+// bucket of the entry map, and the mutex is only taken when the cache
+// is modified. The memory used by a scene grows as more of its file is
+// read, so all the scenes are measured again before any are evicted for
+// exceeding the memory limit. Failures to open a file are cached like
+// scenes are.
+class Cache
 {
+
 	public :
 
-		Cache( SceneLRUCache::Cost maxCost )
-			: SceneLRUCache( fileCacheGetter, maxCost )
+		Cache( size_t maxScenes )
+			:	m_maxScenes( maxScenes ), m_memoryLimit( 0 ), m_memoryUsage( 0 ),
+				m_clock( 0 ), m_hits( 0 ), m_misses( 0 ), m_evictions( 0 )
+		{
+			if( const char *memoryLimit = getenv( "IECORESCENE_SHAREDSCENEINTERFACES_MEMORY_LIMIT" ) )
+			{
+				m_memoryLimit = strtoull( memoryLimit, nullptr, 10 );
+			}
+		}
+
+		ConstSceneInterfacePtr get( const std::string &fileName )
+		{
+			return acquire( fileName, /* pin = */ false )->scene;
+		}
+
+		ConstSceneInterfacePtr pin( const std::string &fileName )
+		{
+			return acquire( fileName, /* pin = */ true )->scene;
+		}
+
+		ConstSceneInterfacePtr location( const std::string &fileName, const SceneInterface::Path &root )
+		{
+			EntryPtr entry = acquire( fileName, /* pin = */ false );
+
+			MurmurHash h;
+			h.append( (uint64_t)root.size() );
+			h.append( root.data(), root.size() );
+
+			{
+				LocationMap::const_accessor accessor;
+				if( entry->locations.find( accessor, h ) )
+				{
+					return accessor->second;
+				}
+			}
+
+			ConstSceneInterfacePtr location = entry->scene->scene( root, SceneInterface::NullIfMissing );
+
+			// If another thread found the same location in the meantime,
+			// we use theirs so that the location is shared.
+			LocationMap::accessor accessor;
+			if( entry->locations.insert( accessor, h ) )
+			{
+				accessor->second = location;
+			}
+			return accessor->second;
+		}
+
+		void unpin( const std::string &fileName )
+		{
+			std::vector<EntryPtr> evicted;
+			std::lock_guard<std::mutex> lock( m_mutex );
+			EntryMap::const_accessor accessor;
+			if( m_entries.find( accessor, fileName ) && accessor->second->pins )
+			{
+				accessor->second->pins--;
+				accessor.release();
+				limit( evicted );
+			}
+		}
+
+		void erase( const std::string &fileName )
+		{
+			EntryPtr erased;
+			std::lock_guard<std::mutex> lock( m_mutex );
+			erased = remove( fileName );
+		}
+
+		void clear()
+		{
+			std::vector<EntryPtr> erased;
+			std::lock_guard<std::mutex> lock( m_mutex );
+			std::vector<std::string> fileNames;
+			for( const auto &entry : m_entries )
+			{
+				fileNames.push_back( entry.first );
+			}
+			for( const auto &fileName : fileNames )
+			{
+				erased.push_back( remove( fileName ) );
+			}
+		}
+
+		void setMaxScenes( size_t maxScenes )
+		{
+			std::vector<EntryPtr> evicted;
+			std::lock_guard<std::mutex> lock( m_mutex );
+			m_maxScenes = maxScenes;
+			limit( evicted );
+		}
+
+		size_t getMaxScenes()
+		{
+			std::lock_guard<std::mutex> lock( m_mutex );
+			return m_maxScenes;
+		}
+
+		size_t numScenes()
+		{
+			return m_entries.size();
+		}
+
+		void setMemoryLimit( size_t memoryLimit )
+		{
+			std::vector<EntryPtr> evicted;
+			std::lock_guard<std::mutex> lock( m_mutex );
+			m_memoryLimit = memoryLimit;
+			limit( evicted );
+		}
+
+		size_t getMemoryLimit()
+		{
+			std::lock_guard<std::mutex> lock( m_mutex );
+			return m_memoryLimit;
+		}
+
+		size_t memoryUsage()
 		{
+			std::lock_guard<std::mutex> lock( m_mutex );
+			updateMemoryUsage();
+			return m_memoryUsage;
+		}
+
+		CompoundDataPtr statistics()
+		{
+			std::lock_guard<std::mutex> lock( m_mutex );
+			updateMemoryUsage();
+
+			size_t pinnedScenes = 0;
+			for( const auto &entry : m_entries )
+			{
+				pinnedScenes += entry.second->pins ? 1 : 0;
+			}
+
+			CompoundDataPtr result = new CompoundData();
+			result->writable()["hits"] = new UInt64Data( m_hits );
+			result->writable()["misses"] = new UInt64Data( m_misses );
+			result->writable()["evictions"] = new UInt64Data( m_evictions );
+			result->writable()["numScenes"] = new UInt64Data( m_entries.size() );
+			result->writable()["pinnedScenes"] = new UInt64Data( pinnedScenes );
+			result->writable()["maxScenes"] = new UInt64Data( m_maxScenes );
+			result->writable()["memoryUsage"] = new UInt64Data( m_memoryUsage );
+			result->writable()["memoryLimit"] = new UInt64Data( m_memoryLimit );
+			return result;
 		}
 
 	private :
 
-		static SceneInterfacePtr fileCacheGetter( const std::string &fileName, size_t &cost )
+		typedef tbb::concurrent_hash_map<MurmurHash, ConstSceneInterfacePtr> LocationMap;
+
+		struct Entry
 		{
-			SceneInterfacePtr result = SceneInterface::create( fileName, IECore::IndexedIO::Read );
-			cost = 1;
+			Entry() : memory( 0 ), pins( 0 ), lastUse( 0 )
+			{
+			}
+
+			// Only one of these is set, and neither
+			// changes once the entry is in the map.
+			ConstSceneInterfacePtr scene;
+			std::exception_ptr exception;
+
+			// Locations retrieved by `location()`, keyed by the hash of
+			// their path. They are released along with the scene.
+			LocationMap locations;
+
+			// Only accessed with the mutex held.
+			size_t memory;
+			size_t pins;
+
+			std::atomic<uint64_t> lastUse;
+		};
+
+		typedef std::shared_ptr<Entry> EntryPtr;
+		typedef tbb::concurrent_hash_map<std::string, EntryPtr> EntryMap;
+
+		// Returns the entry for the file, opening it if necessary, and
+		// rethrowing the exception if it couldn't be opened.
+		EntryPtr acquire( const std::string &fileName, bool pin )
+		{
+			EntryPtr entry;
+			{
+				// Hits only take the mutex when pinning, so that the
+				// scene can't be evicted before the pin is added.
+				std::unique_lock<std::mutex> lock( m_mutex, std::defer_lock );
+				if( pin )
+				{
+					lock.lock();
+				}
+
+				EntryMap::const_accessor accessor;
+				if( m_entries.find( accessor, fileName ) )
+				{
+					entry = accessor->second;
+					if( pin )
+					{
+						entry->pins++;
+					}
+				}
+			}
+
+			if( entry )
+			{
+				m_hits++;
+			}
+			else
+			{
+				entry = insert( fileName, pin );
+			}
+
+			entry->lastUse = m_clock++;
+			if( entry->exception )
+			{
+				std::rethrow_exception( entry->exception );
+			}
+			return entry;
+		}
+
+		EntryPtr insert( const std::string &fileName, bool pin )
+		{
+			m_misses++;
+
+			// Open the file without holding the lock, so that other
+			// files can be opened and retrieved concurrently.
+			EntryPtr entry = std::make_shared<Entry>();
+			try
+			{
+				entry->scene = SceneInterface::create( fileName, IECore::IndexedIO::Read );
+			}
+			catch( ... )
+			{
+				entry->exception = std::current_exception();
+			}
+
+			std::vector<EntryPtr> evicted;
+			{
+				std::lock_guard<std::mutex> lock( m_mutex );
+				{
+					EntryMap::accessor accessor;
+					if( m_entries.insert( accessor, fileName ) )
+					{
+						accessor->second = entry;
+						entry->memory = entry->scene ? entry->scene->memoryUsage() : 0;
+						m_memoryUsage += entry->memory;
+					}
+					else
+					{
+						// Another thread opened the same file in the meantime,
+						// so we use theirs so that the scene is shared.
+						entry = accessor->second;
+					}
+
+					if( pin )
+					{
+						entry->pins++;
+					}
+					entry->lastUse = m_clock++;
+				}
+				limit( evicted );
+			}
+
+			return entry;
+		}
+
+		// Must be called with the mutex held.
+		void updateMemoryUsage()
+		{
+			for( auto &entry : m_entries )
+			{
+				Entry &e = *entry.second;
+				const size_t memory = e.scene ? e.scene->memoryUsage() : 0;
+				m_memoryUsage = m_memoryUsage - e.memory + memory;
+				e.memory = memory;
+			}
+		}
+
+		// Removes the entry, returning it so that the caller can release
+		// it after unlocking the mutex. Must be called with the mutex held.
+		EntryPtr remove( const std::string &fileName )
+		{
+			EntryPtr result;
+			EntryMap::accessor accessor;
+			if( m_entries.find( accessor, fileName ) )
+			{
+				result = accessor->second;
+				m_memoryUsage -= result->memory;
+				m_entries.erase( accessor );
+			}
 			return result;
 		}
+
+		bool overLimit() const
+		{
+			return m_entries.size() > m_maxScenes || ( m_memoryLimit && m_memoryUsage > m_memoryLimit );
+		}
+
+		// Removes the least recently used unpinned scenes until the cache is
+		// within its limits. The most recently used scene is always kept, so
+		// that a file larger than the memory limit can still be used. Must be
+		// called with the mutex held.
+		void limit( std::vector<EntryPtr> &evicted )
+		{
+			if( m_memoryLimit )
+			{
+				updateMemoryUsage();
+			}
+
+			if( !overLimit() )
+			{
+				return;
+			}
+
+			std::vector<std::pair<uint64_t, std::string>> candidates;
+			for( const auto &entry : m_entries )
+			{
+				candidates.emplace_back( entry.second->lastUse, entry.first );
+			}
+			std::sort( candidates.begin(), candidates.end() );
+			candidates.pop_back();
+
+			for( const auto &candidate : candidates )
+			{
+				if( !overLimit() )
+				{
+					return;
+				}
+
+				EntryMap::const_accessor accessor;
+				if( !m_entries.find( accessor, candidate.second ) || accessor->second->pins )
+				{
+					continue;
+				}
+				accessor.release();
+
+				evicted.push_back( remove( candidate.second ) );
+				m_evictions++;
+			}
+		}
+
+		std::mutex m_mutex;
+		EntryMap m_entries;
+
+		size_t m_maxScenes;
+		size_t m_memoryLimit;
+		size_t m_memoryUsage;
+
+		// Incremented each time a scene is used, to order the entries
+		// from least to most recently used.
+		std::atomic<uint64_t> m_clock;
+
+		std::atomic<uint64_t> m_hits;
+		std::atomic<uint64_t> m_misses;
+		std::atomic<uint64_t> m_evictions;
+
 };
 
 Cache &cache()
@@ -96,15 +453,50 @@ void SharedSceneInterfaces::clear()
 
 void SharedSceneInterfaces::setMaxScenes( size_t numScenes )
 {
-	cache().setMaxCost( numScenes );
+	cache().setMaxScenes( numScenes );
 }
 
 size_t SharedSceneInterfaces::getMaxScenes()
 {
-	return cache().getMaxCost();
+	return cache().getMaxScenes();
 }
 
 size_t SharedSceneInterfaces::numScenes()
 {
-	return cache().currentCost();
+	return cache().numScenes();
+}
+
+void SharedSceneInterfaces::setMemoryLimit( size_t memoryLimit )
+{
+	cache().setMemoryLimit( memoryLimit );
+}
+
+size_t SharedSceneInterfaces::getMemoryLimit()
+{
+	return cache().getMemoryLimit();
+}
+
+size_t SharedSceneInterfaces::memoryUsage()
+{
+	return cache().memoryUsage();
+}
+
+ConstSceneInterfacePtr SharedSceneInterfaces::location( const std::string &fileName, const SceneInterface::Path &root )
+{
+	return cache().location( fileName, root );
+}
+
+ConstSceneInterfacePtr SharedSceneInterfaces::pin( const std::string &fileName )
+{
+	return cache().pin( fileName );
+}
+
+void SharedSceneInterfaces::unpin( const std::string &fileName )
+{
+	cache().unpin( fileName );
+}
+
+CompoundDataPtr SharedSceneInterfaces::statistics()
+{
+	return cache().statistics();
 }
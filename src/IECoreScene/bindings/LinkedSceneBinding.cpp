@@ -41,6 +41,7 @@
 #include "IECoreScene/LinkedScene.h"
 
 #include "IECorePython/RunTimeTypedBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 
 using namespace boost::python;
 using namespace IECore;
@@ -60,6 +61,12 @@ static LinkedScenePtr constructor2( SceneInterfacePtr scn )
 	return new LinkedScene( scn );
 }
 
+static void expandLinks( const LinkedScene &scene, const Canceller *canceller )
+{
+	ScopedGILRelease gilRelease;
+	scene.expandLinks( canceller );
+}
+
 void bindLinkedScene()
 {
 	IECore::CompoundDataPtr (*linkAttributeData)( const SceneInterface *scene) = &LinkedScene::linkAttributeData;
@@ -69,6 +76,7 @@ void bindLinkedScene()
 		.def( "__init__", make_constructor( &constructor ), "Opens a linked scene file for read or write." )
 		.def( "__init__", make_constructor( &constructor2 ), "Creates a linked scene to expand links in the given scene file." )
 		.def( "writeLink", &LinkedScene::writeLink )
+		.def( "expandLinks", &expandLinks, ( arg( "canceller" ) = object() ) )
 		.def( "linkAttributeData", linkAttributeData )
 		.def( "linkAttributeData", retimedLinkAttributeData ).staticmethod( "linkAttributeData" )
 		.def_readonly("linkAttribute", &LinkedScene::linkAttribute )
@@ -41,6 +41,9 @@
 #include "IECoreScene/SampledSceneInterface.h"
 
 #include "IECorePython/RunTimeTypedBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
+
+#include "boost/python/suite/indexing/container_utils.hpp"
 
 using namespace boost::python;
 using namespace IECore;
@@ -108,6 +111,25 @@ ObjectPtr readObjectAtSample( SampledSceneInterface &m, size_t sampleIndex )
 	return nullptr;
 }
 
+list readObjects( const SampledSceneInterface &m, list timeList )
+{
+	std::vector<double> times;
+	container_utils::extend_container( times, timeList );
+
+	std::vector<ConstObjectPtr> objects;
+	{
+		IECorePython::ScopedGILRelease gilRelease;
+		m.readObjects( times, objects );
+	}
+
+	list result;
+	for( const auto &o : objects )
+	{
+		result.append( o ? o->copy() : ObjectPtr() );
+	}
+	return result;
+}
+
 void bindSampledSceneInterface()
 {
 	RunTimeTypedClass<SampledSceneInterface>()
@@ -124,6 +146,7 @@ void bindSampledSceneInterface()
 		.def( "readTransformAsMatrixAtSample", &SampledSceneInterface::readTransformAsMatrixAtSample )
 		.def( "readAttributeAtSample", &readAttributeAtSample )
 		.def( "readObjectAtSample", &readObjectAtSample )
+		.def( "readObjects", &readObjects )
 
 		.def( "boundSampleInterval", &boundSampleInterval )
 		.def( "transformSampleInterval", &transformSampleInterval )
@@ -38,6 +38,8 @@
 
 #include "IECoreScene/SceneAlgo.h"
 
+#include "IECorePython/ExceptionAlgo.h"
+#include "IECorePython/ScopedGILLock.h"
 #include "IECorePython/ScopedGILRelease.h"
 
 
@@ -65,6 +67,70 @@ dict parallelReadAll( const SceneInterface *src, int startFrame, int endFrame, f
 	return result;
 }
 
+void copy( const SceneInterface *src, SceneInterface *dst, int startFrame, int endFrame, float frameRate, unsigned int flags, size_t memoryLimit, object progress, const Canceller *canceller )
+{
+	SceneAlgo::ProgressFunction progressFn;
+	if( progress != object() )
+	{
+		progressFn = [&progress]( size_t samplesWritten, size_t numSamples ) {
+			IECorePython::ScopedGILLock gilLock;
+			try
+			{
+				progress( samplesWritten, numSamples );
+			}
+			catch( const error_already_set & )
+			{
+				IECorePython::ExceptionAlgo::translatePythonException();
+			}
+		};
+	}
+
+	IECorePython::ScopedGILRelease gilRelease;
+	SceneAlgo::copy( src, dst, startFrame, endFrame, frameRate, flags, memoryLimit, progressFn, canceller );
+}
+
+dict parallelTraverse( const SceneInterface *src, object visitor, int startFrame, int endFrame, float frameRate, const PathMatcher *filter, const Canceller *canceller )
+{
+	dict result;
+
+	auto locationFn = [&visitor, &result]( const SceneInterface *location, double time ) {
+		IECorePython::ScopedGILLock gilLock;
+		try
+		{
+			object value = visitor( ConstSceneInterfacePtr( location ), time );
+			if( value.ptr() == Py_None || PyBool_Check( value.ptr() ) )
+			{
+				return value.ptr() != Py_False;
+			}
+
+			SceneInterface::Path path;
+			location->path( path );
+			std::string pathString;
+			SceneInterface::pathToString( path, pathString );
+
+			if( !result.has_key( pathString ) )
+			{
+				result[pathString] = list();
+			}
+			list values = extract<list>( result[pathString] );
+			values.append( value );
+			return true;
+		}
+		catch( const error_already_set & )
+		{
+			IECorePython::ExceptionAlgo::translatePythonException();
+		}
+		return false;
+	};
+
+	{
+		IECorePython::ScopedGILRelease gilRelease;
+		SceneAlgo::parallelTraverse( src, locationFn, startFrame, endFrame, frameRate, filter, canceller );
+	}
+
+	return result;
+}
+
 } // namespace
 
 namespace IECoreSceneModule
@@ -92,9 +158,32 @@ void bindSceneAlgo()
 		.export_values()
 		;
 
-	def( "copy", &SceneAlgo::copy );
+	def(
+		"copy", &::copy,
+		(
+			arg( "src" ), arg( "dst" ), arg( "startFrame" ), arg( "endFrame" ), arg( "frameRate" ), arg( "flags" ),
+			arg( "memoryLimit" ) = 1024 * 1024 * 1024, arg( "progress" ) = object(), arg( "canceller" ) = object()
+		)
+	);
+	// Overloads are tried in reverse order of definition, so calls without any of
+	// the arguments above use the serial copy, as they always have.
+	def(
+		"copy", (void (*)( const SceneInterface *, SceneInterface *, int, int, float, unsigned int ))&SceneAlgo::copy,
+		( arg( "src" ), arg( "dst" ), arg( "startFrame" ), arg( "endFrame" ), arg( "frameRate" ), arg( "flags" ) )
+	);
 
 	def( "parallelReadAll", &::parallelReadAll);
+
+	def(
+		"parallelTraverse", &::parallelTraverse,
+		( arg( "src" ), arg( "visitor" ), arg( "startFrame" ), arg( "endFrame" ), arg( "frameRate" ), arg( "filter" ) = object(), arg( "canceller" ) = object() ),
+		"Calls `visitor( location, time )` for each location and frame, from multiple threads. "
+		"The return value of `visitor` is used in one of two ways. Returning `None` or a bool "
+		"controls the traversal, with `False` preventing the children of the location from being "
+		"visited, and the value isn't stored. Any other value is appended to a list of values for "
+		"the location, and the children are visited. Returns a dictionary mapping location paths "
+		"to these lists, which only contains the locations that returned such values."
+	);
 }
 
 } // namespace IECoreSceneModule
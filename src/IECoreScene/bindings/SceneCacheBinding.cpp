@@ -42,6 +42,7 @@
 #include "IECoreScene/SharedSceneInterfaces.h"
 
 #include "IECorePython/RunTimeTypedBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 
 #include "tbb/tbb.h"
 
@@ -155,6 +156,19 @@ void testSceneCacheParallelFakeAttributeRead()
 	}
 }
 
+// The Python binding doesn't accept a Canceller, because Python can't
+// guarantee it outlives the prefetch. Use `cancelPrefetch()` instead.
+void prefetch( const SceneCache &sceneCache, const PathMatcher &paths, double startTime, double endTime )
+{
+	sceneCache.prefetch( paths, startTime, endTime );
+}
+
+void waitForPrefetch( const SceneCache &sceneCache )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	sceneCache.waitForPrefetch();
+}
+
 } // namespace
 
 //////////////////////////////////////////////////////////////////////////
@@ -166,9 +180,38 @@ namespace IECoreSceneModule
 
 void bindSceneCache()
 {
-	RunTimeTypedClass<SceneCache>()
+	RunTimeTypedClass<SceneCache> sceneCacheClass;
+
+	{
+		scope s( sceneCacheClass );
+
+		enum_< SceneCache::CacheType > ( "CacheType" )
+			.value( "ObjectCache", SceneCache::ObjectCache )
+			.value( "AttributeCache", SceneCache::AttributeCache )
+			.value( "TransformCache", SceneCache::TransformCache )
+			.export_values()
+		;
+
+		enum_< SceneCache::PrimitiveVariableEncoding > ( "PrimitiveVariableEncoding" )
+			.value( "FullPrecision", SceneCache::FullPrecision )
+			.value( "HalfPrecision", SceneCache::HalfPrecision )
+			.value( "FixedPoint", SceneCache::FixedPoint )
+			.export_values()
+		;
+	}
+
+	sceneCacheClass
 		.def( "__init__", make_constructor( &constructor ), "Opens a scene file for read or write." )
 		.def( "__init__", make_constructor( &constructor2 ), "Opens a scene from a previously opened file handle." )
+		.def( "setPrimitiveVariableEncoding", &SceneCache::setPrimitiveVariableEncoding )
+		.def( "locationPaths", &SceneCache::locationPaths, ( arg( "objectsOnly" ) = false ) )
+		.def( "prefetch", &prefetch, ( arg( "paths" ), arg( "startTime" ), arg( "endTime" ) ) )
+		.def( "cancelPrefetch", &SceneCache::cancelPrefetch )
+		.def( "waitForPrefetch", &waitForPrefetch )
+		.def( "setCacheMemoryLimit", &SceneCache::setCacheMemoryLimit ).staticmethod( "setCacheMemoryLimit" )
+		.def( "getCacheMemoryLimit", &SceneCache::getCacheMemoryLimit ).staticmethod( "getCacheMemoryLimit" )
+		.def( "cacheStatistics", &SceneCache::cacheStatistics ).staticmethod( "cacheStatistics" )
+		.def( "clearCache", &SceneCache::clearCache ).staticmethod( "clearCache" )
 	;
 
 	def( "testSceneCacheParallelAttributeRead", &testSceneCacheParallelAttributeRead );
@@ -191,6 +191,21 @@ ObjectPtr readObject( SceneInterface &m, double time, const IECore::Canceller *c
 	return nullptr;
 }
 
+PathMatcher intersectingLocationsBound( const SceneInterface &m, const Imath::Box3d &bound, double time, const IECore::Canceller *canceller )
+{
+	ScopedGILRelease gilRelease;
+	return m.intersectingLocations( bound, time, canceller );
+}
+
+PathMatcher intersectingLocationsPlanes( const SceneInterface &m, const list &planes, double time, const IECore::Canceller *canceller )
+{
+	std::vector<Imath::Plane3d> p;
+	boost::python::container_utils::extend_container( p, planes );
+
+	ScopedGILRelease gilRelease;
+	return m.intersectingLocations( p, time, canceller );
+}
+
 static MurmurHash sceneHash( SceneInterface &m, SceneInterface::HashType hashType, double time )
 {
 	MurmurHash h;
@@ -283,7 +298,10 @@ void bindSceneInterface()
 		.def( "child", nonConstChild, ( arg( "name" ), arg( "missingBehaviour" ) = SceneInterface::ThrowIfMissing ) )
 		.def( "createChild", &SceneInterface::createChild )
 		.def( "scene", &nonConstScene, ( arg( "path" ), arg( "missingBehaviour" ) = SceneInterface::ThrowIfMissing ) )
+		.def( "intersectingLocations", &intersectingLocationsPlanes, ( arg_( "planes" ), arg_( "time" ), arg_( "canceller" ) = object() ) )
+		.def( "intersectingLocations", &intersectingLocationsBound, ( arg_( "bound" ), arg_( "time" ), arg_( "canceller" ) = object() ) )
 		.def( "hash", &sceneHash )
+		.def( "memoryUsage", &SceneInterface::memoryUsage )
 
 		.def( "pathToString", pathToString ).staticmethod("pathToString")
 		.def( "stringToPath", stringToPath ).staticmethod("stringToPath")
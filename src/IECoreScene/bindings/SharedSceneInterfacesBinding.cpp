@@ -38,6 +38,8 @@
 
 #include "IECoreScene/SharedSceneInterfaces.h"
 
+#include "boost/python/suite/indexing/container_utils.hpp"
+
 using namespace boost::python;
 using namespace IECoreScene;
 
@@ -50,15 +52,36 @@ static SceneInterfacePtr nonConstGet( std::string fileName )
 	return const_cast<SceneInterface*>( scene.get() );
 }
 
+static SceneInterfacePtr nonConstLocation( std::string fileName, list root )
+{
+	SceneInterface::Path p;
+	container_utils::extend_container( p, root );
+	ConstSceneInterfacePtr scene = SharedSceneInterfaces::location( fileName, p );
+	return const_cast<SceneInterface*>( scene.get() );
+}
+
+static SceneInterfacePtr nonConstPin( std::string fileName )
+{
+	ConstSceneInterfacePtr scene = SharedSceneInterfaces::pin( fileName );
+	return const_cast<SceneInterface*>( scene.get() );
+}
+
 void bindSharedSceneInterfaces()
 {
 	class_<SharedSceneInterfaces>( "SharedSceneInterfaces" )
 		.def( "get", nonConstGet ).staticmethod( "get" )
+		.def( "location", nonConstLocation ).staticmethod( "location" )
 		.def( "erase", SharedSceneInterfaces::erase ).staticmethod( "erase" )
 		.def( "clear", SharedSceneInterfaces::clear ).staticmethod( "clear" )
 		.def( "setMaxScenes", SharedSceneInterfaces::setMaxScenes ).staticmethod( "setMaxScenes" )
 		.def( "getMaxScenes", SharedSceneInterfaces::getMaxScenes ).staticmethod( "getMaxScenes" )
 		.def( "numScenes", SharedSceneInterfaces::numScenes ).staticmethod( "numScenes" )
+		.def( "setMemoryLimit", SharedSceneInterfaces::setMemoryLimit ).staticmethod( "setMemoryLimit" )
+		.def( "getMemoryLimit", SharedSceneInterfaces::getMemoryLimit ).staticmethod( "getMemoryLimit" )
+		.def( "memoryUsage", SharedSceneInterfaces::memoryUsage ).staticmethod( "memoryUsage" )
+		.def( "pin", nonConstPin ).staticmethod( "pin" )
+		.def( "unpin", SharedSceneInterfaces::unpin ).staticmethod( "unpin" )
+		.def( "statistics", SharedSceneInterfaces::statistics ).staticmethod( "statistics" )
 	;
 }
 
@@ -153,6 +153,7 @@ from StringAlgoTest import StringAlgoTest
 from PathMatcherTest import PathMatcherTest
 from PathMatcherDataTest import PathMatcherDataTest
 from CancellerTest import CancellerTest
+from ObjectAlgoTest import ObjectAlgoTest
 
 unittest.TestProgram(
 	testRunner = unittest.TextTestRunner(
@@ -39,6 +39,8 @@ import unittest
 import math
 import random
 
+import imath
+
 import IECore
 
 class TestIndexedIO(unittest.TestCase):
@@ -623,6 +625,21 @@ class TestFileIndexedIO(unittest.TestCase):
 
 		self.assertEqual( d, d2 )
 
+	def testReadMultipleCompressedBlocks( self ):
+
+		filePath = "./test/FileIndexedIO.fio"
+		options = IECore.CompoundData( { "compressor" : "lz4", "compressionLevel" : 9, "maxCompressedBlockSize" : IECore.UIntData( 64 * 1024 ) } )
+
+		f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Write, options = options )
+		d = IECore.IntVectorData( range( 300000 ) )
+		f.write( "foo", d )
+		del f
+
+		for threads in ( 1, 4 ) :
+			options = IECore.CompoundData( { "decompressionThreadCount" : threads } )
+			f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Read, options = options )
+			self.assertEqual( f.read( "foo" ), d )
+
 	def testCompressionParametersAndVersionStoredInMetaData( self ):
 
 		options = IECore.CompoundData( { "compressor" : "zlib", "compressionLevel" : 3 } )
@@ -670,6 +687,317 @@ class TestFileIndexedIO(unittest.TestCase):
 		self.assertEqual( f.metadata(),
 			IECore.CompoundData( { "compressor" : "lz4", "compressionLevel" : 0, 'version': IECore.IntData( 7 ), "compressionThreadCount" : 1, "decompressionThreadCount" : 1 } ) )
 
+	def testBatchRead( self ):
+
+		filePath = "./test/FileIndexedIO.fio"
+
+		for level in ( 0, 9 ) :
+
+			options = IECore.CompoundData( { "compressor" : "lz4", "compressionLevel" : level } )
+			f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Write, options = options )
+
+			values = {
+				"int" : IECore.IntData( 10 ),
+				"float" : IECore.FloatData( 2.5 ),
+				"string" : IECore.StringData( "hello" ),
+				"ints" : IECore.IntVectorData( range( 10000 ) ),
+				"floats" : IECore.FloatVectorData( [ i * 0.5 for i in range( 1000 ) ] ),
+				"doubles" : IECore.DoubleVectorData( [] ),
+				"strings" : IECore.StringVectorData( [ "a", "bb", "" ] ),
+				"internedStrings" : IECore.InternedStringVectorData( [ "x", "y", "x" ] ),
+			}
+			for name, value in values.items() :
+				f.write( name, value )
+			f.subdirectory( "dir", IECore.IndexedIO.MissingBehaviour.CreateIfMissing )
+
+			del f
+
+			f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Read )
+
+			names = sorted( values.keys() )
+			self.assertEqual( f.read( names ), [ values[n] for n in names ] )
+			self.assertEqual( f.read( list( reversed( names ) ) ), [ values[n] for n in reversed( names ) ] )
+			self.assertEqual( f.read( [ "ints", "ints" ] ), [ values["ints"], values["ints"] ] )
+			self.assertEqual( f.read( [] ), [] )
+
+			self.assertRaises( RuntimeError, f.read, [ "int", "missing" ] )
+			self.assertRaises( RuntimeError, f.read, [ "dir" ] )
+
+			del f
+
+	def testMemoryMappedRead( self ):
+
+		filePath = "./test/FileIndexedIO.fio"
+
+		for level in ( 0, 9 ) :
+
+			options = IECore.CompoundData( { "compressor" : "lz4", "compressionLevel" : level, "maxCompressedBlockSize" : IECore.UIntData( 1024 * 1024 ) } )
+			f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Write, options = options )
+			g = f.subdirectory( "sub1", IECore.IndexedIO.MissingBehaviour.CreateIfMissing )
+
+			d = IECore.IntVectorData( range( 1024 * 1024 ) )
+			g.write( "int", d )
+			g.write( "string", IECore.StringVectorData( [ "a", "bb", "ccc" ] ) )
+			g.write( "float", IECore.FloatData( 1.5 ) )
+
+			del g, f
+
+			os.environ["IECORE_MMAPREAD_ENABLED"] = "1"
+			try :
+				f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Read )
+			finally :
+				del os.environ["IECORE_MMAPREAD_ENABLED"]
+
+			g = f.subdirectory( "sub1" )
+			self.assertEqual( g.read( "int" ), d )
+			self.assertEqual( g.read( "string" ), IECore.StringVectorData( [ "a", "bb", "ccc" ] ) )
+			self.assertEqual( g.read( "float" ), IECore.FloatData( 1.5 ) )
+
+			del g, f
+
+	def testSubIndexEviction( self ):
+
+		filePath = "./test/FileIndexedIO.fio"
+
+		f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Write )
+		for i in range( 0, 50 ) :
+			g = f.subdirectory( "sub%d" % i, IECore.IndexedIO.MissingBehaviour.CreateIfMissing )
+			g.write( "int", IECore.IntData( i ) )
+			h = g.subdirectory( "nested", IECore.IndexedIO.MissingBehaviour.CreateIfMissing )
+			h.write( "ints", IECore.IntVectorData( range( i ) ) )
+			h.commit()
+			del h
+			g.commit()
+			del g
+
+		del f
+
+		options = IECore.CompoundData( { "subIndexMemoryLimit" : IECore.UInt64Data( 1 ) } )
+		f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Read, options = options )
+
+		# directories referenced by an IndexedIO must survive the eviction of the others
+		kept = f.directory( [ "sub10", "nested" ] )
+
+		for n in range( 0, 2 ) :
+			for i in range( 0, 50 ) :
+				g = f.subdirectory( "sub%d" % i )
+				self.assertEqual( g.read( "int" ), IECore.IntData( i ) )
+				self.assertEqual( g.subdirectory( "nested" ).read( "ints" ), IECore.IntVectorData( range( i ) ) )
+				self.assertEqual( kept.read( "ints" ), IECore.IntVectorData( range( 10 ) ) )
+				self.assertEqual( kept.parentDirectory().read( "int" ), IECore.IntData( 10 ) )
+
+	def testDeduplicateOnAppend( self ):
+
+		filePath = "./test/FileIndexedIO.fio"
+
+		d = IECore.IntVectorData( [ ( i * 7919 ) % 100003 for i in range( 0, 100000 ) ] )
+		options = IECore.CompoundData( { "compressor" : "lz4", "compressionLevel" : 9 } )
+
+		f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Write, options = options )
+		f.write( "a", d )
+		f.write( "b", d )
+		del f
+		size = os.path.getsize( filePath )
+
+		f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Append, options = IECore.CompoundData( { "deduplicateOnAppend" : True } ) )
+		f.write( "c", d )
+		del f
+
+		# only the index should have grown
+		self.assertLess( os.path.getsize( filePath ) - size, 1000 )
+
+		f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Read )
+		for name in ( "a", "b", "c" ) :
+			self.assertEqual( f.read( name ), d )
+
+	def testSaveDuplicateData( self ):
+
+		filePath = "./test/FileIndexedIO.fio"
+
+		d = IECore.V3fVectorData( [ imath.V3f( i ) for i in range( 0, 1000 ) ], IECore.GeometricData.Interpretation.Point )
+		f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Write )
+		d.save( f, "a" )
+		d.save( f, "b" )
+		IECore.FloatVectorData( [ i for i in range( 0, 1000 ) for j in range( 0, 3 ) ] ).save( f, "c" )
+		del f
+
+		f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Read )
+		self.assertEqual( IECore.Object.load( f, "a" ), d )
+		self.assertEqual( IECore.Object.load( f, "b" ), d )
+		self.assertEqual( IECore.Object.load( f, "c" ), IECore.FloatVectorData( [ i for i in range( 0, 1000 ) for j in range( 0, 3 ) ] ) )
+
+	def testBlockCache( self ):
+
+		filePath = "./test/FileIndexedIO.fio"
+		options = IECore.CompoundData( { "compressor" : "lz4", "compressionLevel" : 9 } )
+
+		def writeFile( d ) :
+			f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Write, options = options )
+			f.write( "d", d )
+
+		d1 = IECore.IntVectorData( range( 0, 100000 ) )
+		d2 = IECore.IntVectorData( range( 1, 50000 ) )
+		writeFile( d1 )
+
+		memoryLimit = IECore.StreamIndexedIO.getBlockCacheMemoryLimit()
+		IECore.StreamIndexedIO.setBlockCacheMemoryLimit( 1024 * 1024 * 10 )
+		IECore.StreamIndexedIO.clearBlockCache()
+		try :
+
+			f1 = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Read )
+			f2 = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Read )
+			self.assertEqual( f1.read( "d" ), d1 )
+			self.assertEqual( f2.read( "d" ), d1 )
+
+			statistics = IECore.StreamIndexedIO.blockCacheStatistics()
+			self.assertEqual( statistics["misses"].value, 1 )
+			self.assertEqual( statistics["hits"].value, 1 )
+			self.assertEqual( statistics["memoryUsage"].value, len( d1 ) * 4 )
+			self.assertEqual( statistics["memoryLimit"].value, 1024 * 1024 * 10 )
+
+			del f1, f2
+
+			# rewriting the file must invalidate the cached data
+			os.remove( filePath )
+			writeFile( d2 )
+			f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Read )
+			self.assertEqual( f.read( "d" ), d2 )
+			self.assertEqual( IECore.StreamIndexedIO.blockCacheStatistics()["misses"].value, 2 )
+
+		finally :
+			IECore.StreamIndexedIO.setBlockCacheMemoryLimit( memoryLimit )
+			IECore.StreamIndexedIO.clearBlockCache()
+
+	def testSmallEntryWrites( self ):
+
+		# many small entries are combined into large writes. uncomment
+		# the timer to get useful information printed out.
+
+		t = IECore.Timer()
+		f = IECore.FileIndexedIO( "./test/FileIndexedIO.fio", [], IECore.IndexedIO.OpenMode.Write )
+		for i in range( 0, 100 ) :
+			g = f.subdirectory( str( i ), IECore.IndexedIO.MissingBehaviour.CreateIfMissing )
+			for j in range( 0, 200 ) :
+				g.write( str( j ), i * j )
+				g.write( "v" + str( j ), IECore.IntVectorData( [ i, j ] ) )
+			# reading back data which hasn't been flushed yet
+			self.assertEqual( g.read( "v10" ), IECore.IntVectorData( [ i, 10 ] ) )
+		del f, g
+		#print "WRITE SMALL ENTRIES", t.stop()
+
+		# removing entries in append mode leaves free pages which are reused
+		# by the following writes, so they aren't all sequential.
+		f = IECore.FileIndexedIO( "./test/FileIndexedIO.fio", [], IECore.IndexedIO.OpenMode.Append )
+		for i in range( 0, 100, 2 ) :
+			g = f.subdirectory( str( i ) )
+			for j in range( 0, 200, 3 ) :
+				g.remove( "v" + str( j ) )
+			for j in range( 0, 200, 3 ) :
+				g.write( "v" + str( j ), IECore.IntVectorData( [ j, i ] ) )
+		del f, g
+
+		f = IECore.FileIndexedIO( "./test/FileIndexedIO.fio", [], IECore.IndexedIO.OpenMode.Read )
+		for i in range( 0, 100 ) :
+			g = f.subdirectory( str( i ) )
+			for j in range( 0, 200 ) :
+				self.assertEqual( g.read( str( j ) ).value, i * j )
+				expected = [ j, i ] if i % 2 == 0 and j % 3 == 0 else [ i, j ]
+				self.assertEqual( g.read( "v" + str( j ) ), IECore.IntVectorData( expected ) )
+
+	def testCompressionQueue( self ):
+
+		def writeFile( fileName, queueLength ) :
+
+			options = IECore.CompoundData( { "compressor" : "lz4", "compressionLevel" : 9, "compressionQueueLength" : queueLength } )
+			f = IECore.IndexedIO.create( fileName, [], IECore.IndexedIO.OpenMode.Write, options = options )
+			for i in range( 0, 50 ) :
+				g = f.subdirectory( str( i ), IECore.IndexedIO.MissingBehaviour.CreateIfMissing )
+				g.write( "a", IECore.IntVectorData( range( i, i + 10000 ) ) )
+				# duplicates of queued and written blocks
+				g.write( "b", IECore.IntVectorData( range( i, i + 10000 ) ) )
+				g.write( "c", IECore.IntVectorData( range( 0, 10000 ) ) )
+				g.write( "small", i )
+				if i % 10 == 0 :
+					# reading flushes the queue
+					self.assertEqual( g.read( "a" ), IECore.IntVectorData( range( i, i + 10000 ) ) )
+				if i % 20 == 0 :
+					g.commit()
+
+		writeFile( "./test/FileIndexedIO.fio", 4 )
+		writeFile( "./test/FileIndexedIOQueued.fio", 4 )
+		writeFile( "./test/FileIndexedIOUnqueued.fio", 0 )
+
+		# the order of the blocks in the file doesn't depend on the compression threads
+		with open( "./test/FileIndexedIO.fio", "rb" ) as f1, open( "./test/FileIndexedIOQueued.fio", "rb" ) as f2 :
+			self.assertEqual( f1.read(), f2.read() )
+
+		for fileName in ( "./test/FileIndexedIO.fio", "./test/FileIndexedIOUnqueued.fio" ) :
+			f = IECore.IndexedIO.create( fileName, [], IECore.IndexedIO.OpenMode.Read )
+			for i in range( 0, 50 ) :
+				g = f.subdirectory( str( i ) )
+				self.assertEqual( g.read( "a" ), IECore.IntVectorData( range( i, i + 10000 ) ) )
+				self.assertEqual( g.read( "b" ), IECore.IntVectorData( range( i, i + 10000 ) ) )
+				self.assertEqual( g.read( "c" ), IECore.IntVectorData( range( 0, 10000 ) ) )
+				self.assertEqual( g.read( "small" ).value, i )
+
+	def testCompressionPolicy( self ):
+
+		filePath = "./test/FileIndexedIO.fio"
+
+		ints = IECore.IntVectorData( range( 0, 100000 ) )
+		floats = IECore.FloatVectorData( [ i * 0.5 for i in range( 0, 100000 ) ] )
+		smallInts = IECore.IntVectorData( range( 0, 200 ) )
+
+		def write( policy ) :
+
+			options = IECore.CompoundData( { "compressionPolicy" : policy } )
+			f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Write, options = options )
+			f.write( "ints", ints )
+			f.write( "floats", floats )
+			f.write( "smallInts", smallInts )
+			del f
+
+			# reading needs no options
+			f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Read )
+			self.assertEqual( f.read( "ints" ), ints )
+			self.assertEqual( f.read( "floats" ), floats )
+			self.assertEqual( f.read( "smallInts" ), smallInts )
+			del f
+
+			return os.path.getsize( filePath )
+
+		uncompressedSize = write( IECore.CompoundData() )
+		self.assertGreater( uncompressedSize, ( 200000 + 200 ) * 4 )
+
+		# compression is off by default, but the policy can enable it for a data type
+		intsCompressedSize = write(
+			IECore.CompoundData( {
+				"IntArray" : IECore.CompoundData( { "compressor" : "lz4", "compressionLevel" : 5, "shuffle" : "bit" } ),
+			} )
+		)
+		self.assertLess( intsCompressedSize, uncompressedSize - 300000 )
+
+		# entry names take precedence over data types, and invalid values revert to defaults
+		floatsCompressedSize = write(
+			IECore.CompoundData( {
+				"IntArray" : IECore.CompoundData( { "compressor" : "lz4", "compressionLevel" : 5, "shuffle" : "bit" } ),
+				"ints" : IECore.CompoundData( { "compressionLevel" : 0 } ),
+				"floats" : IECore.CompoundData( { "compressor" : "foobar", "compressionLevel" : 5, "shuffle" : "foobar" } ),
+			} )
+		)
+		self.assertLess( floatsCompressedSize, uncompressedSize )
+		self.assertGreater( floatsCompressedSize, 400000 )
+
+		# small blocks aren't compressed
+		self.assertEqual(
+			write(
+				IECore.CompoundData( {
+					"smallInts" : IECore.CompoundData( { "compressionLevel" : 9 } ),
+				} )
+			),
+			uncompressedSize
+		)
+
 	def setUp( self ):
 
 		if os.path.isfile("./test/FileIndexedIO.fio") :
@@ -678,8 +1006,9 @@ class TestFileIndexedIO(unittest.TestCase):
 	def tearDown(self):
 
 		# cleanup
-		if os.path.isfile("./test/FileIndexedIO.fio") :
-			os.remove("./test/FileIndexedIO.fio")
+		for fileName in ( "./test/FileIndexedIO.fio", "./test/FileIndexedIOQueued.fio", "./test/FileIndexedIOUnqueued.fio" ) :
+			if os.path.isfile( fileName ) :
+				os.remove( fileName )
 
 
 if __name__ == "__main__":
@@ -33,6 +33,7 @@
 #
 ##########################################################################
 
+import os
 import unittest
 import six
 import IECore
@@ -109,6 +110,26 @@ class InternedStringTest( unittest.TestCase ) :
 		i = IECore.InternedString( s )
 		self.assertEqual( str( i ), s )
 
+	def testConcurrentConstruction( self ) :
+
+		IECore.testInternedStringConcurrentConstruction( 100000, 100 )
+		IECore.testInternedStringConcurrentConstruction( 100000, 10000 )
+
+	@unittest.skipUnless( os.environ.get( "CORTEX_PERFORMANCE_TEST", False ), "'CORTEX_PERFORMANCE_TEST' env var not set" )
+	def testConcurrentConstructionPerformance( self ) :
+
+		for numUniqueStrings in ( 100, 100000 ) :
+
+			# Populate the table before timing, so we measure lookups
+			# rather than insertions.
+			IECore.testInternedStringConcurrentConstruction( numUniqueStrings, numUniqueStrings )
+
+			numIterations = 10000000
+			t = IECore.Timer()
+			IECore.testInternedStringConcurrentConstruction( numIterations, numUniqueStrings )
+			elapsed = t.stop()
+			print( "\n{} unique strings : {:.1f} million lookups per second".format( numUniqueStrings, numIterations / elapsed / 1e6 ) )
+
 if __name__ == "__main__":
 	unittest.main()
 
@@ -0,0 +1,213 @@
+##########################################################################
+#
+#  Copyright (c) 2026, Image Engine Design Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are
+#  met:
+#
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#
+#     * Neither the name of Image Engine Design nor the names of any
+#       other contributors to this software may be used to endorse or
+#       promote products derived from this software without specific prior
+#       written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+#  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+#  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+#  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+#  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+#  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+#  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+#  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+#  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##########################################################################
+
+import os
+import unittest
+import imath
+import IECore
+
+class ObjectAlgoTest( unittest.TestCase ) :
+
+	def assertRoundTrips( self, o ) :
+
+		data = IECore.ObjectAlgo.serialise( o )
+		self.assertTrue( isinstance( data, IECore.CharVectorData ) )
+
+		o2 = IECore.ObjectAlgo.deserialise( data )
+		self.assertEqual( o2, o )
+		self.assertEqual( o2.typeId(), o.typeId() )
+
+		return o2
+
+	def testTypedData( self ) :
+
+		for o in [
+			IECore.BoolData( True ),
+			IECore.IntData( 10 ),
+			IECore.FloatData( 2.5 ),
+			IECore.HalfData( 1.5 ),
+			IECore.UInt64Data( 2 ** 63 ),
+			IECore.StringData( "hello" ),
+			IECore.InternedStringData( "world" ),
+			IECore.V3fData( imath.V3f( 1, 2, 3 ), IECore.GeometricData.Interpretation.Normal ),
+			IECore.Color4fData( imath.Color4f( 1, 2, 3, 4 ) ),
+			IECore.Box3fData( imath.Box3f( imath.V3f( -1 ), imath.V3f( 1 ) ) ),
+			IECore.M44fData( imath.M44f().translate( imath.V3f( 1, 2, 3 ) ) ),
+			IECore.QuatdData( imath.Quatd( 1, 2, 3, 4 ) ),
+			IECore.TransformationMatrixfData( IECore.TransformationMatrixf( imath.V3f( 2 ), imath.Eulerf(), imath.V3f( 1 ) ) ),
+			IECore.BoolVectorData( [ True, False, True ] ),
+			IECore.IntVectorData( list( range( 0, 1000 ) ) ),
+			IECore.FloatVectorData(),
+			IECore.StringVectorData( [ "a", "", "bcd" ] ),
+			IECore.InternedStringVectorData( [ "a", "b" ] ),
+			IECore.V3fVectorData( [ imath.V3f( i ) for i in range( 0, 100 ) ], IECore.GeometricData.Interpretation.Point ),
+			IECore.M33dVectorData( [ imath.M33d(), imath.M33d().scale( imath.V2d( 2 ) ) ] ),
+		] :
+			o2 = self.assertRoundTrips( o )
+			if isinstance( o, IECore.V3fData ) or isinstance( o, IECore.V3fVectorData ) :
+				self.assertEqual( o2.getInterpretation(), o.getInterpretation() )
+
+	def testCompounds( self ) :
+
+		o = IECore.CompoundObject( {
+			"a" : IECore.IntData( 1 ),
+			"b" : IECore.CompoundData( {
+				"c" : IECore.StringData( "c" ),
+				"d" : IECore.CompoundData( { "e" : IECore.FloatVectorData( [ 1, 2, 3 ] ) } ),
+			} ),
+			"f" : IECore.ObjectVector( [ IECore.IntData( 2 ), IECore.CompoundObject() ] ),
+			"g" : IECore.CompoundObject(),
+		} )
+
+		self.assertRoundTrips( o )
+
+	def testSharedObjects( self ) :
+
+		shared = IECore.IntVectorData( list( range( 0, 100 ) ) )
+		o = IECore.CompoundObject( {
+			"a" : shared,
+			"b" : IECore.CompoundData( { "c" : shared } ),
+			"d" : IECore.ObjectVector( [ shared, shared ] ),
+		} )
+
+		o2 = self.assertRoundTrips( o )
+		self.assertTrue( o2["a"].isSame( o2["b"]["c"] ) )
+		self.assertTrue( o2["a"].isSame( o2["d"][0] ) )
+		self.assertTrue( o2["a"].isSame( o2["d"][1] ) )
+
+		# Shared members are only encoded once.
+		unshared = IECore.CompoundObject( {
+			"a" : shared,
+			"b" : IECore.CompoundData( { "c" : shared.copy() } ),
+			"d" : IECore.ObjectVector( [ shared.copy(), shared.copy() ] ),
+		} )
+		self.assertLess( len( IECore.ObjectAlgo.serialise( o ) ), len( IECore.ObjectAlgo.serialise( unshared ) ) )
+
+	def testOtherObjects( self ) :
+
+		spline = IECore.SplineffData(
+			IECore.Splineff(
+				IECore.CubicBasisf.catmullRom(),
+				( ( 0, 0 ), ( 0, 0 ), ( 1, 1 ), ( 1, 1 ) )
+			)
+		)
+
+		self.assertRoundTrips( spline )
+		self.assertRoundTrips( IECore.NullObject() )
+		self.assertRoundTrips( IECore.PathMatcherData( IECore.PathMatcher( [ "/a/b", "/c" ] ) ) )
+		self.assertRoundTrips( IECore.CompoundObject( { "spline" : spline, "null" : IECore.NullObject() } ) )
+
+	def testSmallerThanIndexedIO( self ) :
+
+		o = IECore.CompoundData( {
+			"matrix" : IECore.M44fData( imath.M44f() ),
+			"name" : IECore.StringData( "shader" ),
+			"colour" : IECore.Color3fData( imath.Color3f( 1 ) ),
+		} )
+
+		io = IECore.MemoryIndexedIO( IECore.CharVectorData(), [], IECore.IndexedIO.OpenMode.Write )
+		o.save( io, "o" )
+
+		self.assertLess( len( IECore.ObjectAlgo.serialise( o ) ), len( io.buffer() ) )
+
+	def testStoreInIndexedIO( self ) :
+
+		o = IECore.CompoundObject( { "a" : IECore.IntData( 1 ), "b" : IECore.StringVectorData( [ "b" ] ) } )
+
+		io = IECore.MemoryIndexedIO( IECore.CharVectorData(), [], IECore.IndexedIO.OpenMode.Write )
+		io.write( "o", IECore.ObjectAlgo.serialise( o ) )
+
+		io = IECore.MemoryIndexedIO( io.buffer(), [], IECore.IndexedIO.OpenMode.Read )
+		self.assertEqual( IECore.ObjectAlgo.deserialise( io.read( "o" ) ), o )
+
+	def testInvalidData( self ) :
+
+		data = IECore.ObjectAlgo.serialise( IECore.CompoundData( { "a" : IECore.IntVectorData( [ 1, 2, 3 ] ) } ) )
+
+		truncated = IECore.CharVectorData( data[:-1] )
+		self.assertRaises( RuntimeError, IECore.ObjectAlgo.deserialise, truncated )
+
+		notSerialised = IECore.CharVectorData( [ "x" ] * len( data ) )
+		self.assertRaises( RuntimeError, IECore.ObjectAlgo.deserialise, notSerialised )
+
+	def testCancellation( self ) :
+
+		data = IECore.ObjectAlgo.serialise( IECore.IntData( 1 ) )
+
+		canceller = IECore.Canceller()
+		canceller.cancel()
+		with self.assertRaises( IECore.Cancelled ) :
+			IECore.ObjectAlgo.deserialise( data, canceller )
+
+	@unittest.skipUnless( os.environ.get( "CORTEX_PERFORMANCE_TEST", False ), "'CORTEX_PERFORMANCE_TEST' env var not set" )
+	def testPerformance( self ) :
+
+		small = IECore.CompoundData()
+		for i in range( 0, 10 ) :
+			small["parameter%d" % i] = IECore.M44fData( imath.M44f() )
+			small["name%d" % i] = IECore.StringData( "name%d" % i )
+
+		large = IECore.CompoundObject()
+		for i in range( 0, 10 ) :
+			large["P%d" % i] = IECore.V3fVectorData( [ imath.V3f( j ) for j in range( 0, 100000 ) ] )
+
+		for name, o, iterations in [ ( "small", small, 1000 ), ( "large", large, 10 ) ] :
+
+			t = IECore.Timer()
+			for i in range( 0, iterations ) :
+				io = IECore.MemoryIndexedIO( IECore.CharVectorData(), [], IECore.IndexedIO.OpenMode.Write )
+				o.save( io, "o" )
+				buffer = io.buffer()
+			indexedIOSave = t.stop()
+
+			t = IECore.Timer()
+			for i in range( 0, iterations ) :
+				IECore.Object.load( IECore.MemoryIndexedIO( buffer, [], IECore.IndexedIO.OpenMode.Read ), "o" )
+			indexedIOLoad = t.stop()
+
+			t = IECore.Timer()
+			for i in range( 0, iterations ) :
+				data = IECore.ObjectAlgo.serialise( o )
+			serialiseTime = t.stop()
+
+			t = IECore.Timer()
+			for i in range( 0, iterations ) :
+				IECore.ObjectAlgo.deserialise( data )
+			deserialiseTime = t.stop()
+
+			print( "\n%s : IndexedIO %d bytes, save %.4fs, load %.4fs" % ( name, len( buffer ), indexedIOSave, indexedIOLoad ) )
+			print( "%s : ObjectAlgo %d bytes, serialise %.4fs, deserialise %.4fs" % ( name, len( data ), serialiseTime, deserialiseTime ) )
+
+if __name__ == "__main__":
+	unittest.main()
@@ -262,6 +262,60 @@ class TestObjectIO( unittest.TestCase ) :
 		self.assertTrue( dd['c']['d'].isSame( dd['links']['v3'] ) )
 		self.assertTrue( dd['c/d'].isSame( dd['links']['v3'] ) )
 
+	def testParallelLoad( self ) :
+
+		shared = IECore.IntVectorData( list( range( 0, 1000 ) ) )
+
+		c = IECore.CompoundObject()
+		for i in range( 0, 100 ) :
+			d = IECore.CompoundData()
+			for j in range( 0, 20 ) :
+				d[str(j)] = IECore.IntVectorData( [ i, j ] * 100 )
+			d["shared"] = shared
+			c[str(i)] = d
+			c["shared" + str(i)] = shared
+
+		v = IECore.ObjectVector( [ c["0"], shared ] * 50 )
+		c["vector"] = v
+
+		f = IECore.FileIndexedIO( "test/o.fio", [], IECore.IndexedIO.OpenMode.Write )
+		c.save( f, "test" )
+		del f
+
+		f = IECore.FileIndexedIO( "test/o.fio", [], IECore.IndexedIO.OpenMode.Read )
+		for i in range( 0, 10 ) :
+
+			cc = IECore.Object.load( f, "test" )
+			self.assertEqual( cc, c )
+
+			s = cc["shared0"]
+			for j in range( 0, 100 ) :
+				self.assertTrue( cc[str(j)]["shared"].isSame( s ) )
+				self.assertTrue( cc["shared" + str(j)].isSame( s ) )
+
+			vv = cc["vector"]
+			for j in range( 0, 100, 2 ) :
+				self.assertTrue( vv[j].isSame( cc["0"] ) )
+				self.assertTrue( vv[j+1].isSame( s ) )
+
+	def testCancelLoad( self ) :
+
+		c = IECore.CompoundObject()
+		for i in range( 0, 100 ) :
+			c[str(i)] = IECore.IntVectorData( [ i ] * 1000 )
+
+		f = IECore.FileIndexedIO( "test/o.fio", [], IECore.IndexedIO.OpenMode.Write )
+		c.save( f, "test" )
+		del f
+
+		f = IECore.FileIndexedIO( "test/o.fio", [], IECore.IndexedIO.OpenMode.Read )
+		canceller = IECore.Canceller()
+		canceller.cancel()
+		with self.assertRaises( IECore.Cancelled ) :
+			IECore.Object.load( f, "test", canceller )
+
+		self.assertEqual( IECore.Object.load( f, "test" ), c )
+
 	def tearDown( self ) :
 
 		for f in [ "test/o.fio", "test/FileIndexedIOSlashes.fio" ] :
@@ -130,5 +130,27 @@ class PathMatcherDataTest( unittest.TestCase ) :
 
 		self.assertEqual( d, d2 )
 
+	def testSaveAndLoadNonExactAncestors( self ) :
+
+		d = IECore.PathMatcherData(
+			IECore.PathMatcher( [
+				"/",
+				"/a/b/c/d",
+				"/a/b/e",
+				"/a/f",
+				"/g/h/i",
+				"/g",
+			] )
+		)
+
+		saveIO = IECore.MemoryIndexedIO( IECore.CharVectorData(), IECore.IndexedIO.OpenMode.Write )
+		d.save( saveIO, "d" )
+
+		loadIO = IECore.MemoryIndexedIO( saveIO.buffer(), IECore.IndexedIO.OpenMode.Read )
+		d2 = IECore.Object.load( loadIO, "d" )
+
+		self.assertEqual( d, d2 )
+		self.assertEqual( d2.value.size(), 6 )
+
 if __name__ == "__main__":
 	unittest.main()
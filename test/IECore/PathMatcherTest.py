@@ -35,6 +35,7 @@
 #
 ##########################################################################
 
+import os
 import unittest
 import random
 
@@ -976,5 +977,101 @@ class PathMatcherTest( unittest.TestCase ) :
 		m.clear()
 		self.assertEqual( m.size(), 0 )
 
+	def testInitFromStringVectorData( self ) :
+
+		paths = [ "/" + "/".join( p ) for p in self.generatePaths( seed = 1, depthRange = ( 2, 6 ), numChildrenRange = ( 1, 6 ) ) ]
+		random.seed( 2 )
+		for i in range( 0, 3 ) :
+			paths.append( random.choice( paths ) )
+		paths.append( "/" )
+
+		# Reference built one path at a time using `addPath()`.
+		expected = IECore.PathMatcher()
+		for path in paths :
+			expected.addPath( path )
+
+		for order in ( "sorted", "reversed", "shuffled" ) :
+			if order == "sorted" :
+				paths.sort()
+			elif order == "reversed" :
+				paths.reverse()
+			else :
+				random.shuffle( paths )
+			self.assertEqual( IECore.PathMatcher( IECore.StringVectorData( paths ) ), expected )
+
+	def testInitDoesntModifyLeaves( self ) :
+
+		m1 = IECore.PathMatcher( IECore.StringVectorData( [ "/a", "/b" ] ) )
+		m2 = IECore.PathMatcher( IECore.StringVectorData( [ "/a", "/a/b", "/b", "/b/c/d" ] ) )
+
+		self.assertEqual( sorted( m1.paths() ), [ "/a", "/b" ] )
+		self.assertEqual( m1.match( "/a/b" ), IECore.PathMatcher.Result.AncestorMatch )
+		self.assertEqual( sorted( m2.paths() ), [ "/a", "/a/b", "/b", "/b/c/d" ] )
+
+	def testIntersectionMatchesPaths( self ) :
+
+		paths = [ "/" + "/".join( p ) for p in self.generatePaths( seed = 3, depthRange = ( 2, 5 ), numChildrenRange = ( 1, 5 ) ) ]
+		random.seed( 4 )
+		paths1 = random.sample( paths, len( paths ) // 2 ) + [ "/a*/b", "/..." ]
+		paths2 = random.sample( paths, len( paths ) // 2 ) + [ "/a*/b" ]
+
+		m1 = IECore.PathMatcher( paths1 )
+		m2 = IECore.PathMatcher( paths2 )
+
+		expected = sorted( set( paths1 ).intersection( paths2 ) )
+		self.assertEqual( sorted( m1.intersection( m2 ).paths() ), expected )
+		self.assertEqual( sorted( m2.intersection( m1 ).paths() ), expected )
+
+		self.assertEqual( m1.intersection( m1 ), m1 )
+		self.assertEqual( m1.intersection( IECore.PathMatcher() ), IECore.PathMatcher() )
+		self.assertEqual( IECore.PathMatcher( [ "/" ] ).intersection( IECore.PathMatcher( [ "/", "/a" ] ) ).paths(), [ "/" ] )
+
+		# Editing the intersection must not affect the inputs
+		# it shares nodes with.
+		m1Copy = IECore.PathMatcher( m1 )
+		i = m1.intersection( m1 )
+		i.addPath( "/new/path" )
+		i.removePath( paths1[0] )
+		self.assertEqual( m1, m1Copy )
+
+	@unittest.skipUnless( os.environ.get( "CORTEX_PERFORMANCE_TEST", False ), "'CORTEX_PERFORMANCE_TEST' env var not set" )
+	def testSetOperationsPerformance( self ) :
+
+		paths = [ "/" + "/".join( p ) for p in self.generatePaths( seed = 5, depthRange = ( 3, 4 ), numChildrenRange = ( 10, 20 ) ) ]
+		random.seed( 6 )
+		paths1 = IECore.StringVectorData( sorted( random.sample( paths, len( paths ) // 2 ) ) )
+		paths2 = IECore.StringVectorData( sorted( random.sample( paths, len( paths ) // 2 ) ) )
+
+		t = IECore.Timer()
+		m1 = IECore.PathMatcher()
+		m1.init( list( paths1 ) )
+		print( "\n%d paths : addPath() %.4fs" % ( len( paths1 ), t.stop() ) )
+
+		t = IECore.Timer()
+		m1 = IECore.PathMatcher( paths1 )
+		m2 = IECore.PathMatcher( paths2 )
+		print( "%d paths : init() %.4fs" % ( len( paths1 ), t.stop() / 2 ) )
+
+		t = IECore.Timer()
+		m = IECore.PathMatcher( m1 )
+		m.addPaths( m2 )
+		print( "addPaths() %.4fs" % t.stop() )
+
+		t = IECore.Timer()
+		m.removePaths( m2 )
+		print( "removePaths() %.4fs" % t.stop() )
+
+		t = IECore.Timer()
+		m1.intersection( m2 )
+		print( "intersection() %.4fs" % t.stop() )
+
+		d = IECore.PathMatcherData( m1 )
+		io = IECore.MemoryIndexedIO( IECore.CharVectorData(), IECore.IndexedIO.OpenMode.Write )
+		d.save( io, "d" )
+		io = IECore.MemoryIndexedIO( io.buffer(), IECore.IndexedIO.OpenMode.Read )
+		t = IECore.Timer()
+		IECore.Object.load( io, "d" )
+		print( "PathMatcherData load %.4fs" % t.stop() )
+
 if __name__ == "__main__":
 	unittest.main()
@@ -330,6 +330,32 @@ class LinkedSceneTest( unittest.TestCase ) :
 		self.assertEqual( A2.hasAttribute( "sceneInterface:link.time" ), False )
 
 
+	def testReadObjectsWithTimeRemapping( self ) :
+
+		m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Write )
+		c = m.createChild( "a" )
+		for i in range( 0, 5 ) :
+			c.writeObject( IECoreScene.PointsPrimitive( IECore.V3fVectorData( [ imath.V3f( i ) ] * 10 ) ), i )
+		del m, c
+
+		m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Read )
+		l = IECoreScene.LinkedScene( "/tmp/test.lscc", IECore.IndexedIO.OpenMode.Write )
+		# play the linked scene back at half speed, starting at time 1
+		i = l.createChild( "instance" )
+		i.writeAttribute( IECoreScene.LinkedScene.linkAttribute, IECoreScene.LinkedScene.linkAttributeData( m, 1.0 ), 0.0 )
+		i.writeAttribute( IECoreScene.LinkedScene.linkAttribute, IECoreScene.LinkedScene.linkAttributeData( m, 3.0 ), 4.0 )
+		del i, l
+
+		l = IECoreScene.LinkedScene( "/tmp/test.lscc", IECore.IndexedIO.OpenMode.Read )
+		a = l.child( "instance" ).child( "a" )
+
+		times = [ 0.0, 0.5, 1.0, 2.0, 3.25, 4.0 ]
+		objects = a.readObjects( times )
+		self.assertEqual( len( objects ), len( times ) )
+		for time, o in zip( times, objects ) :
+			self.assertEqual( o, a.readObject( time ) )
+			self.assertEqual( o, IECoreScene.PointsPrimitive( IECore.V3fVectorData( [ imath.V3f( 1 + time / 2.0 ) ] * 10 ) ) )
+
 	def testNestedTimeRemapping( self ):
 
 		m = IECoreScene.SceneCache( "test/IECore/data/sccFiles/animatedSpheres.scc", IECore.IndexedIO.OpenMode.Read )
@@ -1159,6 +1185,46 @@ class LinkedSceneTest( unittest.TestCase ) :
 		self.assertEqual( r.readSet( "don" ), IECore.PathMatcher(['/C', '/C/D/A'] ) )
 		self.assertEqual( r.readSet( "stew" ), IECore.PathMatcher(['/C/D/A/B'] ) )
 
+	def testExpandLinks( self ) :
+
+		m = IECoreScene.SceneCache( "test/IECore/data/sccFiles/animatedSpheres.scc", IECore.IndexedIO.OpenMode.Read )
+
+		n = IECoreScene.LinkedScene( "/tmp/testNested.lscc", IECore.IndexedIO.OpenMode.Write )
+		n.createChild( "instance" ).writeLink( m.child( "A" ) )
+		del n
+
+		n = IECoreScene.LinkedScene( "/tmp/testNested.lscc", IECore.IndexedIO.OpenMode.Read )
+
+		l = IECoreScene.LinkedScene( "/tmp/test.lscc", IECore.IndexedIO.OpenMode.Write )
+		g = l.createChild( "group" )
+		for i in range( 20 ) :
+			g.createChild( "instance{0}".format( i ) ).writeLink( m if i % 2 else m.child( "A" ) )
+		l.createChild( "nested" ).writeLink( n )
+		del g, l
+
+		l = IECoreScene.LinkedScene( "/tmp/test.lscc", IECore.IndexedIO.OpenMode.Read )
+
+		canceller = IECore.Canceller()
+		canceller.cancel()
+		self.assertRaises( IECore.Cancelled, l.expandLinks, canceller )
+
+		l.expandLinks()
+
+		# Expanding again finds the links in the cache.
+		l.expandLinks()
+		l.child( "group" ).expandLinks()
+
+		g = l.child( "group" )
+		for i in range( 20 ) :
+			instance = g.child( "instance{0}".format( i ) )
+			expected = m if i % 2 else m.child( "A" )
+			self.assertEqual( instance.childNames(), expected.childNames() )
+			self.assertEqual( instance.readBound( 0.5 ), expected.readBound( 0.5 ) )
+
+		nested = l.scene( [ "nested", "instance" ] )
+		self.assertEqual( nested.childNames(), m.child( "A" ).childNames() )
+		self.assertEqual( nested.readBound( 0.5 ), m.child( "A" ).readBound( 0.5 ) )
+
 
 if __name__ == "__main__":
 	unittest.main()
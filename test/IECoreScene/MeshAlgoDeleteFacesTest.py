@@ -99,6 +99,17 @@ class MeshAlgoDeleteFacesTest( unittest.TestCase ) :
 		self.assertEqual( facesDeletedMesh["P"].data, IECore.V3fVectorData( [ imath.V3f( 0, 0, 0 ), imath.V3f( 1, 0, 0 ), imath.V3f( 1, 1, 0 ), imath.V3f( 0, 1, 0 ) ], IECore.GeometricData.Interpretation.Point ) )
 		self.assertEqual( facesDeletedMesh["delete"].data, IECore.IntVectorData( [1, 1] ) )
 
+	def testNoFacesRemovedSharesData( self ) :
+
+		mesh = self.makeQuadTriangleMesh()
+		mesh["delete"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Uniform, IECore.IntVectorData( [ 0, 0 ] ) )
+
+		facesDeletedMesh = IECoreScene.MeshAlgo.deleteFaces( mesh, mesh["delete"] )
+
+		self.assertEqual( facesDeletedMesh, mesh )
+		for name in mesh.keys() :
+			self.assertTrue( facesDeletedMesh[name].data.isSame( mesh[name].data ) )
+
 	def testCanRemoveFirstFace( self ) :
 		deleteAttributeData = IECore.IntVectorData( [1, 0] )
 
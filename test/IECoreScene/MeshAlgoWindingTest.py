@@ -159,5 +159,18 @@ class MeshAlgoWindingTest( unittest.TestCase ) :
 		IECoreScene.MeshAlgo.reverseWinding( meshCopy )
 		self.assertEqual( meshCopy, mesh )
 
+	def testSharedDataNotModified( self ) :
+
+		mesh = self.makeSingleTriangleMesh()
+		other = IECoreScene.MeshPrimitive( mesh.verticesPerFace, mesh.vertexIds, "linear", mesh["P"].data )
+		other["uv"] = mesh["uv"]
+		otherCopy = other.copy()
+
+		IECoreScene.MeshAlgo.reverseWinding( mesh )
+
+		self.assertEqual( other, otherCopy )
+		self.assertEqual( list( mesh["uv"].data ), list( reversed( other["uv"].data ) ) )
+		self.assertTrue( mesh["P"].data.isSame( other["P"].data ) )
+
 if __name__ == "__main__":
 	unittest.main()
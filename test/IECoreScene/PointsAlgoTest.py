@@ -382,6 +382,9 @@ class DeletePointsTest( unittest.TestCase ) :
 		self.assertEqual( invertedPoints["d"].data, IECore.FloatVectorData( range( 0, 10 ) ) )
 		self.assertEqual( invertedPoints["e"].data, IECore.FloatVectorData( range( 0, 10 ) ) )
 
+		for name in points.keys() :
+			self.assertTrue( invertedPoints[name].data.isSame( points[name].data ) )
+
 
 	def testPrimitiveVariablesCorrectlyFiltered(self):
 		points  = self.points()
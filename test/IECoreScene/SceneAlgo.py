@@ -149,6 +149,53 @@ class SceneAlgoTest( unittest.TestCase ) :
 		self.assertEqual( len( t.childNames()), 4096 )
 
 
+	def testCopyProgressAndMemoryLimit( self ) :
+
+		self.writeBigSCC()
+
+		for memoryLimit in ( 0, 1024, 1024 * 1024 * 1024 ) :
+
+			src = IECoreScene.SceneCache( SceneAlgoTest.__testFile, IECore.IndexedIO.OpenMode.Read )
+			dst = IECoreScene.SceneCache( SceneAlgoTest.__testFile2, IECore.IndexedIO.OpenMode.Write )
+
+			progress = []
+			IECoreScene.SceneAlgo.copy(
+				src, dst, 1, 2, 1.0, IECoreScene.SceneAlgo.ProcessFlags.All,
+				memoryLimit = memoryLimit, progress = lambda written, total : progress.append( ( written, total ) )
+			)
+
+			del dst, src
+
+			numSamples = ( 4096 + 2 ) * 2
+			self.assertEqual( progress, [ ( i, numSamples ) for i in range( 1, numSamples + 1 ) ] )
+
+			src = IECoreScene.SceneCache( SceneAlgoTest.__testFile2, IECore.IndexedIO.OpenMode.Read )
+			t = src.child( "t" )
+			self.assertEqual( len( t.childNames() ), 4096 )
+			self.assertEqual( t.child( "t10" ).readAttribute( "foo", 1.0 ), IECore.IntData( 1 ) )
+			self.assertEqual(
+				t.child( "t10" ).readObject( 2.0 ),
+				IECoreScene.MeshPrimitive.createBox( imath.Box3f( imath.V3f( -10 ), imath.V3f( 10 ) ) )
+			)
+
+	def testCopyCancellation( self ) :
+
+		self.writeBigSCC()
+
+		src = IECoreScene.SceneCache( SceneAlgoTest.__testFile, IECore.IndexedIO.OpenMode.Read )
+		dst = IECoreScene.SceneCache( SceneAlgoTest.__testFile2, IECore.IndexedIO.OpenMode.Write )
+
+		canceller = IECore.Canceller()
+		def progress( written, total ) :
+			if written == 100 :
+				canceller.cancel()
+
+		with self.assertRaises( IECore.Cancelled ) :
+			IECoreScene.SceneAlgo.copy(
+				src, dst, 1, 1, 1.0, IECoreScene.SceneAlgo.ProcessFlags.All,
+				progress = progress, canceller = canceller
+			)
+
 	def testMultithreadedRead( self ):
 
 		self.writeBigSCC()
@@ -167,7 +214,71 @@ class SceneAlgoTest( unittest.TestCase ) :
 				self.assertEqual(stats["sets"], 0)
 				self.assertEqual(stats["attributes"], 4096 * 2 )  # default attribute & custom attribute 'foo'
 
+	def testParallelTraverse( self ) :
+
+		self.writeSCC()
+		src = IECoreScene.SceneCache( SceneAlgoTest.__testFile, IECore.IndexedIO.OpenMode.Read )
+
+		# Values returned by the visitor are collected per location, in frame order.
+
+		result = IECoreScene.SceneAlgo.parallelTraverse(
+			src, lambda scene, time : ( time, scene.hasObject() ), 1, 3, 1.0
+		)
+		self.assertEqual(
+			result,
+			{
+				"/" : [ ( 1.0, False ), ( 2.0, False ), ( 3.0, False ) ],
+				"/t" : [ ( 1.0, False ), ( 2.0, False ), ( 3.0, False ) ],
+				"/t/s" : [ ( 1.0, True ), ( 2.0, True ), ( 3.0, True ) ],
+			}
+		)
+
+		# Returning False prunes the children, and None and True aren't recorded.
+
+		visited = []
+		def visitor( scene, time ) :
+			visited.append( scene.pathAsString() )
+			return scene.name() != "t"
+
+		self.assertEqual( IECoreScene.SceneAlgo.parallelTraverse( src, visitor, 1, 1, 1.0 ), {} )
+		self.assertEqual( sorted( visited ), [ "/", "/t" ] )
+
+		# Filtering
+
+		result = IECoreScene.SceneAlgo.parallelTraverse(
+			src, lambda scene, time : scene.readAttribute( "glah", time ), 1, 1, 1.0,
+			filter = IECore.PathMatcher( [ "/t/s" ] )
+		)
+		self.assertEqual( result, { "/t/s" : [ IECore.IntData( 15 ) ] } )
+
+		# Exceptions are propagated
+
+		def raiser( scene, time ) :
+			raise RuntimeError( "Oops" )
+
+		with self.assertRaisesRegex( RuntimeError, "Oops" ) :
+			IECoreScene.SceneAlgo.parallelTraverse( src, raiser, 1, 1, 1.0 )
+
+		# Cancellation
+
+		canceller = IECore.Canceller()
+		canceller.cancel()
+		with self.assertRaises( IECore.Cancelled ) :
+			IECoreScene.SceneAlgo.parallelTraverse( src, lambda scene, time : None, 1, 1, 1.0, canceller = canceller )
+
+	def testParallelTraverseThreads( self ) :
+
+		self.writeBigSCC()
+		src = IECoreScene.SceneCache( SceneAlgoTest.__testFile, IECore.IndexedIO.OpenMode.Read )
+
+		result = IECoreScene.SceneAlgo.parallelTraverse(
+			src, lambda scene, time : scene.readBound( time ).size().x if scene.hasObject() else None, 1, 1, 1.0,
+			filter = IECore.PathMatcher( [ "/t/..." ] )
+		)
 
+		self.assertEqual( len( result ), 4096 )
+		for i in range( 4096 ) :
+			self.assertEqual( result["/t/t{0}".format( i )], [ i * 2 ] )
 
 if __name__ == "__main__" :
 	unittest.main()
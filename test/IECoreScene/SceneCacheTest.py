@@ -33,6 +33,7 @@
 ##########################################################################
 
 import gc
+import os
 import sys
 import math
 import unittest
@@ -437,6 +438,32 @@ class SceneCacheTest( unittest.TestCase ) :
 		self.assertRaises( RuntimeError, b.createChild, "c" )
 		self.assertRaises( RuntimeError, b.child, "c", IECoreScene.SceneInterface.MissingBehaviour.CreateIfMissing )
 
+	def testReadingRetainedLocationsAfterFlush( self ) :
+
+		m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Write )
+		a = m.createChild( "a" )
+		b = a.createChild( "b" )
+		c = b.createChild( "c" )
+		c.createChild( "d" )
+		m.createChild( "e" ).createChild( "f" ).createChild( "g" )
+		del m
+
+		# The locations below the flushed root are still usable for reading.
+		for location, name, path, childNames in [
+			( a, "a", [ "a" ], [ "b" ] ),
+			( b, "b", [ "a", "b" ], [ "c" ] ),
+			( c, "c", [ "a", "b", "c" ], [ "d" ] ),
+		] :
+			self.assertEqual( location.name(), name )
+			self.assertEqual( location.path(), path )
+			self.assertEqual( location.childNames(), childNames )
+
+		del a, b, c
+
+		m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Read )
+		self.assertEqual( m.scene( [ "a", "b", "c" ] ).childNames(), [ "d" ] )
+		self.assertEqual( m.scene( [ "e", "f" ] ).childNames(), [ "g" ] )
+
 	def testStoredScene( self ):
 
 		m = IECoreScene.SceneCache( "test/IECore/data/sccFiles/animatedSpheres.scc", IECore.IndexedIO.OpenMode.Read )
@@ -1125,6 +1152,43 @@ class SceneCacheTest( unittest.TestCase ) :
 
 		IECoreScene.testSceneCacheParallelFakeAttributeRead()
 
+	def testSubIndexedHierarchy( self ) :
+
+		m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Write )
+		for i in range( 0, 10 ) :
+			a = m.createChild( "a%d" % i )
+			a.writeTags( [ "tagA" ] )
+			for j in range( 0, 10 ) :
+				b = a.createChild( "b%d" % j )
+				b.writeTransform( IECore.M44dData( imath.M44d().translate( imath.V3d( i, j, 0 ) ) ), 0.0 )
+				c = b.createChild( "c" )
+				c.writeObject( IECoreScene.SpherePrimitive( j + 1 ), 0.0 )
+
+		del m, a, b, c
+
+		def checkHierarchy() :
+
+			m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Read )
+			self.assertEqual( len( m.childNames() ), 10 )
+			for i in range( 0, 10 ) :
+				a = m.child( "a%d" % i )
+				self.assertTrue( a.hasTag( "tagA", IECoreScene.SceneInterface.TagFilter.LocalTag ) )
+				self.assertEqual( len( a.childNames() ), 10 )
+				for j in range( 0, 10 ) :
+					b = a.child( "b%d" % j )
+					self.assertEqual( b.readTransformAsMatrix( 0.0 ), imath.M44d().translate( imath.V3d( i, j, 0 ) ) )
+					self.assertEqual( b.child( "c" ).readObject( 0.0 ), IECoreScene.SpherePrimitive( j + 1 ) )
+					self.assertEqual( b.readBound( 0.0 ), imath.Box3d( imath.V3d( -j - 1 ), imath.V3d( j + 1 ) ) )
+
+		checkHierarchy()
+
+		# and again, releasing the location subindexes as soon as possible
+		os.environ["IECORE_STREAMINDEXEDIO_SUBINDEX_MEMORY_LIMIT"] = "1"
+		try :
+			checkHierarchy()
+		finally :
+			del os.environ["IECORE_STREAMINDEXEDIO_SUBINDEX_MEMORY_LIMIT"]
+
 	def testCanReadV6SceneCache( self ):
 
 		r = IECore.IndexedIO.create("test/IECore/data/sccFiles/cube_v6.scc", IECore.IndexedIO.OpenMode.Read)
@@ -1198,6 +1262,410 @@ class SceneCacheTest( unittest.TestCase ) :
 		for a in nonShaderAttributes :
 			self.assertEqual( c.readAttribute( a, 0 ), objectVector )
 
+	def testPrimitiveVariableEncoding( self ) :
+
+		points = IECore.V3fVectorData( [ imath.V3f( math.sin( i ) * 10, math.cos( i ) * 5, i * 0.01 ) for i in range( 0, 10000 ) ] )
+		widths = IECore.FloatVectorData( [ 1 + math.sin( i ) for i in range( 0, 10000 ) ] )
+		colors = IECore.Color3fVectorData( [ imath.Color3f( 1, 0.5, i * 0.0001 ) for i in range( 0, 10000 ) ] )
+		primitive = IECoreScene.PointsPrimitive( points )
+		primitive["width"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Vertex, widths )
+		primitive["Cs"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Vertex, colors )
+
+		def write( encodings ) :
+
+			io = IECore.MemoryIndexedIO( IECore.CharVectorData(), IECore.IndexedIO.OpenMode.Write )
+			scene = IECoreScene.SceneCache( io )
+			for name, encoding in encodings.items() :
+				scene.setPrimitiveVariableEncoding( name, encoding )
+			scene.createChild( "points" ).writeObject( primitive, 0 )
+			del scene
+			return io.buffer()
+
+		def read( buffer ) :
+
+			io = IECore.MemoryIndexedIO( buffer, IECore.IndexedIO.OpenMode.Read )
+			return IECoreScene.SceneCache( io ).child( "points" ).readObject( 0 )
+
+		def maxError( a, b, components ) :
+
+			if components == 1 :
+				return max( abs( x - y ) for x, y in zip( a, b ) )
+			return max( abs( x[i] - y[i] ) for x, y in zip( a, b ) for i in range( 0, components ) )
+
+		fullBuffer = write( {} )
+		self.assertEqual( read( fullBuffer ), primitive )
+
+		encodedBuffer = write( {
+			"P" : IECoreScene.SceneCache.PrimitiveVariableEncoding.FixedPoint,
+			"width" : IECoreScene.SceneCache.PrimitiveVariableEncoding.HalfPrecision,
+			"Cs" : IECoreScene.SceneCache.PrimitiveVariableEncoding.FullPrecision,
+		} )
+		self.assertLess( len( encodedBuffer ), len( fullBuffer ) )
+
+		encoded = read( encodedBuffer )
+		self.assertEqual( encoded.keys(), primitive.keys() )
+		for name in primitive.keys() :
+			self.assertEqual( type( encoded[name].data ), type( primitive[name].data ) )
+			self.assertEqual( encoded[name].interpolation, primitive[name].interpolation )
+			self.assertEqual( len( encoded[name].data ), len( primitive[name].data ) )
+
+		self.assertEqual( encoded["P"].data.getInterpretation(), IECore.GeometricData.Interpretation.Point )
+		self.assertEqual( encoded["Cs"].data, colors )
+		self.assertNotEqual( encoded["P"].data, points )
+		# 16 bits across the 20 unit range of x
+		self.assertLessEqual( maxError( encoded["P"].data, points, 3 ), 20.0 / 65535 )
+		# half floats have 11 bits of precision
+		self.assertLessEqual( maxError( encoded["width"].data, widths, 1 ), 2.0 / 2048 )
+		self.assertTrue( encoded.arePrimitiveVariablesValid() )
+
+		# values outside the range of half floats are stored at full precision.
+
+		primitive["width"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Vertex, IECore.FloatVectorData( [ 1e6 ] * 10000 ) )
+		encoded = read( write( { "width" : IECoreScene.SceneCache.PrimitiveVariableEncoding.HalfPrecision } ) )
+		self.assertEqual( encoded["width"], primitive["width"] )
+
+		# as are values whose range overflows a float.
+
+		floatMax = 3.4028234663852886e+38
+		primitive["width"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Vertex, IECore.FloatVectorData( [ -floatMax, floatMax ] * 5000 ) )
+		encoded = read( write( { "width" : IECoreScene.SceneCache.PrimitiveVariableEncoding.FixedPoint } ) )
+		self.assertEqual( encoded["width"], primitive["width"] )
+
+	def testCaches( self ) :
+
+		m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Write )
+		for i in range( 0, 10 ) :
+			c = m.createChild( str( i ) )
+			c.writeObject( IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( 1 ) ), imath.V2i( 100 ) ), 0 )
+			c.writeAttribute( "a", IECore.IntData( i ), 0 )
+			c.writeTransform( IECore.M44dData( imath.M44d().translate( imath.V3d( i ) ) ), 0 )
+		del m, c
+
+		cacheTypes = [ IECoreScene.SceneCache.CacheType.ObjectCache, IECoreScene.SceneCache.CacheType.AttributeCache, IECoreScene.SceneCache.CacheType.TransformCache ]
+		memoryLimits = [ IECoreScene.SceneCache.getCacheMemoryLimit( t ) for t in cacheTypes ]
+		for t in cacheTypes :
+			IECoreScene.SceneCache.clearCache( t )
+
+		try :
+
+			m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Read )
+			for n in m.childNames() :
+				c = m.child( n )
+				for i in range( 0, 2 ) :
+					c.readObject( 0 )
+					c.readAttribute( "a", 0 )
+					c.readTransform( 0 )
+
+			objectSize = m.child( "0" ).readObject( 0 ).memoryUsage()
+			for t in cacheTypes :
+				statistics = IECoreScene.SceneCache.cacheStatistics( t )
+				self.assertEqual( statistics["misses"].value, 10 )
+				self.assertGreaterEqual( statistics["hits"].value, 10 )
+				self.assertEqual( statistics["evictions"].value, 0 )
+				self.assertGreater( statistics["memoryUsage"].value, 0 )
+
+			# reopening the same file reuses the cached entries
+
+			m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Read )
+			for n in m.childNames() :
+				c = m.child( n )
+				c.readObject( 0 )
+				c.readAttribute( "a", 0 )
+				c.readTransform( 0 )
+
+			for t in cacheTypes :
+				self.assertEqual( IECoreScene.SceneCache.cacheStatistics( t )["misses"].value, 10 )
+
+			self.assertEqual( IECoreScene.SceneCache.cacheStatistics( IECoreScene.SceneCache.CacheType.ObjectCache )["memoryUsage"].value, objectSize * 10 )
+
+			# objects are evicted to keep within the memory limit
+
+			IECoreScene.SceneCache.setCacheMemoryLimit( IECoreScene.SceneCache.CacheType.ObjectCache, objectSize * 5 )
+			self.assertEqual( IECoreScene.SceneCache.getCacheMemoryLimit( IECoreScene.SceneCache.CacheType.ObjectCache ), objectSize * 5 )
+
+			statistics = IECoreScene.SceneCache.cacheStatistics( IECoreScene.SceneCache.CacheType.ObjectCache )
+			self.assertEqual( statistics["evictions"].value, 5 )
+			self.assertEqual( statistics["memoryUsage"].value, objectSize * 5 )
+			self.assertEqual( statistics["memoryLimit"].value, objectSize * 5 )
+
+			self.assertEqual( m.child( "0" ).readObject( 0 ), IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( 1 ) ), imath.V2i( 100 ) ) )
+			self.assertEqual( IECoreScene.SceneCache.cacheStatistics( IECoreScene.SceneCache.CacheType.ObjectCache )["misses"].value, 11 )
+
+			# rewriting the file doesn't return stale data
+
+			del m, c
+			m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Write )
+			m.createChild( "0" ).writeAttribute( "a", IECore.IntData( 100 ), 0 )
+			del m
+
+			m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Read )
+			self.assertEqual( m.child( "0" ).readAttribute( "a", 0 ), IECore.IntData( 100 ) )
+
+		finally :
+
+			for t, memoryLimit in zip( cacheTypes, memoryLimits ) :
+				IECoreScene.SceneCache.setCacheMemoryLimit( t, memoryLimit )
+				IECoreScene.SceneCache.clearCache( t )
+
+	def testPrefetch( self ) :
+
+		m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Write )
+		for name in [ "a", "b" ] :
+			c = m.createChild( name )
+			for i in range( 0, 10 ) :
+				c.writeObject( IECoreScene.PointsPrimitive( IECore.V3fVectorData( [ imath.V3f( i ) ] * 100 ) ), i )
+				c.writeTransform( IECore.M44dData( imath.M44d().translate( imath.V3d( i ) ) ), i )
+		del m, c
+
+		cacheTypes = [ IECoreScene.SceneCache.CacheType.ObjectCache, IECoreScene.SceneCache.CacheType.TransformCache ]
+		for t in cacheTypes :
+			IECoreScene.SceneCache.clearCache( t )
+
+		try :
+
+			m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Read )
+			m.prefetch( IECore.PathMatcher( [ "/a" ] ), 2.5, 4 )
+			m.waitForPrefetch()
+
+			# samples 2, 3 and 4 of /a are needed.
+			for t in cacheTypes :
+				self.assertEqual( IECoreScene.SceneCache.cacheStatistics( t )["misses"].value, 3 )
+
+			a = m.child( "a" )
+			for i in range( 2, 5 ) :
+				self.assertEqual( a.readObjectAtSample( i ), IECoreScene.PointsPrimitive( IECore.V3fVectorData( [ imath.V3f( i ) ] * 100 ) ) )
+				self.assertEqual( a.readTransformAtSample( i ), IECore.M44dData( imath.M44d().translate( imath.V3d( i ) ) ) )
+
+			for t in cacheTypes :
+				statistics = IECoreScene.SceneCache.cacheStatistics( t )
+				self.assertEqual( statistics["misses"].value, 3 )
+				self.assertEqual( statistics["hits"].value, 3 )
+
+			# cancelled prefetches don't prevent reading.
+
+			m.prefetch( IECore.PathMatcher( [ "/..." ] ), 0, 10 )
+			m.cancelPrefetch()
+			m.waitForPrefetch()
+			self.assertEqual( m.child( "b" ).readObjectAtSample( 9 ), IECoreScene.PointsPrimitive( IECore.V3fVectorData( [ imath.V3f( 9 ) ] * 100 ) ) )
+
+		finally :
+
+			for t in cacheTypes :
+				IECoreScene.SceneCache.clearCache( t )
+
+	def testSampleIntervals( self ) :
+
+		evenTimes = [ i / 24.0 for i in range( -10, 50 ) ]
+		unevenTimes = [ 0, 0.1, 0.15, 0.5, 1, 1.01, 2, 5 ]
+
+		m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Write )
+		for name, times in [ ( "even", evenTimes ), ( "uneven", unevenTimes ) ] :
+			c = m.createChild( name )
+			for t in times :
+				c.writeObject( IECore.V3fVectorData( [ imath.V3f( t ) ] * 10 ), t )
+		del m, c
+
+		def referenceInterval( times, time ) :
+
+			if time <= times[0] :
+				return ( 0, 0, 0 )
+			if time > times[-1] :
+				return ( 0, len( times ) - 1, len( times ) - 1 )
+			ceilIndex = next( i for i, t in enumerate( times ) if time <= t )
+			floorIndex = ceilIndex - 1
+			x = ( time - times[floorIndex] ) / ( times[ceilIndex] - times[floorIndex] )
+			x = 0 if x < 1e-4 else ( 1 if x > 1 - 1e-4 else x )
+			return ( x, floorIndex, ceilIndex )
+
+		m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Read )
+		for name, times in [ ( "even", evenTimes ), ( "uneven", unevenTimes ) ] :
+
+			c = m.child( name )
+			queryTimes = [ times[0] + ( times[-1] - times[0] ) * i / 500.0 for i in range( -10, 510 ) ] + times
+			for t in queryTimes :
+				x, floorIndex, ceilIndex = c.objectSampleInterval( t )
+				rx, rFloorIndex, rCeilIndex = referenceInterval( times, t )
+				self.assertEqual( ( floorIndex, ceilIndex ), ( rFloorIndex, rCeilIndex ) )
+				self.assertAlmostEqual( x, rx )
+
+			# reading many times at once matches reading them individually
+			objects = c.readObjects( queryTimes )
+			self.assertEqual( len( objects ), len( queryTimes ) )
+			for o, t in zip( objects, queryTimes ) :
+				self.assertEqual( o, c.readObject( t ) )
+
+	def testIntersectingLocations( self ) :
+
+		m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Write )
+		for i in range( 5 ) :
+			g = m.createChild( "g{0}".format( i ) )
+			g.writeTransform( IECore.M44dData( imath.M44d().translate( imath.V3d( i * 10, 0, 0 ) ) ), 0.0 )
+			g.writeTransform( IECore.M44dData( imath.M44d().translate( imath.V3d( i * 10, 0, 10 ) ) ), 1.0 )
+			for j in range( 5 ) :
+				s = g.createChild( "s{0}".format( j ) )
+				s.writeTransform( IECore.M44dData( imath.M44d().translate( imath.V3d( 0, j * 10, 0 ) ) ), 0.0 )
+				s.writeObject( IECoreScene.SpherePrimitive( 1 ), 0.0 )
+		del m, g, s
+
+		def referenceLocations( scene, bound, time, matrix = imath.M44d() ) :
+
+			result = IECore.PathMatcher()
+			b = imath.Box3d()
+			localBound = scene.readBound( time )
+			if not localBound.isEmpty() :
+				for x in ( localBound.min().x, localBound.max().x ) :
+					for y in ( localBound.min().y, localBound.max().y ) :
+						for z in ( localBound.min().z, localBound.max().z ) :
+							b.extendBy( imath.V3d( x, y, z ) * matrix )
+
+			if b.isEmpty() or not b.intersects( bound ) :
+				return result
+
+			result.addPath( scene.path() )
+			for childName in scene.childNames() :
+				child = scene.child( childName )
+				result.addPaths( referenceLocations( child, bound, time, child.readTransformAsMatrix( time ) * matrix ) )
+
+			return result
+
+		m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Read )
+		l = IECoreScene.LinkedScene( m )
+
+		bound = imath.Box3d( imath.V3d( 19, 29, -1 ), imath.V3d( 21, 31, 1 ) )
+		self.assertEqual( set( m.intersectingLocations( bound, 0.0 ).paths() ), { "/", "/g2", "/g2/s3" } )
+		self.assertEqual( m.intersectingLocations( bound, 1.0 ), IECore.PathMatcher() )
+		self.assertEqual( set( m.intersectingLocations( imath.Box3d( imath.V3d( 19, 29, 5 ), imath.V3d( 21, 31, 6 ) ), 0.5 ).paths() ), { "/", "/g2", "/g2/s3" } )
+		self.assertEqual( m.intersectingLocations( imath.Box3d(), 0.0 ), IECore.PathMatcher() )
+
+		for bound in [
+			imath.Box3d( imath.V3d( -100 ), imath.V3d( 100 ) ),
+			imath.Box3d( imath.V3d( 5, 5, -1 ), imath.V3d( 25, 15, 1 ) ),
+			imath.Box3d( imath.V3d( 0.5, 0.5, 0.5 ), imath.V3d( 0.6, 0.6, 0.6 ) ),
+			imath.Box3d( imath.V3d( 1000 ), imath.V3d( 1001 ) ),
+		] :
+			for time in ( 0.0, 0.25, 1.0 ) :
+				reference = referenceLocations( m, bound, time )
+				self.assertEqual( m.intersectingLocations( bound, time ), reference )
+				# LinkedScene uses the default implementation
+				self.assertEqual( l.intersectingLocations( bound, time ), reference )
+
+		# Paths are relative to the location queried, as are the planes
+
+		g1 = m.child( "g1" )
+		self.assertEqual(
+			set( g1.intersectingLocations( imath.Box3d( imath.V3d( -1, 9, -1 ), imath.V3d( 1, 11, 1 ) ), 0.0 ).paths() ),
+			{ "/", "/s1" }
+		)
+
+		planes = [ imath.Plane3d( imath.V3d( 1, 0, 0 ), 15 ), imath.Plane3d( imath.V3d( 0, 1, 0 ), 5 ) ]
+		self.assertEqual(
+			set( m.intersectingLocations( planes, 0.0 ).paths() ),
+			{ "/", "/g0", "/g1", "/g0/s0", "/g1/s0" }
+		)
+		self.assertEqual( l.intersectingLocations( planes, 0.0 ), m.intersectingLocations( planes, 0.0 ) )
+
+	def testLocationTable( self ) :
+
+		m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Write )
+		a = m.createChild( "a" )
+		a.writeTransform( IECore.M44dData( imath.M44d().translate( imath.V3d( 1, 0, 0 ) ) ), 0.0 )
+		a.writeTransform( IECore.M44dData( imath.M44d().translate( imath.V3d( 2, 0, 0 ) ) ), 1.0 )
+		a.writeTags( [ "tagA" ] )
+		b = a.createChild( "b" )
+		b.writeObject( IECoreScene.SpherePrimitive( 1 ), 0.0 )
+		b.writeObject( IECoreScene.SpherePrimitive( 2 ), 1.0 )
+		b.writeObject( IECoreScene.SpherePrimitive( 3 ), 2.0 )
+		b.writeTags( [ "tagA", "tagB" ] )
+		c = a.createChild( "c" )
+		for i in range( 10 ) :
+			c.createChild( "d{0}".format( i ) ).writeObject( IECoreScene.SpherePrimitive( 1 ), 0.0 )
+		m.createChild( "e" )
+		del m, a, b, c
+
+		f = IECore.FileIndexedIO( "/tmp/test.scc", IECore.IndexedIO.rootPath, IECore.IndexedIO.OpenMode.Read )
+		self.assertIn( "sceneCache:locationTable", f.subdirectory( "root" ).entryIds() )
+		del f
+
+		m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Read )
+
+		dPaths = { "/a/c/d{0}".format( i ) for i in range( 10 ) }
+		self.assertEqual( set( m.locationPaths().paths() ), { "/", "/a", "/a/b", "/a/c", "/e" } | dPaths )
+		self.assertEqual( set( m.locationPaths( objectsOnly = True ).paths() ), { "/a/b" } | dPaths )
+		self.assertEqual( set( m.child( "a" ).locationPaths().paths() ), { "/", "/b", "/c" } | { p[2:] for p in dPaths } )
+		self.assertEqual( m.child( "e" ).locationPaths().paths(), [ "/" ] )
+		self.assertEqual( m.child( "e" ).locationPaths( objectsOnly = True ).paths(), [] )
+
+		self.assertEqual( set( m.childNames() ), { "a", "e" } )
+		self.assertTrue( m.hasChild( "a" ) )
+		self.assertFalse( m.hasChild( "b" ) )
+		self.assertFalse( m.hasObject() )
+
+		a = m.child( "a" )
+		self.assertEqual( set( a.childNames() ), { "b", "c" } )
+		self.assertFalse( a.hasObject() )
+		self.assertEqual( a.readTags(), [ "tagA" ] )
+		self.assertTrue( a.hasTag( "tagA" ) )
+		self.assertFalse( a.hasTag( "tagB" ) )
+		self.assertTrue( a.hasTag( "tagB", IECoreScene.SceneInterface.TagFilter.DescendantTag ) )
+		self.assertEqual( a.numTransformSamples(), 2 )
+		self.assertEqual( a.readTransformAsMatrix( 0.5 ), imath.M44d().translate( imath.V3d( 1.5, 0, 0 ) ) )
+
+		b = a.child( "b" )
+		self.assertEqual( b.childNames(), [] )
+		self.assertTrue( b.hasObject() )
+		self.assertEqual( set( b.readTags() ), { "tagA", "tagB", "ObjectType:SpherePrimitive" } )
+		self.assertTrue( b.hasTag( "ObjectType:SpherePrimitive" ) )
+		self.assertTrue( b.hasTag( "tagA", IECoreScene.SceneInterface.TagFilter.AncestorTag ) )
+		self.assertEqual( b.numObjectSamples(), 3 )
+		self.assertEqual( b.numTransformSamples(), 1 )
+		self.assertEqual( b.readObject( 2.0 ), IECoreScene.SpherePrimitive( 3 ) )
+
+		c = a.child( "c" )
+		self.assertEqual( set( c.childNames() ), { "d{0}".format( i ) for i in range( 10 ) } )
+		for i in range( 10 ) :
+			self.assertTrue( c.hasChild( "d{0}".format( i ) ) )
+			self.assertTrue( c.child( "d{0}".format( i ) ).hasObject() )
+		self.assertFalse( c.hasChild( "d10" ) )
+		self.assertFalse( c.hasChild( "b" ) )
+		self.assertIsNone( c.child( "d10", IECoreScene.SceneInterface.MissingBehaviour.NullIfMissing ) )
+
+	def testCompleteSets( self ) :
+
+		m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Write )
+		a = m.createChild( "a" )
+		a.writeTags( [ "tagA" ] )
+		a.writeSet( "setA", IECore.PathMatcher( [ "/b", "/c/d" ] ) )
+		b = a.createChild( "b" )
+		b.writeTags( [ "tagA" ] )
+		b.writeSet( "setB", IECore.PathMatcher( [ "/" ] ) )
+		c = a.createChild( "c" )
+		d = c.createChild( "d" )
+		d.writeObject( IECoreScene.SpherePrimitive( 1 ), 0.0 )
+		m.writeSet( "setA", IECore.PathMatcher( [ "/e" ] ) )
+		m.createChild( "e" )
+		del m, a, b, c, d
+
+		f = IECore.FileIndexedIO( "/tmp/test.scc", IECore.IndexedIO.rootPath, IECore.IndexedIO.OpenMode.Read )
+		self.assertIn( "sceneCache:completeSets", f.subdirectory( "root" ).entryIds() )
+		del f
+
+		m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Read )
+
+		self.assertEqual( set( m.readSet( "tagA" ).paths() ), { "/a", "/a/b" } )
+		self.assertEqual( set( m.readSet( "setA" ).paths() ), { "/a/b", "/a/c/d", "/e" } )
+		self.assertEqual( m.readSet( "setB" ).paths(), [ "/a/b" ] )
+		self.assertEqual( m.readSet( "ObjectType:SpherePrimitive" ).paths(), [ "/a/c/d" ] )
+		self.assertEqual( m.readSet( "notASet" ).paths(), [] )
+
+		a = m.child( "a" )
+		self.assertEqual( set( a.readSet( "tagA" ).paths() ), { "/", "/b" } )
+		self.assertEqual( set( a.readSet( "setA" ).paths() ), { "/b", "/c/d" } )
+		self.assertEqual( a.child( "c" ).readSet( "setA" ).paths(), [ "/d" ] )
+		self.assertEqual( m.child( "e" ).readSet( "setA" ).paths(), [ "/" ] )
+
+		# Only the sets stored at the location itself are read when descendant sets are excluded.
+		self.assertEqual( m.readSet( "setA", includeDescendantSets = False ).paths(), [ "/e" ] )
+
 if __name__ == "__main__":
 	unittest.main()
 
@@ -46,6 +46,9 @@ class SharedSceneInterfacesTest( unittest.TestCase ) :
 		maxScenes = IECoreScene.SharedSceneInterfaces.getMaxScenes()
 		self.addCleanup( functools.partial( IECoreScene.SharedSceneInterfaces.setMaxScenes ), maxScenes )
 
+		memoryLimit = IECoreScene.SharedSceneInterfaces.getMemoryLimit()
+		self.addCleanup( functools.partial( IECoreScene.SharedSceneInterfaces.setMemoryLimit ), memoryLimit )
+
 	def testLimits( self ) :
 
 		IECoreScene.SharedSceneInterfaces.clear()
@@ -78,5 +81,116 @@ class SharedSceneInterfacesTest( unittest.TestCase ) :
 
 		self.assertGreater( len( scenes ), len( files ) )
 
+	def testMemoryLimit( self ) :
+
+		IECoreScene.SharedSceneInterfaces.clear()
+		IECoreScene.SharedSceneInterfaces.setMemoryLimit( 0 )
+
+		files = [
+			"test/IECore/data/sccFiles/animatedSpheres.scc",
+			"test/IECore/data/sccFiles/attributeAtRoot.scc",
+			"test/IECore/data/sccFiles/cube_v6.scc",
+		]
+
+		memoryUsage = 0
+		for f in files :
+			scene = IECoreScene.SharedSceneInterfaces.get( f )
+			self.assertGreater( scene.memoryUsage(), 0 )
+			memoryUsage += scene.memoryUsage()
+
+		self.assertEqual( IECoreScene.SharedSceneInterfaces.numScenes(), len( files ) )
+		self.assertEqual( IECoreScene.SharedSceneInterfaces.memoryUsage(), memoryUsage )
+
+		# The most recently used scene is kept, even though it exceeds the limit.
+
+		IECoreScene.SharedSceneInterfaces.setMemoryLimit( 1 )
+		self.assertEqual( IECoreScene.SharedSceneInterfaces.getMemoryLimit(), 1 )
+		self.assertEqual( IECoreScene.SharedSceneInterfaces.numScenes(), 1 )
+		self.assertEqual( IECoreScene.SharedSceneInterfaces.memoryUsage(), IECoreScene.SharedSceneInterfaces.get( files[-1] ).memoryUsage() )
+
+		s = IECoreScene.SharedSceneInterfaces.get( files[0] )
+		self.assertEqual( IECoreScene.SharedSceneInterfaces.numScenes(), 1 )
+		self.assertTrue( IECoreScene.SharedSceneInterfaces.get( files[0] ).isSame( s ) )
+
+	def testPin( self ) :
+
+		IECoreScene.SharedSceneInterfaces.clear()
+		IECoreScene.SharedSceneInterfaces.setMaxScenes( 1 )
+
+		files = [
+			"test/IECore/data/sccFiles/animatedSpheres.scc",
+			"test/IECore/data/sccFiles/attributeAtRoot.scc",
+			"test/IECore/data/sccFiles/cube_v6.scc",
+		]
+
+		pinned = IECoreScene.SharedSceneInterfaces.pin( files[0] )
+		for f in files[1:] :
+			IECoreScene.SharedSceneInterfaces.get( f )
+
+		# The pinned scene isn't evicted.
+
+		self.assertEqual( IECoreScene.SharedSceneInterfaces.numScenes(), 2 )
+		self.assertTrue( IECoreScene.SharedSceneInterfaces.get( files[0] ).isSame( pinned ) )
+		self.assertEqual( IECoreScene.SharedSceneInterfaces.statistics()["pinnedScenes"].value, 1 )
+
+		# Until it is unpinned.
+
+		IECoreScene.SharedSceneInterfaces.get( files[1] )
+		IECoreScene.SharedSceneInterfaces.unpin( files[0] )
+		self.assertEqual( IECoreScene.SharedSceneInterfaces.numScenes(), 1 )
+		self.assertFalse( IECoreScene.SharedSceneInterfaces.get( files[0] ).isSame( pinned ) )
+
+	def testStatistics( self ) :
+
+		IECoreScene.SharedSceneInterfaces.clear()
+		statistics = IECoreScene.SharedSceneInterfaces.statistics()
+
+		f = "test/IECore/data/sccFiles/animatedSpheres.scc"
+		IECoreScene.SharedSceneInterfaces.get( f )
+		IECoreScene.SharedSceneInterfaces.get( f )
+
+		newStatistics = IECoreScene.SharedSceneInterfaces.statistics()
+		self.assertEqual( newStatistics["misses"].value, statistics["misses"].value + 1 )
+		self.assertEqual( newStatistics["hits"].value, statistics["hits"].value + 1 )
+		self.assertEqual( newStatistics["numScenes"].value, 1 )
+		self.assertEqual( newStatistics["memoryUsage"].value, IECoreScene.SharedSceneInterfaces.memoryUsage() )
+		self.assertEqual( newStatistics["maxScenes"].value, IECoreScene.SharedSceneInterfaces.getMaxScenes() )
+
+	def testLocation( self ) :
+
+		IECoreScene.SharedSceneInterfaces.clear()
+
+		f = "test/IECore/data/sccFiles/animatedSpheres.scc"
+		scene = IECoreScene.SharedSceneInterfaces.get( f )
+		a = IECoreScene.SharedSceneInterfaces.location( f, [ "A" ] )
+		self.assertEqual( a.path(), [ "A" ] )
+		self.assertTrue( IECoreScene.SharedSceneInterfaces.location( f, [ "A" ] ).isSame( a ) )
+		self.assertEqual( IECoreScene.SharedSceneInterfaces.location( f, [] ).path(), [] )
+		self.assertIsNone( IECoreScene.SharedSceneInterfaces.location( f, [ "nonexistent" ] ) )
+		self.assertEqual( IECoreScene.SharedSceneInterfaces.numScenes(), 1 )
+
+		# Locations are released along with their scene.
+
+		IECoreScene.SharedSceneInterfaces.erase( f )
+		self.assertFalse( IECoreScene.SharedSceneInterfaces.location( f, [ "A" ] ).isSame( a ) )
+		self.assertFalse( IECoreScene.SharedSceneInterfaces.get( f ).isSame( scene ) )
+
+	def testFailuresAreCached( self ) :
+
+		IECoreScene.SharedSceneInterfaces.clear()
+		statistics = IECoreScene.SharedSceneInterfaces.statistics()
+
+		f = "/tmp/nonexistent.scc"
+		for i in range( 0, 2 ) :
+			self.assertRaises( RuntimeError, IECoreScene.SharedSceneInterfaces.get, f )
+
+		newStatistics = IECoreScene.SharedSceneInterfaces.statistics()
+		self.assertEqual( newStatistics["misses"].value, statistics["misses"].value + 1 )
+		self.assertEqual( newStatistics["hits"].value, statistics["hits"].value + 1 )
+		self.assertEqual( newStatistics["numScenes"].value, 1 )
+
+		IECoreScene.SharedSceneInterfaces.erase( f )
+		self.assertEqual( IECoreScene.SharedSceneInterfaces.numScenes(), 0 )
+
 if __name__ == "__main__":
 	unittest.main()